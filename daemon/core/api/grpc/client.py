@@ -185,6 +185,7 @@ class CoreGrpcClient:
         service_file_configs: List[core_pb2.ServiceFileConfig] = None,
         asymmetric_links: List[core_pb2.Link] = None,
         config_service_configs: List[configservices_pb2.ConfigServiceConfig] = None,
+        bulk: bool = False,
     ) -> core_pb2.StartSessionResponse:
         """
         Start a session.
@@ -202,6 +203,7 @@ class CoreGrpcClient:
         :param service_file_configs: node service file configurations
         :param asymmetric_links: asymmetric links to edit
         :param config_service_configs: config service configurations
+        :param bulk: True to create nodes and links in bulk, planning links up front
         :return: start session response
         """
         request = core_pb2.StartSessionRequest(
@@ -218,6 +220,7 @@ class CoreGrpcClient:
             service_file_configs=service_file_configs,
             asymmetric_links=asymmetric_links,
             config_service_configs=config_service_configs,
+            bulk=bulk,
         )
         return self.stub.StartSession(request)
 
@@ -283,6 +286,23 @@ class CoreGrpcClient:
         request = core_pb2.GetSessionRequest(session_id=session_id)
         return self.stub.GetSession(request)
 
+    def get_session_delta(
+        self, session_id: int, version: int
+    ) -> core_pb2.GetSessionDeltaResponse:
+        """
+        Retrieve changes to session nodes and links since a version previously
+        received, or the full session when those changes are no longer known.
+
+        :param session_id: id of session
+        :param version: session version last received
+        :return: response with session version and changes
+        :raises grpc.RpcError: when session doesn't exist
+        """
+        request = core_pb2.GetSessionDeltaRequest(
+            session_id=session_id, version=version
+        )
+        return self.stub.GetSessionDelta(request)
+
     def get_session_options(
         self, session_id: int
     ) -> core_pb2.GetSessionOptionsResponse:
@@ -423,6 +443,8 @@ class CoreGrpcClient:
         session_id: int,
         handler: Callable[[core_pb2.Event], None],
         events: List[core_pb2.Event] = None,
+        coalesce: float = 0.0,
+        max_queue: int = 0,
     ) -> Any:
         """
         Listen for session events.
@@ -430,27 +452,70 @@ class CoreGrpcClient:
         :param session_id: id of session
         :param handler: handler for received events
         :param events: events to listen to, defaults to all
+        :param coalesce: window in seconds to coalesce node position and link
+            events within, 0 to disable
+        :param max_queue: max number of pending events, before new events are
+            dropped, 0 for no limit
         :return: stream processing events, can be used to cancel stream
         :raises grpc.RpcError: when session doesn't exist
         """
-        request = core_pb2.EventsRequest(session_id=session_id, events=events)
+        request = core_pb2.EventsRequest(
+            session_id=session_id, events=events, coalesce=coalesce, max_queue=max_queue
+        )
         stream = self.stub.Events(request)
         logging.info("STREAM TYPE: %s", type(stream))
         start_streamer(stream, handler)
         return stream
 
+    def batch_events(
+        self,
+        session_id: int,
+        handler: Callable[[core_pb2.Events], None],
+        events: List[core_pb2.Event] = None,
+        coalesce: float = 0.0,
+        max_queue: int = 0,
+    ) -> Any:
+        """
+        Listen for session events, received in batches of all pending events.
+
+        :param session_id: id of session
+        :param handler: handler for received event batches
+        :param events: events to listen to, defaults to all
+        :param coalesce: window in seconds to coalesce node position and link
+            events within, 0 to disable
+        :param max_queue: max number of pending events, before new events are
+            dropped, 0 for no limit
+        :return: stream processing events, can be used to cancel stream
+        :raises grpc.RpcError: when session doesn't exist
+        """
+        request = core_pb2.EventsRequest(
+            session_id=session_id, events=events, coalesce=coalesce, max_queue=max_queue
+        )
+        stream = self.stub.BatchEvents(request)
+        start_streamer(stream, handler)
+        return stream
+
     def throughputs(
-        self, session_id: int, handler: Callable[[core_pb2.ThroughputsEvent], None]
+        self,
+        session_id: int,
+        handler: Callable[[core_pb2.ThroughputsEvent], None],
+        interval: float = 0.0,
+        smoothing: float = 0.0,
     ) -> Any:
         """
         Listen for throughput events with information for interfaces and bridges.
 
         :param session_id: session id
         :param handler: handler for every event
+        :param interval: time in seconds between samples, 0 for the default
+        :param smoothing: weight given to the previous rate of an interface, from 0
+            for no smoothing up to 1
         :return: stream processing events, can be used to cancel stream
         :raises grpc.RpcError: when session doesn't exist
         """
-        request = core_pb2.ThroughputsRequest(session_id=session_id)
+        request = core_pb2.ThroughputsRequest(
+            session_id=session_id, interval=interval, smoothing=smoothing
+        )
         stream = self.stub.Throughputs(request)
         start_streamer(stream, handler)
         return stream
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: core/api/grpc/configservices.proto
+# Protobuf Python Version: 7.35.1
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    7,
+    35,
+    1,
+    '',
+    'core/api/grpc/configservices.proto'
+)
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+from core.api.grpc import common_pb2 as core_dot_api_dot_grpc_dot_common__pb2
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\"core/api/grpc/configservices.proto\x12\x0e\x63onfigservices\x1a\x1a\x63ore/api/grpc/common.proto\"\x9d\x02\n\x13\x43onfigServiceConfig\x12\x0f\n\x07node_id\x18\x01 \x01(\x05\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x45\n\ttemplates\x18\x03 \x03(\x0b\x32\x32.configservices.ConfigServiceConfig.TemplatesEntry\x12?\n\x06\x63onfig\x18\x04 \x03(\x0b\x32/.configservices.ConfigServiceConfig.ConfigEntry\x1a\x30\n\x0eTemplatesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x1a-\n\x0b\x43onfigEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"P\n\x1b\x43onfigServiceValidationMode\"1\n\x04\x45num\x12\x0c\n\x08\x42LOCKING\x10\x00\x12\x10\n\x0cNON_BLOCKING\x10\x01\x12\t\n\x05TIMER\x10\x02\"\xb0\x02\n\rConfigService\x12\r\n\x05group\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x13\n\x0b\x65xecutables\x18\x03 \x03(\t\x12\x14\n\x0c\x64\x65pendencies\x18\x04 \x03(\t\x12\x13\n\x0b\x64irectories\x18\x05 \x03(\t\x12\r\n\x05\x66iles\x18\x06 \x03(\t\x12\x0f\n\x07startup\x18\x07 \x03(\t\x12\x10\n\x08validate\x18\x08 \x03(\t\x12\x10\n\x08shutdown\x18\t \x03(\t\x12I\n\x0fvalidation_mode\x18\n \x01(\x0e\x32\x30.configservices.ConfigServiceValidationMode.Enum\x12\x18\n\x10validation_timer\x18\x0b \x01(\x05\x12\x19\n\x11validation_period\x18\x0c \x01(\x02\"\x81\x01\n\nConfigMode\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x36\n\x06\x63onfig\x18\x02 \x03(\x0b\x32&.configservices.ConfigMode.ConfigEntry\x1a-\n\x0b\x43onfigEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\".\n\x18GetConfigServicesRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\"L\n\x19GetConfigServicesResponse\x12/\n\x08services\x18\x01 \x03(\x0b\x32\x1d.configservices.ConfigService\"/\n\x1fGetConfigServiceDefaultsRequest\x12\x0c\n\x04name\x18\x01 \x01(\t\"\xe6\x02\n GetConfigServiceDefaultsResponse\x12R\n\ttemplates\x18\x01 \x03(\x0b\x32?.configservices.GetConfigServiceDefaultsResponse.TemplatesEntry\x12L\n\x06\x63onfig\x18\x02 \x03(\x0b\x32<.configservices.GetConfigServiceDefaultsResponse.ConfigEntry\x12)\n\x05modes\x18\x03 \x03(\x0b\x32\x1a.configservices.ConfigMode\x1a\x30\n\x0eTemplatesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x1a\x43\n\x0b\x43onfigEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12#\n\x05value\x18\x02 \x01(\x0b\x32\x14.common.ConfigOption:\x02\x38\x01\"8\n\"GetNodeConfigServiceConfigsRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\"[\n#GetNodeConfigServiceConfigsResponse\x12\x34\n\x07\x63onfigs\x18\x01 \x03(\x0b\x32#.configservices.ConfigServiceConfig\"P\n\x1bGetNodeConfigServiceRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12\x0f\n\x07node_id\x18\x02 \x01(\x05\x12\x0c\n\x04name\x18\x03 \x01(\t\"\x97\x01\n\x1cGetNodeConfigServiceResponse\x12H\n\x06\x63onfig\x18\x01 \x03(\x0b\x32\x38.configservices.GetNodeConfigServiceResponse.ConfigEntry\x1a-\n\x0b\x43onfigEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"C\n\x1cGetNodeConfigServicesRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12\x0f\n\x07node_id\x18\x02 \x01(\x05\"1\n\x1dGetNodeConfigServicesResponse\x12\x10\n\x08services\x18\x01 \x03(\t\"\xc8\x01\n\x1bSetNodeConfigServiceRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12\x0f\n\x07node_id\x18\x02 \x01(\x05\x12\x0c\n\x04name\x18\x03 \x01(\t\x12G\n\x06\x63onfig\x18\x04 \x03(\x0b\x32\x37.configservices.SetNodeConfigServiceRequest.ConfigEntry\x1a-\n\x0b\x43onfigEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\".\n\x1cSetNodeConfigServiceResponse\x12\x0e\n\x06result\x18\x01 \x01(\x08\x62\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'core.api.grpc.configservices_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  DESCRIPTOR._loaded_options = None
+  _globals['_CONFIGSERVICECONFIG_TEMPLATESENTRY']._loaded_options = None
+  _globals['_CONFIGSERVICECONFIG_TEMPLATESENTRY']._serialized_options = b'8\001'
+  _globals['_CONFIGSERVICECONFIG_CONFIGENTRY']._loaded_options = None
+  _globals['_CONFIGSERVICECONFIG_CONFIGENTRY']._serialized_options = b'8\001'
+  _globals['_CONFIGMODE_CONFIGENTRY']._loaded_options = None
+  _globals['_CONFIGMODE_CONFIGENTRY']._serialized_options = b'8\001'
+  _globals['_GETCONFIGSERVICEDEFAULTSRESPONSE_TEMPLATESENTRY']._loaded_options = None
+  _globals['_GETCONFIGSERVICEDEFAULTSRESPONSE_TEMPLATESENTRY']._serialized_options = b'8\001'
+  _globals['_GETCONFIGSERVICEDEFAULTSRESPONSE_CONFIGENTRY']._loaded_options = None
+  _globals['_GETCONFIGSERVICEDEFAULTSRESPONSE_CONFIGENTRY']._serialized_options = b'8\001'
+  _globals['_GETNODECONFIGSERVICERESPONSE_CONFIGENTRY']._loaded_options = None
+  _globals['_GETNODECONFIGSERVICERESPONSE_CONFIGENTRY']._serialized_options = b'8\001'
+  _globals['_SETNODECONFIGSERVICEREQUEST_CONFIGENTRY']._loaded_options = None
+  _globals['_SETNODECONFIGSERVICEREQUEST_CONFIGENTRY']._serialized_options = b'8\001'
+  _globals['_CONFIGSERVICECONFIG']._serialized_start=83
+  _globals['_CONFIGSERVICECONFIG']._serialized_end=368
+  _globals['_CONFIGSERVICECONFIG_TEMPLATESENTRY']._serialized_start=273
+  _globals['_CONFIGSERVICECONFIG_TEMPLATESENTRY']._serialized_end=321
+  _globals['_CONFIGSERVICECONFIG_CONFIGENTRY']._serialized_start=323
+  _globals['_CONFIGSERVICECONFIG_CONFIGENTRY']._serialized_end=368
+  _globals['_CONFIGSERVICEVALIDATIONMODE']._serialized_start=370
+  _globals['_CONFIGSERVICEVALIDATIONMODE']._serialized_end=450
+  _globals['_CONFIGSERVICEVALIDATIONMODE_ENUM']._serialized_start=401
+  _globals['_CONFIGSERVICEVALIDATIONMODE_ENUM']._serialized_end=450
+  _globals['_CONFIGSERVICE']._serialized_start=453
+  _globals['_CONFIGSERVICE']._serialized_end=757
+  _globals['_CONFIGMODE']._serialized_start=760
+  _globals['_CONFIGMODE']._serialized_end=889
+  _globals['_CONFIGMODE_CONFIGENTRY']._serialized_start=323
+  _globals['_CONFIGMODE_CONFIGENTRY']._serialized_end=368
+  _globals['_GETCONFIGSERVICESREQUEST']._serialized_start=891
+  _globals['_GETCONFIGSERVICESREQUEST']._serialized_end=937
+  _globals['_GETCONFIGSERVICESRESPONSE']._serialized_start=939
+  _globals['_GETCONFIGSERVICESRESPONSE']._serialized_end=1015
+  _globals['_GETCONFIGSERVICEDEFAULTSREQUEST']._serialized_start=1017
+  _globals['_GETCONFIGSERVICEDEFAULTSREQUEST']._serialized_end=1064
+  _globals['_GETCONFIGSERVICEDEFAULTSRESPONSE']._serialized_start=1067
+  _globals['_GETCONFIGSERVICEDEFAULTSRESPONSE']._serialized_end=1425
+  _globals['_GETCONFIGSERVICEDEFAULTSRESPONSE_TEMPLATESENTRY']._serialized_start=273
+  _globals['_GETCONFIGSERVICEDEFAULTSRESPONSE_TEMPLATESENTRY']._serialized_end=321
+  _globals['_GETCONFIGSERVICEDEFAULTSRESPONSE_CONFIGENTRY']._serialized_start=1358
+  _globals['_GETCONFIGSERVICEDEFAULTSRESPONSE_CONFIGENTRY']._serialized_end=1425
+  _globals['_GETNODECONFIGSERVICECONFIGSREQUEST']._serialized_start=1427
+  _globals['_GETNODECONFIGSERVICECONFIGSREQUEST']._serialized_end=1483
+  _globals['_GETNODECONFIGSERVICECONFIGSRESPONSE']._serialized_start=1485
+  _globals['_GETNODECONFIGSERVICECONFIGSRESPONSE']._serialized_end=1576
+  _globals['_GETNODECONFIGSERVICEREQUEST']._serialized_start=1578
+  _globals['_GETNODECONFIGSERVICEREQUEST']._serialized_end=1658
+  _globals['_GETNODECONFIGSERVICERESPONSE']._serialized_start=1661
+  _globals['_GETNODECONFIGSERVICERESPONSE']._serialized_end=1812
+  _globals['_GETNODECONFIGSERVICERESPONSE_CONFIGENTRY']._serialized_start=323
+  _globals['_GETNODECONFIGSERVICERESPONSE_CONFIGENTRY']._serialized_end=368
+  _globals['_GETNODECONFIGSERVICESREQUEST']._serialized_start=1814
+  _globals['_GETNODECONFIGSERVICESREQUEST']._serialized_end=1881
+  _globals['_GETNODECONFIGSERVICESRESPONSE']._serialized_start=1883
+  _globals['_GETNODECONFIGSERVICESRESPONSE']._serialized_end=1932
+  _globals['_SETNODECONFIGSERVICEREQUEST']._serialized_start=1935
+  _globals['_SETNODECONFIGSERVICEREQUEST']._serialized_end=2135
+  _globals['_SETNODECONFIGSERVICEREQUEST_CONFIGENTRY']._serialized_start=323
+  _globals['_SETNODECONFIGSERVICEREQUEST_CONFIGENTRY']._serialized_end=368
+  _globals['_SETNODECONFIGSERVICERESPONSE']._serialized_start=2137
+  _globals['_SETNODECONFIGSERVICERESPONSE']._serialized_end=2183
+# @@protoc_insertion_point(module_scope)
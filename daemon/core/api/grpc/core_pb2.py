@@ -0,0 +1,447 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: core/api/grpc/core.proto
+# Protobuf Python Version: 7.35.1
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    7,
+    35,
+    1,
+    '',
+    'core/api/grpc/core.proto'
+)
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+from core.api.grpc import configservices_pb2 as core_dot_api_dot_grpc_dot_configservices__pb2
+from core.api.grpc import common_pb2 as core_dot_api_dot_grpc_dot_common__pb2
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x18\x63ore/api/grpc/core.proto\x12\x04\x63ore\x1a\"core/api/grpc/configservices.proto\x1a\x1a\x63ore/api/grpc/common.proto\"\x84\x05\n\x13StartSessionRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12\x19\n\x05nodes\x18\x02 \x03(\x0b\x32\n.core.Node\x12\x19\n\x05links\x18\x03 \x03(\x0b\x32\n.core.Link\x12\x19\n\x05hooks\x18\x04 \x03(\x0b\x32\n.core.Hook\x12\'\n\x08location\x18\x05 \x01(\x0b\x32\x15.core.SessionLocation\x12@\n\x0c\x65mane_config\x18\x06 \x03(\x0b\x32*.core.StartSessionRequest.EmaneConfigEntry\x12&\n\x0cwlan_configs\x18\x07 \x03(\x0b\x32\x10.core.WlanConfig\x12\x33\n\x13\x65mane_model_configs\x18\x08 \x03(\x0b\x32\x16.core.EmaneModelConfig\x12.\n\x10mobility_configs\x18\t \x03(\x0b\x32\x14.core.MobilityConfig\x12,\n\x0fservice_configs\x18\n \x03(\x0b\x32\x13.core.ServiceConfig\x12\x35\n\x14service_file_configs\x18\x0b \x03(\x0b\x32\x17.core.ServiceFileConfig\x12$\n\x10\x61symmetric_links\x18\x0c \x03(\x0b\x32\n.core.Link\x12\x43\n\x16\x63onfig_service_configs\x18\r \x03(\x0b\x32#.configservices.ConfigServiceConfig\x12\x0c\n\x04\x62ulk\x18\x0e \x01(\x08\x1a\x32\n\x10\x45maneConfigEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\xa4\x01\n\x14StartSessionResponse\x12\x0e\n\x06result\x18\x01 \x01(\x08\x12\x12\n\nexceptions\x18\x02 \x03(\t\x12\x38\n\x07timings\x18\x03 \x03(\x0b\x32\'.core.StartSessionResponse.TimingsEntry\x1a.\n\x0cTimingsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x02:\x02\x38\x01\"(\n\x12StopSessionRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\"%\n\x13StopSessionResponse\x12\x0e\n\x06result\x18\x01 \x01(\x08\"*\n\x14\x43reateSessionRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\"S\n\x15\x43reateSessionResponse\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12&\n\x05state\x18\x02 \x01(\x0e\x32\x17.core.SessionState.Enum\"*\n\x14\x44\x65leteSessionRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\"\'\n\x15\x44\x65leteSessionResponse\x12\x0e\n\x06result\x18\x01 \x01(\x08\"\x14\n\x12GetSessionsRequest\"=\n\x13GetSessionsResponse\x12&\n\x08sessions\x18\x01 \x03(\x0b\x32\x14.core.SessionSummary\")\n\x13\x43heckSessionRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\"&\n\x14\x43heckSessionResponse\x12\x0e\n\x06result\x18\x01 \x01(\x08\"\'\n\x11GetSessionRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\"E\n\x12GetSessionResponse\x12\x1e\n\x07session\x18\x01 \x01(\x0b\x32\r.core.Session\x12\x0f\n\x07version\x18\x02 \x01(\x03\"=\n\x16GetSessionDeltaRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12\x0f\n\x07version\x18\x02 \x01(\x03\"\xf0\x01\n\x17GetSessionDeltaResponse\x12\x0f\n\x07version\x18\x01 \x01(\x03\x12\x0c\n\x04\x66ull\x18\x02 \x01(\x08\x12&\n\x05state\x18\x03 \x01(\x0e\x32\x17.core.SessionState.Enum\x12\x1e\n\x07session\x18\x04 \x01(\x0b\x32\r.core.Session\x12\x19\n\x05nodes\x18\x05 \x03(\x0b\x32\n.core.Node\x12\x15\n\rdeleted_nodes\x18\x06 \x03(\x05\x12\x19\n\x05links\x18\x07 \x03(\x0b\x32\n.core.Link\x12!\n\rdeleted_links\x18\x08 \x03(\x0b\x32\n.core.Link\".\n\x18GetSessionOptionsRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\"\x9d\x01\n\x19GetSessionOptionsResponse\x12;\n\x06\x63onfig\x18\x02 \x03(\x0b\x32+.core.GetSessionOptionsResponse.ConfigEntry\x1a\x43\n\x0b\x43onfigEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12#\n\x05value\x18\x02 \x01(\x0b\x32\x14.common.ConfigOption:\x02\x38\x01\"\x99\x01\n\x18SetSessionOptionsRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12:\n\x06\x63onfig\x18\x02 \x03(\x0b\x32*.core.SetSessionOptionsRequest.ConfigEntry\x1a-\n\x0b\x43onfigEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"+\n\x19SetSessionOptionsResponse\x12\x0e\n\x06result\x18\x01 \x01(\x08\"\x9b\x01\n\x19SetSessionMetadataRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12;\n\x06\x63onfig\x18\x02 \x03(\x0b\x32+.core.SetSessionMetadataRequest.ConfigEntry\x1a-\n\x0b\x43onfigEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\",\n\x1aSetSessionMetadataResponse\x12\x0e\n\x06result\x18\x01 \x01(\x08\"/\n\x19GetSessionMetadataRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\"\x89\x01\n\x1aGetSessionMetadataResponse\x12<\n\x06\x63onfig\x18\x01 \x03(\x0b\x32,.core.GetSessionMetadataResponse.ConfigEntry\x1a-\n\x0b\x43onfigEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"/\n\x19GetSessionLocationRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\"E\n\x1aGetSessionLocationResponse\x12\'\n\x08location\x18\x01 \x01(\x0b\x32\x15.core.SessionLocation\"X\n\x19SetSessionLocationRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12\'\n\x08location\x18\x02 \x01(\x0b\x32\x15.core.SessionLocation\",\n\x1aSetSessionLocationResponse\x12\x0e\n\x06result\x18\x01 \x01(\x08\"T\n\x16SetSessionStateRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12&\n\x05state\x18\x02 \x01(\x0e\x32\x17.core.SessionState.Enum\")\n\x17SetSessionStateResponse\x12\x0e\n\x06result\x18\x01 \x01(\x08\"I\n\x17\x41\x64\x64SessionServerRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x0c\n\x04host\x18\x03 \x01(\t\"*\n\x18\x41\x64\x64SessionServerResponse\x12\x0e\n\x06result\x18\x01 \x01(\x08\"n\n\rEventsRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12$\n\x06\x65vents\x18\x02 \x03(\x0e\x32\x14.core.EventType.Enum\x12\x10\n\x08\x63oalesce\x18\x03 \x01(\x02\x12\x11\n\tmax_queue\x18\x04 \x01(\x05\"M\n\x12ThroughputsRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12\x10\n\x08interval\x18\x02 \x01(\x02\x12\x11\n\tsmoothing\x18\x03 \x01(\x02\"\x94\x01\n\x10ThroughputsEvent\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12\x32\n\x12\x62ridge_throughputs\x18\x02 \x03(\x0b\x32\x16.core.BridgeThroughput\x12\x38\n\x15interface_throughputs\x18\x03 \x03(\x0b\x32\x19.core.InterfaceThroughput\"P\n\x13InterfaceThroughput\x12\x0f\n\x07node_id\x18\x01 \x01(\x05\x12\x14\n\x0cinterface_id\x18\x02 \x01(\x05\x12\x12\n\nthroughput\x18\x03 \x01(\x01\"7\n\x10\x42ridgeThroughput\x12\x0f\n\x07node_id\x18\x01 \x01(\x05\x12\x12\n\nthroughput\x18\x02 \x01(\x01\"\xa7\x02\n\x05\x45vent\x12+\n\rsession_event\x18\x01 \x01(\x0b\x32\x12.core.SessionEventH\x00\x12%\n\nnode_event\x18\x02 \x01(\x0b\x32\x0f.core.NodeEventH\x00\x12%\n\nlink_event\x18\x03 \x01(\x0b\x32\x0f.core.LinkEventH\x00\x12)\n\x0c\x63onfig_event\x18\x04 \x01(\x0b\x32\x11.core.ConfigEventH\x00\x12/\n\x0f\x65xception_event\x18\x05 \x01(\x0b\x32\x14.core.ExceptionEventH\x00\x12%\n\nfile_event\x18\x06 \x01(\x0b\x32\x0f.core.FileEventH\x00\x12\x12\n\nsession_id\x18\x07 \x01(\x05\x42\x0c\n\nevent_type\"]\n\x06\x45vents\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12\x1b\n\x06\x65vents\x18\x02 \x03(\x0b\x32\x0b.core.Event\x12\x0f\n\x07\x64ropped\x18\x03 \x01(\x05\x12\x11\n\tcoalesced\x18\x04 \x01(\x05\"5\n\tNodeEvent\x12\x18\n\x04node\x18\x01 \x01(\x0b\x32\n.core.Node\x12\x0e\n\x06source\x18\x02 \x01(\t\"S\n\tLinkEvent\x12,\n\x0cmessage_type\x18\x01 \x01(\x0e\x32\x16.core.MessageType.Enum\x12\x18\n\x04link\x18\x02 \x01(\x0b\x32\n.core.Link\"X\n\x0cSessionEvent\x12\x0f\n\x07node_id\x18\x01 \x01(\x05\x12\r\n\x05\x65vent\x18\x02 \x01(\x05\x12\x0c\n\x04name\x18\x03 \x01(\t\x12\x0c\n\x04\x64\x61ta\x18\x04 \x01(\t\x12\x0c\n\x04time\x18\x05 \x01(\x02\"\x95\x02\n\x0b\x43onfigEvent\x12,\n\x0cmessage_type\x18\x01 \x01(\x0e\x32\x16.core.MessageType.Enum\x12\x0f\n\x07node_id\x18\x02 \x01(\x05\x12\x0e\n\x06object\x18\x03 \x01(\t\x12\x0c\n\x04type\x18\x04 \x01(\x05\x12\x12\n\ndata_types\x18\x05 \x03(\x05\x12\x13\n\x0b\x64\x61ta_values\x18\x06 \x01(\t\x12\x10\n\x08\x63\x61ptions\x18\x07 \x01(\t\x12\x0e\n\x06\x62itmap\x18\x08 \x01(\t\x12\x17\n\x0fpossible_values\x18\t \x01(\t\x12\x0e\n\x06groups\x18\n \x01(\t\x12\x11\n\tinterface\x18\x0b \x01(\x05\x12\x12\n\nnetwork_id\x18\x0c \x01(\x05\x12\x0e\n\x06opaque\x18\r \x01(\t\"\x87\x01\n\x0e\x45xceptionEvent\x12\x0f\n\x07node_id\x18\x01 \x01(\x05\x12(\n\x05level\x18\x02 \x01(\x0e\x32\x19.core.ExceptionLevel.Enum\x12\x0e\n\x06source\x18\x03 \x01(\t\x12\x0c\n\x04\x64\x61te\x18\x04 \x01(\t\x12\x0c\n\x04text\x18\x05 \x01(\t\x12\x0e\n\x06opaque\x18\x06 \x01(\t\"\xbb\x01\n\tFileEvent\x12,\n\x0cmessage_type\x18\x01 \x01(\x0e\x32\x16.core.MessageType.Enum\x12\x0f\n\x07node_id\x18\x02 \x01(\x05\x12\x0c\n\x04name\x18\x03 \x01(\t\x12\x0c\n\x04mode\x18\x04 \x01(\t\x12\x0e\n\x06number\x18\x05 \x01(\x05\x12\x0c\n\x04type\x18\x06 \x01(\t\x12\x0e\n\x06source\x18\x07 \x01(\t\x12\x0c\n\x04\x64\x61ta\x18\x08 \x01(\t\x12\x17\n\x0f\x63ompressed_data\x18\t \x01(\t\">\n\x0e\x41\x64\x64NodeRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12\x18\n\x04node\x18\x02 \x01(\x0b\x32\n.core.Node\"\"\n\x0f\x41\x64\x64NodeResponse\x12\x0f\n\x07node_id\x18\x01 \x01(\x05\"5\n\x0eGetNodeRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12\x0f\n\x07node_id\x18\x02 \x01(\x05\"P\n\x0fGetNodeResponse\x12\x18\n\x04node\x18\x01 \x01(\x0b\x32\n.core.Node\x12#\n\ninterfaces\x18\x02 \x03(\x0b\x32\x0f.core.Interface\"\x8e\x01\n\x0f\x45\x64itNodeRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12\x0f\n\x07node_id\x18\x02 \x01(\x05\x12 \n\x08position\x18\x03 \x01(\x0b\x32\x0e.core.Position\x12\x0c\n\x04icon\x18\x04 \x01(\t\x12\x0e\n\x06source\x18\x05 \x01(\t\x12\x16\n\x03geo\x18\x06 \x01(\x0b\x32\t.core.Geo\"\"\n\x10\x45\x64itNodeResponse\x12\x0e\n\x06result\x18\x01 \x01(\x08\"8\n\x11\x44\x65leteNodeRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12\x0f\n\x07node_id\x18\x02 \x01(\x05\"$\n\x12\x44\x65leteNodeResponse\x12\x0e\n\x06result\x18\x01 \x01(\x08\"=\n\x16GetNodeTerminalRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12\x0f\n\x07node_id\x18\x02 \x01(\x05\"+\n\x17GetNodeTerminalResponse\x12\x10\n\x08terminal\x18\x01 \x01(\t\"J\n\x12NodeCommandRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12\x0f\n\x07node_id\x18\x02 \x01(\x05\x12\x0f\n\x07\x63ommand\x18\x03 \x01(\t\"%\n\x13NodeCommandResponse\x12\x0e\n\x06output\x18\x01 \x01(\t\":\n\x13GetNodeLinksRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12\x0f\n\x07node_id\x18\x02 \x01(\x05\"1\n\x14GetNodeLinksResponse\x12\x19\n\x05links\x18\x01 \x03(\x0b\x32\n.core.Link\">\n\x0e\x41\x64\x64LinkRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12\x18\n\x04link\x18\x02 \x01(\x0b\x32\n.core.Link\"q\n\x0f\x41\x64\x64LinkResponse\x12\x0e\n\x06result\x18\x01 \x01(\x08\x12&\n\rinterface_one\x18\x02 \x01(\x0b\x32\x0f.core.Interface\x12&\n\rinterface_two\x18\x03 \x01(\x0b\x32\x0f.core.Interface\"\xa7\x01\n\x0f\x45\x64itLinkRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12\x13\n\x0bnode_one_id\x18\x02 \x01(\x05\x12\x13\n\x0bnode_two_id\x18\x03 \x01(\x05\x12\x18\n\x10interface_one_id\x18\x04 \x01(\x05\x12\x18\n\x10interface_two_id\x18\x05 \x01(\x05\x12\"\n\x07options\x18\x06 \x01(\x0b\x32\x11.core.LinkOptions\"\"\n\x10\x45\x64itLinkResponse\x12\x0e\n\x06result\x18\x01 \x01(\x08\"\x85\x01\n\x11\x44\x65leteLinkRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12\x13\n\x0bnode_one_id\x18\x02 \x01(\x05\x12\x13\n\x0bnode_two_id\x18\x03 \x01(\x05\x12\x18\n\x10interface_one_id\x18\x04 \x01(\x05\x12\x18\n\x10interface_two_id\x18\x05 \x01(\x05\"$\n\x12\x44\x65leteLinkResponse\x12\x0e\n\x06result\x18\x01 \x01(\x08\"%\n\x0fGetHooksRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\"-\n\x10GetHooksResponse\x12\x19\n\x05hooks\x18\x01 \x03(\x0b\x32\n.core.Hook\">\n\x0e\x41\x64\x64HookRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12\x18\n\x04hook\x18\x02 \x01(\x0b\x32\n.core.Hook\"!\n\x0f\x41\x64\x64HookResponse\x12\x0e\n\x06result\x18\x01 \x01(\x08\"/\n\x19GetMobilityConfigsRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\"\xa0\x01\n\x1aGetMobilityConfigsResponse\x12>\n\x07\x63onfigs\x18\x01 \x03(\x0b\x32-.core.GetMobilityConfigsResponse.ConfigsEntry\x1a\x42\n\x0c\x43onfigsEntry\x12\x0b\n\x03key\x18\x01 \x01(\x05\x12!\n\x05value\x18\x02 \x01(\x0b\x32\x12.core.MappedConfig:\x02\x38\x01\"?\n\x18GetMobilityConfigRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12\x0f\n\x07node_id\x18\x02 \x01(\x05\"\x9d\x01\n\x19GetMobilityConfigResponse\x12;\n\x06\x63onfig\x18\x01 \x03(\x0b\x32+.core.GetMobilityConfigResponse.ConfigEntry\x1a\x43\n\x0b\x43onfigEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12#\n\x05value\x18\x02 \x01(\x0b\x32\x14.common.ConfigOption:\x02\x38\x01\"]\n\x18SetMobilityConfigRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12-\n\x0fmobility_config\x18\x02 \x01(\x0b\x32\x14.core.MobilityConfig\"+\n\x19SetMobilityConfigResponse\x12\x0e\n\x06result\x18\x01 \x01(\x08\"g\n\x15MobilityActionRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12\x0f\n\x07node_id\x18\x02 \x01(\x05\x12)\n\x06\x61\x63tion\x18\x03 \x01(\x0e\x32\x19.core.MobilityAction.Enum\"(\n\x16MobilityActionResponse\x12\x0e\n\x06result\x18\x01 \x01(\x08\"\x14\n\x12GetServicesRequest\"6\n\x13GetServicesResponse\x12\x1f\n\x08services\x18\x01 \x03(\x0b\x32\r.core.Service\"/\n\x19GetServiceDefaultsRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\"E\n\x1aGetServiceDefaultsResponse\x12\'\n\x08\x64\x65\x66\x61ults\x18\x01 \x03(\x0b\x32\x15.core.ServiceDefaults\"X\n\x19SetServiceDefaultsRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12\'\n\x08\x64\x65\x66\x61ults\x18\x02 \x03(\x0b\x32\x15.core.ServiceDefaults\",\n\x1aSetServiceDefaultsResponse\x12\x0e\n\x06result\x18\x01 \x01(\x08\"2\n\x1cGetNodeServiceConfigsRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\"\xb7\x02\n\x1dGetNodeServiceConfigsResponse\x12\x42\n\x07\x63onfigs\x18\x01 \x03(\x0b\x32\x31.core.GetNodeServiceConfigsResponse.ServiceConfig\x1a\xd1\x01\n\rServiceConfig\x12\x0f\n\x07node_id\x18\x01 \x01(\x05\x12\x0f\n\x07service\x18\x02 \x01(\t\x12#\n\x04\x64\x61ta\x18\x03 \x01(\x0b\x32\x15.core.NodeServiceData\x12K\n\x05\x66iles\x18\x04 \x03(\x0b\x32<.core.GetNodeServiceConfigsResponse.ServiceConfig.FilesEntry\x1a,\n\nFilesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"M\n\x15GetNodeServiceRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12\x0f\n\x07node_id\x18\x02 \x01(\x05\x12\x0f\n\x07service\x18\x03 \x01(\t\"@\n\x16GetNodeServiceResponse\x12&\n\x07service\x18\x01 \x01(\x0b\x32\x15.core.NodeServiceData\"_\n\x19GetNodeServiceFileRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12\x0f\n\x07node_id\x18\x02 \x01(\x05\x12\x0f\n\x07service\x18\x03 \x01(\t\x12\x0c\n\x04\x66ile\x18\x04 \x01(\t\"*\n\x1aGetNodeServiceFileResponse\x12\x0c\n\x04\x64\x61ta\x18\x01 \x01(\t\"P\n\x15SetNodeServiceRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12#\n\x06\x63onfig\x18\x02 \x01(\x0b\x32\x13.core.ServiceConfig\"(\n\x16SetNodeServiceResponse\x12\x0e\n\x06result\x18\x01 \x01(\x08\"X\n\x19SetNodeServiceFileRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12\'\n\x06\x63onfig\x18\x02 \x01(\x0b\x32\x17.core.ServiceFileConfig\",\n\x1aSetNodeServiceFileResponse\x12\x0e\n\x06result\x18\x01 \x01(\x08\"v\n\x14ServiceActionRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12\x0f\n\x07node_id\x18\x02 \x01(\x05\x12\x0f\n\x07service\x18\x03 \x01(\t\x12(\n\x06\x61\x63tion\x18\x04 \x01(\x0e\x32\x18.core.ServiceAction.Enum\"\'\n\x15ServiceActionResponse\x12\x0e\n\x06result\x18\x01 \x01(\x08\"+\n\x15GetWlanConfigsRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\"\x98\x01\n\x16GetWlanConfigsResponse\x12:\n\x07\x63onfigs\x18\x01 \x03(\x0b\x32).core.GetWlanConfigsResponse.ConfigsEntry\x1a\x42\n\x0c\x43onfigsEntry\x12\x0b\n\x03key\x18\x01 \x01(\x05\x12!\n\x05value\x18\x02 \x01(\x0b\x32\x12.core.MappedConfig:\x02\x38\x01\";\n\x14GetWlanConfigRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12\x0f\n\x07node_id\x18\x02 \x01(\x05\"\x95\x01\n\x15GetWlanConfigResponse\x12\x37\n\x06\x63onfig\x18\x01 \x03(\x0b\x32\'.core.GetWlanConfigResponse.ConfigEntry\x1a\x43\n\x0b\x43onfigEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12#\n\x05value\x18\x02 \x01(\x0b\x32\x14.common.ConfigOption:\x02\x38\x01\"Q\n\x14SetWlanConfigRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12%\n\x0bwlan_config\x18\x02 \x01(\x0b\x32\x10.core.WlanConfig\"\'\n\x15SetWlanConfigResponse\x12\x0e\n\x06result\x18\x01 \x01(\x08\"+\n\x15GetEmaneConfigRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\"\x97\x01\n\x16GetEmaneConfigResponse\x12\x38\n\x06\x63onfig\x18\x01 \x03(\x0b\x32(.core.GetEmaneConfigResponse.ConfigEntry\x1a\x43\n\x0b\x43onfigEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12#\n\x05value\x18\x02 \x01(\x0b\x32\x14.common.ConfigOption:\x02\x38\x01\"\x93\x01\n\x15SetEmaneConfigRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12\x37\n\x06\x63onfig\x18\x02 \x03(\x0b\x32\'.core.SetEmaneConfigRequest.ConfigEntry\x1a-\n\x0b\x43onfigEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"(\n\x16SetEmaneConfigResponse\x12\x0e\n\x06result\x18\x01 \x01(\x08\"+\n\x15GetEmaneModelsRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\"(\n\x16GetEmaneModelsResponse\x12\x0e\n\x06models\x18\x01 \x03(\t\"c\n\x1aGetEmaneModelConfigRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12\x0f\n\x07node_id\x18\x02 \x01(\x05\x12\x11\n\tinterface\x18\x03 \x01(\x05\x12\r\n\x05model\x18\x04 \x01(\t\"\xa1\x01\n\x1bGetEmaneModelConfigResponse\x12=\n\x06\x63onfig\x18\x01 \x03(\x0b\x32-.core.GetEmaneModelConfigResponse.ConfigEntry\x1a\x43\n\x0b\x43onfigEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12#\n\x05value\x18\x02 \x01(\x0b\x32\x14.common.ConfigOption:\x02\x38\x01\"d\n\x1aSetEmaneModelConfigRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12\x32\n\x12\x65mane_model_config\x18\x02 \x01(\x0b\x32\x16.core.EmaneModelConfig\"-\n\x1bSetEmaneModelConfigResponse\x12\x0e\n\x06result\x18\x01 \x01(\x08\"1\n\x1bGetEmaneModelConfigsRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\"\xb3\x02\n\x1cGetEmaneModelConfigsResponse\x12?\n\x07\x63onfigs\x18\x01 \x03(\x0b\x32..core.GetEmaneModelConfigsResponse.ModelConfig\x1a\xd1\x01\n\x0bModelConfig\x12\x0f\n\x07node_id\x18\x01 \x01(\x05\x12\r\n\x05model\x18\x02 \x01(\t\x12\x11\n\tinterface\x18\x03 \x01(\x05\x12J\n\x06\x63onfig\x18\x04 \x03(\x0b\x32:.core.GetEmaneModelConfigsResponse.ModelConfig.ConfigEntry\x1a\x43\n\x0b\x43onfigEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12#\n\x05value\x18\x02 \x01(\x0b\x32\x14.common.ConfigOption:\x02\x38\x01\"1\n\x1bGetEmaneEventChannelRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\"K\n\x1cGetEmaneEventChannelResponse\x12\r\n\x05group\x18\x01 \x01(\t\x12\x0c\n\x04port\x18\x02 \x01(\x05\x12\x0e\n\x06\x64\x65vice\x18\x03 \x01(\t\"$\n\x0eSaveXmlRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\"\x1f\n\x0fSaveXmlResponse\x12\x0c\n\x04\x64\x61ta\x18\x01 \x01(\t\";\n\x0eOpenXmlRequest\x12\x0c\n\x04\x64\x61ta\x18\x01 \x01(\t\x12\r\n\x05start\x18\x02 \x01(\x08\x12\x0c\n\x04\x66ile\x18\x03 \x01(\t\"5\n\x0fOpenXmlResponse\x12\x0e\n\x06result\x18\x01 \x01(\x08\x12\x12\n\nsession_id\x18\x02 \x01(\x05\"\x16\n\x14GetInterfacesRequest\"+\n\x15GetInterfacesResponse\x12\x12\n\ninterfaces\x18\x01 \x03(\t\"X\n\x10\x45maneLinkRequest\x12\x12\n\nsession_id\x18\x01 \x01(\x05\x12\x0f\n\x07nem_one\x18\x02 \x01(\x05\x12\x0f\n\x07nem_two\x18\x03 \x01(\x05\x12\x0e\n\x06linked\x18\x04 \x01(\x08\"#\n\x11\x45maneLinkResponse\x12\x0e\n\x06result\x18\x01 \x01(\x08\"&\n\x14\x45xecuteScriptRequest\x12\x0e\n\x06script\x18\x01 \x01(\t\"+\n\x15\x45xecuteScriptResponse\x12\x12\n\nsession_id\x18\x01 \x01(\x05\"z\n\nWlanConfig\x12\x0f\n\x07node_id\x18\x01 \x01(\x05\x12,\n\x06\x63onfig\x18\x02 \x03(\x0b\x32\x1c.core.WlanConfig.ConfigEntry\x1a-\n\x0b\x43onfigEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\x82\x01\n\x0eMobilityConfig\x12\x0f\n\x07node_id\x18\x01 \x01(\x05\x12\x30\n\x06\x63onfig\x18\x02 \x03(\x0b\x32 .core.MobilityConfig.ConfigEntry\x1a-\n\x0b\x43onfigEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\xab\x01\n\x10\x45maneModelConfig\x12\x0f\n\x07node_id\x18\x01 \x01(\x05\x12\x14\n\x0cinterface_id\x18\x02 \x01(\x05\x12\r\n\x05model\x18\x03 \x01(\t\x12\x32\n\x06\x63onfig\x18\x04 \x03(\x0b\x32\".core.EmaneModelConfig.ConfigEntry\x1a-\n\x0b\x43onfigEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\x8a\x01\n\rServiceConfig\x12\x0f\n\x07node_id\x18\x01 \x01(\x05\x12\x0f\n\x07service\x18\x02 \x01(\t\x12\x0f\n\x07startup\x18\x03 \x03(\t\x12\x10\n\x08validate\x18\x04 \x03(\t\x12\x10\n\x08shutdown\x18\x05 \x03(\t\x12\r\n\x05\x66iles\x18\x06 \x03(\t\x12\x13\n\x0b\x64irectories\x18\x07 \x03(\t\"Q\n\x11ServiceFileConfig\x12\x0f\n\x07node_id\x18\x01 \x01(\x05\x12\x0f\n\x07service\x18\x02 \x01(\t\x12\x0c\n\x04\x66ile\x18\x03 \x01(\t\x12\x0c\n\x04\x64\x61ta\x18\x04 \x01(\t\"Y\n\tEventType\"L\n\x04\x45num\x12\x0b\n\x07SESSION\x10\x00\x12\x08\n\x04NODE\x10\x01\x12\x08\n\x04LINK\x10\x02\x12\n\n\x06\x43ONFIG\x10\x03\x12\r\n\tEXCEPTION\x10\x04\x12\x08\n\x04\x46ILE\x10\x05\"g\n\x0bMessageType\"X\n\x04\x45num\x12\x08\n\x04NONE\x10\x00\x12\x07\n\x03\x41\x44\x44\x10\x01\x12\n\n\x06\x44\x45LETE\x10\x02\x12\x07\n\x03\x43RI\x10\x04\x12\t\n\x05LOCAL\x10\x08\x12\n\n\x06STRING\x10\x10\x12\x08\n\x04TEXT\x10 \x12\x07\n\x03TTY\x10@\"+\n\x08LinkType\"\x1f\n\x04\x45num\x12\x0c\n\x08WIRELESS\x10\x00\x12\t\n\x05WIRED\x10\x01\"\x82\x01\n\x0cSessionState\"r\n\x04\x45num\x12\x08\n\x04NONE\x10\x00\x12\x0e\n\nDEFINITION\x10\x01\x12\x11\n\rCONFIGURATION\x10\x02\x12\x11\n\rINSTANTIATION\x10\x03\x12\x0b\n\x07RUNTIME\x10\x04\x12\x0f\n\x0b\x44\x41TACOLLECT\x10\x05\x12\x0c\n\x08SHUTDOWN\x10\x06\"\xbe\x01\n\x08NodeType\"\xb1\x01\n\x04\x45num\x12\x0b\n\x07\x44\x45\x46\x41ULT\x10\x00\x12\x0c\n\x08PHYSICAL\x10\x01\x12\n\n\x06SWITCH\x10\x04\x12\x07\n\x03HUB\x10\x05\x12\x10\n\x0cWIRELESS_LAN\x10\x06\x12\x08\n\x04RJ45\x10\x07\x12\n\n\x06TUNNEL\x10\x08\x12\t\n\x05\x45MANE\x10\n\x12\x0e\n\nTAP_BRIDGE\x10\x0b\x12\x10\n\x0cPEER_TO_PEER\x10\x0c\x12\x0f\n\x0b\x43ONTROL_NET\x10\r\x12\n\n\x06\x44OCKER\x10\x0f\x12\x07\n\x03LXC\x10\x10\"\xa0\x01\n\x10\x43onfigOptionType\"\x8b\x01\n\x04\x45num\x12\x08\n\x04NONE\x10\x00\x12\t\n\x05UINT8\x10\x01\x12\n\n\x06UINT16\x10\x02\x12\n\n\x06UINT32\x10\x03\x12\n\n\x06UINT64\x10\x04\x12\x08\n\x04INT8\x10\x05\x12\t\n\x05INT16\x10\x06\x12\t\n\x05INT32\x10\x07\x12\t\n\x05INT64\x10\x08\x12\t\n\x05\x46LOAT\x10\t\x12\n\n\x06STRING\x10\n\x12\x08\n\x04\x42OOL\x10\x0b\"J\n\x15ServiceValidationMode\"1\n\x04\x45num\x12\x0c\n\x08\x42LOCKING\x10\x00\x12\x10\n\x0cNON_BLOCKING\x10\x01\x12\t\n\x05TIMER\x10\x02\"G\n\rServiceAction\"6\n\x04\x45num\x12\t\n\x05START\x10\x00\x12\x08\n\x04STOP\x10\x01\x12\x0b\n\x07RESTART\x10\x02\x12\x0c\n\x08VALIDATE\x10\x03\"8\n\x0eMobilityAction\"&\n\x04\x45num\x12\t\n\x05START\x10\x00\x12\t\n\x05PAUSE\x10\x01\x12\x08\n\x04STOP\x10\x02\"T\n\x0e\x45xceptionLevel\"B\n\x04\x45num\x12\x0b\n\x07\x44\x45\x46\x41ULT\x10\x00\x12\t\n\x05\x46\x41TAL\x10\x01\x12\t\n\x05\x45RROR\x10\x02\x12\x0b\n\x07WARNING\x10\x03\x12\n\n\x06NOTICE\x10\x04\"J\n\x04Hook\x12&\n\x05state\x18\x01 \x01(\x0e\x32\x17.core.SessionState.Enum\x12\x0c\n\x04\x66ile\x18\x02 \x01(\t\x12\x0c\n\x04\x64\x61ta\x18\x03 \x01(\t\"6\n\x0fServiceDefaults\x12\x11\n\tnode_type\x18\x01 \x01(\t\x12\x10\n\x08services\x18\x02 \x03(\t\"&\n\x07Service\x12\r\n\x05group\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\"\xf3\x01\n\x0fNodeServiceData\x12\x13\n\x0b\x65xecutables\x18\x01 \x03(\t\x12\x14\n\x0c\x64\x65pendencies\x18\x02 \x03(\t\x12\x0c\n\x04\x64irs\x18\x03 \x03(\t\x12\x0f\n\x07\x63onfigs\x18\x04 \x03(\t\x12\x0f\n\x07startup\x18\x05 \x03(\t\x12\x10\n\x08validate\x18\x06 \x03(\t\x12\x39\n\x0fvalidation_mode\x18\x07 \x01(\x0e\x32 .core.ServiceValidationMode.Enum\x12\x18\n\x10validation_timer\x18\x08 \x01(\x05\x12\x10\n\x08shutdown\x18\t \x03(\t\x12\x0c\n\x04meta\x18\n \x01(\t\"\x83\x01\n\x0cMappedConfig\x12.\n\x06\x63onfig\x18\x01 \x03(\x0b\x32\x1e.core.MappedConfig.ConfigEntry\x1a\x43\n\x0b\x43onfigEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12#\n\x05value\x18\x02 \x01(\x0b\x32\x14.common.ConfigOption:\x02\x38\x01\"s\n\x07Session\x12\n\n\x02id\x18\x01 \x01(\x05\x12&\n\x05state\x18\x02 \x01(\x0e\x32\x17.core.SessionState.Enum\x12\x19\n\x05nodes\x18\x03 \x03(\x0b\x32\n.core.Node\x12\x19\n\x05links\x18\x04 \x03(\x0b\x32\n.core.Link\"a\n\x0eSessionSummary\x12\n\n\x02id\x18\x01 \x01(\x05\x12&\n\x05state\x18\x02 \x01(\x0e\x32\x17.core.SessionState.Enum\x12\r\n\x05nodes\x18\x03 \x01(\x05\x12\x0c\n\x04\x66ile\x18\x04 \x01(\t\"\x83\x02\n\x04Node\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0c\n\x04name\x18\x02 \x01(\t\x12!\n\x04type\x18\x03 \x01(\x0e\x32\x13.core.NodeType.Enum\x12\r\n\x05model\x18\x04 \x01(\t\x12 \n\x08position\x18\x05 \x01(\x0b\x32\x0e.core.Position\x12\x10\n\x08services\x18\x06 \x03(\t\x12\r\n\x05\x65mane\x18\x07 \x01(\t\x12\x0c\n\x04icon\x18\x08 \x01(\t\x12\x0e\n\x06opaque\x18\t \x01(\t\x12\r\n\x05image\x18\n \x01(\t\x12\x0e\n\x06server\x18\x0b \x01(\t\x12\x17\n\x0f\x63onfig_services\x18\x0c \x03(\t\x12\x16\n\x03geo\x18\r \x01(\x0b\x32\t.core.Geo\"\xc7\x01\n\x04Link\x12\x13\n\x0bnode_one_id\x18\x01 \x01(\x05\x12\x13\n\x0bnode_two_id\x18\x02 \x01(\x05\x12!\n\x04type\x18\x03 \x01(\x0e\x32\x13.core.LinkType.Enum\x12&\n\rinterface_one\x18\x04 \x01(\x0b\x32\x0f.core.Interface\x12&\n\rinterface_two\x18\x05 \x01(\x0b\x32\x0f.core.Interface\x12\"\n\x07options\x18\x06 \x01(\x0b\x32\x11.core.LinkOptions\"\xba\x01\n\x0bLinkOptions\x12\x0e\n\x06opaque\x18\x01 \x01(\t\x12\x0e\n\x06jitter\x18\x02 \x01(\x03\x12\x0b\n\x03key\x18\x03 \x01(\x05\x12\x0e\n\x06mburst\x18\x04 \x01(\x05\x12\x0b\n\x03mer\x18\x05 \x01(\x05\x12\x0b\n\x03per\x18\x06 \x01(\x02\x12\x11\n\tbandwidth\x18\x07 \x01(\x03\x12\r\n\x05\x62urst\x18\x08 \x01(\x05\x12\r\n\x05\x64\x65lay\x18\t \x01(\x03\x12\x0b\n\x03\x64up\x18\n \x01(\x05\x12\x16\n\x0eunidirectional\x18\x0b \x01(\x08\"\x9a\x01\n\tInterface\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x0b\n\x03mac\x18\x03 \x01(\t\x12\x0b\n\x03ip4\x18\x04 \x01(\t\x12\x0f\n\x07ip4mask\x18\x05 \x01(\x05\x12\x0b\n\x03ip6\x18\x06 \x01(\t\x12\x0f\n\x07ip6mask\x18\x07 \x01(\x05\x12\r\n\x05netid\x18\x08 \x01(\x05\x12\x0e\n\x06\x66lowid\x18\t \x01(\x05\x12\x0b\n\x03mtu\x18\n \x01(\x05\"h\n\x0fSessionLocation\x12\t\n\x01x\x18\x01 \x01(\x02\x12\t\n\x01y\x18\x02 \x01(\x02\x12\t\n\x01z\x18\x03 \x01(\x02\x12\x0b\n\x03lat\x18\x04 \x01(\x02\x12\x0b\n\x03lon\x18\x05 \x01(\x02\x12\x0b\n\x03\x61lt\x18\x06 \x01(\x02\x12\r\n\x05scale\x18\x07 \x01(\x02\"+\n\x08Position\x12\t\n\x01x\x18\x01 \x01(\x02\x12\t\n\x01y\x18\x02 \x01(\x02\x12\t\n\x01z\x18\x03 \x01(\x02\",\n\x03Geo\x12\x0b\n\x03lat\x18\x01 \x01(\x02\x12\x0b\n\x03lon\x18\x02 \x01(\x02\x12\x0b\n\x03\x61lt\x18\x03 \x01(\x02\x32\x9a)\n\x07\x43oreApi\x12G\n\x0cStartSession\x12\x19.core.StartSessionRequest\x1a\x1a.core.StartSessionResponse\"\x00\x12\x44\n\x0bStopSession\x12\x18.core.StopSessionRequest\x1a\x19.core.StopSessionResponse\"\x00\x12J\n\rCreateSession\x12\x1a.core.CreateSessionRequest\x1a\x1b.core.CreateSessionResponse\"\x00\x12J\n\rDeleteSession\x12\x1a.core.DeleteSessionRequest\x1a\x1b.core.DeleteSessionResponse\"\x00\x12\x44\n\x0bGetSessions\x12\x18.core.GetSessionsRequest\x1a\x19.core.GetSessionsResponse\"\x00\x12\x41\n\nGetSession\x12\x17.core.GetSessionRequest\x1a\x18.core.GetSessionResponse\"\x00\x12P\n\x0fGetSessionDelta\x12\x1c.core.GetSessionDeltaRequest\x1a\x1d.core.GetSessionDeltaResponse\"\x00\x12G\n\x0c\x43heckSession\x12\x19.core.CheckSessionRequest\x1a\x1a.core.CheckSessionResponse\"\x00\x12V\n\x11GetSessionOptions\x12\x1e.core.GetSessionOptionsRequest\x1a\x1f.core.GetSessionOptionsResponse\"\x00\x12V\n\x11SetSessionOptions\x12\x1e.core.SetSessionOptionsRequest\x1a\x1f.core.SetSessionOptionsResponse\"\x00\x12Y\n\x12SetSessionMetadata\x12\x1f.core.SetSessionMetadataRequest\x1a .core.SetSessionMetadataResponse\"\x00\x12Y\n\x12GetSessionMetadata\x12\x1f.core.GetSessionMetadataRequest\x1a .core.GetSessionMetadataResponse\"\x00\x12Y\n\x12GetSessionLocation\x12\x1f.core.GetSessionLocationRequest\x1a .core.GetSessionLocationResponse\"\x00\x12Y\n\x12SetSessionLocation\x12\x1f.core.SetSessionLocationRequest\x1a .core.SetSessionLocationResponse\"\x00\x12P\n\x0fSetSessionState\x12\x1c.core.SetSessionStateRequest\x1a\x1d.core.SetSessionStateResponse\"\x00\x12S\n\x10\x41\x64\x64SessionServer\x12\x1d.core.AddSessionServerRequest\x1a\x1e.core.AddSessionServerResponse\"\x00\x12.\n\x06\x45vents\x12\x13.core.EventsRequest\x1a\x0b.core.Event\"\x00\x30\x01\x12\x34\n\x0b\x42\x61tchEvents\x12\x13.core.EventsRequest\x1a\x0c.core.Events\"\x00\x30\x01\x12\x43\n\x0bThroughputs\x12\x18.core.ThroughputsRequest\x1a\x16.core.ThroughputsEvent\"\x00\x30\x01\x12\x38\n\x07\x41\x64\x64Node\x12\x14.core.AddNodeRequest\x1a\x15.core.AddNodeResponse\"\x00\x12\x38\n\x07GetNode\x12\x14.core.GetNodeRequest\x1a\x15.core.GetNodeResponse\"\x00\x12;\n\x08\x45\x64itNode\x12\x15.core.EditNodeRequest\x1a\x16.core.EditNodeResponse\"\x00\x12\x41\n\nDeleteNode\x12\x17.core.DeleteNodeRequest\x1a\x18.core.DeleteNodeResponse\"\x00\x12\x44\n\x0bNodeCommand\x12\x18.core.NodeCommandRequest\x1a\x19.core.NodeCommandResponse\"\x00\x12P\n\x0fGetNodeTerminal\x12\x1c.core.GetNodeTerminalRequest\x1a\x1d.core.GetNodeTerminalResponse\"\x00\x12G\n\x0cGetNodeLinks\x12\x19.core.GetNodeLinksRequest\x1a\x1a.core.GetNodeLinksResponse\"\x00\x12\x38\n\x07\x41\x64\x64Link\x12\x14.core.AddLinkRequest\x1a\x15.core.AddLinkResponse\"\x00\x12;\n\x08\x45\x64itLink\x12\x15.core.EditLinkRequest\x1a\x16.core.EditLinkResponse\"\x00\x12\x41\n\nDeleteLink\x12\x17.core.DeleteLinkRequest\x1a\x18.core.DeleteLinkResponse\"\x00\x12;\n\x08GetHooks\x12\x15.core.GetHooksRequest\x1a\x16.core.GetHooksResponse\"\x00\x12\x38\n\x07\x41\x64\x64Hook\x12\x14.core.AddHookRequest\x1a\x15.core.AddHookResponse\"\x00\x12Y\n\x12GetMobilityConfigs\x12\x1f.core.GetMobilityConfigsRequest\x1a .core.GetMobilityConfigsResponse\"\x00\x12V\n\x11GetMobilityConfig\x12\x1e.core.GetMobilityConfigRequest\x1a\x1f.core.GetMobilityConfigResponse\"\x00\x12V\n\x11SetMobilityConfig\x12\x1e.core.SetMobilityConfigRequest\x1a\x1f.core.SetMobilityConfigResponse\"\x00\x12M\n\x0eMobilityAction\x12\x1b.core.MobilityActionRequest\x1a\x1c.core.MobilityActionResponse\"\x00\x12\x44\n\x0bGetServices\x12\x18.core.GetServicesRequest\x1a\x19.core.GetServicesResponse\"\x00\x12Y\n\x12GetServiceDefaults\x12\x1f.core.GetServiceDefaultsRequest\x1a .core.GetServiceDefaultsResponse\"\x00\x12Y\n\x12SetServiceDefaults\x12\x1f.core.SetServiceDefaultsRequest\x1a .core.SetServiceDefaultsResponse\"\x00\x12\x62\n\x15GetNodeServiceConfigs\x12\".core.GetNodeServiceConfigsRequest\x1a#.core.GetNodeServiceConfigsResponse\"\x00\x12M\n\x0eGetNodeService\x12\x1b.core.GetNodeServiceRequest\x1a\x1c.core.GetNodeServiceResponse\"\x00\x12Y\n\x12GetNodeServiceFile\x12\x1f.core.GetNodeServiceFileRequest\x1a .core.GetNodeServiceFileResponse\"\x00\x12M\n\x0eSetNodeService\x12\x1b.core.SetNodeServiceRequest\x1a\x1c.core.SetNodeServiceResponse\"\x00\x12Y\n\x12SetNodeServiceFile\x12\x1f.core.SetNodeServiceFileRequest\x1a .core.SetNodeServiceFileResponse\"\x00\x12J\n\rServiceAction\x12\x1a.core.ServiceActionRequest\x1a\x1b.core.ServiceActionResponse\"\x00\x12j\n\x11GetConfigServices\x12(.configservices.GetConfigServicesRequest\x1a).configservices.GetConfigServicesResponse\"\x00\x12\x7f\n\x18GetConfigServiceDefaults\x12/.configservices.GetConfigServiceDefaultsRequest\x1a\x30.configservices.GetConfigServiceDefaultsResponse\"\x00\x12\x88\x01\n\x1bGetNodeConfigServiceConfigs\x12\x32.configservices.GetNodeConfigServiceConfigsRequest\x1a\x33.configservices.GetNodeConfigServiceConfigsResponse\"\x00\x12s\n\x14GetNodeConfigService\x12+.configservices.GetNodeConfigServiceRequest\x1a,.configservices.GetNodeConfigServiceResponse\"\x00\x12v\n\x15GetNodeConfigServices\x12,.configservices.GetNodeConfigServicesRequest\x1a-.configservices.GetNodeConfigServicesResponse\"\x00\x12s\n\x14SetNodeConfigService\x12+.configservices.SetNodeConfigServiceRequest\x1a,.configservices.SetNodeConfigServiceResponse\"\x00\x12M\n\x0eGetWlanConfigs\x12\x1b.core.GetWlanConfigsRequest\x1a\x1c.core.GetWlanConfigsResponse\"\x00\x12J\n\rGetWlanConfig\x12\x1a.core.GetWlanConfigRequest\x1a\x1b.core.GetWlanConfigResponse\"\x00\x12J\n\rSetWlanConfig\x12\x1a.core.SetWlanConfigRequest\x1a\x1b.core.SetWlanConfigResponse\"\x00\x12M\n\x0eGetEmaneConfig\x12\x1b.core.GetEmaneConfigRequest\x1a\x1c.core.GetEmaneConfigResponse\"\x00\x12M\n\x0eSetEmaneConfig\x12\x1b.core.SetEmaneConfigRequest\x1a\x1c.core.SetEmaneConfigResponse\"\x00\x12M\n\x0eGetEmaneModels\x12\x1b.core.GetEmaneModelsRequest\x1a\x1c.core.GetEmaneModelsResponse\"\x00\x12\\\n\x13GetEmaneModelConfig\x12 .core.GetEmaneModelConfigRequest\x1a!.core.GetEmaneModelConfigResponse\"\x00\x12\\\n\x13SetEmaneModelConfig\x12 .core.SetEmaneModelConfigRequest\x1a!.core.SetEmaneModelConfigResponse\"\x00\x12_\n\x14GetEmaneModelConfigs\x12!.core.GetEmaneModelConfigsRequest\x1a\".core.GetEmaneModelConfigsResponse\"\x00\x12_\n\x14GetEmaneEventChannel\x12!.core.GetEmaneEventChannelRequest\x1a\".core.GetEmaneEventChannelResponse\"\x00\x12\x38\n\x07SaveXml\x12\x14.core.SaveXmlRequest\x1a\x15.core.SaveXmlResponse\"\x00\x12\x38\n\x07OpenXml\x12\x14.core.OpenXmlRequest\x1a\x15.core.OpenXmlResponse\"\x00\x12J\n\rGetInterfaces\x12\x1a.core.GetInterfacesRequest\x1a\x1b.core.GetInterfacesResponse\"\x00\x12>\n\tEmaneLink\x12\x16.core.EmaneLinkRequest\x1a\x17.core.EmaneLinkResponse\"\x00\x12J\n\rExecuteScript\x12\x1a.core.ExecuteScriptRequest\x1a\x1b.core.ExecuteScriptResponse\"\x00\x42!\n\x14\x63om.core.client.grpcB\tCoreProtob\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'core.api.grpc.core_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  _globals['DESCRIPTOR']._loaded_options = None
+  _globals['DESCRIPTOR']._serialized_options = b'\n\024com.core.client.grpcB\tCoreProto'
+  _globals['_STARTSESSIONREQUEST_EMANECONFIGENTRY']._loaded_options = None
+  _globals['_STARTSESSIONREQUEST_EMANECONFIGENTRY']._serialized_options = b'8\001'
+  _globals['_STARTSESSIONRESPONSE_TIMINGSENTRY']._loaded_options = None
+  _globals['_STARTSESSIONRESPONSE_TIMINGSENTRY']._serialized_options = b'8\001'
+  _globals['_GETSESSIONOPTIONSRESPONSE_CONFIGENTRY']._loaded_options = None
+  _globals['_GETSESSIONOPTIONSRESPONSE_CONFIGENTRY']._serialized_options = b'8\001'
+  _globals['_SETSESSIONOPTIONSREQUEST_CONFIGENTRY']._loaded_options = None
+  _globals['_SETSESSIONOPTIONSREQUEST_CONFIGENTRY']._serialized_options = b'8\001'
+  _globals['_SETSESSIONMETADATAREQUEST_CONFIGENTRY']._loaded_options = None
+  _globals['_SETSESSIONMETADATAREQUEST_CONFIGENTRY']._serialized_options = b'8\001'
+  _globals['_GETSESSIONMETADATARESPONSE_CONFIGENTRY']._loaded_options = None
+  _globals['_GETSESSIONMETADATARESPONSE_CONFIGENTRY']._serialized_options = b'8\001'
+  _globals['_GETMOBILITYCONFIGSRESPONSE_CONFIGSENTRY']._loaded_options = None
+  _globals['_GETMOBILITYCONFIGSRESPONSE_CONFIGSENTRY']._serialized_options = b'8\001'
+  _globals['_GETMOBILITYCONFIGRESPONSE_CONFIGENTRY']._loaded_options = None
+  _globals['_GETMOBILITYCONFIGRESPONSE_CONFIGENTRY']._serialized_options = b'8\001'
+  _globals['_GETNODESERVICECONFIGSRESPONSE_SERVICECONFIG_FILESENTRY']._loaded_options = None
+  _globals['_GETNODESERVICECONFIGSRESPONSE_SERVICECONFIG_FILESENTRY']._serialized_options = b'8\001'
+  _globals['_GETWLANCONFIGSRESPONSE_CONFIGSENTRY']._loaded_options = None
+  _globals['_GETWLANCONFIGSRESPONSE_CONFIGSENTRY']._serialized_options = b'8\001'
+  _globals['_GETWLANCONFIGRESPONSE_CONFIGENTRY']._loaded_options = None
+  _globals['_GETWLANCONFIGRESPONSE_CONFIGENTRY']._serialized_options = b'8\001'
+  _globals['_GETEMANECONFIGRESPONSE_CONFIGENTRY']._loaded_options = None
+  _globals['_GETEMANECONFIGRESPONSE_CONFIGENTRY']._serialized_options = b'8\001'
+  _globals['_SETEMANECONFIGREQUEST_CONFIGENTRY']._loaded_options = None
+  _globals['_SETEMANECONFIGREQUEST_CONFIGENTRY']._serialized_options = b'8\001'
+  _globals['_GETEMANEMODELCONFIGRESPONSE_CONFIGENTRY']._loaded_options = None
+  _globals['_GETEMANEMODELCONFIGRESPONSE_CONFIGENTRY']._serialized_options = b'8\001'
+  _globals['_GETEMANEMODELCONFIGSRESPONSE_MODELCONFIG_CONFIGENTRY']._loaded_options = None
+  _globals['_GETEMANEMODELCONFIGSRESPONSE_MODELCONFIG_CONFIGENTRY']._serialized_options = b'8\001'
+  _globals['_WLANCONFIG_CONFIGENTRY']._loaded_options = None
+  _globals['_WLANCONFIG_CONFIGENTRY']._serialized_options = b'8\001'
+  _globals['_MOBILITYCONFIG_CONFIGENTRY']._loaded_options = None
+  _globals['_MOBILITYCONFIG_CONFIGENTRY']._serialized_options = b'8\001'
+  _globals['_EMANEMODELCONFIG_CONFIGENTRY']._loaded_options = None
+  _globals['_EMANEMODELCONFIG_CONFIGENTRY']._serialized_options = b'8\001'
+  _globals['_MAPPEDCONFIG_CONFIGENTRY']._loaded_options = None
+  _globals['_MAPPEDCONFIG_CONFIGENTRY']._serialized_options = b'8\001'
+  _globals['_STARTSESSIONREQUEST']._serialized_start=99
+  _globals['_STARTSESSIONREQUEST']._serialized_end=743
+  _globals['_STARTSESSIONREQUEST_EMANECONFIGENTRY']._serialized_start=693
+  _globals['_STARTSESSIONREQUEST_EMANECONFIGENTRY']._serialized_end=743
+  _globals['_STARTSESSIONRESPONSE']._serialized_start=746
+  _globals['_STARTSESSIONRESPONSE']._serialized_end=910
+  _globals['_STARTSESSIONRESPONSE_TIMINGSENTRY']._serialized_start=864
+  _globals['_STARTSESSIONRESPONSE_TIMINGSENTRY']._serialized_end=910
+  _globals['_STOPSESSIONREQUEST']._serialized_start=912
+  _globals['_STOPSESSIONREQUEST']._serialized_end=952
+  _globals['_STOPSESSIONRESPONSE']._serialized_start=954
+  _globals['_STOPSESSIONRESPONSE']._serialized_end=991
+  _globals['_CREATESESSIONREQUEST']._serialized_start=993
+  _globals['_CREATESESSIONREQUEST']._serialized_end=1035
+  _globals['_CREATESESSIONRESPONSE']._serialized_start=1037
+  _globals['_CREATESESSIONRESPONSE']._serialized_end=1120
+  _globals['_DELETESESSIONREQUEST']._serialized_start=1122
+  _globals['_DELETESESSIONREQUEST']._serialized_end=1164
+  _globals['_DELETESESSIONRESPONSE']._serialized_start=1166
+  _globals['_DELETESESSIONRESPONSE']._serialized_end=1205
+  _globals['_GETSESSIONSREQUEST']._serialized_start=1207
+  _globals['_GETSESSIONSREQUEST']._serialized_end=1227
+  _globals['_GETSESSIONSRESPONSE']._serialized_start=1229
+  _globals['_GETSESSIONSRESPONSE']._serialized_end=1290
+  _globals['_CHECKSESSIONREQUEST']._serialized_start=1292
+  _globals['_CHECKSESSIONREQUEST']._serialized_end=1333
+  _globals['_CHECKSESSIONRESPONSE']._serialized_start=1335
+  _globals['_CHECKSESSIONRESPONSE']._serialized_end=1373
+  _globals['_GETSESSIONREQUEST']._serialized_start=1375
+  _globals['_GETSESSIONREQUEST']._serialized_end=1414
+  _globals['_GETSESSIONRESPONSE']._serialized_start=1416
+  _globals['_GETSESSIONRESPONSE']._serialized_end=1485
+  _globals['_GETSESSIONDELTAREQUEST']._serialized_start=1487
+  _globals['_GETSESSIONDELTAREQUEST']._serialized_end=1548
+  _globals['_GETSESSIONDELTARESPONSE']._serialized_start=1551
+  _globals['_GETSESSIONDELTARESPONSE']._serialized_end=1791
+  _globals['_GETSESSIONOPTIONSREQUEST']._serialized_start=1793
+  _globals['_GETSESSIONOPTIONSREQUEST']._serialized_end=1839
+  _globals['_GETSESSIONOPTIONSRESPONSE']._serialized_start=1842
+  _globals['_GETSESSIONOPTIONSRESPONSE']._serialized_end=1999
+  _globals['_GETSESSIONOPTIONSRESPONSE_CONFIGENTRY']._serialized_start=1932
+  _globals['_GETSESSIONOPTIONSRESPONSE_CONFIGENTRY']._serialized_end=1999
+  _globals['_SETSESSIONOPTIONSREQUEST']._serialized_start=2002
+  _globals['_SETSESSIONOPTIONSREQUEST']._serialized_end=2155
+  _globals['_SETSESSIONOPTIONSREQUEST_CONFIGENTRY']._serialized_start=2110
+  _globals['_SETSESSIONOPTIONSREQUEST_CONFIGENTRY']._serialized_end=2155
+  _globals['_SETSESSIONOPTIONSRESPONSE']._serialized_start=2157
+  _globals['_SETSESSIONOPTIONSRESPONSE']._serialized_end=2200
+  _globals['_SETSESSIONMETADATAREQUEST']._serialized_start=2203
+  _globals['_SETSESSIONMETADATAREQUEST']._serialized_end=2358
+  _globals['_SETSESSIONMETADATAREQUEST_CONFIGENTRY']._serialized_start=2110
+  _globals['_SETSESSIONMETADATAREQUEST_CONFIGENTRY']._serialized_end=2155
+  _globals['_SETSESSIONMETADATARESPONSE']._serialized_start=2360
+  _globals['_SETSESSIONMETADATARESPONSE']._serialized_end=2404
+  _globals['_GETSESSIONMETADATAREQUEST']._serialized_start=2406
+  _globals['_GETSESSIONMETADATAREQUEST']._serialized_end=2453
+  _globals['_GETSESSIONMETADATARESPONSE']._serialized_start=2456
+  _globals['_GETSESSIONMETADATARESPONSE']._serialized_end=2593
+  _globals['_GETSESSIONMETADATARESPONSE_CONFIGENTRY']._serialized_start=2110
+  _globals['_GETSESSIONMETADATARESPONSE_CONFIGENTRY']._serialized_end=2155
+  _globals['_GETSESSIONLOCATIONREQUEST']._serialized_start=2595
+  _globals['_GETSESSIONLOCATIONREQUEST']._serialized_end=2642
+  _globals['_GETSESSIONLOCATIONRESPONSE']._serialized_start=2644
+  _globals['_GETSESSIONLOCATIONRESPONSE']._serialized_end=2713
+  _globals['_SETSESSIONLOCATIONREQUEST']._serialized_start=2715
+  _globals['_SETSESSIONLOCATIONREQUEST']._serialized_end=2803
+  _globals['_SETSESSIONLOCATIONRESPONSE']._serialized_start=2805
+  _globals['_SETSESSIONLOCATIONRESPONSE']._serialized_end=2849
+  _globals['_SETSESSIONSTATEREQUEST']._serialized_start=2851
+  _globals['_SETSESSIONSTATEREQUEST']._serialized_end=2935
+  _globals['_SETSESSIONSTATERESPONSE']._serialized_start=2937
+  _globals['_SETSESSIONSTATERESPONSE']._serialized_end=2978
+  _globals['_ADDSESSIONSERVERREQUEST']._serialized_start=2980
+  _globals['_ADDSESSIONSERVERREQUEST']._serialized_end=3053
+  _globals['_ADDSESSIONSERVERRESPONSE']._serialized_start=3055
+  _globals['_ADDSESSIONSERVERRESPONSE']._serialized_end=3097
+  _globals['_EVENTSREQUEST']._serialized_start=3099
+  _globals['_EVENTSREQUEST']._serialized_end=3209
+  _globals['_THROUGHPUTSREQUEST']._serialized_start=3211
+  _globals['_THROUGHPUTSREQUEST']._serialized_end=3288
+  _globals['_THROUGHPUTSEVENT']._serialized_start=3291
+  _globals['_THROUGHPUTSEVENT']._serialized_end=3439
+  _globals['_INTERFACETHROUGHPUT']._serialized_start=3441
+  _globals['_INTERFACETHROUGHPUT']._serialized_end=3521
+  _globals['_BRIDGETHROUGHPUT']._serialized_start=3523
+  _globals['_BRIDGETHROUGHPUT']._serialized_end=3578
+  _globals['_EVENT']._serialized_start=3581
+  _globals['_EVENT']._serialized_end=3876
+  _globals['_EVENTS']._serialized_start=3878
+  _globals['_EVENTS']._serialized_end=3971
+  _globals['_NODEEVENT']._serialized_start=3973
+  _globals['_NODEEVENT']._serialized_end=4026
+  _globals['_LINKEVENT']._serialized_start=4028
+  _globals['_LINKEVENT']._serialized_end=4111
+  _globals['_SESSIONEVENT']._serialized_start=4113
+  _globals['_SESSIONEVENT']._serialized_end=4201
+  _globals['_CONFIGEVENT']._serialized_start=4204
+  _globals['_CONFIGEVENT']._serialized_end=4481
+  _globals['_EXCEPTIONEVENT']._serialized_start=4484
+  _globals['_EXCEPTIONEVENT']._serialized_end=4619
+  _globals['_FILEEVENT']._serialized_start=4622
+  _globals['_FILEEVENT']._serialized_end=4809
+  _globals['_ADDNODEREQUEST']._serialized_start=4811
+  _globals['_ADDNODEREQUEST']._serialized_end=4873
+  _globals['_ADDNODERESPONSE']._serialized_start=4875
+  _globals['_ADDNODERESPONSE']._serialized_end=4909
+  _globals['_GETNODEREQUEST']._serialized_start=4911
+  _globals['_GETNODEREQUEST']._serialized_end=4964
+  _globals['_GETNODERESPONSE']._serialized_start=4966
+  _globals['_GETNODERESPONSE']._serialized_end=5046
+  _globals['_EDITNODEREQUEST']._serialized_start=5049
+  _globals['_EDITNODEREQUEST']._serialized_end=5191
+  _globals['_EDITNODERESPONSE']._serialized_start=5193
+  _globals['_EDITNODERESPONSE']._serialized_end=5227
+  _globals['_DELETENODEREQUEST']._serialized_start=5229
+  _globals['_DELETENODEREQUEST']._serialized_end=5285
+  _globals['_DELETENODERESPONSE']._serialized_start=5287
+  _globals['_DELETENODERESPONSE']._serialized_end=5323
+  _globals['_GETNODETERMINALREQUEST']._serialized_start=5325
+  _globals['_GETNODETERMINALREQUEST']._serialized_end=5386
+  _globals['_GETNODETERMINALRESPONSE']._serialized_start=5388
+  _globals['_GETNODETERMINALRESPONSE']._serialized_end=5431
+  _globals['_NODECOMMANDREQUEST']._serialized_start=5433
+  _globals['_NODECOMMANDREQUEST']._serialized_end=5507
+  _globals['_NODECOMMANDRESPONSE']._serialized_start=5509
+  _globals['_NODECOMMANDRESPONSE']._serialized_end=5546
+  _globals['_GETNODELINKSREQUEST']._serialized_start=5548
+  _globals['_GETNODELINKSREQUEST']._serialized_end=5606
+  _globals['_GETNODELINKSRESPONSE']._serialized_start=5608
+  _globals['_GETNODELINKSRESPONSE']._serialized_end=5657
+  _globals['_ADDLINKREQUEST']._serialized_start=5659
+  _globals['_ADDLINKREQUEST']._serialized_end=5721
+  _globals['_ADDLINKRESPONSE']._serialized_start=5723
+  _globals['_ADDLINKRESPONSE']._serialized_end=5836
+  _globals['_EDITLINKREQUEST']._serialized_start=5839
+  _globals['_EDITLINKREQUEST']._serialized_end=6006
+  _globals['_EDITLINKRESPONSE']._serialized_start=6008
+  _globals['_EDITLINKRESPONSE']._serialized_end=6042
+  _globals['_DELETELINKREQUEST']._serialized_start=6045
+  _globals['_DELETELINKREQUEST']._serialized_end=6178
+  _globals['_DELETELINKRESPONSE']._serialized_start=6180
+  _globals['_DELETELINKRESPONSE']._serialized_end=6216
+  _globals['_GETHOOKSREQUEST']._serialized_start=6218
+  _globals['_GETHOOKSREQUEST']._serialized_end=6255
+  _globals['_GETHOOKSRESPONSE']._serialized_start=6257
+  _globals['_GETHOOKSRESPONSE']._serialized_end=6302
+  _globals['_ADDHOOKREQUEST']._serialized_start=6304
+  _globals['_ADDHOOKREQUEST']._serialized_end=6366
+  _globals['_ADDHOOKRESPONSE']._serialized_start=6368
+  _globals['_ADDHOOKRESPONSE']._serialized_end=6401
+  _globals['_GETMOBILITYCONFIGSREQUEST']._serialized_start=6403
+  _globals['_GETMOBILITYCONFIGSREQUEST']._serialized_end=6450
+  _globals['_GETMOBILITYCONFIGSRESPONSE']._serialized_start=6453
+  _globals['_GETMOBILITYCONFIGSRESPONSE']._serialized_end=6613
+  _globals['_GETMOBILITYCONFIGSRESPONSE_CONFIGSENTRY']._serialized_start=6547
+  _globals['_GETMOBILITYCONFIGSRESPONSE_CONFIGSENTRY']._serialized_end=6613
+  _globals['_GETMOBILITYCONFIGREQUEST']._serialized_start=6615
+  _globals['_GETMOBILITYCONFIGREQUEST']._serialized_end=6678
+  _globals['_GETMOBILITYCONFIGRESPONSE']._serialized_start=6681
+  _globals['_GETMOBILITYCONFIGRESPONSE']._serialized_end=6838
+  _globals['_GETMOBILITYCONFIGRESPONSE_CONFIGENTRY']._serialized_start=1932
+  _globals['_GETMOBILITYCONFIGRESPONSE_CONFIGENTRY']._serialized_end=1999
+  _globals['_SETMOBILITYCONFIGREQUEST']._serialized_start=6840
+  _globals['_SETMOBILITYCONFIGREQUEST']._serialized_end=6933
+  _globals['_SETMOBILITYCONFIGRESPONSE']._serialized_start=6935
+  _globals['_SETMOBILITYCONFIGRESPONSE']._serialized_end=6978
+  _globals['_MOBILITYACTIONREQUEST']._serialized_start=6980
+  _globals['_MOBILITYACTIONREQUEST']._serialized_end=7083
+  _globals['_MOBILITYACTIONRESPONSE']._serialized_start=7085
+  _globals['_MOBILITYACTIONRESPONSE']._serialized_end=7125
+  _globals['_GETSERVICESREQUEST']._serialized_start=7127
+  _globals['_GETSERVICESREQUEST']._serialized_end=7147
+  _globals['_GETSERVICESRESPONSE']._serialized_start=7149
+  _globals['_GETSERVICESRESPONSE']._serialized_end=7203
+  _globals['_GETSERVICEDEFAULTSREQUEST']._serialized_start=7205
+  _globals['_GETSERVICEDEFAULTSREQUEST']._serialized_end=7252
+  _globals['_GETSERVICEDEFAULTSRESPONSE']._serialized_start=7254
+  _globals['_GETSERVICEDEFAULTSRESPONSE']._serialized_end=7323
+  _globals['_SETSERVICEDEFAULTSREQUEST']._serialized_start=7325
+  _globals['_SETSERVICEDEFAULTSREQUEST']._serialized_end=7413
+  _globals['_SETSERVICEDEFAULTSRESPONSE']._serialized_start=7415
+  _globals['_SETSERVICEDEFAULTSRESPONSE']._serialized_end=7459
+  _globals['_GETNODESERVICECONFIGSREQUEST']._serialized_start=7461
+  _globals['_GETNODESERVICECONFIGSREQUEST']._serialized_end=7511
+  _globals['_GETNODESERVICECONFIGSRESPONSE']._serialized_start=7514
+  _globals['_GETNODESERVICECONFIGSRESPONSE']._serialized_end=7825
+  _globals['_GETNODESERVICECONFIGSRESPONSE_SERVICECONFIG']._serialized_start=7616
+  _globals['_GETNODESERVICECONFIGSRESPONSE_SERVICECONFIG']._serialized_end=7825
+  _globals['_GETNODESERVICECONFIGSRESPONSE_SERVICECONFIG_FILESENTRY']._serialized_start=7781
+  _globals['_GETNODESERVICECONFIGSRESPONSE_SERVICECONFIG_FILESENTRY']._serialized_end=7825
+  _globals['_GETNODESERVICEREQUEST']._serialized_start=7827
+  _globals['_GETNODESERVICEREQUEST']._serialized_end=7904
+  _globals['_GETNODESERVICERESPONSE']._serialized_start=7906
+  _globals['_GETNODESERVICERESPONSE']._serialized_end=7970
+  _globals['_GETNODESERVICEFILEREQUEST']._serialized_start=7972
+  _globals['_GETNODESERVICEFILEREQUEST']._serialized_end=8067
+  _globals['_GETNODESERVICEFILERESPONSE']._serialized_start=8069
+  _globals['_GETNODESERVICEFILERESPONSE']._serialized_end=8111
+  _globals['_SETNODESERVICEREQUEST']._serialized_start=8113
+  _globals['_SETNODESERVICEREQUEST']._serialized_end=8193
+  _globals['_SETNODESERVICERESPONSE']._serialized_start=8195
+  _globals['_SETNODESERVICERESPONSE']._serialized_end=8235
+  _globals['_SETNODESERVICEFILEREQUEST']._serialized_start=8237
+  _globals['_SETNODESERVICEFILEREQUEST']._serialized_end=8325
+  _globals['_SETNODESERVICEFILERESPONSE']._serialized_start=8327
+  _globals['_SETNODESERVICEFILERESPONSE']._serialized_end=8371
+  _globals['_SERVICEACTIONREQUEST']._serialized_start=8373
+  _globals['_SERVICEACTIONREQUEST']._serialized_end=8491
+  _globals['_SERVICEACTIONRESPONSE']._serialized_start=8493
+  _globals['_SERVICEACTIONRESPONSE']._serialized_end=8532
+  _globals['_GETWLANCONFIGSREQUEST']._serialized_start=8534
+  _globals['_GETWLANCONFIGSREQUEST']._serialized_end=8577
+  _globals['_GETWLANCONFIGSRESPONSE']._serialized_start=8580
+  _globals['_GETWLANCONFIGSRESPONSE']._serialized_end=8732
+  _globals['_GETWLANCONFIGSRESPONSE_CONFIGSENTRY']._serialized_start=6547
+  _globals['_GETWLANCONFIGSRESPONSE_CONFIGSENTRY']._serialized_end=6613
+  _globals['_GETWLANCONFIGREQUEST']._serialized_start=8734
+  _globals['_GETWLANCONFIGREQUEST']._serialized_end=8793
+  _globals['_GETWLANCONFIGRESPONSE']._serialized_start=8796
+  _globals['_GETWLANCONFIGRESPONSE']._serialized_end=8945
+  _globals['_GETWLANCONFIGRESPONSE_CONFIGENTRY']._serialized_start=1932
+  _globals['_GETWLANCONFIGRESPONSE_CONFIGENTRY']._serialized_end=1999
+  _globals['_SETWLANCONFIGREQUEST']._serialized_start=8947
+  _globals['_SETWLANCONFIGREQUEST']._serialized_end=9028
+  _globals['_SETWLANCONFIGRESPONSE']._serialized_start=9030
+  _globals['_SETWLANCONFIGRESPONSE']._serialized_end=9069
+  _globals['_GETEMANECONFIGREQUEST']._serialized_start=9071
+  _globals['_GETEMANECONFIGREQUEST']._serialized_end=9114
+  _globals['_GETEMANECONFIGRESPONSE']._serialized_start=9117
+  _globals['_GETEMANECONFIGRESPONSE']._serialized_end=9268
+  _globals['_GETEMANECONFIGRESPONSE_CONFIGENTRY']._serialized_start=1932
+  _globals['_GETEMANECONFIGRESPONSE_CONFIGENTRY']._serialized_end=1999
+  _globals['_SETEMANECONFIGREQUEST']._serialized_start=9271
+  _globals['_SETEMANECONFIGREQUEST']._serialized_end=9418
+  _globals['_SETEMANECONFIGREQUEST_CONFIGENTRY']._serialized_start=2110
+  _globals['_SETEMANECONFIGREQUEST_CONFIGENTRY']._serialized_end=2155
+  _globals['_SETEMANECONFIGRESPONSE']._serialized_start=9420
+  _globals['_SETEMANECONFIGRESPONSE']._serialized_end=9460
+  _globals['_GETEMANEMODELSREQUEST']._serialized_start=9462
+  _globals['_GETEMANEMODELSREQUEST']._serialized_end=9505
+  _globals['_GETEMANEMODELSRESPONSE']._serialized_start=9507
+  _globals['_GETEMANEMODELSRESPONSE']._serialized_end=9547
+  _globals['_GETEMANEMODELCONFIGREQUEST']._serialized_start=9549
+  _globals['_GETEMANEMODELCONFIGREQUEST']._serialized_end=9648
+  _globals['_GETEMANEMODELCONFIGRESPONSE']._serialized_start=9651
+  _globals['_GETEMANEMODELCONFIGRESPONSE']._serialized_end=9812
+  _globals['_GETEMANEMODELCONFIGRESPONSE_CONFIGENTRY']._serialized_start=1932
+  _globals['_GETEMANEMODELCONFIGRESPONSE_CONFIGENTRY']._serialized_end=1999
+  _globals['_SETEMANEMODELCONFIGREQUEST']._serialized_start=9814
+  _globals['_SETEMANEMODELCONFIGREQUEST']._serialized_end=9914
+  _globals['_SETEMANEMODELCONFIGRESPONSE']._serialized_start=9916
+  _globals['_SETEMANEMODELCONFIGRESPONSE']._serialized_end=9961
+  _globals['_GETEMANEMODELCONFIGSREQUEST']._serialized_start=9963
+  _globals['_GETEMANEMODELCONFIGSREQUEST']._serialized_end=10012
+  _globals['_GETEMANEMODELCONFIGSRESPONSE']._serialized_start=10015
+  _globals['_GETEMANEMODELCONFIGSRESPONSE']._serialized_end=10322
+  _globals['_GETEMANEMODELCONFIGSRESPONSE_MODELCONFIG']._serialized_start=10113
+  _globals['_GETEMANEMODELCONFIGSRESPONSE_MODELCONFIG']._serialized_end=10322
+  _globals['_GETEMANEMODELCONFIGSRESPONSE_MODELCONFIG_CONFIGENTRY']._serialized_start=1932
+  _globals['_GETEMANEMODELCONFIGSRESPONSE_MODELCONFIG_CONFIGENTRY']._serialized_end=1999
+  _globals['_GETEMANEEVENTCHANNELREQUEST']._serialized_start=10324
+  _globals['_GETEMANEEVENTCHANNELREQUEST']._serialized_end=10373
+  _globals['_GETEMANEEVENTCHANNELRESPONSE']._serialized_start=10375
+  _globals['_GETEMANEEVENTCHANNELRESPONSE']._serialized_end=10450
+  _globals['_SAVEXMLREQUEST']._serialized_start=10452
+  _globals['_SAVEXMLREQUEST']._serialized_end=10488
+  _globals['_SAVEXMLRESPONSE']._serialized_start=10490
+  _globals['_SAVEXMLRESPONSE']._serialized_end=10521
+  _globals['_OPENXMLREQUEST']._serialized_start=10523
+  _globals['_OPENXMLREQUEST']._serialized_end=10582
+  _globals['_OPENXMLRESPONSE']._serialized_start=10584
+  _globals['_OPENXMLRESPONSE']._serialized_end=10637
+  _globals['_GETINTERFACESREQUEST']._serialized_start=10639
+  _globals['_GETINTERFACESREQUEST']._serialized_end=10661
+  _globals['_GETINTERFACESRESPONSE']._serialized_start=10663
+  _globals['_GETINTERFACESRESPONSE']._serialized_end=10706
+  _globals['_EMANELINKREQUEST']._serialized_start=10708
+  _globals['_EMANELINKREQUEST']._serialized_end=10796
+  _globals['_EMANELINKRESPONSE']._serialized_start=10798
+  _globals['_EMANELINKRESPONSE']._serialized_end=10833
+  _globals['_EXECUTESCRIPTREQUEST']._serialized_start=10835
+  _globals['_EXECUTESCRIPTREQUEST']._serialized_end=10873
+  _globals['_EXECUTESCRIPTRESPONSE']._serialized_start=10875
+  _globals['_EXECUTESCRIPTRESPONSE']._serialized_end=10918
+  _globals['_WLANCONFIG']._serialized_start=10920
+  _globals['_WLANCONFIG']._serialized_end=11042
+  _globals['_WLANCONFIG_CONFIGENTRY']._serialized_start=2110
+  _globals['_WLANCONFIG_CONFIGENTRY']._serialized_end=2155
+  _globals['_MOBILITYCONFIG']._serialized_start=11045
+  _globals['_MOBILITYCONFIG']._serialized_end=11175
+  _globals['_MOBILITYCONFIG_CONFIGENTRY']._serialized_start=2110
+  _globals['_MOBILITYCONFIG_CONFIGENTRY']._serialized_end=2155
+  _globals['_EMANEMODELCONFIG']._serialized_start=11178
+  _globals['_EMANEMODELCONFIG']._serialized_end=11349
+  _globals['_EMANEMODELCONFIG_CONFIGENTRY']._serialized_start=2110
+  _globals['_EMANEMODELCONFIG_CONFIGENTRY']._serialized_end=2155
+  _globals['_SERVICECONFIG']._serialized_start=11352
+  _globals['_SERVICECONFIG']._serialized_end=11490
+  _globals['_SERVICEFILECONFIG']._serialized_start=11492
+  _globals['_SERVICEFILECONFIG']._serialized_end=11573
+  _globals['_EVENTTYPE']._serialized_start=11575
+  _globals['_EVENTTYPE']._serialized_end=11664
+  _globals['_EVENTTYPE_ENUM']._serialized_start=11588
+  _globals['_EVENTTYPE_ENUM']._serialized_end=11664
+  _globals['_MESSAGETYPE']._serialized_start=11666
+  _globals['_MESSAGETYPE']._serialized_end=11769
+  _globals['_MESSAGETYPE_ENUM']._serialized_start=11681
+  _globals['_MESSAGETYPE_ENUM']._serialized_end=11769
+  _globals['_LINKTYPE']._serialized_start=11771
+  _globals['_LINKTYPE']._serialized_end=11814
+  _globals['_LINKTYPE_ENUM']._serialized_start=11783
+  _globals['_LINKTYPE_ENUM']._serialized_end=11814
+  _globals['_SESSIONSTATE']._serialized_start=11817
+  _globals['_SESSIONSTATE']._serialized_end=11947
+  _globals['_SESSIONSTATE_ENUM']._serialized_start=11833
+  _globals['_SESSIONSTATE_ENUM']._serialized_end=11947
+  _globals['_NODETYPE']._serialized_start=11950
+  _globals['_NODETYPE']._serialized_end=12140
+  _globals['_NODETYPE_ENUM']._serialized_start=11963
+  _globals['_NODETYPE_ENUM']._serialized_end=12140
+  _globals['_CONFIGOPTIONTYPE']._serialized_start=12143
+  _globals['_CONFIGOPTIONTYPE']._serialized_end=12303
+  _globals['_CONFIGOPTIONTYPE_ENUM']._serialized_start=12164
+  _globals['_CONFIGOPTIONTYPE_ENUM']._serialized_end=12303
+  _globals['_SERVICEVALIDATIONMODE']._serialized_start=12305
+  _globals['_SERVICEVALIDATIONMODE']._serialized_end=12379
+  _globals['_SERVICEVALIDATIONMODE_ENUM']._serialized_start=12330
+  _globals['_SERVICEVALIDATIONMODE_ENUM']._serialized_end=12379
+  _globals['_SERVICEACTION']._serialized_start=12381
+  _globals['_SERVICEACTION']._serialized_end=12452
+  _globals['_SERVICEACTION_ENUM']._serialized_start=12398
+  _globals['_SERVICEACTION_ENUM']._serialized_end=12452
+  _globals['_MOBILITYACTION']._serialized_start=12454
+  _globals['_MOBILITYACTION']._serialized_end=12510
+  _globals['_MOBILITYACTION_ENUM']._serialized_start=12472
+  _globals['_MOBILITYACTION_ENUM']._serialized_end=12510
+  _globals['_EXCEPTIONLEVEL']._serialized_start=12512
+  _globals['_EXCEPTIONLEVEL']._serialized_end=12596
+  _globals['_EXCEPTIONLEVEL_ENUM']._serialized_start=12530
+  _globals['_EXCEPTIONLEVEL_ENUM']._serialized_end=12596
+  _globals['_HOOK']._serialized_start=12598
+  _globals['_HOOK']._serialized_end=12672
+  _globals['_SERVICEDEFAULTS']._serialized_start=12674
+  _globals['_SERVICEDEFAULTS']._serialized_end=12728
+  _globals['_SERVICE']._serialized_start=12730
+  _globals['_SERVICE']._serialized_end=12768
+  _globals['_NODESERVICEDATA']._serialized_start=12771
+  _globals['_NODESERVICEDATA']._serialized_end=13014
+  _globals['_MAPPEDCONFIG']._serialized_start=13017
+  _globals['_MAPPEDCONFIG']._serialized_end=13148
+  _globals['_MAPPEDCONFIG_CONFIGENTRY']._serialized_start=1932
+  _globals['_MAPPEDCONFIG_CONFIGENTRY']._serialized_end=1999
+  _globals['_SESSION']._serialized_start=13150
+  _globals['_SESSION']._serialized_end=13265
+  _globals['_SESSIONSUMMARY']._serialized_start=13267
+  _globals['_SESSIONSUMMARY']._serialized_end=13364
+  _globals['_NODE']._serialized_start=13367
+  _globals['_NODE']._serialized_end=13626
+  _globals['_LINK']._serialized_start=13629
+  _globals['_LINK']._serialized_end=13828
+  _globals['_LINKOPTIONS']._serialized_start=13831
+  _globals['_LINKOPTIONS']._serialized_end=14017
+  _globals['_INTERFACE']._serialized_start=14020
+  _globals['_INTERFACE']._serialized_end=14174
+  _globals['_SESSIONLOCATION']._serialized_start=14176
+  _globals['_SESSIONLOCATION']._serialized_end=14280
+  _globals['_POSITION']._serialized_start=14282
+  _globals['_POSITION']._serialized_end=14325
+  _globals['_GEO']._serialized_start=14327
+  _globals['_GEO']._serialized_end=14371
+  _globals['_COREAPI']._serialized_start=14374
+  _globals['_COREAPI']._serialized_end=19648
+# @@protoc_insertion_point(module_scope)
@@ -0,0 +1,2862 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+import warnings
+
+from core.api.grpc import configservices_pb2 as core_dot_api_dot_grpc_dot_configservices__pb2
+from core.api.grpc import core_pb2 as core_dot_api_dot_grpc_dot_core__pb2
+
+GRPC_GENERATED_VERSION = '1.84.0'
+GRPC_VERSION = grpc.__version__
+_version_not_supported = False
+
+try:
+    from grpc._utilities import first_version_is_lower
+    _version_not_supported = first_version_is_lower(GRPC_VERSION, GRPC_GENERATED_VERSION)
+except ImportError:
+    _version_not_supported = True
+
+if _version_not_supported:
+    raise RuntimeError(
+        f'The grpc package installed is at version {GRPC_VERSION},'
+        + ' but the generated code in core/api/grpc/core_pb2_grpc.py depends on'
+        + f' grpcio>={GRPC_GENERATED_VERSION}.'
+        + f' Please upgrade your grpc module to grpcio>={GRPC_GENERATED_VERSION}'
+        + f' or downgrade your generated code using grpcio-tools<={GRPC_VERSION}.'
+    )
+
+
+class CoreApiStub:
+    """Missing associated documentation comment in .proto file."""
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.StartSession = channel.unary_unary(
+                '/core.CoreApi/StartSession',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.StartSessionRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.StartSessionResponse.FromString,
+                _registered_method=True)
+        self.StopSession = channel.unary_unary(
+                '/core.CoreApi/StopSession',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.StopSessionRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.StopSessionResponse.FromString,
+                _registered_method=True)
+        self.CreateSession = channel.unary_unary(
+                '/core.CoreApi/CreateSession',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.CreateSessionRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.CreateSessionResponse.FromString,
+                _registered_method=True)
+        self.DeleteSession = channel.unary_unary(
+                '/core.CoreApi/DeleteSession',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.DeleteSessionRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.DeleteSessionResponse.FromString,
+                _registered_method=True)
+        self.GetSessions = channel.unary_unary(
+                '/core.CoreApi/GetSessions',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetSessionsRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetSessionsResponse.FromString,
+                _registered_method=True)
+        self.GetSession = channel.unary_unary(
+                '/core.CoreApi/GetSession',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetSessionRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetSessionResponse.FromString,
+                _registered_method=True)
+        self.GetSessionDelta = channel.unary_unary(
+                '/core.CoreApi/GetSessionDelta',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetSessionDeltaRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetSessionDeltaResponse.FromString,
+                _registered_method=True)
+        self.CheckSession = channel.unary_unary(
+                '/core.CoreApi/CheckSession',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.CheckSessionRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.CheckSessionResponse.FromString,
+                _registered_method=True)
+        self.GetSessionOptions = channel.unary_unary(
+                '/core.CoreApi/GetSessionOptions',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetSessionOptionsRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetSessionOptionsResponse.FromString,
+                _registered_method=True)
+        self.SetSessionOptions = channel.unary_unary(
+                '/core.CoreApi/SetSessionOptions',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.SetSessionOptionsRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.SetSessionOptionsResponse.FromString,
+                _registered_method=True)
+        self.SetSessionMetadata = channel.unary_unary(
+                '/core.CoreApi/SetSessionMetadata',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.SetSessionMetadataRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.SetSessionMetadataResponse.FromString,
+                _registered_method=True)
+        self.GetSessionMetadata = channel.unary_unary(
+                '/core.CoreApi/GetSessionMetadata',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetSessionMetadataRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetSessionMetadataResponse.FromString,
+                _registered_method=True)
+        self.GetSessionLocation = channel.unary_unary(
+                '/core.CoreApi/GetSessionLocation',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetSessionLocationRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetSessionLocationResponse.FromString,
+                _registered_method=True)
+        self.SetSessionLocation = channel.unary_unary(
+                '/core.CoreApi/SetSessionLocation',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.SetSessionLocationRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.SetSessionLocationResponse.FromString,
+                _registered_method=True)
+        self.SetSessionState = channel.unary_unary(
+                '/core.CoreApi/SetSessionState',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.SetSessionStateRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.SetSessionStateResponse.FromString,
+                _registered_method=True)
+        self.AddSessionServer = channel.unary_unary(
+                '/core.CoreApi/AddSessionServer',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.AddSessionServerRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.AddSessionServerResponse.FromString,
+                _registered_method=True)
+        self.Events = channel.unary_stream(
+                '/core.CoreApi/Events',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.EventsRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.Event.FromString,
+                _registered_method=True)
+        self.BatchEvents = channel.unary_stream(
+                '/core.CoreApi/BatchEvents',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.EventsRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.Events.FromString,
+                _registered_method=True)
+        self.Throughputs = channel.unary_stream(
+                '/core.CoreApi/Throughputs',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.ThroughputsRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.ThroughputsEvent.FromString,
+                _registered_method=True)
+        self.AddNode = channel.unary_unary(
+                '/core.CoreApi/AddNode',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.AddNodeRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.AddNodeResponse.FromString,
+                _registered_method=True)
+        self.GetNode = channel.unary_unary(
+                '/core.CoreApi/GetNode',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetNodeRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetNodeResponse.FromString,
+                _registered_method=True)
+        self.EditNode = channel.unary_unary(
+                '/core.CoreApi/EditNode',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.EditNodeRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.EditNodeResponse.FromString,
+                _registered_method=True)
+        self.DeleteNode = channel.unary_unary(
+                '/core.CoreApi/DeleteNode',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.DeleteNodeRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.DeleteNodeResponse.FromString,
+                _registered_method=True)
+        self.NodeCommand = channel.unary_unary(
+                '/core.CoreApi/NodeCommand',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.NodeCommandRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.NodeCommandResponse.FromString,
+                _registered_method=True)
+        self.GetNodeTerminal = channel.unary_unary(
+                '/core.CoreApi/GetNodeTerminal',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetNodeTerminalRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetNodeTerminalResponse.FromString,
+                _registered_method=True)
+        self.GetNodeLinks = channel.unary_unary(
+                '/core.CoreApi/GetNodeLinks',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetNodeLinksRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetNodeLinksResponse.FromString,
+                _registered_method=True)
+        self.AddLink = channel.unary_unary(
+                '/core.CoreApi/AddLink',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.AddLinkRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.AddLinkResponse.FromString,
+                _registered_method=True)
+        self.EditLink = channel.unary_unary(
+                '/core.CoreApi/EditLink',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.EditLinkRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.EditLinkResponse.FromString,
+                _registered_method=True)
+        self.DeleteLink = channel.unary_unary(
+                '/core.CoreApi/DeleteLink',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.DeleteLinkRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.DeleteLinkResponse.FromString,
+                _registered_method=True)
+        self.GetHooks = channel.unary_unary(
+                '/core.CoreApi/GetHooks',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetHooksRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetHooksResponse.FromString,
+                _registered_method=True)
+        self.AddHook = channel.unary_unary(
+                '/core.CoreApi/AddHook',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.AddHookRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.AddHookResponse.FromString,
+                _registered_method=True)
+        self.GetMobilityConfigs = channel.unary_unary(
+                '/core.CoreApi/GetMobilityConfigs',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetMobilityConfigsRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetMobilityConfigsResponse.FromString,
+                _registered_method=True)
+        self.GetMobilityConfig = channel.unary_unary(
+                '/core.CoreApi/GetMobilityConfig',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetMobilityConfigRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetMobilityConfigResponse.FromString,
+                _registered_method=True)
+        self.SetMobilityConfig = channel.unary_unary(
+                '/core.CoreApi/SetMobilityConfig',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.SetMobilityConfigRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.SetMobilityConfigResponse.FromString,
+                _registered_method=True)
+        self.MobilityAction = channel.unary_unary(
+                '/core.CoreApi/MobilityAction',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.MobilityActionRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.MobilityActionResponse.FromString,
+                _registered_method=True)
+        self.GetServices = channel.unary_unary(
+                '/core.CoreApi/GetServices',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetServicesRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetServicesResponse.FromString,
+                _registered_method=True)
+        self.GetServiceDefaults = channel.unary_unary(
+                '/core.CoreApi/GetServiceDefaults',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetServiceDefaultsRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetServiceDefaultsResponse.FromString,
+                _registered_method=True)
+        self.SetServiceDefaults = channel.unary_unary(
+                '/core.CoreApi/SetServiceDefaults',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.SetServiceDefaultsRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.SetServiceDefaultsResponse.FromString,
+                _registered_method=True)
+        self.GetNodeServiceConfigs = channel.unary_unary(
+                '/core.CoreApi/GetNodeServiceConfigs',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetNodeServiceConfigsRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetNodeServiceConfigsResponse.FromString,
+                _registered_method=True)
+        self.GetNodeService = channel.unary_unary(
+                '/core.CoreApi/GetNodeService',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetNodeServiceRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetNodeServiceResponse.FromString,
+                _registered_method=True)
+        self.GetNodeServiceFile = channel.unary_unary(
+                '/core.CoreApi/GetNodeServiceFile',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetNodeServiceFileRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetNodeServiceFileResponse.FromString,
+                _registered_method=True)
+        self.SetNodeService = channel.unary_unary(
+                '/core.CoreApi/SetNodeService',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.SetNodeServiceRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.SetNodeServiceResponse.FromString,
+                _registered_method=True)
+        self.SetNodeServiceFile = channel.unary_unary(
+                '/core.CoreApi/SetNodeServiceFile',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.SetNodeServiceFileRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.SetNodeServiceFileResponse.FromString,
+                _registered_method=True)
+        self.ServiceAction = channel.unary_unary(
+                '/core.CoreApi/ServiceAction',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.ServiceActionRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.ServiceActionResponse.FromString,
+                _registered_method=True)
+        self.GetConfigServices = channel.unary_unary(
+                '/core.CoreApi/GetConfigServices',
+                request_serializer=core_dot_api_dot_grpc_dot_configservices__pb2.GetConfigServicesRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_configservices__pb2.GetConfigServicesResponse.FromString,
+                _registered_method=True)
+        self.GetConfigServiceDefaults = channel.unary_unary(
+                '/core.CoreApi/GetConfigServiceDefaults',
+                request_serializer=core_dot_api_dot_grpc_dot_configservices__pb2.GetConfigServiceDefaultsRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_configservices__pb2.GetConfigServiceDefaultsResponse.FromString,
+                _registered_method=True)
+        self.GetNodeConfigServiceConfigs = channel.unary_unary(
+                '/core.CoreApi/GetNodeConfigServiceConfigs',
+                request_serializer=core_dot_api_dot_grpc_dot_configservices__pb2.GetNodeConfigServiceConfigsRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_configservices__pb2.GetNodeConfigServiceConfigsResponse.FromString,
+                _registered_method=True)
+        self.GetNodeConfigService = channel.unary_unary(
+                '/core.CoreApi/GetNodeConfigService',
+                request_serializer=core_dot_api_dot_grpc_dot_configservices__pb2.GetNodeConfigServiceRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_configservices__pb2.GetNodeConfigServiceResponse.FromString,
+                _registered_method=True)
+        self.GetNodeConfigServices = channel.unary_unary(
+                '/core.CoreApi/GetNodeConfigServices',
+                request_serializer=core_dot_api_dot_grpc_dot_configservices__pb2.GetNodeConfigServicesRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_configservices__pb2.GetNodeConfigServicesResponse.FromString,
+                _registered_method=True)
+        self.SetNodeConfigService = channel.unary_unary(
+                '/core.CoreApi/SetNodeConfigService',
+                request_serializer=core_dot_api_dot_grpc_dot_configservices__pb2.SetNodeConfigServiceRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_configservices__pb2.SetNodeConfigServiceResponse.FromString,
+                _registered_method=True)
+        self.GetWlanConfigs = channel.unary_unary(
+                '/core.CoreApi/GetWlanConfigs',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetWlanConfigsRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetWlanConfigsResponse.FromString,
+                _registered_method=True)
+        self.GetWlanConfig = channel.unary_unary(
+                '/core.CoreApi/GetWlanConfig',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetWlanConfigRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetWlanConfigResponse.FromString,
+                _registered_method=True)
+        self.SetWlanConfig = channel.unary_unary(
+                '/core.CoreApi/SetWlanConfig',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.SetWlanConfigRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.SetWlanConfigResponse.FromString,
+                _registered_method=True)
+        self.GetEmaneConfig = channel.unary_unary(
+                '/core.CoreApi/GetEmaneConfig',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetEmaneConfigRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetEmaneConfigResponse.FromString,
+                _registered_method=True)
+        self.SetEmaneConfig = channel.unary_unary(
+                '/core.CoreApi/SetEmaneConfig',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.SetEmaneConfigRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.SetEmaneConfigResponse.FromString,
+                _registered_method=True)
+        self.GetEmaneModels = channel.unary_unary(
+                '/core.CoreApi/GetEmaneModels',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetEmaneModelsRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetEmaneModelsResponse.FromString,
+                _registered_method=True)
+        self.GetEmaneModelConfig = channel.unary_unary(
+                '/core.CoreApi/GetEmaneModelConfig',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetEmaneModelConfigRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetEmaneModelConfigResponse.FromString,
+                _registered_method=True)
+        self.SetEmaneModelConfig = channel.unary_unary(
+                '/core.CoreApi/SetEmaneModelConfig',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.SetEmaneModelConfigRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.SetEmaneModelConfigResponse.FromString,
+                _registered_method=True)
+        self.GetEmaneModelConfigs = channel.unary_unary(
+                '/core.CoreApi/GetEmaneModelConfigs',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetEmaneModelConfigsRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetEmaneModelConfigsResponse.FromString,
+                _registered_method=True)
+        self.GetEmaneEventChannel = channel.unary_unary(
+                '/core.CoreApi/GetEmaneEventChannel',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetEmaneEventChannelRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetEmaneEventChannelResponse.FromString,
+                _registered_method=True)
+        self.SaveXml = channel.unary_unary(
+                '/core.CoreApi/SaveXml',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.SaveXmlRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.SaveXmlResponse.FromString,
+                _registered_method=True)
+        self.OpenXml = channel.unary_unary(
+                '/core.CoreApi/OpenXml',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.OpenXmlRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.OpenXmlResponse.FromString,
+                _registered_method=True)
+        self.GetInterfaces = channel.unary_unary(
+                '/core.CoreApi/GetInterfaces',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetInterfacesRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetInterfacesResponse.FromString,
+                _registered_method=True)
+        self.EmaneLink = channel.unary_unary(
+                '/core.CoreApi/EmaneLink',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.EmaneLinkRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.EmaneLinkResponse.FromString,
+                _registered_method=True)
+        self.ExecuteScript = channel.unary_unary(
+                '/core.CoreApi/ExecuteScript',
+                request_serializer=core_dot_api_dot_grpc_dot_core__pb2.ExecuteScriptRequest.SerializeToString,
+                response_deserializer=core_dot_api_dot_grpc_dot_core__pb2.ExecuteScriptResponse.FromString,
+                _registered_method=True)
+
+
+class CoreApiServicer:
+    """Missing associated documentation comment in .proto file."""
+
+    def StartSession(self, request, context):
+        """session rpc
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StopSession(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def CreateSession(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def DeleteSession(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetSessions(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetSession(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetSessionDelta(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def CheckSession(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetSessionOptions(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SetSessionOptions(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SetSessionMetadata(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetSessionMetadata(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetSessionLocation(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SetSessionLocation(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SetSessionState(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def AddSessionServer(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Events(self, request, context):
+        """streams
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def BatchEvents(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Throughputs(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def AddNode(self, request, context):
+        """node rpc
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetNode(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def EditNode(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def DeleteNode(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def NodeCommand(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetNodeTerminal(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetNodeLinks(self, request, context):
+        """link rpc
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def AddLink(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def EditLink(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def DeleteLink(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetHooks(self, request, context):
+        """hook rpc
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def AddHook(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetMobilityConfigs(self, request, context):
+        """mobility rpc
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetMobilityConfig(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SetMobilityConfig(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def MobilityAction(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetServices(self, request, context):
+        """service rpc
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetServiceDefaults(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SetServiceDefaults(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetNodeServiceConfigs(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetNodeService(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetNodeServiceFile(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SetNodeService(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SetNodeServiceFile(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ServiceAction(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetConfigServices(self, request, context):
+        """config services
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetConfigServiceDefaults(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetNodeConfigServiceConfigs(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetNodeConfigService(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetNodeConfigServices(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SetNodeConfigService(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetWlanConfigs(self, request, context):
+        """wlan rpc
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetWlanConfig(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SetWlanConfig(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetEmaneConfig(self, request, context):
+        """emane rpc
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SetEmaneConfig(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetEmaneModels(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetEmaneModelConfig(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SetEmaneModelConfig(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetEmaneModelConfigs(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetEmaneEventChannel(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SaveXml(self, request, context):
+        """xml rpc
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def OpenXml(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetInterfaces(self, request, context):
+        """utilities
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def EmaneLink(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ExecuteScript(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_CoreApiServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'StartSession': grpc.unary_unary_rpc_method_handler(
+                    servicer.StartSession,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.StartSessionRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.StartSessionResponse.SerializeToString,
+            ),
+            'StopSession': grpc.unary_unary_rpc_method_handler(
+                    servicer.StopSession,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.StopSessionRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.StopSessionResponse.SerializeToString,
+            ),
+            'CreateSession': grpc.unary_unary_rpc_method_handler(
+                    servicer.CreateSession,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.CreateSessionRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.CreateSessionResponse.SerializeToString,
+            ),
+            'DeleteSession': grpc.unary_unary_rpc_method_handler(
+                    servicer.DeleteSession,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.DeleteSessionRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.DeleteSessionResponse.SerializeToString,
+            ),
+            'GetSessions': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetSessions,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetSessionsRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetSessionsResponse.SerializeToString,
+            ),
+            'GetSession': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetSession,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetSessionRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetSessionResponse.SerializeToString,
+            ),
+            'GetSessionDelta': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetSessionDelta,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetSessionDeltaRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetSessionDeltaResponse.SerializeToString,
+            ),
+            'CheckSession': grpc.unary_unary_rpc_method_handler(
+                    servicer.CheckSession,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.CheckSessionRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.CheckSessionResponse.SerializeToString,
+            ),
+            'GetSessionOptions': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetSessionOptions,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetSessionOptionsRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetSessionOptionsResponse.SerializeToString,
+            ),
+            'SetSessionOptions': grpc.unary_unary_rpc_method_handler(
+                    servicer.SetSessionOptions,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.SetSessionOptionsRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.SetSessionOptionsResponse.SerializeToString,
+            ),
+            'SetSessionMetadata': grpc.unary_unary_rpc_method_handler(
+                    servicer.SetSessionMetadata,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.SetSessionMetadataRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.SetSessionMetadataResponse.SerializeToString,
+            ),
+            'GetSessionMetadata': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetSessionMetadata,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetSessionMetadataRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetSessionMetadataResponse.SerializeToString,
+            ),
+            'GetSessionLocation': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetSessionLocation,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetSessionLocationRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetSessionLocationResponse.SerializeToString,
+            ),
+            'SetSessionLocation': grpc.unary_unary_rpc_method_handler(
+                    servicer.SetSessionLocation,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.SetSessionLocationRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.SetSessionLocationResponse.SerializeToString,
+            ),
+            'SetSessionState': grpc.unary_unary_rpc_method_handler(
+                    servicer.SetSessionState,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.SetSessionStateRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.SetSessionStateResponse.SerializeToString,
+            ),
+            'AddSessionServer': grpc.unary_unary_rpc_method_handler(
+                    servicer.AddSessionServer,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.AddSessionServerRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.AddSessionServerResponse.SerializeToString,
+            ),
+            'Events': grpc.unary_stream_rpc_method_handler(
+                    servicer.Events,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.EventsRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.Event.SerializeToString,
+            ),
+            'BatchEvents': grpc.unary_stream_rpc_method_handler(
+                    servicer.BatchEvents,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.EventsRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.Events.SerializeToString,
+            ),
+            'Throughputs': grpc.unary_stream_rpc_method_handler(
+                    servicer.Throughputs,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.ThroughputsRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.ThroughputsEvent.SerializeToString,
+            ),
+            'AddNode': grpc.unary_unary_rpc_method_handler(
+                    servicer.AddNode,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.AddNodeRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.AddNodeResponse.SerializeToString,
+            ),
+            'GetNode': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetNode,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetNodeRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetNodeResponse.SerializeToString,
+            ),
+            'EditNode': grpc.unary_unary_rpc_method_handler(
+                    servicer.EditNode,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.EditNodeRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.EditNodeResponse.SerializeToString,
+            ),
+            'DeleteNode': grpc.unary_unary_rpc_method_handler(
+                    servicer.DeleteNode,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.DeleteNodeRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.DeleteNodeResponse.SerializeToString,
+            ),
+            'NodeCommand': grpc.unary_unary_rpc_method_handler(
+                    servicer.NodeCommand,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.NodeCommandRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.NodeCommandResponse.SerializeToString,
+            ),
+            'GetNodeTerminal': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetNodeTerminal,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetNodeTerminalRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetNodeTerminalResponse.SerializeToString,
+            ),
+            'GetNodeLinks': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetNodeLinks,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetNodeLinksRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetNodeLinksResponse.SerializeToString,
+            ),
+            'AddLink': grpc.unary_unary_rpc_method_handler(
+                    servicer.AddLink,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.AddLinkRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.AddLinkResponse.SerializeToString,
+            ),
+            'EditLink': grpc.unary_unary_rpc_method_handler(
+                    servicer.EditLink,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.EditLinkRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.EditLinkResponse.SerializeToString,
+            ),
+            'DeleteLink': grpc.unary_unary_rpc_method_handler(
+                    servicer.DeleteLink,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.DeleteLinkRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.DeleteLinkResponse.SerializeToString,
+            ),
+            'GetHooks': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetHooks,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetHooksRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetHooksResponse.SerializeToString,
+            ),
+            'AddHook': grpc.unary_unary_rpc_method_handler(
+                    servicer.AddHook,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.AddHookRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.AddHookResponse.SerializeToString,
+            ),
+            'GetMobilityConfigs': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetMobilityConfigs,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetMobilityConfigsRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetMobilityConfigsResponse.SerializeToString,
+            ),
+            'GetMobilityConfig': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetMobilityConfig,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetMobilityConfigRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetMobilityConfigResponse.SerializeToString,
+            ),
+            'SetMobilityConfig': grpc.unary_unary_rpc_method_handler(
+                    servicer.SetMobilityConfig,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.SetMobilityConfigRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.SetMobilityConfigResponse.SerializeToString,
+            ),
+            'MobilityAction': grpc.unary_unary_rpc_method_handler(
+                    servicer.MobilityAction,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.MobilityActionRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.MobilityActionResponse.SerializeToString,
+            ),
+            'GetServices': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetServices,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetServicesRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetServicesResponse.SerializeToString,
+            ),
+            'GetServiceDefaults': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetServiceDefaults,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetServiceDefaultsRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetServiceDefaultsResponse.SerializeToString,
+            ),
+            'SetServiceDefaults': grpc.unary_unary_rpc_method_handler(
+                    servicer.SetServiceDefaults,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.SetServiceDefaultsRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.SetServiceDefaultsResponse.SerializeToString,
+            ),
+            'GetNodeServiceConfigs': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetNodeServiceConfigs,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetNodeServiceConfigsRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetNodeServiceConfigsResponse.SerializeToString,
+            ),
+            'GetNodeService': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetNodeService,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetNodeServiceRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetNodeServiceResponse.SerializeToString,
+            ),
+            'GetNodeServiceFile': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetNodeServiceFile,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetNodeServiceFileRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetNodeServiceFileResponse.SerializeToString,
+            ),
+            'SetNodeService': grpc.unary_unary_rpc_method_handler(
+                    servicer.SetNodeService,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.SetNodeServiceRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.SetNodeServiceResponse.SerializeToString,
+            ),
+            'SetNodeServiceFile': grpc.unary_unary_rpc_method_handler(
+                    servicer.SetNodeServiceFile,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.SetNodeServiceFileRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.SetNodeServiceFileResponse.SerializeToString,
+            ),
+            'ServiceAction': grpc.unary_unary_rpc_method_handler(
+                    servicer.ServiceAction,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.ServiceActionRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.ServiceActionResponse.SerializeToString,
+            ),
+            'GetConfigServices': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetConfigServices,
+                    request_deserializer=core_dot_api_dot_grpc_dot_configservices__pb2.GetConfigServicesRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_configservices__pb2.GetConfigServicesResponse.SerializeToString,
+            ),
+            'GetConfigServiceDefaults': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetConfigServiceDefaults,
+                    request_deserializer=core_dot_api_dot_grpc_dot_configservices__pb2.GetConfigServiceDefaultsRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_configservices__pb2.GetConfigServiceDefaultsResponse.SerializeToString,
+            ),
+            'GetNodeConfigServiceConfigs': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetNodeConfigServiceConfigs,
+                    request_deserializer=core_dot_api_dot_grpc_dot_configservices__pb2.GetNodeConfigServiceConfigsRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_configservices__pb2.GetNodeConfigServiceConfigsResponse.SerializeToString,
+            ),
+            'GetNodeConfigService': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetNodeConfigService,
+                    request_deserializer=core_dot_api_dot_grpc_dot_configservices__pb2.GetNodeConfigServiceRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_configservices__pb2.GetNodeConfigServiceResponse.SerializeToString,
+            ),
+            'GetNodeConfigServices': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetNodeConfigServices,
+                    request_deserializer=core_dot_api_dot_grpc_dot_configservices__pb2.GetNodeConfigServicesRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_configservices__pb2.GetNodeConfigServicesResponse.SerializeToString,
+            ),
+            'SetNodeConfigService': grpc.unary_unary_rpc_method_handler(
+                    servicer.SetNodeConfigService,
+                    request_deserializer=core_dot_api_dot_grpc_dot_configservices__pb2.SetNodeConfigServiceRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_configservices__pb2.SetNodeConfigServiceResponse.SerializeToString,
+            ),
+            'GetWlanConfigs': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetWlanConfigs,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetWlanConfigsRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetWlanConfigsResponse.SerializeToString,
+            ),
+            'GetWlanConfig': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetWlanConfig,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetWlanConfigRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetWlanConfigResponse.SerializeToString,
+            ),
+            'SetWlanConfig': grpc.unary_unary_rpc_method_handler(
+                    servicer.SetWlanConfig,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.SetWlanConfigRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.SetWlanConfigResponse.SerializeToString,
+            ),
+            'GetEmaneConfig': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetEmaneConfig,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetEmaneConfigRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetEmaneConfigResponse.SerializeToString,
+            ),
+            'SetEmaneConfig': grpc.unary_unary_rpc_method_handler(
+                    servicer.SetEmaneConfig,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.SetEmaneConfigRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.SetEmaneConfigResponse.SerializeToString,
+            ),
+            'GetEmaneModels': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetEmaneModels,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetEmaneModelsRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetEmaneModelsResponse.SerializeToString,
+            ),
+            'GetEmaneModelConfig': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetEmaneModelConfig,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetEmaneModelConfigRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetEmaneModelConfigResponse.SerializeToString,
+            ),
+            'SetEmaneModelConfig': grpc.unary_unary_rpc_method_handler(
+                    servicer.SetEmaneModelConfig,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.SetEmaneModelConfigRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.SetEmaneModelConfigResponse.SerializeToString,
+            ),
+            'GetEmaneModelConfigs': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetEmaneModelConfigs,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetEmaneModelConfigsRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetEmaneModelConfigsResponse.SerializeToString,
+            ),
+            'GetEmaneEventChannel': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetEmaneEventChannel,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetEmaneEventChannelRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetEmaneEventChannelResponse.SerializeToString,
+            ),
+            'SaveXml': grpc.unary_unary_rpc_method_handler(
+                    servicer.SaveXml,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.SaveXmlRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.SaveXmlResponse.SerializeToString,
+            ),
+            'OpenXml': grpc.unary_unary_rpc_method_handler(
+                    servicer.OpenXml,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.OpenXmlRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.OpenXmlResponse.SerializeToString,
+            ),
+            'GetInterfaces': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetInterfaces,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.GetInterfacesRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.GetInterfacesResponse.SerializeToString,
+            ),
+            'EmaneLink': grpc.unary_unary_rpc_method_handler(
+                    servicer.EmaneLink,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.EmaneLinkRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.EmaneLinkResponse.SerializeToString,
+            ),
+            'ExecuteScript': grpc.unary_unary_rpc_method_handler(
+                    servicer.ExecuteScript,
+                    request_deserializer=core_dot_api_dot_grpc_dot_core__pb2.ExecuteScriptRequest.FromString,
+                    response_serializer=core_dot_api_dot_grpc_dot_core__pb2.ExecuteScriptResponse.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'core.CoreApi', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('core.CoreApi', rpc_method_handlers)
+
+
+ # This class is part of an EXPERIMENTAL API.
+class CoreApi:
+    """Missing associated documentation comment in .proto file."""
+
+    @staticmethod
+    def StartSession(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/StartSession',
+            core_dot_api_dot_grpc_dot_core__pb2.StartSessionRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.StartSessionResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def StopSession(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/StopSession',
+            core_dot_api_dot_grpc_dot_core__pb2.StopSessionRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.StopSessionResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def CreateSession(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/CreateSession',
+            core_dot_api_dot_grpc_dot_core__pb2.CreateSessionRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.CreateSessionResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def DeleteSession(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/DeleteSession',
+            core_dot_api_dot_grpc_dot_core__pb2.DeleteSessionRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.DeleteSessionResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetSessions(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/GetSessions',
+            core_dot_api_dot_grpc_dot_core__pb2.GetSessionsRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.GetSessionsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetSession(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/GetSession',
+            core_dot_api_dot_grpc_dot_core__pb2.GetSessionRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.GetSessionResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetSessionDelta(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/GetSessionDelta',
+            core_dot_api_dot_grpc_dot_core__pb2.GetSessionDeltaRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.GetSessionDeltaResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def CheckSession(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/CheckSession',
+            core_dot_api_dot_grpc_dot_core__pb2.CheckSessionRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.CheckSessionResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetSessionOptions(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/GetSessionOptions',
+            core_dot_api_dot_grpc_dot_core__pb2.GetSessionOptionsRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.GetSessionOptionsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def SetSessionOptions(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/SetSessionOptions',
+            core_dot_api_dot_grpc_dot_core__pb2.SetSessionOptionsRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.SetSessionOptionsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def SetSessionMetadata(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/SetSessionMetadata',
+            core_dot_api_dot_grpc_dot_core__pb2.SetSessionMetadataRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.SetSessionMetadataResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetSessionMetadata(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/GetSessionMetadata',
+            core_dot_api_dot_grpc_dot_core__pb2.GetSessionMetadataRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.GetSessionMetadataResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetSessionLocation(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/GetSessionLocation',
+            core_dot_api_dot_grpc_dot_core__pb2.GetSessionLocationRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.GetSessionLocationResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def SetSessionLocation(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/SetSessionLocation',
+            core_dot_api_dot_grpc_dot_core__pb2.SetSessionLocationRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.SetSessionLocationResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def SetSessionState(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/SetSessionState',
+            core_dot_api_dot_grpc_dot_core__pb2.SetSessionStateRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.SetSessionStateResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def AddSessionServer(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/AddSessionServer',
+            core_dot_api_dot_grpc_dot_core__pb2.AddSessionServerRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.AddSessionServerResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Events(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/core.CoreApi/Events',
+            core_dot_api_dot_grpc_dot_core__pb2.EventsRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.Event.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def BatchEvents(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/core.CoreApi/BatchEvents',
+            core_dot_api_dot_grpc_dot_core__pb2.EventsRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.Events.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Throughputs(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/core.CoreApi/Throughputs',
+            core_dot_api_dot_grpc_dot_core__pb2.ThroughputsRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.ThroughputsEvent.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def AddNode(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/AddNode',
+            core_dot_api_dot_grpc_dot_core__pb2.AddNodeRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.AddNodeResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetNode(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/GetNode',
+            core_dot_api_dot_grpc_dot_core__pb2.GetNodeRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.GetNodeResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def EditNode(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/EditNode',
+            core_dot_api_dot_grpc_dot_core__pb2.EditNodeRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.EditNodeResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def DeleteNode(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/DeleteNode',
+            core_dot_api_dot_grpc_dot_core__pb2.DeleteNodeRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.DeleteNodeResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def NodeCommand(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/NodeCommand',
+            core_dot_api_dot_grpc_dot_core__pb2.NodeCommandRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.NodeCommandResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetNodeTerminal(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/GetNodeTerminal',
+            core_dot_api_dot_grpc_dot_core__pb2.GetNodeTerminalRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.GetNodeTerminalResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetNodeLinks(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/GetNodeLinks',
+            core_dot_api_dot_grpc_dot_core__pb2.GetNodeLinksRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.GetNodeLinksResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def AddLink(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/AddLink',
+            core_dot_api_dot_grpc_dot_core__pb2.AddLinkRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.AddLinkResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def EditLink(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/EditLink',
+            core_dot_api_dot_grpc_dot_core__pb2.EditLinkRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.EditLinkResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def DeleteLink(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/DeleteLink',
+            core_dot_api_dot_grpc_dot_core__pb2.DeleteLinkRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.DeleteLinkResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetHooks(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/GetHooks',
+            core_dot_api_dot_grpc_dot_core__pb2.GetHooksRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.GetHooksResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def AddHook(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/AddHook',
+            core_dot_api_dot_grpc_dot_core__pb2.AddHookRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.AddHookResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetMobilityConfigs(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/GetMobilityConfigs',
+            core_dot_api_dot_grpc_dot_core__pb2.GetMobilityConfigsRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.GetMobilityConfigsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetMobilityConfig(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/GetMobilityConfig',
+            core_dot_api_dot_grpc_dot_core__pb2.GetMobilityConfigRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.GetMobilityConfigResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def SetMobilityConfig(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/SetMobilityConfig',
+            core_dot_api_dot_grpc_dot_core__pb2.SetMobilityConfigRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.SetMobilityConfigResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def MobilityAction(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/MobilityAction',
+            core_dot_api_dot_grpc_dot_core__pb2.MobilityActionRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.MobilityActionResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetServices(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/GetServices',
+            core_dot_api_dot_grpc_dot_core__pb2.GetServicesRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.GetServicesResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetServiceDefaults(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/GetServiceDefaults',
+            core_dot_api_dot_grpc_dot_core__pb2.GetServiceDefaultsRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.GetServiceDefaultsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def SetServiceDefaults(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/SetServiceDefaults',
+            core_dot_api_dot_grpc_dot_core__pb2.SetServiceDefaultsRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.SetServiceDefaultsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetNodeServiceConfigs(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/GetNodeServiceConfigs',
+            core_dot_api_dot_grpc_dot_core__pb2.GetNodeServiceConfigsRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.GetNodeServiceConfigsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetNodeService(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/GetNodeService',
+            core_dot_api_dot_grpc_dot_core__pb2.GetNodeServiceRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.GetNodeServiceResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetNodeServiceFile(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/GetNodeServiceFile',
+            core_dot_api_dot_grpc_dot_core__pb2.GetNodeServiceFileRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.GetNodeServiceFileResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def SetNodeService(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/SetNodeService',
+            core_dot_api_dot_grpc_dot_core__pb2.SetNodeServiceRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.SetNodeServiceResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def SetNodeServiceFile(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/SetNodeServiceFile',
+            core_dot_api_dot_grpc_dot_core__pb2.SetNodeServiceFileRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.SetNodeServiceFileResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ServiceAction(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/ServiceAction',
+            core_dot_api_dot_grpc_dot_core__pb2.ServiceActionRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.ServiceActionResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetConfigServices(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/GetConfigServices',
+            core_dot_api_dot_grpc_dot_configservices__pb2.GetConfigServicesRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_configservices__pb2.GetConfigServicesResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetConfigServiceDefaults(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/GetConfigServiceDefaults',
+            core_dot_api_dot_grpc_dot_configservices__pb2.GetConfigServiceDefaultsRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_configservices__pb2.GetConfigServiceDefaultsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetNodeConfigServiceConfigs(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/GetNodeConfigServiceConfigs',
+            core_dot_api_dot_grpc_dot_configservices__pb2.GetNodeConfigServiceConfigsRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_configservices__pb2.GetNodeConfigServiceConfigsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetNodeConfigService(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/GetNodeConfigService',
+            core_dot_api_dot_grpc_dot_configservices__pb2.GetNodeConfigServiceRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_configservices__pb2.GetNodeConfigServiceResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetNodeConfigServices(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/GetNodeConfigServices',
+            core_dot_api_dot_grpc_dot_configservices__pb2.GetNodeConfigServicesRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_configservices__pb2.GetNodeConfigServicesResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def SetNodeConfigService(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/SetNodeConfigService',
+            core_dot_api_dot_grpc_dot_configservices__pb2.SetNodeConfigServiceRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_configservices__pb2.SetNodeConfigServiceResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetWlanConfigs(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/GetWlanConfigs',
+            core_dot_api_dot_grpc_dot_core__pb2.GetWlanConfigsRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.GetWlanConfigsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetWlanConfig(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/GetWlanConfig',
+            core_dot_api_dot_grpc_dot_core__pb2.GetWlanConfigRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.GetWlanConfigResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def SetWlanConfig(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/SetWlanConfig',
+            core_dot_api_dot_grpc_dot_core__pb2.SetWlanConfigRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.SetWlanConfigResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetEmaneConfig(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/GetEmaneConfig',
+            core_dot_api_dot_grpc_dot_core__pb2.GetEmaneConfigRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.GetEmaneConfigResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def SetEmaneConfig(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/SetEmaneConfig',
+            core_dot_api_dot_grpc_dot_core__pb2.SetEmaneConfigRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.SetEmaneConfigResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetEmaneModels(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/GetEmaneModels',
+            core_dot_api_dot_grpc_dot_core__pb2.GetEmaneModelsRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.GetEmaneModelsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetEmaneModelConfig(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/GetEmaneModelConfig',
+            core_dot_api_dot_grpc_dot_core__pb2.GetEmaneModelConfigRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.GetEmaneModelConfigResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def SetEmaneModelConfig(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/SetEmaneModelConfig',
+            core_dot_api_dot_grpc_dot_core__pb2.SetEmaneModelConfigRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.SetEmaneModelConfigResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetEmaneModelConfigs(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/GetEmaneModelConfigs',
+            core_dot_api_dot_grpc_dot_core__pb2.GetEmaneModelConfigsRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.GetEmaneModelConfigsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetEmaneEventChannel(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/GetEmaneEventChannel',
+            core_dot_api_dot_grpc_dot_core__pb2.GetEmaneEventChannelRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.GetEmaneEventChannelResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def SaveXml(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/SaveXml',
+            core_dot_api_dot_grpc_dot_core__pb2.SaveXmlRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.SaveXmlResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def OpenXml(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/OpenXml',
+            core_dot_api_dot_grpc_dot_core__pb2.OpenXmlRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.OpenXmlResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetInterfaces(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/GetInterfaces',
+            core_dot_api_dot_grpc_dot_core__pb2.GetInterfacesRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.GetInterfacesResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def EmaneLink(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/EmaneLink',
+            core_dot_api_dot_grpc_dot_core__pb2.EmaneLinkRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.EmaneLinkResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ExecuteScript(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/core.CoreApi/ExecuteScript',
+            core_dot_api_dot_grpc_dot_core__pb2.ExecuteScriptRequest.SerializeToString,
+            core_dot_api_dot_grpc_dot_core__pb2.ExecuteScriptResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -1,9 +1,12 @@
 import logging
-from queue import Empty, Queue
-from typing import Iterable
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional
 
 from core.api.grpc import core_pb2
 from core.api.grpc.grpcutils import convert_value
+from core.emulator.broadcast import BatchHandler
 from core.emulator.data import (
     ConfigData,
     EventData,
@@ -12,8 +15,14 @@ from core.emulator.data import (
     LinkData,
     NodeData,
 )
+from core.emulator.enumerations import MessageFlags
 from core.emulator.session import Session
 
+LINK_FLAPS = {
+    (MessageFlags.ADD.value, MessageFlags.DELETE.value),
+    (MessageFlags.DELETE.value, MessageFlags.ADD.value),
+}
+
 
 def handle_node_event(event: NodeData) -> core_pb2.NodeEvent:
     """
@@ -173,20 +182,41 @@ def handle_file_event(event: FileData) -> core_pb2.FileEvent:
 class EventStreamer:
     """
     Processes session events to generate grpc events.
+
+    Events can be coalesced within a window of time, keeping only the latest
+    position update for a node and merging link add/delete flaps. The number of
+    pending events can also be bounded, dropping new events when full.
     """
 
+    # max number of events provided in a single batch
+    batch_size = 1000
+
     def __init__(
-        self, session: Session, event_types: Iterable[core_pb2.EventType]
+        self,
+        session: Session,
+        event_types: Iterable[core_pb2.EventType],
+        coalesce: float = 0.0,
+        max_queue: int = 0,
     ) -> None:
         """
         Create a EventStreamer instance.
 
         :param session: session to process events for
         :param event_types: types of events to process
+        :param coalesce: window in seconds to coalesce events within, 0 to disable
+        :param max_queue: max number of pending events, 0 for no limit
         """
         self.session = session
         self.event_types = event_types
-        self.queue = Queue()
+        self.coalesce = max(coalesce, 0.0)
+        self.max_queue = max(max_queue, 0)
+        self.condition = threading.Condition()
+        self.pending = OrderedDict()
+        self.window = None
+        self.eventnum = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.node_handler = BatchHandler(self.put, self.put_all)
         self.add_handlers()
 
     def add_handlers(self) -> None:
@@ -196,46 +226,194 @@ class EventStreamer:
         :return: nothing
         """
         if core_pb2.EventType.NODE in self.event_types:
-            self.session.node_handlers.append(self.queue.put)
+            self.session.node_handlers.append(self.node_handler)
         if core_pb2.EventType.LINK in self.event_types:
-            self.session.link_handlers.append(self.queue.put)
+            self.session.link_handlers.append(self.put)
         if core_pb2.EventType.CONFIG in self.event_types:
-            self.session.config_handlers.append(self.queue.put)
+            self.session.config_handlers.append(self.put)
         if core_pb2.EventType.FILE in self.event_types:
-            self.session.file_handlers.append(self.queue.put)
+            self.session.file_handlers.append(self.put)
         if core_pb2.EventType.EXCEPTION in self.event_types:
-            self.session.exception_handlers.append(self.queue.put)
+            self.session.exception_handlers.append(self.put)
         if core_pb2.EventType.SESSION in self.event_types:
-            self.session.event_handlers.append(self.queue.put)
+            self.session.event_handlers.append(self.put)
 
-    def process(self) -> core_pb2.Event:
+    def _key(self, data: Any) -> Hashable:
         """
-        Process the next event in the queue.
+        Retrieve the key used to coalesce event data, events without a shared key
+        are never coalesced.
 
-        :return: grpc event, or None when invalid event or queue timeout
+        :param data: event data
+        :return: coalesce key
         """
-        event = core_pb2.Event(session_id=self.session.id)
-        try:
-            data = self.queue.get(timeout=1)
+        if self.coalesce:
+            if isinstance(data, NodeData) and not data.message_type:
+                return "node", data.id
+            if isinstance(data, LinkData):
+                return (
+                    "link",
+                    data.network_id,
+                    data.node1_id,
+                    data.node2_id,
+                    data.interface1_id,
+                    data.interface2_id,
+                )
+        self.eventnum += 1
+        return self.eventnum
+
+    def _put(self, data: Any) -> bool:
+        """
+        Add event data to the pending events, coalescing or dropping it as needed.
+        Expects lock to be held.
+
+        :param data: event data
+        :return: True if a new event is pending, False otherwise
+        """
+        key = self._key(data)
+        current = self.pending.get(key)
+        if current is not None:
             if isinstance(data, NodeData):
-                event.node_event.CopyFrom(handle_node_event(data))
-            elif isinstance(data, LinkData):
-                event.link_event.CopyFrom(handle_link_event(data))
-            elif isinstance(data, EventData):
-                event.session_event.CopyFrom(handle_session_event(data))
-            elif isinstance(data, ConfigData):
-                event.config_event.CopyFrom(handle_config_event(data))
-            elif isinstance(data, ExceptionData):
-                event.exception_event.CopyFrom(handle_exception_event(data))
-            elif isinstance(data, FileData):
-                event.file_event.CopyFrom(handle_file_event(data))
+                self.pending[key] = data
+                self.coalesced += 1
+            elif (current.message_type, data.message_type) in LINK_FLAPS:
+                del self.pending[key]
+                self.coalesced += 2
             else:
-                logging.error("unknown event: %s", data)
-                event = None
-        except Empty:
+                if not data.message_type:
+                    data = data._replace(message_type=current.message_type)
+                self.pending[key] = data
+                self.coalesced += 1
+            return False
+        if self.max_queue and len(self.pending) >= self.max_queue:
+            self.dropped += 1
+            return False
+        if not self.pending:
+            self.window = time.monotonic() + self.coalesce
+        self.pending[key] = data
+        return True
+
+    def put(self, data: Any) -> None:
+        """
+        Session event handler, adds event data to the pending events.
+
+        :param data: event data
+        :return: nothing
+        """
+        with self.condition:
+            if self._put(data):
+                self.condition.notify()
+
+    def put_all(self, datas: List[Any]) -> None:
+        """
+        Session batch event handler, adds a batch of event data to the pending
+        events under a single lock.
+
+        :param datas: event data
+        :return: nothing
+        """
+        with self.condition:
+            added = False
+            for data in datas:
+                added = self._put(data) or added
+            if added:
+                self.condition.notify()
+
+    def _get(self, count: int, timeout: float = 1.0) -> List[Any]:
+        """
+        Retrieve pending event data, once the current coalesce window has passed.
+
+        :param count: max number of events to retrieve
+        :param timeout: max time in seconds to wait for events
+        :return: event data, empty when timed out
+        """
+        end = time.monotonic() + timeout
+        with self.condition:
+            while True:
+                now = time.monotonic()
+                if self.pending and now >= self.window:
+                    break
+                if now >= end:
+                    return []
+                wait = end - now
+                if self.pending:
+                    wait = min(wait, self.window - now)
+                self.condition.wait(wait)
+            events = []
+            while self.pending and len(events) < count:
+                _, data = self.pending.popitem(last=False)
+                events.append(data)
+            return events
+
+    def convert(self, data: Any) -> Optional[core_pb2.Event]:
+        """
+        Convert event data to a grpc event.
+
+        :param data: event data
+        :return: grpc event, or None when invalid event
+        """
+        event = core_pb2.Event(session_id=self.session.id)
+        if isinstance(data, NodeData):
+            event.node_event.CopyFrom(handle_node_event(data))
+        elif isinstance(data, LinkData):
+            event.link_event.CopyFrom(handle_link_event(data))
+        elif isinstance(data, EventData):
+            event.session_event.CopyFrom(handle_session_event(data))
+        elif isinstance(data, ConfigData):
+            event.config_event.CopyFrom(handle_config_event(data))
+        elif isinstance(data, ExceptionData):
+            event.exception_event.CopyFrom(handle_exception_event(data))
+        elif isinstance(data, FileData):
+            event.file_event.CopyFrom(handle_file_event(data))
+        else:
+            logging.error("unknown event: %s", data)
             event = None
         return event
 
+    def process(self) -> Optional[core_pb2.Event]:
+        """
+        Process the next event in the queue.
+
+        :return: grpc event, or None when invalid event or queue timeout
+        """
+        for data in self._get(1):
+            return self.convert(data)
+        return None
+
+    def process_batch(self) -> Optional[core_pb2.Events]:
+        """
+        Process all pending events, up to the batch size.
+
+        :return: grpc events, or None when there are no valid events or queue timeout
+        """
+        events = []
+        for data in self._get(self.batch_size):
+            event = self.convert(data)
+            if event:
+                events.append(event)
+        if not events:
+            return None
+        with self.condition:
+            dropped, coalesced = self.dropped, self.coalesced
+        return core_pb2.Events(
+            session_id=self.session.id,
+            events=events,
+            dropped=dropped,
+            coalesced=coalesced,
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Retrieve counts for pending, dropped, and coalesced events.
+
+        :return: dict of event counts
+        """
+        with self.condition:
+            return dict(
+                pending=len(self.pending),
+                dropped=self.dropped,
+                coalesced=self.coalesced,
+            )
+
     def remove_handlers(self) -> None:
         """
         Remove session event handlers for events being watched.
@@ -243,14 +421,14 @@ class EventStreamer:
         :return: nothing
         """
         if core_pb2.EventType.NODE in self.event_types:
-            self.session.node_handlers.remove(self.queue.put)
+            self.session.node_handlers.remove(self.node_handler)
         if core_pb2.EventType.LINK in self.event_types:
-            self.session.link_handlers.remove(self.queue.put)
+            self.session.link_handlers.remove(self.put)
         if core_pb2.EventType.CONFIG in self.event_types:
-            self.session.config_handlers.remove(self.queue.put)
+            self.session.config_handlers.remove(self.put)
         if core_pb2.EventType.FILE in self.event_types:
-            self.session.file_handlers.remove(self.queue.put)
+            self.session.file_handlers.remove(self.put)
         if core_pb2.EventType.EXCEPTION in self.event_types:
-            self.session.exception_handlers.remove(self.queue.put)
+            self.session.exception_handlers.remove(self.put)
         if core_pb2.EventType.SESSION in self.event_types:
-            self.session.event_handlers.remove(self.queue.put)
+            self.session.event_handlers.remove(self.put)
@@ -4,15 +4,17 @@ from typing import Any, Dict, List, Tuple, Type
 
 import netaddr
 
-from core import utils
 from core.api.grpc import common_pb2, core_pb2
 from core.config import ConfigurableOptions
+from core.emane.nodes import EmaneNet
 from core.emulator.data import LinkData
 from core.emulator.emudata import InterfaceData, LinkOptions, NodeOptions
 from core.emulator.enumerations import LinkTypes, NodeTypes
 from core.emulator.session import Session
 from core.nodes.base import CoreNetworkBase, NodeBase
+from core.nodes.docker import DockerNode
 from core.nodes.interface import CoreInterface
+from core.nodes.lxd import LxcNode
 from core.services.coreservices import CoreService
 
 WORKERS = 10
@@ -128,12 +130,38 @@ def create_nodes(
         args = (_type, _id, options)
         funcs.append((session.add_node, args, {}))
     start = time.monotonic()
-    results, exceptions = utils.threadpool(funcs)
+    results, exceptions = session.run_tasks(funcs)
     total = time.monotonic() - start
     logging.debug("grpc created nodes time: %s", total)
     return results, exceptions
 
 
+def create_topology(
+    session: Session, node_protos: List[core_pb2.Node], link_protos: List[core_pb2.Link]
+) -> Tuple[Dict[str, float], List[Exception]]:
+    """
+    Create nodes and links in bulk, planning links up front.
+
+    :param session: session to create nodes and links in
+    :param node_protos: node proto messages
+    :param link_protos: link proto messages
+    :return: time taken by each phase and exceptions encountered
+    """
+    nodes = [add_node_data(x) for x in node_protos]
+    links = []
+    for link_proto in link_protos:
+        interface_one, interface_two, options = add_link_data(link_proto)
+        args = (
+            link_proto.node_one_id,
+            link_proto.node_two_id,
+            interface_one,
+            interface_two,
+            options,
+        )
+        links.append(args)
+    return session.add_topology(nodes, links)
+
+
 def create_links(
     session: Session, link_protos: List[core_pb2.Link]
 ) -> Tuple[List[NodeBase], List[Exception]]:
@@ -152,7 +180,7 @@ def create_links(
         args = (node_one_id, node_two_id, interface_one, interface_two, options)
         funcs.append((session.add_link, args, {}))
     start = time.monotonic()
-    results, exceptions = utils.threadpool(funcs)
+    results, exceptions = session.run_tasks(funcs)
     total = time.monotonic() - start
     logging.debug("grpc created links time: %s", total)
     return results, exceptions
@@ -176,7 +204,7 @@ def edit_links(
         args = (node_one_id, node_two_id, interface_one.id, interface_two.id, options)
         funcs.append((session.update_link, args, {}))
     start = time.monotonic()
-    results, exceptions = utils.threadpool(funcs)
+    results, exceptions = session.run_tasks(funcs)
     total = time.monotonic() - start
     logging.debug("grpc edit links time: %s", total)
     return results, exceptions
@@ -224,6 +252,46 @@ def get_config_options(
     return results
 
 
+def get_node_proto(session: Session, node: NodeBase) -> core_pb2.Node:
+    """
+    Convert a session node to a node proto.
+
+    :param session: session containing node
+    :param node: node to convert
+    :return: node proto
+    """
+    node_type = session.get_node_type(node.__class__)
+    model = getattr(node, "type", None)
+    position = core_pb2.Position(
+        x=node.position.x, y=node.position.y, z=node.position.z
+    )
+    services = getattr(node, "services", [])
+    if services is None:
+        services = []
+    services = [x.name for x in services]
+    config_services = getattr(node, "config_services", {})
+    config_services = [x for x in config_services]
+    emane_model = None
+    if isinstance(node, EmaneNet):
+        emane_model = node.model.name
+    image = getattr(node, "image", None)
+    node_proto = core_pb2.Node(
+        id=node.id,
+        name=node.name,
+        emane=emane_model,
+        model=model,
+        type=node_type.value,
+        position=position,
+        services=services,
+        icon=node.icon,
+        image=image,
+        config_services=config_services,
+    )
+    if isinstance(node, (DockerNode, LxcNode)):
+        node_proto.image = node.image
+    return node_proto
+
+
 def get_links(session: Session, node: NodeBase):
     """
     Retrieve a list of links for grpc to use
@@ -334,27 +402,6 @@ def convert_link(session: Session, link_data: LinkData) -> core_pb2.Link:
     )
 
 
-def get_net_stats() -> Dict[str, Dict]:
-    """
-    Retrieve status about the current interfaces in the system
-
-    :return: send and receive status of the interfaces in the system
-    """
-    with open("/proc/net/dev", "r") as f:
-        data = f.readlines()[2:]
-
-    stats = {}
-    for line in data:
-        line = line.strip()
-        if not line:
-            continue
-        line = line.split()
-        line[0] = line[0].strip(":")
-        stats[line[0]] = {"rx": float(line[1]), "tx": float(line[9])}
-
-    return stats
-
-
 def session_location(session: Session, location: core_pb2.SessionLocation) -> None:
     """
     Set session location based on location proto.
@@ -1,7 +1,6 @@
 import atexit
 import logging
 import os
-import re
 import tempfile
 import threading
 import time
@@ -40,12 +39,9 @@ from core.api.grpc.core_pb2 import (
     GetEmaneEventChannelResponse,
 )
 from core.api.grpc.events import EventStreamer
-from core.api.grpc.grpcutils import (
-    get_config_options,
-    get_emane_model_id,
-    get_links,
-    get_net_stats,
-)
+from core.api.grpc.grpcutils import get_config_options, get_emane_model_id, get_links
+from core.api.grpc.snapshot import SnapshotCache
+from core.api.grpc.throughputs import ThroughputSamplers
 from core.emane.nodes import EmaneNet
 from core.emulator.coreemu import CoreEmu
 from core.emulator.data import LinkData
@@ -60,7 +56,6 @@ from core.nodes.lxd import LxcNode
 from core.services.coreservices import ServiceManager
 
 _ONE_DAY_IN_SECONDS = 60 * 60 * 24
-_INTERFACE_REGEX = re.compile(r"veth(?P<node>[0-9a-fA-F]+)")
 
 
 class CoreGrpcServer(core_pb2_grpc.CoreApiServicer):
@@ -73,6 +68,8 @@ class CoreGrpcServer(core_pb2_grpc.CoreApiServicer):
     def __init__(self, coreemu: CoreEmu) -> None:
         super().__init__()
         self.coreemu = coreemu
+        self.snapshots = SnapshotCache()
+        self.throughputs = ThroughputSamplers()
         self.running = True
         self.server = None
         atexit.register(self._exit_handler)
@@ -175,8 +172,16 @@ class CoreGrpcServer(core_pb2_grpc.CoreApiServicer):
         for hook in request.hooks:
             session.add_hook(hook.state, hook.file, None, hook.data)
 
-        # create nodes
-        _, exceptions = grpcutils.create_nodes(session, request.nodes)
+        # create nodes, along with links in bulk mode
+        timings = {}
+        if request.bulk:
+            start = time.monotonic()
+            timings, exceptions = grpcutils.create_topology(
+                session, request.nodes, request.links
+            )
+            timings["topology"] = time.monotonic() - start
+        else:
+            _, exceptions = grpcutils.create_nodes(session, request.nodes)
         if exceptions:
             exceptions = [str(x) for x in exceptions]
             return core_pb2.StartSessionResponse(result=False, exceptions=exceptions)
@@ -220,10 +225,13 @@ class CoreGrpcServer(core_pb2_grpc.CoreApiServicer):
             )
 
         # create links
-        _, exceptions = grpcutils.create_links(session, request.links)
-        if exceptions:
-            exceptions = [str(x) for x in exceptions]
-            return core_pb2.StartSessionResponse(result=False, exceptions=exceptions)
+        if not request.bulk:
+            _, exceptions = grpcutils.create_links(session, request.links)
+            if exceptions:
+                exceptions = [str(x) for x in exceptions]
+                return core_pb2.StartSessionResponse(
+                    result=False, exceptions=exceptions
+                )
 
         # asymmetric links
         _, exceptions = grpcutils.edit_links(session, request.asymmetric_links)
@@ -235,15 +243,19 @@ class CoreGrpcServer(core_pb2_grpc.CoreApiServicer):
         session.set_state(EventTypes.INSTANTIATION_STATE)
 
         # boot services
+        start = time.monotonic()
         boot_exceptions = session.instantiate()
+        timings["instantiate"] = time.monotonic() - start
         if boot_exceptions:
             exceptions = []
             for boot_exception in boot_exceptions:
                 for service_exception in boot_exception.args:
                     exceptions.append(str(service_exception))
-            return core_pb2.StartSessionResponse(result=False, exceptions=exceptions)
+            return core_pb2.StartSessionResponse(
+                result=False, exceptions=exceptions, timings=timings
+            )
 
-        return core_pb2.StartSessionResponse(result=True)
+        return core_pb2.StartSessionResponse(result=True, timings=timings)
 
     def StopSession(
         self, request: core_pb2.StopSessionRequest, context: ServicerContext
@@ -294,6 +306,7 @@ class CoreGrpcServer(core_pb2_grpc.CoreApiServicer):
         """
         logging.debug("delete session: %s", request)
         result = self.coreemu.delete_session(request.session_id)
+        self.snapshots.remove(request.session_id)
         return core_pb2.DeleteSessionResponse(result=result)
 
     def GetSessions(
@@ -478,51 +491,23 @@ class CoreGrpcServer(core_pb2_grpc.CoreApiServicer):
         """
         logging.debug("get session: %s", request)
         session = self.get_session(request.session_id, context)
+        version, session_proto = self.snapshots.get(session).get()
+        return core_pb2.GetSessionResponse(session=session_proto, version=version)
 
-        links = []
-        nodes = []
-        for _id in session.nodes:
-            node = session.nodes[_id]
-            if not isinstance(node.id, int):
-                continue
-
-            node_type = session.get_node_type(node.__class__)
-            model = getattr(node, "type", None)
-            position = core_pb2.Position(
-                x=node.position.x, y=node.position.y, z=node.position.z
-            )
-            services = getattr(node, "services", [])
-            if services is None:
-                services = []
-            services = [x.name for x in services]
-            config_services = getattr(node, "config_services", {})
-            config_services = [x for x in config_services]
-            emane_model = None
-            if isinstance(node, EmaneNet):
-                emane_model = node.model.name
-            image = getattr(node, "image", None)
-
-            node_proto = core_pb2.Node(
-                id=node.id,
-                name=node.name,
-                emane=emane_model,
-                model=model,
-                type=node_type.value,
-                position=position,
-                services=services,
-                icon=node.icon,
-                image=image,
-                config_services=config_services,
-            )
-            if isinstance(node, (DockerNode, LxcNode)):
-                node_proto.image = node.image
-            nodes.append(node_proto)
-
-            node_links = get_links(session, node)
-            links.extend(node_links)
+    def GetSessionDelta(
+        self, request: core_pb2.GetSessionDeltaRequest, context: ServicerContext
+    ) -> core_pb2.GetSessionDeltaResponse:
+        """
+        Retrieve changes to nodes and links of a session since a version
+        previously received, or the full session when those are no longer known.
 
-        session_proto = core_pb2.Session(state=session.state, nodes=nodes, links=links)
-        return core_pb2.GetSessionResponse(session=session_proto)
+        :param request: get session delta request
+        :param context: context object
+        :return: get session delta response
+        """
+        logging.debug("get session delta: %s", request)
+        session = self.get_session(request.session_id, context)
+        return self.snapshots.get(session).delta(request.version)
 
     def AddSessionServer(
         self, request: core_pb2.AddSessionServerRequest, context: ServicerContext
@@ -545,84 +530,68 @@ class CoreGrpcServer(core_pb2_grpc.CoreApiServicer):
         if not event_types:
             event_types = set(core_pb2.EventType.Enum.values())
 
-        streamer = EventStreamer(session, event_types)
+        streamer = EventStreamer(
+            session, event_types, request.coalesce, request.max_queue
+        )
         while self._is_running(context):
             event = streamer.process()
             if event:
                 yield event
 
         streamer.remove_handlers()
+        logging.debug("event stream stats: %s", streamer.stats())
+        self._cancel_stream(context)
+
+    def BatchEvents(
+        self, request: core_pb2.EventsRequest, context: ServicerContext
+    ) -> None:
+        """
+        Stream session events, providing all pending events in each message.
+
+        :param request: events request
+        :param context: context object
+        :return: nothing
+        """
+        session = self.get_session(request.session_id, context)
+        event_types = set(request.events)
+        if not event_types:
+            event_types = set(core_pb2.EventType.Enum.values())
+
+        streamer = EventStreamer(
+            session, event_types, request.coalesce, request.max_queue
+        )
+        while self._is_running(context):
+            events = streamer.process_batch()
+            if events:
+                yield events
+
+        streamer.remove_handlers()
+        logging.debug("event stream stats: %s", streamer.stats())
         self._cancel_stream(context)
 
     def Throughputs(
         self, request: core_pb2.ThroughputsRequest, context: ServicerContext
     ) -> None:
         """
-        Calculate average throughput after every certain amount of delay time
+        Stream throughput of session interfaces and bridges, sampled at an interval
+        shared by all clients requesting the same interval and smoothing
 
         :param request: throughputs request
         :param context: context object
         :return: nothing
         """
         session = self.get_session(request.session_id, context)
-        delay = 3
-        last_check = None
-        last_stats = None
-
-        while self._is_running(context):
-            now = time.monotonic()
-            stats = get_net_stats()
-
-            # calculate average
-            if last_check is not None:
-                interval = now - last_check
-                throughputs_event = core_pb2.ThroughputsEvent(session_id=session.id)
-                for key in stats:
-                    current_rxtx = stats[key]
-                    previous_rxtx = last_stats.get(key)
-                    if not previous_rxtx:
-                        continue
-                    rx_kbps = (
-                        (current_rxtx["rx"] - previous_rxtx["rx"]) * 8.0 / interval
-                    )
-                    tx_kbps = (
-                        (current_rxtx["tx"] - previous_rxtx["tx"]) * 8.0 / interval
-                    )
-                    throughput = rx_kbps + tx_kbps
-                    if key.startswith("veth"):
-                        key = key.split(".")
-                        node_id = _INTERFACE_REGEX.search(key[0]).group("node")
-                        node_id = int(node_id, base=16)
-                        interface_id = int(key[1], base=16)
-                        session_id = int(key[2], base=16)
-                        if session.id != session_id:
-                            continue
-                        interface_throughput = (
-                            throughputs_event.interface_throughputs.add()
-                        )
-                        interface_throughput.node_id = node_id
-                        interface_throughput.interface_id = interface_id
-                        interface_throughput.throughput = throughput
-                    elif key.startswith("b."):
-                        try:
-                            key = key.split(".")
-                            node_id = int(key[1], base=16)
-                            session_id = int(key[2], base=16)
-                            if session.id != session_id:
-                                continue
-                            bridge_throughput = (
-                                throughputs_event.bridge_throughputs.add()
-                            )
-                            bridge_throughput.node_id = node_id
-                            bridge_throughput.throughput = throughput
-                        except ValueError:
-                            pass
-
-                yield throughputs_event
-
-            last_check = now
-            last_stats = stats
-            time.sleep(delay)
+        sampler = self.throughputs.subscribe(
+            session, request.interval, request.smoothing
+        )
+        try:
+            sequence = 0
+            while self._is_running(context):
+                sequence, event = sampler.wait(sequence)
+                if event is not None:
+                    yield event
+        finally:
+            self.throughputs.unsubscribe(sampler)
 
     def AddNode(
         self, request: core_pb2.AddNodeRequest, context: ServicerContext
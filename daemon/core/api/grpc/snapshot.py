@@ -0,0 +1,242 @@
+"""
+Versioned snapshots of session nodes and links, rebuilding only nodes changed
+since the last snapshot, and tracking changes to provide deltas to clients.
+"""
+
+import collections
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from core.api.grpc import core_pb2
+from core.api.grpc.grpcutils import get_links, get_node_proto
+from core.emulator.session import Session
+
+LinkKey = Tuple[int, int, Optional[int], Optional[int]]
+
+
+def link_key(link: core_pb2.Link) -> LinkKey:
+    """
+    Create a key identifying a link.
+
+    :param link: link to create key for
+    :return: link key
+    """
+    interface_one = None
+    if link.HasField("interface_one"):
+        interface_one = link.interface_one.id
+    interface_two = None
+    if link.HasField("interface_two"):
+        interface_two = link.interface_two.id
+    return link.node_one_id, link.node_two_id, interface_one, interface_two
+
+
+class SnapshotChange:
+    """
+    Changes made by rebuilding a snapshot from one version to another.
+    """
+
+    def __init__(self, previous: int, version: int) -> None:
+        """
+        Create a SnapshotChange instance.
+
+        :param previous: version of snapshot before the change
+        :param version: version of snapshot after the change
+        """
+        self.previous = previous
+        self.version = version
+        self.nodes = set()
+        self.deleted_nodes = set()
+        self.links = {}
+        self.deleted_links = {}
+
+
+class SessionSnapshot:
+    """
+    Cached node and link protos for a session. Node changes are tracked by the
+    session, only changed nodes are converted again when a snapshot is requested.
+    """
+
+    # max number of changes kept for providing deltas
+    max_changes = 100
+
+    def __init__(self, session: Session) -> None:
+        """
+        Create a SessionSnapshot instance.
+
+        :param session: session to snapshot
+        """
+        self.session = session
+        self.lock = threading.Lock()
+        self.version = -1
+        self.nodes = {}
+        self.links = {}
+        self.changes = collections.deque(maxlen=self.max_changes)
+
+    def update(self) -> None:
+        """
+        Update cached protos for nodes changed since the last update.
+
+        :return: nothing
+        """
+        version, node_ids = self.session.changes_since(self.version)
+        if version == self.version:
+            return
+        if node_ids is None:
+            node_ids = set(self.session.nodes) | set(self.nodes)
+        change = SnapshotChange(self.version, version)
+        for node_id in node_ids:
+            node = self.session.nodes.get(node_id)
+            previous_links = self.links.pop(node_id, {})
+            change.deleted_links.update(previous_links)
+            if node is None or not isinstance(node.id, int):
+                if self.nodes.pop(node_id, None) is not None:
+                    change.deleted_nodes.add(node_id)
+                continue
+            self.nodes[node_id] = get_node_proto(self.session, node)
+            change.nodes.add(node_id)
+            links = {}
+            for link in get_links(self.session, node):
+                key = link_key(link)
+                links[key] = link
+                if change.deleted_links.pop(key, None) != link:
+                    change.links[key] = link
+            if links:
+                self.links[node_id] = links
+        self.version = version
+        self.changes.append(change)
+
+    def _session_proto(self) -> core_pb2.Session:
+        """
+        Create a session proto from cached nodes and links. Expects lock to be held.
+
+        :return: session proto
+        """
+        nodes = [self.nodes[x] for x in sorted(self.nodes)]
+        links = []
+        for node_id in sorted(self.links):
+            links.extend(self.links[node_id].values())
+        return core_pb2.Session(
+            id=self.session.id, state=self.session.state, nodes=nodes, links=links
+        )
+
+    def get(self) -> Tuple[int, core_pb2.Session]:
+        """
+        Retrieve the current snapshot of the session.
+
+        :return: snapshot version and session proto
+        """
+        with self.lock:
+            self.update()
+            return self.version, self._session_proto()
+
+    def _changes_after(self, version: int) -> Optional[List[SnapshotChange]]:
+        """
+        Retrieve changes made after a version. Expects lock to be held.
+
+        :param version: version to get changes after
+        :return: changes in order, None when changes are no longer known
+        """
+        if version > self.version:
+            return None
+        changes = [x for x in self.changes if x.version > version]
+        if changes and changes[0].previous > version:
+            return None
+        if not changes and version != self.version:
+            return None
+        return changes
+
+    def delta(self, version: int) -> core_pb2.GetSessionDeltaResponse:
+        """
+        Retrieve the changes made to the session after a version. A full snapshot
+        is provided when the changes are no longer known.
+
+        :param version: version a client last received
+        :return: delta response
+        """
+        with self.lock:
+            self.update()
+            changes = self._changes_after(version)
+            state = self.session.state
+            if changes is None:
+                return core_pb2.GetSessionDeltaResponse(
+                    version=self.version,
+                    full=True,
+                    state=state,
+                    session=self._session_proto(),
+                )
+            node_ids = set()
+            deleted_node_ids = set()
+            links = {}
+            deleted_links = {}
+            for change in changes:
+                node_ids |= change.nodes
+                node_ids -= change.deleted_nodes
+                deleted_node_ids -= change.nodes
+                deleted_node_ids |= change.deleted_nodes
+                for key, link in change.deleted_links.items():
+                    links.pop(key, None)
+                    deleted_links[key] = link
+                for key, link in change.links.items():
+                    deleted_links.pop(key, None)
+                    links[key] = link
+            nodes = [self.nodes[x] for x in sorted(node_ids)]
+            return core_pb2.GetSessionDeltaResponse(
+                version=self.version,
+                state=state,
+                nodes=nodes,
+                deleted_nodes=sorted(deleted_node_ids),
+                links=list(links.values()),
+                deleted_links=list(deleted_links.values()),
+            )
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Retrieve snapshot counts.
+
+        :return: dict of snapshot counts
+        """
+        with self.lock:
+            links = sum(len(x) for x in self.links.values())
+            return dict(
+                version=self.version,
+                nodes=len(self.nodes),
+                links=links,
+                changes=len(self.changes),
+            )
+
+
+class SnapshotCache:
+    """
+    Snapshots for sessions, replaced when a session is recreated.
+    """
+
+    def __init__(self) -> None:
+        """
+        Create a SnapshotCache instance.
+        """
+        self.lock = threading.Lock()
+        self.snapshots = {}
+
+    def get(self, session: Session) -> SessionSnapshot:
+        """
+        Retrieve the snapshot for a session, creating it when needed.
+
+        :param session: session to get snapshot for
+        :return: session snapshot
+        """
+        with self.lock:
+            snapshot = self.snapshots.get(session.id)
+            if snapshot is None or snapshot.session is not session:
+                snapshot = SessionSnapshot(session)
+                self.snapshots[session.id] = snapshot
+            return snapshot
+
+    def remove(self, session_id: int) -> None:
+        """
+        Remove the snapshot for a session.
+
+        :param session_id: id of session to remove snapshot for
+        :return: nothing
+        """
+        with self.lock:
+            self.snapshots.pop(session_id, None)
@@ -0,0 +1,364 @@
+"""
+Shared throughput sampling for sessions. Byte counters are read only for the
+host side of session veths and session bridges, through sysfs counter files
+kept open between samples, and each computed event is provided to every
+subscriber of a sampler.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from core.api.grpc import core_pb2
+from core.emulator.session import Session
+from core.nodes.base import CoreNodeBase
+from core.nodes.interface import Veth
+from core.nodes.network import CoreNetwork
+
+# default and min time in seconds between samples
+DEFAULT_INTERVAL = 3.0
+MIN_INTERVAL = 0.1
+
+CounterKey = Tuple[int, Optional[int]]
+
+
+class DeviceCounters:
+    """
+    Open sysfs byte counters for a host network device.
+    """
+
+    def __init__(self, path: str, name: str) -> None:
+        """
+        Create a DeviceCounters instance.
+
+        :param path: sysfs class net directory
+        :param name: name of device
+        :raises OSError: when the counters can not be opened
+        """
+        self.name = name
+        statistics = os.path.join(path, name, "statistics")
+        self.rx_fd = os.open(os.path.join(statistics, "rx_bytes"), os.O_RDONLY)
+        try:
+            self.tx_fd = os.open(os.path.join(statistics, "tx_bytes"), os.O_RDONLY)
+        except OSError:
+            os.close(self.rx_fd)
+            raise
+
+    def read(self) -> int:
+        """
+        Read the total bytes received and sent by the device.
+
+        :return: total bytes
+        :raises OSError: when the device no longer exists
+        """
+        rx = int(os.pread(self.rx_fd, 32, 0))
+        tx = int(os.pread(self.tx_fd, 32, 0))
+        return rx + tx
+
+    def close(self) -> None:
+        """
+        Close the counter files.
+
+        :return: nothing
+        """
+        os.close(self.rx_fd)
+        os.close(self.tx_fd)
+
+
+class ThroughputSampler:
+    """
+    Samples throughput of session interfaces and bridges on a thread, while
+    there are subscribers, with optional per device rate smoothing.
+    """
+
+    # directory providing network device counters
+    sysfs_path = "/sys/class/net"
+
+    def __init__(
+        self, session: Session, interval: float = 0.0, smoothing: float = 0.0
+    ) -> None:
+        """
+        Create a ThroughputSampler instance.
+
+        :param session: session to sample
+        :param interval: time in seconds between samples, 0 for the default
+        :param smoothing: weight given to the previous rate of a device, from 0 for
+            no smoothing up to 1
+        """
+        self.session = session
+        self.interval = max(interval or DEFAULT_INTERVAL, MIN_INTERVAL)
+        self.smoothing = min(max(smoothing, 0.0), 0.99)
+        self.condition = threading.Condition()
+        self.subscribers = 0
+        self.sequence = 0
+        self.event = None
+        self.thread = None
+        self.version = None
+        self.devices = {}
+        self.counters = {}
+        self.last_bytes = {}
+        self.rates = {}
+        self.last_check = None
+        self.samples = 0
+        self.errors = 0
+
+    def subscribe(self) -> None:
+        """
+        Add a subscriber, starting the sampling thread when needed.
+
+        :return: nothing
+        """
+        with self.condition:
+            self.subscribers += 1
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+
+    def unsubscribe(self) -> bool:
+        """
+        Remove a subscriber, the sampling thread stops once none are left.
+
+        :return: True if subscribers remain, False otherwise
+        """
+        with self.condition:
+            self.subscribers -= 1
+            self.condition.notify_all()
+            return self.subscribers > 0
+
+    def wait(
+        self, sequence: int, timeout: float = 1.0
+    ) -> Tuple[int, Optional[core_pb2.ThroughputsEvent]]:
+        """
+        Wait for an event newer than the last one received by a subscriber.
+
+        :param sequence: sequence of the last event received, 0 for none
+        :param timeout: max time in seconds to wait
+        :return: sequence and event, event is None when timed out
+        """
+        with self.condition:
+            if self.sequence == sequence:
+                self.condition.wait(timeout)
+            if self.sequence == sequence:
+                return sequence, None
+            return self.sequence, self.event
+
+    def session_devices(self) -> Dict[CounterKey, str]:
+        """
+        Retrieve host device names for local session veths and bridges, devices not
+        yet created are skipped when sampling.
+
+        :return: dict of node id and interface id, None for bridges, to device name
+        """
+        devices = {}
+        for node in list(self.session.nodes.values()):
+            if node.server is not None:
+                continue
+            if isinstance(node, CoreNetwork):
+                devices[(node.id, None)] = node.brname
+            elif isinstance(node, CoreNodeBase):
+                for netif in node.netifs():
+                    if isinstance(netif, Veth):
+                        devices[(node.id, netif.netindex)] = netif.localname
+        return devices
+
+    def update_devices(self) -> None:
+        """
+        Update the devices sampled when the session has changed, opening counters
+        for new devices and closing them for removed ones.
+
+        :return: nothing
+        """
+        version = self.session.version
+        if version == self.version:
+            return
+        devices = self.session_devices()
+        for key, counters in list(self.counters.items()):
+            if devices.get(key) != counters.name:
+                counters.close()
+                del self.counters[key]
+                self.last_bytes.pop(key, None)
+                self.rates.pop(key, None)
+        self.devices = devices
+        self.version = version
+
+    def get_counters(self, key: CounterKey) -> Optional[DeviceCounters]:
+        """
+        Retrieve open counters for a device, opening them when needed.
+
+        :param key: node id and interface id of device
+        :return: device counters, None when not available
+        """
+        counters = self.counters.get(key)
+        if counters is None:
+            try:
+                counters = DeviceCounters(self.sysfs_path, self.devices[key])
+            except OSError:
+                return None
+            self.counters[key] = counters
+        return counters
+
+    def sample(self) -> Optional[core_pb2.ThroughputsEvent]:
+        """
+        Read device counters and calculate rates since the previous sample.
+
+        :return: throughputs event, None for the first sample
+        """
+        self.update_devices()
+        now = time.monotonic()
+        interval = None
+        if self.last_check is not None:
+            interval = now - self.last_check
+        self.last_check = now
+        event = core_pb2.ThroughputsEvent(session_id=self.session.id)
+        for key in self.devices:
+            counters = self.get_counters(key)
+            if counters is None:
+                continue
+            try:
+                total = counters.read()
+            except (OSError, ValueError):
+                self.errors += 1
+                counters.close()
+                del self.counters[key]
+                self.last_bytes.pop(key, None)
+                continue
+            previous = self.last_bytes.get(key)
+            self.last_bytes[key] = total
+            if previous is None or not interval:
+                continue
+            rate = (total - previous) * 8.0 / interval
+            last_rate = self.rates.get(key)
+            if last_rate is not None:
+                rate = self.smoothing * last_rate + (1.0 - self.smoothing) * rate
+            self.rates[key] = rate
+            node_id, interface_id = key
+            if interface_id is None:
+                throughput = event.bridge_throughputs.add()
+            else:
+                throughput = event.interface_throughputs.add()
+                throughput.interface_id = interface_id
+            throughput.node_id = node_id
+            throughput.throughput = rate
+        self.samples += 1
+        if interval is None:
+            return None
+        return event
+
+    def publish(self, event: core_pb2.ThroughputsEvent) -> None:
+        """
+        Provide an event to all subscribers.
+
+        :param event: event to provide
+        :return: nothing
+        """
+        with self.condition:
+            self.sequence += 1
+            self.event = event
+            self.condition.notify_all()
+
+    def run(self) -> None:
+        """
+        Sampling thread target, samples at the configured interval until there
+        are no subscribers left.
+
+        :return: nothing
+        """
+        next_sample = time.monotonic()
+        while True:
+            with self.condition:
+                while self.subscribers > 0:
+                    remaining = next_sample - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+                if self.subscribers <= 0:
+                    self.thread = None
+                    break
+            try:
+                event = self.sample()
+            except Exception:
+                logging.exception("error sampling session throughputs")
+                event = None
+            if event is not None:
+                self.publish(event)
+            next_sample = max(next_sample + self.interval, time.monotonic())
+        self.close()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Retrieve sampler counts.
+
+        :return: dict of sampler counts
+        """
+        with self.condition:
+            return dict(
+                subscribers=self.subscribers,
+                devices=len(self.devices),
+                samples=self.samples,
+                errors=self.errors,
+            )
+
+    def close(self) -> None:
+        """
+        Close all open device counters and reset rates.
+
+        :return: nothing
+        """
+        for counters in self.counters.values():
+            counters.close()
+        self.counters.clear()
+        self.last_bytes.clear()
+        self.rates.clear()
+        self.version = None
+        self.last_check = None
+
+
+class ThroughputSamplers:
+    """
+    Samplers shared by subscribers of the same session, interval, and smoothing.
+    """
+
+    def __init__(self) -> None:
+        """
+        Create a ThroughputSamplers instance.
+        """
+        self.lock = threading.Lock()
+        self.samplers = {}
+
+    def subscribe(
+        self, session: Session, interval: float = 0.0, smoothing: float = 0.0
+    ) -> ThroughputSampler:
+        """
+        Subscribe to a sampler for a session, creating it when needed.
+
+        :param session: session to sample
+        :param interval: time in seconds between samples, 0 for the default
+        :param smoothing: weight given to the previous rate of a device
+        :return: subscribed sampler
+        """
+        with self.lock:
+            sampler = ThroughputSampler(session, interval, smoothing)
+            key = (session.id, sampler.interval, sampler.smoothing)
+            current = self.samplers.get(key)
+            if current is not None and current.session is session:
+                sampler = current
+            else:
+                self.samplers[key] = sampler
+            sampler.subscribe()
+            return sampler
+
+    def unsubscribe(self, sampler: ThroughputSampler) -> None:
+        """
+        Unsubscribe from a sampler, removing it when there are no subscribers left.
+
+        :param sampler: sampler to unsubscribe from
+        :return: nothing
+        """
+        with self.lock:
+            if sampler.unsubscribe():
+                return
+            key = (sampler.session.id, sampler.interval, sampler.smoothing)
+            if self.samplers.get(key) is sampler:
+                del self.samplers[key]
@@ -40,6 +40,20 @@ class CoreTlvData:
     data_type = None
     # pad length for data after packing
     pad_len = None
+    # compiled data format, along with the format of a whole tlv for fixed size data
+    data_struct = None
+    tlv_struct = None
+
+    @classmethod
+    def compile(cls):
+        """
+        Compile the data format of a fixed size data class, along with the format
+        of a whole tlv, header included.
+
+        :return: nothing
+        """
+        cls.data_struct = struct.Struct(cls.data_format)
+        cls.tlv_struct = struct.Struct(CoreTlv.header_format + cls.data_format[1:])
 
     @classmethod
     def pack(cls, value):
@@ -50,10 +64,27 @@ class CoreTlvData:
         :return: length of data and the packed data itself
         :rtype: tuple
         """
-        data = struct.pack(cls.data_format, value)
+        data = cls.data_struct.pack(value)
         length = len(data) - cls.pad_len
         return length, data
 
+    @classmethod
+    def pack_tlv(cls, tlv_type, value):
+        """
+        Pack a whole tlv for a value, using a single compiled format for fixed
+        size data.
+
+        :param int tlv_type: type of tlv
+        :param value: value to pack
+        :return: header and packed data
+        :rtype: bytes
+        """
+        if cls.tlv_struct is not None:
+            length = cls.data_struct.size - cls.pad_len
+            return cls.tlv_struct.pack(tlv_type, length, value)
+        tlv_len, tlv_data = cls.pack(value)
+        return CoreTlv.pack_header(tlv_type, tlv_len) + tlv_data
+
     @classmethod
     def unpack(cls, data):
         """
@@ -62,7 +93,7 @@ class CoreTlvData:
         :param data: data to unpack
         :return: the value of the unpacked data
         """
-        return struct.unpack(cls.data_format, data)[0]
+        return cls.data_struct.unpack(data)[0]
 
     @classmethod
     def pack_string(cls, value):
@@ -103,6 +134,19 @@ class CoreTlvDataObj(CoreTlvData):
         value = cls.get_value(value)
         return super().pack(value)
 
+    @classmethod
+    def pack_tlv(cls, tlv_type, value):
+        """
+        Pack a whole tlv for a custom object.
+
+        :param int tlv_type: type of tlv
+        :param value: custom object to pack
+        :return: header and packed data
+        :rtype: bytes
+        """
+        length = cls.data_struct.size - cls.pad_len
+        return cls.tlv_struct.pack(tlv_type, length, cls.get_value(value))
+
     @classmethod
     def unpack(cls, data):
         """
@@ -201,7 +245,7 @@ class CoreTlvDataString(CoreTlvData):
         :param str data: unpack string data
         :return: unpacked string data
         """
-        return data.rstrip(b"\0").decode("utf-8")
+        return bytes(data).rstrip(b"\0").decode("utf-8")
 
 
 class CoreTlvDataUint16List(CoreTlvData):
@@ -224,11 +268,13 @@ class CoreTlvDataUint16List(CoreTlvData):
         if not isinstance(values, tuple):
             raise ValueError(f"value not a tuple: {values}")
 
-        data = b""
-        for value in values:
-            data += struct.pack(cls.data_format, value)
+        data = struct.pack(f"!{len(values)}H", *values)
+        if len(data) < 256:
+            header_len = CoreTlv.header_len
+        else:
+            header_len = CoreTlv.long_header_len
 
-        pad_len = -(CoreTlv.header_len + len(data)) % 4
+        pad_len = -(header_len + len(data)) % 4
         return len(data), data + b"\0" * pad_len
 
     @classmethod
@@ -362,10 +408,12 @@ class CoreTlv:
     """
 
     header_format = "!BB"
-    header_len = struct.calcsize(header_format)
+    header_struct = struct.Struct(header_format)
+    header_len = header_struct.size
 
     long_header_format = "!BBH"
-    long_header_len = struct.calcsize(long_header_format)
+    long_header_struct = struct.Struct(long_header_format)
+    long_header_len = long_header_struct.size
 
     tlv_type_map = Enum
     tlv_data_class_map = {}
@@ -383,7 +431,7 @@ class CoreTlv:
             try:
                 self.value = self.tlv_data_class_map[self.tlv_type].unpack(tlv_data)
             except KeyError:
-                self.value = tlv_data
+                self.value = bytes(tlv_data)
         else:
             self.value = None
 
@@ -393,19 +441,32 @@ class CoreTlv:
         Parse data and return unpacked class.
 
         :param data: data to unpack
-        :return: unpacked data class
+        :return: unpacked data class and remaining data
+        """
+        tlv, offset = cls.unpack_from(memoryview(data))
+        return tlv, data[offset:]
+
+    @classmethod
+    def unpack_from(cls, data, offset=0):
+        """
+        Parse data at the given offset, without copying the data being parsed.
+
+        :param memoryview data: data to unpack
+        :param int offset: offset to unpack from
+        :return: unpacked data class and offset of the following tlv
+        :rtype: tuple
         """
-        tlv_type, tlv_len = struct.unpack(cls.header_format, data[: cls.header_len])
+        tlv_type, tlv_len = cls.header_struct.unpack_from(data, offset)
         header_len = cls.header_len
         if tlv_len == 0:
-            tlv_type, _zero, tlv_len = struct.unpack(
-                cls.long_header_format, data[: cls.long_header_len]
-            )
+            tlv_type, _zero, tlv_len = cls.long_header_struct.unpack_from(data, offset)
             header_len = cls.long_header_len
+        start = offset + header_len
         tlv_size = header_len + tlv_len
         # for 32-bit alignment
         tlv_size += -tlv_size % 4
-        return cls(tlv_type, data[header_len:tlv_size]), data[tlv_size:]
+        end = offset + tlv_size
+        return cls(tlv_type, data[start:end]), end
 
     @classmethod
     def pack(cls, tlv_type, value):
@@ -416,12 +477,21 @@ class CoreTlv:
         :param value: data to pack
         :return: header and packed data
         """
-        tlv_len, tlv_data = cls.tlv_data_class_map[tlv_type].pack(value)
+        return cls.tlv_data_class_map[tlv_type].pack_tlv(tlv_type, value)
+
+    @classmethod
+    def pack_header(cls, tlv_type, tlv_len):
+        """
+        Pack a TLV header, using the long header for lengths over 255.
+
+        :param int tlv_type: type of data being packed
+        :param int tlv_len: length of data being packed
+        :return: packed header
+        """
         if tlv_len < 256:
-            hdr = struct.pack(cls.header_format, tlv_type, tlv_len)
+            return cls.header_struct.pack(tlv_type, tlv_len)
         else:
-            hdr = struct.pack(cls.long_header_format, tlv_type, 0, tlv_len)
-        return hdr + tlv_data
+            return cls.long_header_struct.pack(tlv_type, 0, tlv_len)
 
     @classmethod
     def pack_string(cls, tlv_type, value):
@@ -456,6 +526,18 @@ class CoreTlv:
         return f"{self.__class__.__name__} <tlvtype = {self.type_str()}, value = {self.value}>"
 
 
+# compile fixed size data classes, using the tlv header format
+for data_class in (
+    CoreTlvDataUint16,
+    CoreTlvDataUint32,
+    CoreTlvDataUint64,
+    CoreTlvDataIpv4Addr,
+    CoreTlvDataIPv6Addr,
+    CoreTlvDataMacAddr,
+):
+    data_class.compile()
+
+
 class CoreNodeTlv(CoreTlv):
     """
     Class for representing CORE Node TLVs.
@@ -684,7 +766,8 @@ class CoreMessage:
     """
 
     header_format = "!BBH"
-    header_len = struct.calcsize(header_format)
+    header_struct = struct.Struct(header_format)
+    header_len = header_struct.size
     message_type = None
     flag_map = MessageFlags
     tlv_class = CoreTlv
@@ -704,8 +787,8 @@ class CoreMessage:
         :return: unpacked tuple
         :rtype: tuple
         """
-        message_type, message_flags, message_len = struct.unpack(
-            cls.header_format, data[: cls.header_len]
+        message_type, message_flags, message_len = cls.header_struct.unpack(
+            data[: cls.header_len]
         )
         return message_type, message_flags, message_len
 
@@ -725,9 +808,7 @@ class CoreMessage:
         :param tlv_data: data to get length from for packing
         :return: combined header and tlv data
         """
-        header = struct.pack(
-            cls.header_format, cls.message_type, message_flags, len(tlv_data)
-        )
+        header = cls.header_struct.pack(cls.message_type, message_flags, len(tlv_data))
         return header + tlv_data
 
     def add_tlv_data(self, key, value):
@@ -759,8 +840,10 @@ class CoreMessage:
         :param data: data to parse for TLV data
         :return: nothing
         """
-        while data:
-            tlv, data = self.tlv_class.unpack(data)
+        data = memoryview(data)
+        offset = 0
+        while offset < len(data):
+            tlv, offset = self.tlv_class.unpack_from(data, offset)
             self.add_tlv_data(tlv.tlv_type, tlv.value)
 
     def pack_tlv_data(self):
@@ -771,11 +854,7 @@ class CoreMessage:
         :rtype: str
         """
         keys = sorted(self.tlv_data.keys())
-        tlv_data = b""
-        for key in keys:
-            value = self.tlv_data[key]
-            tlv_data += self.tlv_class.pack(key, value)
-        return tlv_data
+        return b"".join(self.tlv_class.pack(key, self.tlv_data[key]) for key in keys)
 
     def repack(self):
         """
@@ -14,8 +14,9 @@ from itertools import repeat
 from queue import Empty, Queue
 
 from core import utils
-from core.api.tlv import coreapi, dataconversion, structutils
+from core.api.tlv import coreapi, dataconversion
 from core.config import ConfigShim
+from core.emulator.broadcast import BroadcastSubscriber, OverflowPolicy
 from core.emulator.data import ConfigData, EventData, ExceptionData, FileData
 from core.emulator.emudata import InterfaceData, LinkOptions, NodeOptions
 from core.emulator.enumerations import (
@@ -86,6 +87,11 @@ class CoreHandler(socketserver.BaseRequestHandler):
         self.session = None
         self.session_clients = {}
         self.coreemu = server.coreemu
+        # session broadcasts are sent from a dispatch thread, so broadcasting
+        # threads never block writing to this client
+        self.broadcasts = BroadcastSubscriber(
+            f"broadcast-{client_address}", policy=OverflowPolicy.COALESCE
+        )
         utils.close_onexec(request.fileno())
         socketserver.BaseRequestHandler.__init__(self, request, client_address, server)
 
@@ -141,6 +147,7 @@ class CoreHandler(socketserver.BaseRequestHandler):
                     "no session clients left and not active, initiating shutdown"
                 )
                 self.coreemu.delete_session(self.session.id)
+        self.broadcasts.stop()
 
         return socketserver.BaseRequestHandler.finish(self)
 
@@ -223,19 +230,7 @@ class CoreHandler(socketserver.BaseRequestHandler):
         :return: nothing
         """
         logging.debug("handling broadcast event: %s", event_data)
-
-        tlv_data = structutils.pack_values(
-            coreapi.CoreEventTlv,
-            [
-                (EventTlvs.NODE, event_data.node),
-                (EventTlvs.TYPE, event_data.event_type),
-                (EventTlvs.NAME, event_data.name),
-                (EventTlvs.DATA, event_data.data),
-                (EventTlvs.TIME, event_data.time),
-                (EventTlvs.SESSION, event_data.session),
-            ],
-        )
-        message = coreapi.CoreEventMessage.pack(0, tlv_data)
+        message = dataconversion.encode(dataconversion.convert_event, event_data)
 
         try:
             self.sendall(message)
@@ -250,22 +245,7 @@ class CoreHandler(socketserver.BaseRequestHandler):
         :return: nothing
         """
         logging.debug("handling broadcast file: %s", file_data)
-
-        tlv_data = structutils.pack_values(
-            coreapi.CoreFileTlv,
-            [
-                (FileTlvs.NODE, file_data.node),
-                (FileTlvs.NAME, file_data.name),
-                (FileTlvs.MODE, file_data.mode),
-                (FileTlvs.NUMBER, file_data.number),
-                (FileTlvs.TYPE, file_data.type),
-                (FileTlvs.SOURCE_NAME, file_data.source),
-                (FileTlvs.SESSION, file_data.session),
-                (FileTlvs.DATA, file_data.data),
-                (FileTlvs.COMPRESSED_DATA, file_data.compressed_data),
-            ],
-        )
-        message = coreapi.CoreFileMessage.pack(file_data.message_type, tlv_data)
+        message = dataconversion.encode(dataconversion.convert_file, file_data)
 
         try:
             self.sendall(message)
@@ -280,7 +260,7 @@ class CoreHandler(socketserver.BaseRequestHandler):
         :return: nothing
         """
         logging.debug("handling broadcast config: %s", config_data)
-        message = dataconversion.convert_config(config_data)
+        message = dataconversion.encode(dataconversion.convert_config, config_data)
         try:
             self.sendall(message)
         except IOError:
@@ -294,18 +274,9 @@ class CoreHandler(socketserver.BaseRequestHandler):
         :return: nothing
         """
         logging.debug("handling broadcast exception: %s", exception_data)
-        tlv_data = structutils.pack_values(
-            coreapi.CoreExceptionTlv,
-            [
-                (ExceptionTlvs.NODE, exception_data.node),
-                (ExceptionTlvs.SESSION, exception_data.session),
-                (ExceptionTlvs.LEVEL, exception_data.level.value),
-                (ExceptionTlvs.SOURCE, exception_data.source),
-                (ExceptionTlvs.DATE, exception_data.date),
-                (ExceptionTlvs.TEXT, exception_data.text),
-            ],
+        message = dataconversion.encode(
+            dataconversion.convert_exception, exception_data
         )
-        message = coreapi.CoreExceptionMessage.pack(0, tlv_data)
 
         try:
             self.sendall(message)
@@ -320,7 +291,7 @@ class CoreHandler(socketserver.BaseRequestHandler):
         :return: nothing
         """
         logging.debug("handling broadcast node: %s", node_data)
-        message = dataconversion.convert_node(node_data)
+        message = dataconversion.encode(dataconversion.convert_node, node_data)
 
         try:
             self.sendall(message)
@@ -335,52 +306,7 @@ class CoreHandler(socketserver.BaseRequestHandler):
         :return: nothing
         """
         logging.debug("handling broadcast link: %s", link_data)
-        per = ""
-        if link_data.per is not None:
-            per = str(link_data.per)
-        dup = ""
-        if link_data.dup is not None:
-            dup = str(link_data.dup)
-
-        tlv_data = structutils.pack_values(
-            coreapi.CoreLinkTlv,
-            [
-                (LinkTlvs.N1_NUMBER, link_data.node1_id),
-                (LinkTlvs.N2_NUMBER, link_data.node2_id),
-                (LinkTlvs.DELAY, link_data.delay),
-                (LinkTlvs.BANDWIDTH, link_data.bandwidth),
-                (LinkTlvs.PER, per),
-                (LinkTlvs.DUP, dup),
-                (LinkTlvs.JITTER, link_data.jitter),
-                (LinkTlvs.MER, link_data.mer),
-                (LinkTlvs.BURST, link_data.burst),
-                (LinkTlvs.SESSION, link_data.session),
-                (LinkTlvs.MBURST, link_data.mburst),
-                (LinkTlvs.TYPE, link_data.link_type),
-                (LinkTlvs.GUI_ATTRIBUTES, link_data.gui_attributes),
-                (LinkTlvs.UNIDIRECTIONAL, link_data.unidirectional),
-                (LinkTlvs.EMULATION_ID, link_data.emulation_id),
-                (LinkTlvs.NETWORK_ID, link_data.network_id),
-                (LinkTlvs.KEY, link_data.key),
-                (LinkTlvs.INTERFACE1_NUMBER, link_data.interface1_id),
-                (LinkTlvs.INTERFACE1_NAME, link_data.interface1_name),
-                (LinkTlvs.INTERFACE1_IP4, link_data.interface1_ip4),
-                (LinkTlvs.INTERFACE1_IP4_MASK, link_data.interface1_ip4_mask),
-                (LinkTlvs.INTERFACE1_MAC, link_data.interface1_mac),
-                (LinkTlvs.INTERFACE1_IP6, link_data.interface1_ip6),
-                (LinkTlvs.INTERFACE1_IP6_MASK, link_data.interface1_ip6_mask),
-                (LinkTlvs.INTERFACE2_NUMBER, link_data.interface2_id),
-                (LinkTlvs.INTERFACE2_NAME, link_data.interface2_name),
-                (LinkTlvs.INTERFACE2_IP4, link_data.interface2_ip4),
-                (LinkTlvs.INTERFACE2_IP4_MASK, link_data.interface2_ip4_mask),
-                (LinkTlvs.INTERFACE2_MAC, link_data.interface2_mac),
-                (LinkTlvs.INTERFACE2_IP6, link_data.interface2_ip6),
-                (LinkTlvs.INTERFACE2_IP6_MASK, link_data.interface2_ip6_mask),
-                (LinkTlvs.OPAQUE, link_data.opaque),
-            ],
-        )
-
-        message = coreapi.CoreLinkMessage.pack(link_data.message_type, tlv_data)
+        message = dataconversion.encode(dataconversion.convert_link, link_data)
 
         try:
             self.sendall(message)
@@ -468,13 +394,14 @@ class CoreHandler(socketserver.BaseRequestHandler):
         if message_len == 0:
             logging.warning("received message with no data")
 
-        data = b""
-        while len(data) < message_len:
-            data += self.request.recv(message_len - len(data))
-            if len(data) > message_len:
-                error_message = f"received message length does not match received data ({len(data)} != {message_len})"
-                logging.error(error_message)
-                raise IOError(error_message)
+        data = bytearray(message_len)
+        view = memoryview(data)
+        received = 0
+        while received < message_len:
+            size = self.request.recv_into(view[received:], message_len - received)
+            if size == 0:
+                raise EOFError("client disconnected")
+            received += size
 
         try:
             message_class = coreapi.CLASS_MAP[message_type]
@@ -649,21 +576,27 @@ class CoreHandler(socketserver.BaseRequestHandler):
 
     def add_session_handlers(self):
         logging.debug("adding session broadcast handlers")
-        self.session.event_handlers.append(self.handle_broadcast_event)
-        self.session.exception_handlers.append(self.handle_broadcast_exception)
-        self.session.node_handlers.append(self.handle_broadcast_node)
-        self.session.link_handlers.append(self.handle_broadcast_link)
-        self.session.file_handlers.append(self.handle_broadcast_file)
-        self.session.config_handlers.append(self.handle_broadcast_config)
+        handler = self.broadcasts.handler
+        self.session.event_handlers.append(handler(self.handle_broadcast_event))
+        self.session.exception_handlers.append(
+            handler(self.handle_broadcast_exception)
+        )
+        self.session.node_handlers.append(handler(self.handle_broadcast_node))
+        self.session.link_handlers.append(handler(self.handle_broadcast_link))
+        self.session.file_handlers.append(handler(self.handle_broadcast_file))
+        self.session.config_handlers.append(handler(self.handle_broadcast_config))
 
     def remove_session_handlers(self):
         logging.debug("removing session broadcast handlers")
-        self.session.event_handlers.remove(self.handle_broadcast_event)
-        self.session.exception_handlers.remove(self.handle_broadcast_exception)
-        self.session.node_handlers.remove(self.handle_broadcast_node)
-        self.session.link_handlers.remove(self.handle_broadcast_link)
-        self.session.file_handlers.remove(self.handle_broadcast_file)
-        self.session.config_handlers.remove(self.handle_broadcast_config)
+        handler = self.broadcasts.handler
+        self.session.event_handlers.remove(handler(self.handle_broadcast_event))
+        self.session.exception_handlers.remove(
+            handler(self.handle_broadcast_exception)
+        )
+        self.session.node_handlers.remove(handler(self.handle_broadcast_node))
+        self.session.link_handlers.remove(handler(self.handle_broadcast_link))
+        self.session.file_handlers.remove(handler(self.handle_broadcast_file))
+        self.session.config_handlers.remove(handler(self.handle_broadcast_config))
 
     def handle_node_message(self, message):
         """
@@ -2,8 +2,87 @@
 Converts CORE data objects into legacy API messages.
 """
 
+import threading
+from collections import OrderedDict
+
 from core.api.tlv import coreapi, structutils
-from core.emulator.enumerations import ConfigTlvs, NodeTlvs
+from core.emulator.enumerations import (
+    ConfigTlvs,
+    EventTlvs,
+    ExceptionTlvs,
+    FileTlvs,
+    LinkTlvs,
+    NodeTlvs,
+)
+
+
+class EncodedCache:
+    """
+    Messages recently converted from broadcast data. Broadcast data is provided
+    to every client as the same immutable object, so each broadcast is converted
+    once and the same bytes are sent to all clients.
+    """
+
+    def __init__(self, size=256):
+        """
+        Create an EncodedCache instance.
+
+        :param int size: max number of messages to keep
+        """
+        self.size = size
+        self.lock = threading.Lock()
+        self.messages = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, convert, data):
+        """
+        Retrieve the message for broadcast data, converting it when not cached.
+
+        :param convert: function converting data to a message
+        :param data: broadcast data
+        :return: packed message
+        :rtype: bytes
+        """
+        # cached data is kept referenced, so its id can not be reused
+        key = (id(data), convert)
+        with self.lock:
+            cached = self.messages.get(key)
+            if cached is not None and cached[0] is data:
+                self.hits += 1
+                return cached[1]
+        message = convert(data)
+        with self.lock:
+            self.misses += 1
+            self.messages[key] = (data, message)
+            if len(self.messages) > self.size:
+                self.messages.popitem(last=False)
+        return message
+
+    def stats(self):
+        """
+        Retrieve cache hits and misses.
+
+        :return: dict of cache stats
+        :rtype: dict
+        """
+        with self.lock:
+            return dict(size=len(self.messages), hits=self.hits, misses=self.misses)
+
+
+encoded_cache = EncodedCache()
+
+
+def encode(convert, data):
+    """
+    Convert broadcast data to a message once, sharing the result between clients.
+
+    :param convert: function converting data to a message
+    :param data: broadcast data
+    :return: packed message
+    :rtype: bytes
+    """
+    return encoded_cache.get(convert, data)
 
 
 def convert_node(node_data):
@@ -67,3 +146,123 @@ def convert_config(config_data):
         ],
     )
     return coreapi.CoreConfMessage.pack(config_data.message_type, tlv_data)
+
+
+def convert_event(event_data):
+    """
+    Convenience method for converting EventData to a packed TLV message.
+
+    :param core.emulator.data.EventData event_data: event data to convert
+    :return: packed event message
+    """
+    tlv_data = structutils.pack_values(
+        coreapi.CoreEventTlv,
+        [
+            (EventTlvs.NODE, event_data.node),
+            (EventTlvs.TYPE, event_data.event_type),
+            (EventTlvs.NAME, event_data.name),
+            (EventTlvs.DATA, event_data.data),
+            (EventTlvs.TIME, event_data.time),
+            (EventTlvs.SESSION, event_data.session),
+        ],
+    )
+    return coreapi.CoreEventMessage.pack(0, tlv_data)
+
+
+def convert_file(file_data):
+    """
+    Convenience method for converting FileData to a packed TLV message.
+
+    :param core.emulator.data.FileData file_data: file data to convert
+    :return: packed file message
+    """
+    tlv_data = structutils.pack_values(
+        coreapi.CoreFileTlv,
+        [
+            (FileTlvs.NODE, file_data.node),
+            (FileTlvs.NAME, file_data.name),
+            (FileTlvs.MODE, file_data.mode),
+            (FileTlvs.NUMBER, file_data.number),
+            (FileTlvs.TYPE, file_data.type),
+            (FileTlvs.SOURCE_NAME, file_data.source),
+            (FileTlvs.SESSION, file_data.session),
+            (FileTlvs.DATA, file_data.data),
+            (FileTlvs.COMPRESSED_DATA, file_data.compressed_data),
+        ],
+    )
+    return coreapi.CoreFileMessage.pack(file_data.message_type, tlv_data)
+
+
+def convert_exception(exception_data):
+    """
+    Convenience method for converting ExceptionData to a packed TLV message.
+
+    :param core.emulator.data.ExceptionData exception_data: exception data to convert
+    :return: packed exception message
+    """
+    tlv_data = structutils.pack_values(
+        coreapi.CoreExceptionTlv,
+        [
+            (ExceptionTlvs.NODE, exception_data.node),
+            (ExceptionTlvs.SESSION, exception_data.session),
+            (ExceptionTlvs.LEVEL, exception_data.level.value),
+            (ExceptionTlvs.SOURCE, exception_data.source),
+            (ExceptionTlvs.DATE, exception_data.date),
+            (ExceptionTlvs.TEXT, exception_data.text),
+        ],
+    )
+    return coreapi.CoreExceptionMessage.pack(0, tlv_data)
+
+
+def convert_link(link_data):
+    """
+    Convenience method for converting LinkData to a packed TLV message.
+
+    :param core.emulator.data.LinkData link_data: link data to convert
+    :return: packed link message
+    """
+    per = ""
+    if link_data.per is not None:
+        per = str(link_data.per)
+    dup = ""
+    if link_data.dup is not None:
+        dup = str(link_data.dup)
+
+    tlv_data = structutils.pack_values(
+        coreapi.CoreLinkTlv,
+        [
+            (LinkTlvs.N1_NUMBER, link_data.node1_id),
+            (LinkTlvs.N2_NUMBER, link_data.node2_id),
+            (LinkTlvs.DELAY, link_data.delay),
+            (LinkTlvs.BANDWIDTH, link_data.bandwidth),
+            (LinkTlvs.PER, per),
+            (LinkTlvs.DUP, dup),
+            (LinkTlvs.JITTER, link_data.jitter),
+            (LinkTlvs.MER, link_data.mer),
+            (LinkTlvs.BURST, link_data.burst),
+            (LinkTlvs.SESSION, link_data.session),
+            (LinkTlvs.MBURST, link_data.mburst),
+            (LinkTlvs.TYPE, link_data.link_type),
+            (LinkTlvs.GUI_ATTRIBUTES, link_data.gui_attributes),
+            (LinkTlvs.UNIDIRECTIONAL, link_data.unidirectional),
+            (LinkTlvs.EMULATION_ID, link_data.emulation_id),
+            (LinkTlvs.NETWORK_ID, link_data.network_id),
+            (LinkTlvs.KEY, link_data.key),
+            (LinkTlvs.INTERFACE1_NUMBER, link_data.interface1_id),
+            (LinkTlvs.INTERFACE1_NAME, link_data.interface1_name),
+            (LinkTlvs.INTERFACE1_IP4, link_data.interface1_ip4),
+            (LinkTlvs.INTERFACE1_IP4_MASK, link_data.interface1_ip4_mask),
+            (LinkTlvs.INTERFACE1_MAC, link_data.interface1_mac),
+            (LinkTlvs.INTERFACE1_IP6, link_data.interface1_ip6),
+            (LinkTlvs.INTERFACE1_IP6_MASK, link_data.interface1_ip6_mask),
+            (LinkTlvs.INTERFACE2_NUMBER, link_data.interface2_id),
+            (LinkTlvs.INTERFACE2_NAME, link_data.interface2_name),
+            (LinkTlvs.INTERFACE2_IP4, link_data.interface2_ip4),
+            (LinkTlvs.INTERFACE2_IP4_MASK, link_data.interface2_ip4_mask),
+            (LinkTlvs.INTERFACE2_MAC, link_data.interface2_mac),
+            (LinkTlvs.INTERFACE2_IP6, link_data.interface2_ip6),
+            (LinkTlvs.INTERFACE2_IP6_MASK, link_data.interface2_ip6_mask),
+            (LinkTlvs.OPAQUE, link_data.opaque),
+        ],
+    )
+    return coreapi.CoreLinkMessage.pack(link_data.message_type, tlv_data)
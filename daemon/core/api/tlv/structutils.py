@@ -16,7 +16,7 @@ def pack_values(clazz, packers):
 
     # iterate through tuples of values to pack
     logging.debug("packing: %s", packers)
-    data = b""
+    data = []
     for packer in packers:
         # check if a transformer was provided for valid values
         transformer = None
@@ -37,7 +37,6 @@ def pack_values(clazz, packers):
             value = transformer(value)
 
         # pack and add to existing data
-        logging.debug("packing: %s - %s type(%s)", tlv_type, value, type(value))
-        data += clazz.pack(tlv_type.value, value)
+        data.append(clazz.pack(tlv_type.value, value))
 
-    return data
+    return b"".join(data)
@@ -1,15 +1,21 @@
 import abc
 import enum
+import hashlib
 import inspect
 import logging
+import os
 import pathlib
+import tempfile
+import threading
 import time
-from typing import Any, Dict, List
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Type
 
 from mako import exceptions
 from mako.lookup import TemplateLookup
 from mako.template import Template
 
+from core import utils
 from core.config import Configuration
 from core.errors import CoreCommandError, CoreError
 from core.nodes.base import CoreNode
@@ -27,11 +33,194 @@ class ConfigServiceBootError(Exception):
     pass
 
 
+class TemplateCache:
+    """
+    Process wide cache of compiled templates, shared by all instances of a
+    service. Compiled templates are kept in memory, unless a module directory is
+    provided, allowing compiled modules to be reused across restarts.
+    """
+
+    # max number of compiled text templates to keep
+    cache_size = 1024
+
+    def __init__(self, module_directory: Optional[str] = None) -> None:
+        """
+        Create a TemplateCache instance.
+
+        :param module_directory: private directory to write compiled template
+            modules to, created on first use, None to only cache in memory
+        """
+        self.lock = threading.Lock()
+        self.module_directory = module_directory
+        self.lookups = {}
+        self.files = {}
+        self.texts = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.checked = module_directory is None
+
+    def _get_module_directory(self) -> Optional[str]:
+        """
+        Retrieve the module directory, creating it on first use. Compiled modules
+        are imported from it, so it is not used unless only accessible to the
+        current user. Expects lock to be held.
+
+        :return: module directory, None to only cache in memory
+        """
+        if not self.checked:
+            self.checked = True
+            if not utils.private_directory(self.module_directory):
+                logging.error(
+                    "template module directory is not private, "
+                    "caching templates in memory: %s",
+                    self.module_directory,
+                )
+                self.module_directory = None
+        return self.module_directory
+
+    @staticmethod
+    def digest(value: str) -> str:
+        """
+        Creates a digest used to name compiled template modules.
+
+        :param value: value to digest
+        :return: hex digest
+        """
+        return hashlib.sha1(value.encode("utf-8")).hexdigest()
+
+    def lookup(self, service_class: Type["ConfigService"]) -> TemplateLookup:
+        """
+        Retrieve the template lookup for the file templates of a service class.
+
+        :param service_class: service class to get lookup for
+        :return: template lookup
+        """
+        with self.lock:
+            lookup = self.lookups.get(service_class)
+            if lookup is None:
+                class_file = inspect.getfile(service_class)
+                templates_path = pathlib.Path(class_file).parent.joinpath(
+                    TEMPLATES_DIR
+                )
+                module_directory = self._get_module_directory()
+                if module_directory is not None:
+                    # templates with the same name may exist in different
+                    # directories, so modules are kept apart per directory
+                    module_directory = os.path.join(
+                        module_directory, self.digest(str(templates_path))
+                    )
+                lookup = TemplateLookup(
+                    directories=[str(templates_path)],
+                    module_directory=module_directory,
+                )
+                self.lookups[service_class] = lookup
+            return lookup
+
+    def get_template(
+        self, service_class: Type["ConfigService"], basename: str
+    ) -> Optional[Template]:
+        """
+        Retrieve the compiled file template for a service class.
+
+        :param service_class: service class to get template for
+        :param basename: base name of template file
+        :return: compiled template, None if the service has no such template file
+        """
+        key = (service_class, basename)
+        with self.lock:
+            if key in self.files:
+                self.hits += 1
+                return self.files[key]
+        lookup = self.lookup(service_class)
+        template = None
+        if lookup.has_template(basename):
+            template = lookup.get_template(basename)
+        with self.lock:
+            self.misses += 1
+            self.files[key] = template
+        return template
+
+    def get_text(self, service_class: Type["ConfigService"], text: str) -> Template:
+        """
+        Retrieve the compiled template for text, for a service class.
+
+        :param service_class: service class to get template for
+        :param text: template text
+        :return: compiled template
+        """
+        key = (service_class, text)
+        with self.lock:
+            template = self.texts.get(key)
+            if template is not None:
+                self.hits += 1
+                self.texts.move_to_end(key)
+                return template
+        template = self._compile_text(text)
+        with self.lock:
+            self.misses += 1
+            self.texts[key] = template
+            if len(self.texts) > self.cache_size:
+                self.texts.popitem(last=False)
+        return template
+
+    def _compile_text(self, text: str) -> Template:
+        """
+        Compile a text template. Text is written to a source file named by its
+        digest, so the compiled module can be found on disk again.
+
+        :param text: template text
+        :return: compiled template
+        """
+        with self.lock:
+            module_directory = self._get_module_directory()
+        if module_directory is None:
+            return Template(text)
+        uri = f"text/{self.digest(text)}.mako"
+        path = os.path.join(module_directory, "source", uri)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, "w") as f:
+                f.write(text)
+            os.replace(temp_path, path)
+        return Template(filename=path, uri=uri, module_directory=module_directory)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Retrieve cache hit and miss counts.
+
+        :return: dict of cache stats
+        """
+        with self.lock:
+            return dict(
+                hits=self.hits,
+                misses=self.misses,
+                files=len(self.files),
+                texts=len(self.texts),
+            )
+
+    def clear(self) -> None:
+        """
+        Clear cached templates and counts, compiled modules on disk are kept.
+
+        :return: nothing
+        """
+        with self.lock:
+            self.lookups.clear()
+            self.files.clear()
+            self.texts.clear()
+            self.hits = 0
+            self.misses = 0
+
+
 class ConfigService(abc.ABC):
     """
     Base class for creating configurable services.
     """
 
+    # compiled templates shared by all services
+    template_cache = TemplateCache()
+
     # validation period in seconds, how frequent validation is attempted
     validation_period = 0.5
 
@@ -45,9 +234,7 @@ class ConfigService(abc.ABC):
         :param node: node this service is assigned to
         """
         self.node = node
-        class_file = inspect.getfile(self.__class__)
-        templates_path = pathlib.Path(class_file).parent.joinpath(TEMPLATES_DIR)
-        self.templates = TemplateLookup(directories=templates_path)
+        self.templates = self.template_cache.lookup(self.__class__)
         self.config = {}
         self.custom_templates = {}
         self.custom_config = {}
@@ -133,16 +320,48 @@ class ConfigService(abc.ABC):
         :return: nothing
         :raises ConfigServiceBootError: when there is an error starting service
         """
+        if self.boot():
+            self.check_validation()
+
+    def boot(self) -> bool:
+        """
+        Creates services files/directories and runs startup, leaving validation
+        to be ran separately.
+
+        :return: True when validation is still required, False otherwise
+        :raises ConfigServiceBootError: when there is an error starting service
+        """
         logging.info("node(%s) service(%s) starting...", self.node.name, self.name)
         self.create_dirs()
         self.create_files()
         wait = self.validation_mode == ConfigServiceMode.BLOCKING
         self.run_startup(wait)
-        if not wait:
-            if self.validation_mode == ConfigServiceMode.TIMER:
-                self.wait_validation()
-            else:
-                self.run_validation()
+        return not wait
+
+    def check_validation(self) -> None:
+        """
+        Validates a started service based on validation mode.
+
+        :return: nothing
+        :raises ConfigServiceBootError: if there is a validation failure
+        """
+        if self.validation_mode == ConfigServiceMode.TIMER:
+            self.wait_validation()
+        else:
+            self.run_validation()
+
+    def node_cmd(self, args: str, **kwargs: Any) -> str:
+        """
+        Run a command on the service node, limited by the number of service
+        commands allowed to run concurrently within the session.
+
+        :param args: command to run
+        :param kwargs: keyword arguments for the node command
+        :return: command output
+        :raises CoreCommandError: when there is a non-zero exit status
+        """
+        with self.node.session.service_commands:
+            return self.node.cmd(args, **kwargs)
 
     def stop(self) -> None:
         """
@@ -152,7 +371,7 @@ class ConfigService(abc.ABC):
         """
         for cmd in self.shutdown:
             try:
-                self.node.cmd(cmd)
+                self.node_cmd(cmd)
             except CoreCommandError:
                 logging.exception(
                     f"node({self.node.name}) service({self.name}) "
@@ -211,6 +430,15 @@ class ConfigService(abc.ABC):
         """
         raise CoreError(f"service({self.name}) unknown template({name})")
 
+    def get_file_template(self, basename: str) -> Optional[Template]:
+        """
+        Retrieves the compiled file based template for a file.
+
+        :param basename: base name of file to get template for
+        :return: compiled template, None when there is no file based template
+        """
+        return self.template_cache.get_template(self.__class__, basename)
+
     def get_templates(self) -> Dict[str, str]:
         """
         Retrieves mapping of file names to templates for all cases, which
@@ -224,11 +452,13 @@ class ConfigService(abc.ABC):
             if name in self.custom_templates:
                 template = self.custom_templates[name]
                 template = self.clean_text(template)
-            elif self.templates.has_template(basename):
-                template = self.templates.get_template(basename).source
             else:
-                template = self.get_text_template(name)
-                template = self.clean_text(template)
+                file_template = self.get_file_template(basename)
+                if file_template:
+                    template = file_template.source
+                else:
+                    template = self.get_text_template(name)
+                    template = self.clean_text(template)
             templates[name] = template
         return templates
 
@@ -244,7 +474,7 @@ class ConfigService(abc.ABC):
             if name in self.custom_templates:
                 text = self.custom_templates[name]
                 rendered = self.render_text(text, data)
-            elif self.templates.has_template(basename):
+            elif self.get_file_template(basename):
                 rendered = self.render_template(basename, data)
             else:
                 text = self.get_text_template(name)
@@ -269,7 +499,7 @@ class ConfigService(abc.ABC):
         """
         for cmd in self.startup:
             try:
-                self.node.cmd(cmd, wait=wait)
+                self.node_cmd(cmd, wait=wait)
             except CoreCommandError as e:
                 raise ConfigServiceBootError(
                     f"node({self.node.name}) service({self.name}) failed startup: {e}"
@@ -296,7 +526,7 @@ class ConfigService(abc.ABC):
         while cmds:
             cmd = cmds[index]
             try:
-                self.node.cmd(cmd)
+                self.node_cmd(cmd)
                 del cmds[index]
                 index += 1
             except CoreCommandError:
@@ -335,7 +565,7 @@ class ConfigService(abc.ABC):
         """
         text = self.clean_text(text)
         try:
-            template = Template(text)
+            template = self.template_cache.get_text(self.__class__, text)
             return self._render(template, data)
         except Exception:
             raise CoreError(
@@ -352,7 +582,7 @@ class ConfigService(abc.ABC):
         :return: rendered template
         """
         try:
-            template = self.templates.get_template(basename)
+            template = self.get_file_template(basename)
             return self._render(template, data)
         except Exception:
             raise CoreError(
@@ -5,8 +5,10 @@ emane.py: definition of an Emane class for implementing configuration control of
 import logging
 import os
 import threading
+import time
 from collections import OrderedDict
-from typing import TYPE_CHECKING, Dict, List, Set, Tuple, Type
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Set, Tuple, Type
 
 from core import utils
 from core.config import ConfigGroup, Configuration, ModelManager
@@ -18,6 +20,7 @@ from core.emane.ieee80211abg import EmaneIeee80211abgModel
 from core.emane.nodes import EmaneNet
 from core.emane.rfpipe import EmaneRfPipeModel
 from core.emane.tdma import EmaneTdmaModel
+from core.emulator.data import NodeData
 from core.emulator.enumerations import ConfigDataTypes, RegisterTlvs
 from core.errors import CoreCommandError, CoreError
 from core.nodes.base import CoreNode
@@ -64,6 +67,8 @@ class EmaneManager(ModelManager):
     SUCCESS, NOT_NEEDED, NOT_READY = (0, 1, 2)
     EVENTCFGVAR = "LIBEMANEEVENTSERVICECONFIG"
     DEFAULT_LOG_LEVEL = 3
+    # max number of nodes to start emane daemons and install interfaces for at once
+    startup_workers = 16
 
     def __init__(self, session: "Session") -> None:
         """
@@ -75,6 +80,7 @@ class EmaneManager(ModelManager):
         super().__init__()
         self.session = session
         self._emane_nets = {}
+        self._nems = {}
         self._emane_node_lock = threading.Lock()
         # port numbers are allocated from these counters
         self.platformport = self.session.options.get_config_int(
@@ -85,6 +91,7 @@ class EmaneManager(ModelManager):
         )
         self.doeventloop = False
         self.eventmonthread = None
+        self.timings = OrderedDict()
 
         # model for global EMANE configuration options
         self.emane_config = EmaneGlobalModel(session)
@@ -326,13 +333,17 @@ class EmaneManager(ModelManager):
             return r
 
         nems = []
+        self.timings.clear()
         with self._emane_node_lock:
-            self.buildxml()
-            self.starteventmonitor()
+            with self.timer("buildxml"):
+                self.buildxml()
+            with self.timer("eventmonitor"):
+                self.starteventmonitor()
 
             if self.numnems() > 0:
                 self.startdaemons()
-                self.installnetifs()
+                with self.timer("netifs"):
+                    self.installnetifs()
 
             for node_id in self._emane_nets:
                 emane_node = self._emane_nets[node_id]
@@ -350,8 +361,26 @@ class EmaneManager(ModelManager):
             except IOError:
                 logging.exception("Error writing EMANE NEMs file: %s")
 
+        logging.info(
+            "emane startup timings: %s",
+            ", ".join(f"{x}({self.timings[x]:.3f}s)" for x in self.timings),
+        )
         return EmaneManager.SUCCESS
 
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """
+        Record the time taken by a startup phase.
+
+        :param name: name of startup phase
+        :return: nothing
+        """
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.timings[name] = time.monotonic() - start
+
     def poststartup(self) -> None:
         """
         Retransmit location events now that all NEMs are active.
@@ -379,6 +408,7 @@ class EmaneManager(ModelManager):
         """
         with self._emane_node_lock:
             self._emane_nets.clear()
+            self._nems.clear()
 
         self.platformport = self.session.options.get_config_int(
             "emane_platform_port", 8100
@@ -443,23 +473,36 @@ class EmaneManager(ModelManager):
             model_class = self.models[model_name]
             emane_node.setmodel(model_class, config)
 
-    def nemlookup(self, nemid) -> Tuple[EmaneNet, CoreInterface]:
+    def setnemid(self, emane_net: EmaneNet, netif: CoreInterface, nemid: int) -> None:
         """
-        Look for the given numerical NEM ID and return the first matching
-        EMANE network and NEM interface.
+        Index the EMANE network and NEM interface for a numerical NEM ID.
+
+        :param emane_net: emane network the interface belongs to
+        :param netif: NEM interface
+        :param nemid: numerical NEM ID of interface
+        :return: nothing
         """
-        emane_node = None
-        netif = None
+        self._nems[nemid] = (emane_net, netif)
 
-        for node_id in self._emane_nets:
-            emane_node = self._emane_nets[node_id]
-            netif = emane_node.getnemnetif(nemid)
-            if netif is not None:
-                break
-            else:
-                emane_node = None
+    def removenemid(self, nemid: int, netif: CoreInterface) -> None:
+        """
+        Remove a numerical NEM ID from the index, when still mapped to the
+        given interface.
+
+        :param nemid: numerical NEM ID to remove
+        :param netif: NEM interface being removed
+        :return: nothing
+        """
+        _emane_net, current = self._nems.get(nemid, (None, None))
+        if current is netif:
+            del self._nems[nemid]
 
-        return emane_node, netif
+    def nemlookup(self, nemid) -> Tuple[EmaneNet, CoreInterface]:
+        """
+        Look for the given numerical NEM ID and return the matching
+        EMANE network and NEM interface.
+        """
+        return self._nems.get(nemid, (None, None))
 
     def numnems(self) -> int:
         """
@@ -542,53 +585,34 @@ class EmaneManager(ModelManager):
         if realtime:
             emanecmd += " -r"
 
-        otagroup, _otaport = self.get_config("otamanagergroup").split(":")
         otadev = self.get_config("otamanagerdevice")
         otanetidx = self.session.get_control_net_index(otadev)
 
-        eventgroup, _eventport = self.get_config("eventservicegroup").split(":")
         eventdev = self.get_config("eventservicedevice")
         eventservicenetidx = self.session.get_control_net_index(eventdev)
 
+        # create control networks up front, so nodes can be started concurrently
+        with self.timer("controlnets"):
+            for index in {0, otanetidx, eventservicenetidx}:
+                if index >= 0:
+                    self.session.add_remove_control_net(
+                        index, remove=False, conf_required=False
+                    )
+
         run_emane_on_host = False
+        funcs = []
         for node in self.getnodes():
             if hasattr(node, "transport_type") and node.transport_type == "raw":
                 run_emane_on_host = True
                 continue
-            path = self.session.session_dir
-            n = node.id
-
-            # control network not yet started here
-            self.session.add_remove_control_interface(
-                node, 0, remove=False, conf_required=False
-            )
-
-            if otanetidx > 0:
-                logging.info("adding ota device ctrl%d", otanetidx)
-                self.session.add_remove_control_interface(
-                    node, otanetidx, remove=False, conf_required=False
-                )
-
-            if eventservicenetidx >= 0:
-                logging.info("adding event service device ctrl%d", eventservicenetidx)
-                self.session.add_remove_control_interface(
-                    node, eventservicenetidx, remove=False, conf_required=False
-                )
-
-            # multicast route is needed for OTA data
-            node.node_net_client.create_route(otagroup, otadev)
-
-            # multicast route is also needed for event data if on control network
-            if eventservicenetidx >= 0 and eventgroup != otagroup:
-                node.node_net_client.create_route(eventgroup, eventdev)
-
-            # start emane
-            log_file = os.path.join(path, f"emane{n}.log")
-            platform_xml = os.path.join(path, f"platform{n}.xml")
-            args = f"{emanecmd} -f {log_file} {platform_xml}"
-            output = node.cmd(args)
-            logging.info("node(%s) emane daemon running: %s", node.name, args)
-            logging.debug("node(%s) emane daemon output: %s", node.name, output)
+            args = (node, emanecmd, otanetidx, eventservicenetidx)
+            funcs.append((self.startdaemon, args, {}))
+        with self.timer("daemons"):
+            if funcs:
+                workers = min(len(funcs), self.startup_workers)
+                _, exceptions = utils.threadpool(funcs, workers)
+                if exceptions:
+                    raise exceptions[0]
 
         if not run_emane_on_host:
             return
@@ -601,6 +625,58 @@ class EmaneManager(ModelManager):
         self.session.distributed.execute(lambda x: x.remote_cmd(emanecmd, cwd=path))
         logging.info("host emane daemon running: %s", emanecmd)
 
+    def startdaemon(
+        self, node: CoreNode, emanecmd: str, otanetidx: int, eventservicenetidx: int
+    ) -> None:
+        """
+        Start an EMANE daemon for a node, adding the control interfaces and
+        multicast routes it needs.
+
+        :param node: node to start emane daemon for
+        :param emanecmd: emane command to run
+        :param otanetidx: control network index for ota manager
+        :param eventservicenetidx: control network index for event service
+        :return: nothing
+        """
+        otagroup, _otaport = self.get_config("otamanagergroup").split(":")
+        otadev = self.get_config("otamanagerdevice")
+        eventgroup, _eventport = self.get_config("eventservicegroup").split(":")
+        eventdev = self.get_config("eventservicedevice")
+        path = self.session.session_dir
+        n = node.id
+
+        # control network not yet started here
+        self.session.add_remove_control_interface(
+            node, 0, remove=False, conf_required=False
+        )
+
+        if otanetidx > 0:
+            logging.info("adding ota device ctrl%d", otanetidx)
+            self.session.add_remove_control_interface(
+                node, otanetidx, remove=False, conf_required=False
+            )
+
+        if eventservicenetidx >= 0:
+            logging.info("adding event service device ctrl%d", eventservicenetidx)
+            self.session.add_remove_control_interface(
+                node, eventservicenetidx, remove=False, conf_required=False
+            )
+
+        # multicast route is needed for OTA data
+        node.node_net_client.create_route(otagroup, otadev)
+
+        # multicast route is also needed for event data if on control network
+        if eventservicenetidx >= 0 and eventgroup != otagroup:
+            node.node_net_client.create_route(eventgroup, eventdev)
+
+        # start emane
+        log_file = os.path.join(path, f"emane{n}.log")
+        platform_xml = os.path.join(path, f"platform{n}.xml")
+        args = f"{emanecmd} -f {log_file} {platform_xml}"
+        output = node.cmd(args)
+        logging.info("node(%s) emane daemon running: %s", node.name, args)
+        logging.debug("node(%s) emane daemon output: %s", node.name, output)
+
     def stopdaemons(self) -> None:
         """
         Kill the appropriate EMANE daemons.
@@ -730,10 +806,12 @@ class EmaneManager(ModelManager):
 
     def handlelocationevent(self, rxnemid: int, eid: int, data: str) -> None:
         """
-        Handle an EMANE location event.
+        Handle an EMANE location event, converting all locations within the event
+        together and broadcasting the node updates together.
         """
         events = LocationEvent()
         events.restore(data)
+        locations = []
         for event in events:
             txnemid, attrs = event
             if (
@@ -749,7 +827,18 @@ class EmaneManager(ModelManager):
             lon = attrs["longitude"]
             alt = attrs["altitude"]
             logging.debug("emane location event: %s,%s,%s", lat, lon, alt)
-            self.handlelocationeventtoxyz(txnemid, lat, lon, alt)
+            locations.append((txnemid, lat, lon, alt))
+        if not locations:
+            return
+
+        _nemids, lats, lons, alts = zip(*locations)
+        xs, ys, zs = self.session.location.getxyz_many(lats, lons, alts)
+        node_datas = []
+        for location, x, y, z in zip(locations, xs, ys, zs):
+            node_data = self.locationnodedata(*location, x, y, z)
+            if node_data is not None:
+                node_datas.append(node_data)
+        self.session.broadcast_nodes(node_datas)
 
     def handlelocationeventtoxyz(
         self, nemid: int, lat: float, lon: float, alt: float
@@ -759,15 +848,36 @@ class EmaneManager(ModelManager):
         into a node and x,y,z coordinate values, sending a Node Message.
         Returns True if successfully parsed and a Node Message was sent.
         """
+        x, y, z = self.session.location.getxyz(lat, lon, alt)
+        node_data = self.locationnodedata(nemid, lat, lon, alt, x, y, z)
+        if node_data is None:
+            return False
+        self.session.broadcast_node(node_data)
+        return True
+
+    def locationnodedata(
+        self,
+        nemid: int,
+        lat: float,
+        lon: float,
+        alt: float,
+        x: float,
+        y: float,
+        z: float,
+    ) -> Optional[NodeData]:
+        """
+        Apply the (NEM ID, lat, long, alt) from a received location event, along
+        with its converted x,y,z coordinate values, to the position of its node.
+        Returns node data for the updated node, or None when the location
+        could not be applied.
+        """
         # convert nemid to node number
         _emanenode, netif = self.nemlookup(nemid)
         if netif is None:
             logging.info("location event for unknown NEM %s", nemid)
-            return False
+            return None
 
         n = netif.node.id
-        # convert from lat/long/alt to x,y,z coordinates
-        x, y, z = self.session.location.getxyz(lat, lon, alt)
         x = int(x)
         y = int(y)
         z = int(z)
@@ -793,7 +903,7 @@ class EmaneManager(ModelManager):
                 y,
                 z,
             )
-            return False
+            return None
 
         # generate a node message for this location update
         try:
@@ -802,13 +912,11 @@ class EmaneManager(ModelManager):
             logging.exception(
                 "location event NEM %s has no corresponding node %s", nemid, n
             )
-            return False
+            return None
 
         # don"t use node.setposition(x,y,z) which generates an event
         node.position.set(x, y, z)
-        node_data = node.data(message_type=0, lat=lat, lon=lon, alt=alt)
-        self.session.broadcast_node(node_data)
-        return True
+        return node.data(message_type=0, lat=lat, lon=lon, alt=alt)
 
     def emanerunning(self, node: CoreNode) -> bool:
         """
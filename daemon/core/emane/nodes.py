@@ -6,6 +6,7 @@ share the same MAC+PHY model.
 import logging
 from typing import TYPE_CHECKING, Dict, List, Optional, Type
 
+from core import utils
 from core.emulator.distributed import DistributedServer
 from core.emulator.enumerations import LinkTypes, NodeTypes, RegisterTlvs
 from core.nodes.base import CoreNetworkBase
@@ -50,6 +51,7 @@ class EmaneNet(CoreNetworkBase):
         self.conf = ""
         self.up = False
         self.nemidmap = {}
+        self.nemids = {}
         self.model = None
         self.mobility = None
 
@@ -117,7 +119,28 @@ class EmaneNet(CoreNetworkBase):
         Record an interface to numerical ID mapping. The Emane controller
         object manages and assigns these IDs for all NEMs.
         """
+        self.removenemid(netif)
         self.nemidmap[netif] = nemid
+        self.nemids[nemid] = netif
+        self.session.emane.setnemid(self, netif, nemid)
+
+    def removenemid(self, netif: CoreInterface) -> None:
+        """
+        Remove the numerical ID mapping for an interface, if one exists.
+        """
+        nemid = self.nemidmap.pop(netif, None)
+        if nemid is None:
+            return
+        if self.nemids.get(nemid) is netif:
+            del self.nemids[nemid]
+        self.session.emane.removenemid(nemid, netif)
+
+    def detach(self, netif: CoreInterface) -> None:
+        """
+        Detach network interface, removing its numerical ID mapping.
+        """
+        super().detach(netif)
+        self.removenemid(netif)
 
     def getnemid(self, netif: CoreInterface) -> Optional[int]:
         """
@@ -130,13 +153,9 @@ class EmaneNet(CoreNetworkBase):
 
     def getnemnetif(self, nemid: int) -> Optional[CoreInterface]:
         """
-        Given a numerical NEM ID, return its interface. This returns the
-        first interface that matches the given NEM ID.
+        Given a numerical NEM ID, return its interface.
         """
-        for netif in self.nemidmap:
-            if self.nemidmap[netif] == nemid:
-                return netif
-        return None
+        return self.nemids.get(nemid)
 
     def netifs(self, sort: bool = True) -> List[CoreInterface]:
         """
@@ -158,13 +177,17 @@ class EmaneNet(CoreNetworkBase):
             warntxt += "Python bindings failed to load"
             logging.error(warntxt)
 
-        for netif in self.netifs():
-            external = self.session.emane.get_config(
-                "external", self.id, self.model.name
-            )
-            if external == "0":
-                netif.setaddrs()
+        # wait for tap devices and set addresses concurrently
+        external = self.session.emane.get_config("external", self.id, self.model.name)
+        if external == "0":
+            funcs = [(netif.setaddrs, (), {}) for netif in self.netifs()]
+            if funcs:
+                workers = min(len(funcs), self.session.emane.startup_workers)
+                _, exceptions = utils.threadpool(funcs, workers)
+                if exceptions:
+                    raise exceptions[0]
 
+        for netif in self.netifs():
             if not self.session.emane.genlocationevents():
                 netif.poshook = None
                 continue
@@ -222,8 +245,10 @@ class EmaneNet(CoreNetworkBase):
             logging.info("position service not available")
             return
 
-        event = LocationEvent()
-        i = 0
+        nemids = []
+        xs = []
+        ys = []
+        zs = []
         for netif in moved_netifs:
             nemid = self.getnemid(netif)
             ifname = netif.localname
@@ -231,10 +256,16 @@ class EmaneNet(CoreNetworkBase):
                 logging.info("nemid for %s is unknown", ifname)
                 continue
             x, y, z = netif.node.getposition()
-            lat, lon, alt = self.session.location.getgeo(x, y, z)
+            nemids.append(nemid)
+            xs.append(x)
+            ys.append(y)
+            zs.append(z)
+
+        event = LocationEvent()
+        lats, lons, alts = self.session.location.getgeo_many(xs, ys, zs)
+        for nemid, lat, lon, alt in zip(nemids, lats, lons, alts):
             # altitude must be an integer or warning is printed
             alt = int(round(alt))
             event.append(nemid, latitude=lat, longitude=lon, altitude=alt)
-            i += 1
 
         self.session.emane.service.publish(0, event)
@@ -0,0 +1,297 @@
+"""
+Asynchronous delivery of session broadcasts. A subscriber has its own bounded
+queue and dispatch thread, so threads broadcasting session data never wait on
+slow handlers, such as those writing to client sockets.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from enum import Enum
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from core.emulator.data import NodeData
+
+
+class OverflowPolicy(Enum):
+    """
+    Behavior of a subscriber once its queue is full.
+    """
+
+    # drop the oldest pending data
+    DROP_OLDEST = 0
+    # replace pending node updates with newer ones, dropping the oldest pending
+    # data when still full
+    COALESCE = 1
+
+
+class BatchHandler:
+    """
+    Session handler that can also be provided a batch of data in a single call,
+    such as all node updates for a round of mobility. Handlers compare equal when
+    created for the same function, allowing them to be removed from session
+    handlers.
+    """
+
+    def __init__(
+        self, func: Callable[[Any], None], batch_func: Callable[[List[Any]], None]
+    ) -> None:
+        """
+        Create a BatchHandler instance.
+
+        :param func: function to handle data
+        :param batch_func: function to handle a batch of data
+        """
+        self.func = func
+        self.batch_func = batch_func
+
+    def __call__(self, data: Any) -> None:
+        self.func(data)
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, BatchHandler) and self.func == other.func
+
+    def __hash__(self) -> int:
+        return hash(self.func)
+
+    def batch(self, datas: List[Any]) -> None:
+        """
+        Handle a batch of data.
+
+        :param datas: data to handle
+        :return: nothing
+        """
+        self.batch_func(datas)
+
+
+class BroadcastSubscriber:
+    """
+    Queues broadcast data for its handlers, which are ran in order on a dispatch
+    thread. The dispatch thread is started when data is queued and exits after
+    being idle for a while.
+    """
+
+    # time in seconds the dispatch thread waits for data before exiting
+    idle_timeout = 5.0
+
+    def __init__(
+        self,
+        name: str,
+        max_queue: int = 1000,
+        policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        idle: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """
+        Create a BroadcastSubscriber instance.
+
+        :param name: name of subscriber, used for the dispatch thread
+        :param max_queue: max number of pending broadcasts
+        :param policy: behavior once the queue is full
+        :param idle: function ran on the dispatch thread once pending data has been
+            handled, such as for sending output batched by handlers
+        """
+        self.name = name
+        self.max_queue = max(max_queue, 1)
+        self.policy = policy
+        self.idle = idle
+        self.condition = threading.Condition()
+        self.handlers = {}
+        self.pending = OrderedDict()
+        self.thread = None
+        self.running = True
+        self.busy = False
+        self.eventnum = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+
+    def handler(self, func: Callable[[Any], None]) -> BatchHandler:
+        """
+        Retrieve a session handler that queues data for the provided function,
+        which also queues batches of data together. The same handler is returned
+        for the same function, allowing it to be removed from session handlers.
+
+        :param func: function to run with broadcast data
+        :return: queueing session handler
+        """
+        with self.condition:
+            handler = self.handlers.get(func)
+            if handler is None:
+
+                def put(data: Any) -> None:
+                    self.put(func, data)
+
+                def put_all(datas: List[Any]) -> None:
+                    self.put_all(func, datas)
+
+                handler = BatchHandler(put, put_all)
+                self.handlers[func] = handler
+            return handler
+
+    def _key(self, func: Callable[[Any], None], data: Any) -> Hashable:
+        """
+        Retrieve the key for pending data, only node updates for the same handler
+        share a key when coalescing. Expects lock to be held.
+
+        :param func: function to run with data
+        :param data: broadcast data
+        :return: pending data key
+        """
+        if (
+            self.policy == OverflowPolicy.COALESCE
+            and isinstance(data, NodeData)
+            and not data.message_type
+        ):
+            return func, data.id
+        self.eventnum += 1
+        return self.eventnum
+
+    def _put(self, func: Callable[[Any], None], data: Any, now: float) -> None:
+        """
+        Add data to the pending data, coalescing or dropping data as needed.
+        Expects lock to be held.
+
+        :param func: function to run with data
+        :param data: broadcast data
+        :param now: time data was queued
+        :return: nothing
+        """
+        key = self._key(func, data)
+        current = self.pending.get(key)
+        if current is not None:
+            self.pending[key] = (func, data, current[2])
+            self.coalesced += 1
+            return
+        if len(self.pending) >= self.max_queue:
+            self.pending.popitem(last=False)
+            self.dropped += 1
+        self.pending[key] = (func, data, now)
+
+    def _dispatch(self) -> None:
+        """
+        Start the dispatch thread when needed and wake it for pending data.
+        Expects lock to be held.
+
+        :return: nothing
+        """
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name=self.name, daemon=True)
+            self.thread.start()
+        self.condition.notify_all()
+
+    def put(self, func: Callable[[Any], None], data: Any) -> None:
+        """
+        Queue data for a function to run with, never blocks on the function.
+
+        :param func: function to run with data
+        :param data: broadcast data
+        :return: nothing
+        """
+        with self.condition:
+            if not self.running:
+                return
+            self._put(func, data, time.monotonic())
+            self._dispatch()
+
+    def put_all(self, func: Callable[[Any], None], datas: List[Any]) -> None:
+        """
+        Queue a batch of data for a function to run with, under a single lock and
+        wake up of the dispatch thread.
+
+        :param func: function to run with data
+        :param datas: broadcast data
+        :return: nothing
+        """
+        if not datas:
+            return
+        with self.condition:
+            if not self.running:
+                return
+            now = time.monotonic()
+            for data in datas:
+                self._put(func, data, now)
+            self._dispatch()
+
+    def run(self) -> None:
+        """
+        Dispatch thread target, runs queued data through its functions until
+        stopped or idle.
+
+        :return: nothing
+        """
+        while True:
+            with self.condition:
+                self.busy = False
+                self.condition.notify_all()
+                if self.running and not self.pending:
+                    self.condition.wait(self.idle_timeout)
+                if not self.pending:
+                    self.thread = None
+                    return
+                _, (func, data, queued) = self.pending.popitem(last=False)
+                self.busy = True
+                lag = time.monotonic() - queued
+                self.total_lag += lag
+                self.max_lag = max(self.max_lag, lag)
+                self.delivered += 1
+            try:
+                func(data)
+            except Exception:
+                logging.exception("error handling broadcast for %s", self.name)
+            if self.idle is not None:
+                with self.condition:
+                    idle = not self.pending
+                if idle:
+                    try:
+                        self.idle()
+                    except Exception:
+                        logging.exception("error running idle for %s", self.name)
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Wait for all pending data to be handled.
+
+        :param timeout: max time in seconds to wait, None to wait forever
+        :return: True if all data was handled, False on timeout
+        """
+        with self.condition:
+            return self.condition.wait_for(
+                lambda: not self.pending and not self.busy, timeout
+            )
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Retrieve counts for pending, delivered, dropped, and coalesced data, along
+        with the time data waited to be handled.
+
+        :return: dict of subscriber stats
+        """
+        with self.condition:
+            mean_lag = self.total_lag / self.delivered if self.delivered else 0.0
+            return dict(
+                pending=len(self.pending),
+                delivered=self.delivered,
+                dropped=self.dropped,
+                coalesced=self.coalesced,
+                mean_lag=mean_lag,
+                max_lag=self.max_lag,
+            )
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """
+        Stop queueing data and stop the dispatch thread, once pending data has been
+        handled.
+
+        :param timeout: max time in seconds to wait for the dispatch thread
+        :return: nothing
+        """
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+            thread = self.thread
+        if thread and thread is not threading.current_thread():
+            thread.join(timeout)
+        logging.debug("broadcast subscriber %s stats: %s", self.name, self.stats())
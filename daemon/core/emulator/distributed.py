@@ -2,12 +2,18 @@
 Defines distributed server functionality.
 """
 
+import io
 import logging
 import os
+import queue
+import tarfile
 import threading
+import time
+import uuid
 from collections import OrderedDict
+from contextlib import contextmanager
 from tempfile import NamedTemporaryFile
-from typing import TYPE_CHECKING, Callable, Dict, Tuple
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Tuple
 
 import netaddr
 from fabric import Connection
@@ -30,6 +36,9 @@ class DistributedServer:
     Provides distributed server interactions.
     """
 
+    # max number of concurrent connections to a server
+    max_connections = 4
+
     def __init__(self, name: str, host: str) -> None:
         """
         Create a DistributedServer instance.
@@ -41,6 +50,40 @@ class DistributedServer:
         self.host = host
         self.conn = Connection(host, user="root")
         self.lock = threading.Lock()
+        self.connections = [self.conn]
+        self.idle = queue.LifoQueue()
+        self.idle.put(self.conn)
+        self.staging = False
+        self.staged = {}
+        self.stage_lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.files_sent = 0
+        self.bytes_sent = 0
+        self.archives_sent = 0
+
+    @contextmanager
+    def connection(self) -> Iterator[Connection]:
+        """
+        Retrieve an idle connection to the server for the duration of the context,
+        creating one when below the max number of connections, otherwise waiting
+        for one to become idle.
+
+        :return: server connection
+        """
+        with self.lock:
+            try:
+                conn = self.idle.get_nowait()
+            except queue.Empty:
+                conn = None
+                if len(self.connections) < self.max_connections:
+                    conn = Connection(self.host, user="root")
+                    self.connections.append(conn)
+        if conn is None:
+            conn = self.idle.get()
+        try:
+            yield conn
+        finally:
+            self.idle.put(conn)
 
     def remote_cmd(
         self, cmd: str, env: Dict[str, str] = None, cwd: str = None, wait: bool = True
@@ -64,15 +107,16 @@ class DistributedServer:
             "remote cmd server(%s) cwd(%s) wait(%s): %s", self.host, cwd, wait, cmd
         )
         try:
-            if cwd is None:
-                result = self.conn.run(
-                    cmd, hide=CMD_HIDE, env=env, replace_env=replace_env
-                )
-            else:
-                with self.conn.cd(cwd):
-                    result = self.conn.run(
+            with self.connection() as conn:
+                if cwd is None:
+                    result = conn.run(
                         cmd, hide=CMD_HIDE, env=env, replace_env=replace_env
                     )
+                else:
+                    with conn.cd(cwd):
+                        result = conn.run(
+                            cmd, hide=CMD_HIDE, env=env, replace_env=replace_env
+                        )
             return result.stdout.strip()
         except UnexpectedExit as e:
             stdout, stderr = e.streams_for_display()
@@ -86,8 +130,8 @@ class DistributedServer:
         :param destination: destination file location
         :return: nothing
         """
-        with self.lock:
-            self.conn.put(source, destination)
+        with self.connection() as conn:
+            conn.put(source, destination)
 
     def remote_put_temp(self, destination: str, data: str) -> None:
         """
@@ -98,13 +142,120 @@ class DistributedServer:
         :param data: data to store in remote file
         :return: nothing
         """
-        with self.lock:
-            temp = NamedTemporaryFile(delete=False)
-            temp.write(data.encode("utf-8"))
-            temp.close()
-            self.conn.put(temp.name, destination)
+        temp = NamedTemporaryFile(delete=False)
+        temp.write(data.encode("utf-8"))
+        temp.close()
+        try:
+            with self.connection() as conn:
+                conn.put(temp.name, destination)
+        finally:
             os.unlink(temp.name)
 
+    def remote_write(
+        self, destination: str, data: str, mode: int = 0o644, group: str = None
+    ) -> None:
+        """
+        Write file contents to a remote server with the given mode, creating parent
+        directories as needed. Files are staged to be sent together in a single
+        archive when staging, otherwise they are sent immediately.
+
+        :param destination: file destination for data
+        :param data: data to store in remote file
+        :param mode: mode for file
+        :param group: group of staged files to add file to, such as the directory
+            of the node the file belongs to, allowing users of the group to send
+            only the files they depend on
+        :return: nothing
+        """
+        if self.staging:
+            with self.stage_lock:
+                files = self.staged.setdefault(group, [])
+                files.append((destination, data.encode("utf-8"), mode))
+            return
+        dirname = os.path.dirname(destination)
+        self.remote_cmd(f"mkdir -m {0o755:o} -p {dirname}")
+        self.remote_put_temp(destination, data)
+        self.remote_cmd(f"chmod {mode:o} {destination}")
+        with self.stage_lock:
+            self.files_sent += 1
+            self.bytes_sent += len(data.encode("utf-8"))
+
+    def flush(self, group: str = None) -> None:
+        """
+        Send staged files to the remote server, as a single archive that is
+        unpacked with file modes preserved. Nodes send their own staged files
+        before running commands, so files are present before they can be used,
+        leaving all other staged files to be sent together.
+
+        :param group: group of staged files to send, all staged files when None
+        :return: nothing
+        :raises CoreCommandError: when unpacking staged files fails
+        """
+        # a flush in progress may have taken files staged by the current thread
+        staged = self.staged if group is None else group in self.staged
+        if not staged and not self.flush_lock.locked():
+            return
+        with self.flush_lock:
+            with self.stage_lock:
+                if group is None:
+                    files = [x for y in self.staged.values() for x in y]
+                    self.staged = {}
+                else:
+                    files = self.staged.pop(group, [])
+            if not files:
+                return
+            data = io.BytesIO()
+            now = time.time()
+            with tarfile.open(fileobj=data, mode="w:gz") as tar:
+                for destination, contents, mode in files:
+                    info = tarfile.TarInfo(destination.lstrip("/"))
+                    info.size = len(contents)
+                    info.mode = mode
+                    info.mtime = now
+                    tar.addfile(info, io.BytesIO(contents))
+            size = data.tell()
+            data.seek(0)
+            path = f"/tmp/core-files-{uuid.uuid4().hex}.tgz"
+            logging.debug(
+                "server(%s) sending staged files(%s) bytes(%s)",
+                self.name,
+                len(files),
+                size,
+            )
+            with self.connection() as conn:
+                conn.put(data, path)
+            self.remote_cmd(
+                f"tar -xzpf {path} -C / --no-overwrite-dir; "
+                f"status=$?; rm -f {path}; exit $status"
+            )
+            with self.stage_lock:
+                self.files_sent += len(files)
+                self.bytes_sent += size
+                self.archives_sent += 1
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Retrieve counts of files, bytes, and archives sent to this server.
+
+        :return: dict of file transfer counts
+        """
+        with self.stage_lock:
+            return dict(
+                files=self.files_sent,
+                bytes=self.bytes_sent,
+                archives=self.archives_sent,
+            )
+
+    def close(self) -> None:
+        """
+        Close all connections to the server.
+
+        :return: nothing
+        """
+        with self.lock:
+            for conn in self.connections:
+                conn.close()
+
 
 class DistributedController:
     """
@@ -120,6 +271,7 @@ class DistributedController:
         self.session = session
         self.servers = OrderedDict()
         self.tunnels = {}
+        self.lock = threading.Lock()
         self.address = self.session.options.get_config(
             "distributed_address", default=None
         )
@@ -139,14 +291,65 @@ class DistributedController:
 
     def execute(self, func: Callable[[DistributedServer], None]) -> None:
         """
-        Convenience for executing logic against all distributed servers.
+        Convenience for executing logic against all distributed servers, running
+        concurrently across servers.
 
         :param func: function to run, that takes a DistributedServer as a parameter
+        :return: nothing
+        :raises Exception: the first exception raised by func for any server
+        """
+        funcs = [(func, (server,), {}) for server in self.servers.values()]
+        self.run_all(funcs)
+
+    def run_all(self, funcs: List[Tuple[Callable, Iterable, Dict]]) -> List[Any]:
+        """
+        Run functions concurrently, with enough workers to use all connections
+        to all servers.
+
+        :param funcs: functions to run, along with args and kwargs
+        :return: function results
+        :raises Exception: the first exception raised by a function
+        """
+        if not funcs:
+            return []
+        if len(funcs) == 1:
+            func, args, kwargs = funcs[0]
+            return [func(*args, **kwargs)]
+        workers = max(len(self.servers), 1) * DistributedServer.max_connections
+        results, exceptions = utils.threadpool(funcs, workers)
+        if exceptions:
+            raise exceptions[0]
+        return results
+
+    @contextmanager
+    def staging(self) -> Iterator[None]:
+        """
+        Stage files written to servers within this context, so they are sent in
+        bulk, and report files and bytes sent per server.
+
         :return: nothing
         """
-        for name in self.servers:
-            server = self.servers[name]
-            func(server)
+        servers = list(self.servers.values())
+        start = {}
+        for server in servers:
+            start[server.name] = server.stats()
+            server.staging = True
+        try:
+            yield
+        finally:
+            for server in servers:
+                server.staging = False
+            self.execute(lambda x: x.flush())
+            for server in servers:
+                stats = server.stats()
+                previous = start[server.name]
+                logging.info(
+                    "server(%s) files(%s) bytes(%s) archives(%s)",
+                    server.name,
+                    stats["files"] - previous["files"],
+                    stats["bytes"] - previous["bytes"],
+                    stats["archives"] - previous["archives"],
+                )
 
     def shutdown(self) -> None:
         """
@@ -156,26 +359,29 @@ class DistributedController:
         :return: nothing
         """
         # shutdown all tunnels
+        funcs = []
         for key in self.tunnels:
             tunnels = self.tunnels[key]
             for tunnel in tunnels:
-                tunnel.shutdown()
+                funcs.append((tunnel.shutdown, (), {}))
+        self.run_all(funcs)
 
         # remove all remote session directories
-        for name in self.servers:
-            server = self.servers[name]
-            cmd = f"rm -rf {self.session.session_dir}"
-            server.remote_cmd(cmd)
+        cmd = f"rm -rf {self.session.session_dir}"
+        self.execute(lambda x: x.remote_cmd(cmd))
+        for server in self.servers.values():
+            server.close()
 
         # clear tunnels
         self.tunnels.clear()
 
     def start(self) -> None:
         """
-        Start distributed network tunnels.
+        Start distributed network tunnels, concurrently across servers and networks.
 
         :return: nothing
         """
+        funcs = []
         for node_id in self.session.nodes:
             node = self.session.nodes[node_id]
 
@@ -187,7 +393,8 @@ class DistributedController:
 
             for name in self.servers:
                 server = self.servers[name]
-                self.create_gre_tunnel(node, server)
+                funcs.append((self.create_gre_tunnel, (node, server), {}))
+        self.run_all(funcs)
 
     def create_gre_tunnel(
         self, node: CoreNetwork, server: DistributedServer
@@ -225,7 +432,8 @@ class DistributedController:
 
         # save tunnels for shutdown
         tunnel = (local_tap, remote_tap)
-        self.tunnels[key] = tunnel
+        with self.lock:
+            self.tunnels[key] = tunnel
         return tunnel
 
     def tunnel_key(self, n1_id: int, n2_id: int) -> int:
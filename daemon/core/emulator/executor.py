@@ -0,0 +1,227 @@
+"""
+Session scoped executor, used to run batches of functions concurrently.
+"""
+
+import collections
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+
+def default_workers() -> int:
+    """
+    Default number of workers, based on the number of cpus.
+
+    :return: number of workers
+    """
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+class ExecutorTask:
+    """
+    Function to run within an executor, along with its outcome.
+    """
+
+    def __init__(
+        self, func: Callable, args: Iterable[Any], kwargs: Dict[Any, Any]
+    ) -> None:
+        """
+        Create an ExecutorTask instance.
+
+        :param func: function to run
+        :param args: function arguments
+        :param kwargs: function keyword arguments
+        """
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.submitted = time.monotonic()
+        self.claimed = False
+        self.done = threading.Event()
+        self.result = None
+        self.exception = None
+
+    def run(self) -> None:
+        """
+        Run the task function, storing the result or exception raised. The task
+        is marked done separately, once the executor has recorded its run.
+
+        :return: nothing
+        """
+        try:
+            self.result = self.func(*self.args, **self.kwargs)
+        except Exception as e:
+            logging.exception("thread pool exception")
+            self.exception = e
+
+
+class SessionExecutor:
+    """
+    Long lived pool of worker threads for running batches of functions.
+
+    Batches may be submitted from within a running task. A thread waiting on a
+    batch runs tasks of that batch not yet picked up by a worker itself, so
+    nested batches always make progress, even when all workers are busy.
+    """
+
+    def __init__(self, workers: int = 0) -> None:
+        """
+        Create a SessionExecutor instance.
+
+        :param workers: number of worker threads, 0 to base it on the cpu count
+        """
+        self.workers = workers or default_workers()
+        self.lock = threading.Lock()
+        self.condition = threading.Condition(self.lock)
+        self.queue = collections.deque()
+        self.threads = []
+        self.queued = 0
+        self.active = 0
+        self.completed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.total_run = 0.0
+
+    def resize(self, workers: int) -> None:
+        """
+        Change the number of worker threads, extra workers exit once idle.
+
+        :param workers: number of worker threads, 0 to base it on the cpu count
+        :return: nothing
+        """
+        with self.lock:
+            self.workers = workers or default_workers()
+            self.condition.notify_all()
+
+    def _claim(self, task: ExecutorTask) -> bool:
+        """
+        Claim a task to run, tasks are only ran once. Expects lock to be held.
+
+        :param task: task to claim
+        :return: True if claimed, False if it was already claimed
+        """
+        if task.claimed:
+            return False
+        task.claimed = True
+        self.queued -= 1
+        self.active += 1
+        wait = time.monotonic() - task.submitted
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        return True
+
+    def _run(self, task: ExecutorTask) -> None:
+        """
+        Run a claimed task and record its run time.
+
+        :param task: task to run
+        :return: nothing
+        """
+        start = time.monotonic()
+        try:
+            task.run()
+        finally:
+            elapsed = time.monotonic() - start
+            with self.lock:
+                self.active -= 1
+                self.completed += 1
+                self.total_run += elapsed
+            task.done.set()
+
+    def _worker(self) -> None:
+        """
+        Worker thread target, runs queued tasks until there are more workers
+        than desired.
+
+        :return: nothing
+        """
+        thread = threading.current_thread()
+        while True:
+            with self.lock:
+                while True:
+                    if len(self.threads) > self.workers:
+                        self.threads.remove(thread)
+                        return
+                    if self.queue:
+                        task = self.queue.popleft()
+                        if self._claim(task):
+                            break
+                    else:
+                        self.condition.wait()
+            self._run(task)
+
+    def run(
+        self, funcs: List[Tuple[Callable, Iterable[Any], Dict[Any, Any]]]
+    ) -> Tuple[List[Any], List[Exception]]:
+        """
+        Run provided functions, arguments, and keywords within the executor,
+        waiting for all to complete and collecting results and exceptions.
+
+        :param funcs: iterable that provides a func, args, kwargs
+        :return: results and exceptions from running functions with args and kwargs
+        """
+        tasks = [ExecutorTask(func, args, kwargs) for func, args, kwargs in funcs]
+        with self.lock:
+            self.queue.extend(tasks)
+            self.queued += len(tasks)
+            while len(self.threads) < min(self.workers, self.queued):
+                thread = threading.Thread(target=self._worker, daemon=True)
+                self.threads.append(thread)
+                thread.start()
+            self.condition.notify(len(tasks))
+        # help run tasks not yet picked up, rather than blocking a thread that
+        # may itself be a worker
+        for task in reversed(tasks):
+            with self.lock:
+                claimed = self._claim(task)
+            if claimed:
+                self._run(task)
+        results = []
+        exceptions = []
+        for task in tasks:
+            task.done.wait()
+            if task.exception is None:
+                results.append(task.result)
+            else:
+                exceptions.append(task.exception)
+        return results, exceptions
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Retrieve queue depth and task latency stats.
+
+        :return: dict of executor stats
+        """
+        with self.lock:
+            count = self.completed + self.active
+            mean_wait = self.total_wait / count if count else 0.0
+            mean_run = self.total_run / self.completed if self.completed else 0.0
+            return dict(
+                workers=self.workers,
+                threads=len(self.threads),
+                queued=self.queued,
+                active=self.active,
+                completed=self.completed,
+                mean_wait=mean_wait,
+                max_wait=self.max_wait,
+                mean_run=mean_run,
+            )
+
+    def shutdown(self) -> None:
+        """
+        Stop idle worker threads, workers are started again as needed.
+
+        :return: nothing
+        """
+        with self.lock:
+            workers = self.workers
+            self.workers = 0
+            self.condition.notify_all()
+        threads = list(self.threads)
+        for thread in threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout=1)
+        with self.lock:
+            self.workers = workers
@@ -17,6 +17,7 @@ from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type
 from core import constants, utils
 from core.emane.emanemanager import EmaneManager
 from core.emane.nodes import EmaneNet
+from core.emulator.broadcast import BatchHandler
 from core.emulator.data import (
     ConfigData,
     EventData,
@@ -35,7 +36,9 @@ from core.emulator.emudata import (
     link_config,
 )
 from core.emulator.enumerations import EventTypes, ExceptionLevels, LinkTypes, NodeTypes
+from core.emulator.executor import SessionExecutor
 from core.emulator.sessionconfig import SessionConfig
+from core.emulator.topology import LinkArgs, NodeArgs, TopologyBuilder
 from core.errors import CoreError
 from core.location.event import EventLoop
 from core.location.geo import GeoLocation
@@ -77,6 +80,8 @@ NODES = {
 }
 NODES_TYPE = {NODES[x]: x for x in NODES}
 CTRL_NET_ID = 9001
+# max number of config service commands running at once within a session
+MAX_SERVICE_COMMANDS = 32
 
 
 class Session:
@@ -106,12 +111,20 @@ class Session:
         self.thumbnail = None
         self.user = None
         self.event_loop = EventLoop()
+        self.executor = SessionExecutor()
+        self.service_commands = threading.BoundedSemaphore(MAX_SERVICE_COMMANDS)
 
         # dict of nodes: all nodes and nets
         self.node_id_gen = IdGen()
         self.nodes = {}
         self._nodes_lock = threading.Lock()
 
+        # versions of node and link changes, used to update cached views
+        self.version = 0
+        self.reset_version = 0
+        self.node_versions = {}
+        self._version_lock = threading.Lock()
+
         # TODO: should the default state be definition?
         self.state = EventTypes.NONE.value
         self._state_time = time.monotonic()
@@ -431,10 +444,28 @@ class Session:
                 node_one.lock.release()
             if node_two:
                 node_two.lock.release()
+            self.mark_changed(node_one, node_two, net_one, net_two)
 
         self.sdt.add_link(node_one_id, node_two_id, is_wireless=False)
         return node_one_interface, node_two_interface
 
+    def add_topology(
+        self, nodes: List[NodeArgs], links: List[LinkArgs]
+    ) -> Tuple[Dict[str, float], List[Exception]]:
+        """
+        Add nodes and then links between them in bulk. Wired links between local
+        nodes and bridged networks are planned up front and created using
+        batches of commands, other links are added as normal.
+
+        :param nodes: add node arguments, type, id, and options for each node
+        :param links: add link arguments, node ids, interface data, and options for
+            each link
+        :return: time taken in seconds by each phase and exceptions encountered
+        """
+        builder = TopologyBuilder(self)
+        exceptions = builder.build(nodes, links)
+        return builder.timings, exceptions
+
     def delete_link(
         self,
         node_one_id: int,
@@ -540,6 +571,7 @@ class Session:
                 node_one.lock.release()
             if node_two:
                 node_two.lock.release()
+            self.mark_changed(node_one, node_two, net_one, net_two)
 
         self.sdt.delete_link(node_one_id, node_two_id)
 
@@ -655,6 +687,7 @@ class Session:
                 node_one.lock.release()
             if node_two:
                 node_two.lock.release()
+            self.mark_changed(node_one, node_two, net_one, net_two)
 
     def add_node(
         self,
@@ -781,6 +814,7 @@ class Session:
         # update attributes
         node.canvas = options.canvas
         node.icon = options.icon
+        self.mark_changed(node)
 
         # provide edits to sdt
         self.sdt.edit_node(node, options.lon, options.lat, options.alt)
@@ -997,6 +1031,67 @@ class Session:
         for handler in self.shutdown_handlers:
             handler(self)
 
+        # stop idle worker threads
+        self.executor.shutdown()
+
+    def mark_changed(self, *nodes: Optional[NodeBase]) -> int:
+        """
+        Record a change to nodes or their links, for views of the session to
+        update. When no nodes are given, all nodes are considered changed.
+
+        :param nodes: changed nodes, None values are ignored
+        :return: new session version
+        """
+        node_ids = [x.id for x in nodes if x is not None]
+        return self.mark_changed_ids(*node_ids, reset=not nodes)
+
+    def mark_changed_ids(self, *node_ids: Optional[int], reset: bool = False) -> int:
+        """
+        Record a change to nodes or their links by id.
+
+        :param node_ids: changed node ids, None values are ignored
+        :param reset: True to consider all nodes changed, False otherwise
+        :return: new session version
+        """
+        with self._version_lock:
+            self.version += 1
+            if reset:
+                self.reset_version = self.version
+            for node_id in node_ids:
+                if node_id is not None:
+                    self.node_versions[node_id] = self.version
+            return self.version
+
+    def changes_since(self, version: int) -> Tuple[int, Optional[List[int]]]:
+        """
+        Retrieve nodes changed after a given version.
+
+        :param version: version to get changes after
+        :return: current version and changed node ids, None when all nodes
+            should be considered changed
+        """
+        with self._version_lock:
+            if self.reset_version > version:
+                return self.version, None
+            node_ids = [x for x, y in self.node_versions.items() if y > version]
+            return self.version, node_ids
+
+    def run_tasks(
+        self, funcs: List[Tuple[Callable, Iterable[Any], Dict[Any, Any]]]
+    ) -> Tuple[List[Any], List[Exception]]:
+        """
+        Run provided functions concurrently using the session executor, sized by
+        the workers session option. Tasks may run functions of their own using
+        this as well.
+
+        :param funcs: iterable that provides a func, args, kwargs
+        :return: results and exceptions from running functions with args and kwargs
+        """
+        workers = self.options.get_config_int("workers", default=0)
+        if workers != self.executor.workers:
+            self.executor.resize(workers)
+        return self.executor.run(funcs)
+
     def broadcast_event(self, event_data: EventData) -> None:
         """
         Handle event data that should be provided to event handler.
@@ -1026,10 +1121,29 @@ class Session:
         :param node_data: node data to send out
         :return: nothing
         """
-
+        self.mark_changed_ids(node_data.id)
         for handler in self.node_handlers:
             handler(node_data)
 
+    def broadcast_nodes(self, node_datas: List[NodeData]) -> None:
+        """
+        Handle a batch of node data that should be provided to node handlers.
+        Handlers supporting batches are provided the whole batch in one call, other
+        handlers are provided node data one at a time.
+
+        :param node_datas: node data to send out
+        :return: nothing
+        """
+        if not node_datas:
+            return
+        self.mark_changed_ids(*[x.id for x in node_datas])
+        for handler in self.node_handlers:
+            if isinstance(handler, BatchHandler):
+                handler.batch(node_datas)
+            else:
+                for node_data in node_datas:
+                    handler(node_data)
+
     def broadcast_file(self, file_data: FileData) -> None:
         """
         Handle file data that should be provided to file handlers.
@@ -1059,7 +1173,9 @@ class Session:
         :param link_data: link data to send out
         :return: nothing
         """
-
+        self.mark_changed_ids(
+            link_data.node1_id, link_data.node2_id, link_data.network_id
+        )
         for handler in self.link_handlers:
             handler(link_data)
 
@@ -1084,6 +1200,8 @@ class Session:
 
         self.state = state_value
         self._state_time = time.monotonic()
+        # node services and interfaces are set up between states
+        self.mark_changed()
         logging.info("changing session(%s) to state %s", self.id, state_name)
 
         self.write_state(state_value)
@@ -1383,6 +1501,7 @@ class Session:
                 node.shutdown()
                 raise CoreError(f"duplicate node id {node.id} for {node.name}")
             self.nodes[node.id] = node
+        self.mark_changed(node)
         return node
 
     def get_node(self, _id: int) -> NodeBase:
@@ -1412,6 +1531,12 @@ class Session:
                 node = self.nodes.pop(_id)
 
         if node:
+            # links of networks the node was attached to change as well
+            if isinstance(node, CoreNetworkBase):
+                self.mark_changed()
+            else:
+                nets = [x.net for x in node.netifs()]
+                self.mark_changed(node, *nets)
             node.shutdown()
             self.check_shutdown()
             self.sdt.delete_node(_id)
@@ -1428,7 +1553,8 @@ class Session:
                 _, node = self.nodes.popitem()
                 self.sdt.delete_node(node.id)
                 funcs.append((node.shutdown, [], {}))
-            utils.threadpool(funcs)
+            self.run_tasks(funcs)
+        self.mark_changed()
         self.node_id_gen.id = 0
 
     def write_nodes(self) -> None:
@@ -1582,7 +1708,7 @@ class Session:
                     continue
                 args = (node,)
                 funcs.append((self.services.stop_services, args, {}))
-            utils.threadpool(funcs)
+            self.run_tasks(funcs)
 
         # shutdown emane
         self.emane.shutdown()
@@ -1652,9 +1778,11 @@ class Session:
                 if isinstance(node, CoreNodeBase) and not isinstance(node, Rj45Node):
                     args = (node,)
                     funcs.append((self.boot_node, args, {}))
-            results, exceptions = utils.threadpool(funcs)
+            with self.distributed.staging():
+                results, exceptions = self.run_tasks(funcs)
             total = time.monotonic() - start
             logging.debug("boot run time: %s", total)
+            logging.debug("boot executor stats: %s", self.executor.stats())
         if not exceptions:
             self.update_control_interface_hosts()
         return exceptions
@@ -56,6 +56,18 @@ class SessionConfig(ConfigurableManager, ConfigurableOptions):
             default=Sdt.DEFAULT_SDT_URL,
             label="SDT3D URL",
         ),
+        Configuration(
+            _id="sdtthreshold",
+            _type=ConfigDataTypes.UINT32,
+            default="0",
+            label="SDT3D Min Node Movement",
+        ),
+        Configuration(
+            _id="workers",
+            _type=ConfigDataTypes.UINT32,
+            default="0",
+            label="Worker Threads (0 = cpu based)",
+        ),
     ]
     config_type = RegisterTlvs.UTILITY.value
 
@@ -0,0 +1,337 @@
+"""
+Bulk creation of session topologies. Interfaces for wired links are planned up
+front, with their commands ran in large batches on the host and per node
+namespace, rather than link by link.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+
+from core import utils
+from core.emulator.emudata import InterfaceData, LinkOptions, NodeOptions, link_config
+from core.emulator.enumerations import LinkTypes, NodeTypes
+from core.errors import CoreCommandError, CoreError
+from core.nodes.base import CoreNetworkBase, CoreNode, NodeBase
+from core.nodes.interface import Veth
+from core.nodes.netclient import get_net_client
+from core.nodes.network import HubNode, PtpNet, SwitchNode
+
+if TYPE_CHECKING:
+    from core.emulator.session import Session
+
+NodeArgs = Tuple[NodeTypes, int, NodeOptions]
+LinkArgs = Tuple[int, int, InterfaceData, InterfaceData, LinkOptions]
+
+# networks that only bridge attached interfaces, that can be planned
+PLANNED_NETWORKS = (SwitchNode, HubNode, PtpNet)
+
+
+class TopologyInterface:
+    """
+    Planned interface for a node on a network.
+    """
+
+    def __init__(
+        self,
+        node: CoreNode,
+        net: CoreNetworkBase,
+        interface_data: InterfaceData,
+        link_options: LinkOptions,
+        config: bool,
+    ) -> None:
+        """
+        Create a TopologyInterface instance.
+
+        :param node: node to create interface for
+        :param net: network interface is attached to
+        :param interface_data: interface data
+        :param link_options: options for link
+        :param config: True to configure link options on interface, False otherwise
+        """
+        self.node = node
+        self.net = net
+        self.interface_data = interface_data
+        self.link_options = link_options
+        self.config = config
+        self.ifindex = None
+        self.ifname = None
+        self.veth = None
+
+
+class TopologyBuilder:
+    """
+    Builds nodes and links for a session in phases, recording time taken by each.
+    Links not able to be planned, such as wireless, emane, tunnel or distributed
+    links, are created using the session as normal.
+    """
+
+    def __init__(self, session: "Session") -> None:
+        """
+        Create a TopologyBuilder instance.
+
+        :param session: session to build topology for
+        """
+        self.session = session
+        use_ovs = session.options.get_config("ovs") == "True"
+        self.net_client = get_net_client(use_ovs, utils.cmd, True)
+        self.timings = OrderedDict()
+        self.interfaces = []
+        self.planned = []
+        self.unplanned = []
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """
+        Record the time taken by a phase.
+
+        :param name: name of phase
+        :return: nothing
+        """
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.timings[name] = time.monotonic() - start
+
+    def build(self, nodes: List[NodeArgs], links: List[LinkArgs]) -> List[Exception]:
+        """
+        Create provided nodes and then links.
+
+        :param nodes: add node arguments for nodes to create
+        :param links: add link arguments for links to create
+        :return: exceptions encountered
+        """
+        with self.timer("nodes"):
+            funcs = [(self.session.add_node, args, {}) for args in nodes]
+            _, exceptions = self.session.run_tasks(funcs)
+        if exceptions:
+            return exceptions
+        try:
+            with self.timer("plan"):
+                self.plan(links)
+            with self.timer("host"):
+                self.create_interfaces()
+            with self.timer("namespaces"):
+                exceptions = self.configure_nodes()
+            if exceptions:
+                return exceptions
+            with self.timer("config"):
+                self.configure_links()
+        except (CoreCommandError, CoreError, ValueError) as e:
+            logging.exception("error creating planned links")
+            return [e]
+        with self.timer("links"):
+            funcs = [(self.session.add_link, args, {}) for args in self.unplanned]
+            _, exceptions = self.session.run_tasks(funcs)
+        logging.info("topology build %s timings: %s", self.stats(), dict(self.timings))
+        return exceptions
+
+    def _planned_node(self, node: Optional[NodeBase]) -> bool:
+        """
+        Check if a node can have planned interfaces.
+
+        :param node: node to check
+        :return: True if node can be planned, False otherwise
+        """
+        return type(node) is CoreNode and node.up and node.server is None
+
+    def _planned_net(self, net: Optional[CoreNetworkBase]) -> bool:
+        """
+        Check if a network can have planned interfaces attached.
+
+        :param net: network to check
+        :return: True if network can be planned, False otherwise
+        """
+        return type(net) in PLANNED_NETWORKS and net.up and net.server is None
+
+    def plan(self, links: List[LinkArgs]) -> None:
+        """
+        Determine links that can be planned, creating the point to point networks
+        they need and the interfaces to create.
+
+        :param links: add link arguments for links to create
+        :return: nothing
+        """
+        ptp_links = []
+        for args in links:
+            node_one_id, node_two_id, interface_one, interface_two, options = args
+            if not options:
+                options = LinkOptions()
+            if options.type == LinkTypes.WIRELESS:
+                self.unplanned.append(args)
+                continue
+            node_one, node_two, net_one, net_two, tunnel = self.session._link_nodes(
+                node_one_id, node_two_id
+            )
+            if tunnel or net_two:
+                self.unplanned.append(args)
+            elif node_one and node_two:
+                if (
+                    self._planned_node(node_one)
+                    and self._planned_node(node_two)
+                    and interface_one
+                    and interface_two
+                ):
+                    ptp_links.append((node_one, node_two, args, options))
+                else:
+                    self.unplanned.append(args)
+            elif node_one and self._planned_node(node_one) and interface_one:
+                if self._planned_net(net_one):
+                    self.add_interface(node_one, net_one, interface_one, options, True)
+                    self.planned.append(args)
+                else:
+                    self.unplanned.append(args)
+            elif node_two and self._planned_node(node_two) and interface_two:
+                if self._planned_net(net_one):
+                    config = not options.unidirectional
+                    self.add_interface(
+                        node_two, net_one, interface_two, options, config
+                    )
+                    self.planned.append(args)
+                else:
+                    self.unplanned.append(args)
+            else:
+                self.unplanned.append(args)
+
+        # create all needed point to point networks together
+        funcs = [(self.session.create_node, (PtpNet,), {}) for _ in ptp_links]
+        nets, exceptions = self.session.run_tasks(funcs)
+        if exceptions:
+            raise exceptions[0]
+        for net, ptp_link in zip(nets, ptp_links):
+            node_one, node_two, args, options = ptp_link
+            _, _, interface_one, interface_two, _ = args
+            config = not options.unidirectional
+            self.add_interface(node_one, net, interface_one, options, True)
+            self.add_interface(node_two, net, interface_two, options, config)
+            self.planned.append(args)
+
+    def add_interface(
+        self,
+        node: CoreNode,
+        net: CoreNetworkBase,
+        interface_data: InterfaceData,
+        link_options: LinkOptions,
+        config: bool,
+    ) -> None:
+        """
+        Plan an interface for a node, adding it to the node without creating it.
+
+        :param node: node to create interface for
+        :param net: network interface is attached to
+        :param interface_data: interface data
+        :param link_options: options for link
+        :param config: True to configure link options on interface, False otherwise
+        :return: nothing
+        :raises ValueError: when the interface index already exists
+        """
+        interface = TopologyInterface(node, net, interface_data, link_options, config)
+        with node.lock:
+            ifindex = interface_data.id
+            if ifindex is None:
+                ifindex = node.newifindex()
+            ifname = interface_data.name
+            if ifname is None:
+                ifname = f"eth{ifindex}"
+            name, localname = node.veth_names(ifindex)
+            veth = Veth(self.session, node, name, localname, start=False)
+            # share the host net client, so commands for all interfaces are batched
+            veth.net_client = self.net_client
+            node.addnetif(veth, ifindex)
+        interface.ifindex = ifindex
+        interface.ifname = ifname
+        interface.veth = veth
+        self.interfaces.append(interface)
+
+    def create_interfaces(self) -> None:
+        """
+        Create all planned veth pairs, move them into their nodes and attach them
+        to their networks, using host batches.
+
+        :return: nothing
+        :raises CoreCommandError: when there is a command exception
+        """
+        with self.net_client.batch():
+            for interface in self.interfaces:
+                interface.veth.startup()
+        # ifindex and mac are kept when moved, read them from host sysfs
+        for interface in self.interfaces:
+            veth = interface.veth
+            veth.flow_id = int(self.net_client.get_ifindex(veth.name))
+            veth.sethwaddr(self.net_client.get_mac(veth.name))
+        with self.net_client.batch():
+            for interface in self.interfaces:
+                node = interface.node
+                self.net_client.device_ns(interface.veth.name, str(node.pid))
+                node.attachnet(interface.ifindex, interface.net)
+        nets = {x.net for x in self.interfaces}
+        self.session.mark_changed(*nets)
+
+    def configure_nodes(self) -> List[Exception]:
+        """
+        Rename and configure planned interfaces, using a batch per node.
+
+        :return: exceptions encountered
+        """
+        node_interfaces = {}
+        for interface in self.interfaces:
+            node_interfaces.setdefault(interface.node, []).append(interface)
+        funcs = []
+        for node, interfaces in node_interfaces.items():
+            funcs.append((self.configure_node, (node, interfaces), {}))
+        _, exceptions = self.session.run_tasks(funcs)
+        return exceptions
+
+    def configure_node(
+        self, node: CoreNode, interfaces: List[TopologyInterface]
+    ) -> None:
+        """
+        Rename and configure planned interfaces within a node.
+
+        :param node: node to configure
+        :param interfaces: planned interfaces for node
+        :return: nothing
+        :raises CoreCommandError: when there is a command exception
+        """
+        with node.lock:
+            with node.node_net_client.batch():
+                for interface in interfaces:
+                    interface_data = interface.interface_data
+                    node.node_net_client.device_name(
+                        interface.veth.name, interface.ifname
+                    )
+                    interface.veth.name = interface.ifname
+                    if interface_data.mac:
+                        node.sethwaddr(interface.ifindex, interface_data.mac)
+                    for address in interface_data.get_addresses():
+                        node.addaddr(interface.ifindex, address)
+                    node.ifup(interface.ifindex)
+            names = [x.ifname for x in interfaces]
+            node.node_net_client.checksums_off_devices(names)
+
+    def configure_links(self) -> None:
+        """
+        Apply link options for planned interfaces and notify sdt of links.
+
+        :return: nothing
+        """
+        for interface in self.interfaces:
+            if interface.config:
+                link_config(interface.net, interface.veth, interface.link_options)
+        for node_one_id, node_two_id, _, _, _ in self.planned:
+            self.session.sdt.add_link(node_one_id, node_two_id, is_wireless=False)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Retrieve counts of planned interfaces and links.
+
+        :return: dict of counts
+        """
+        return dict(
+            interfaces=len(self.interfaces),
+            planned=len(self.planned),
+            unplanned=len(self.unplanned),
+        )
@@ -4,6 +4,7 @@ Incorporate grpc into python tkinter GUI
 import json
 import logging
 import os
+import threading
 from pathlib import Path
 from tkinter import messagebox
 from typing import TYPE_CHECKING, Dict, List
@@ -27,6 +28,7 @@ if TYPE_CHECKING:
     from core.gui.app import Application
 
 GUI_SOURCE = "gui"
+HEARTBEAT_INTERVAL = 5
 OBSERVERS = {
     "processes": "ps",
     "ifconfig": "ifconfig",
@@ -96,6 +98,8 @@ class CoreClient:
         self.mobility_players = {}
         self.handling_throughputs = None
         self.handling_events = None
+        self.session_lost = False
+        self.heartbeat = None
 
         self.xml_dir = None
         self.xml_file = None
@@ -104,20 +108,68 @@ class CoreClient:
 
     @property
     def client(self):
-        if self.session_id:
-            response = self._client.check_session(self.session_id)
-            if not response.result:
-                throughputs_enabled = self.handling_throughputs is not None
-                self.cancel_throughputs()
-                self.cancel_events()
-                self._client.create_session(self.session_id)
-                self.handling_events = self._client.events(
-                    self.session_id, self.handle_events
-                )
-                if throughputs_enabled:
-                    self.enable_throughputs()
+        if self.session_id and self.session_lost:
+            self.recover_session()
         return self._client
 
+    def recover_session(self):
+        """
+        Recreate the current session when it no longer exists and subscribe to its
+        events and throughputs again.
+        """
+        logging.info("recovering lost session(%s)", self.session_id)
+        self.session_lost = False
+        throughputs_enabled = self.handling_throughputs is not None
+        self.cancel_throughputs()
+        response = self._client.check_session(self.session_id)
+        if not response.result:
+            self._client.create_session(self.session_id)
+        self.start_events()
+        if throughputs_enabled:
+            self.enable_throughputs()
+
+    def start_events(self):
+        self.cancel_events()
+        self.handling_events = self._client.events(self.session_id, self.handle_events)
+
+    def start_heartbeat(self):
+        """
+        Periodically check the current session still exists in the background,
+        rather than before every request.
+        """
+        self.stop_heartbeat()
+        self.heartbeat = threading.Event()
+        thread = threading.Thread(
+            target=self.run_heartbeat, args=(self.heartbeat,), daemon=True
+        )
+        thread.start()
+
+    def stop_heartbeat(self):
+        if self.heartbeat:
+            self.heartbeat.set()
+            self.heartbeat = None
+
+    def run_heartbeat(self, stop: threading.Event):
+        while not stop.wait(HEARTBEAT_INTERVAL):
+            self.check_session()
+
+    def check_session(self):
+        """
+        Check the current session still exists, marking it as lost otherwise, to
+        be recovered on next use of the client. Ran outside of the gui thread.
+        """
+        session_id = self.session_id
+        if not session_id or self.session_lost:
+            return
+        try:
+            response = self._client.check_session(session_id)
+        except grpc.RpcError as e:
+            logging.debug("check session error: %s", e.details())
+            return
+        if not response.result and session_id == self.session_id:
+            logging.info("session(%s) no longer exists", session_id)
+            self.session_lost = True
+
     def reset(self):
         # helpers
         self.interfaces_manager.reset()
@@ -178,6 +230,9 @@ class CoreClient:
             session_event = event.session_event
             if session_event.event <= core_pb2.SessionState.SHUTDOWN:
                 self.state = event.session_event.event
+                # shutdown is broadcast when a session is stopped or deleted
+                if session_event.event == core_pb2.SessionState.SHUTDOWN:
+                    self.check_session()
             elif session_event.event in {7, 8, 9}:
                 node_id = session_event.node_id
                 dialog = self.mobility_players.get(node_id)
@@ -257,6 +312,7 @@ class CoreClient:
         logging.info("join session(%s)", session_id)
         # update session and title
         self.session_id = session_id
+        self.session_lost = False
         self.master.title(f"CORE Session({self.session_id})")
 
         # clear session data
@@ -267,9 +323,8 @@ class CoreClient:
             response = self.client.get_session(self.session_id)
             session = response.session
             self.state = session.state
-            self.handling_events = self.client.events(
-                self.session_id, self.handle_events
-            )
+            self.start_events()
+            self.start_heartbeat()
 
             # get location
             if query_location:
@@ -766,6 +821,7 @@ class CoreClient:
         Clean ups when done using grpc
         """
         logging.debug("close grpc")
+        self.stop_heartbeat()
         self.client.close()
 
     def next_node_id(self) -> int:
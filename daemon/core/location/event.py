@@ -1,74 +1,62 @@
 """
-event.py: event loop implementation using a heap queue and threads.
+event.py: event loop implementation using a heap queue and a scheduler thread.
 """
 
 import heapq
+import logging
 import threading
 import time
 from functools import total_ordering
-from typing import Any, Callable
+from typing import Any, Callable, Dict, Optional
 
 
-class Timer(threading.Thread):
+class EventStats:
     """
-    Based on threading.Timer but cancel() returns if the timer was
-    already running.
+    Tracks lateness (jitter) of events, the time between when an event was
+    scheduled to run and when it actually ran.
     """
 
-    def __init__(
-        self, interval: float, function: Callable, args: Any = None, kwargs: Any = None
-    ) -> None:
+    def __init__(self) -> None:
         """
-        Create a Timer instance.
-
-        :param interval: time interval
-        :param function: function to call when timer finishes
-        :param args: function arguments
-        :param kwargs: function keyword arguments
+        Create an EventStats instance.
         """
-        super().__init__()
-        self.interval = interval
-        self.function = function
-
-        self.finished = threading.Event()
-        self._running = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.last = 0.0
 
-        # validate arguments were provided
-        if args:
-            self.args = args
-        else:
-            self.args = []
+    def update(self, lateness: float) -> None:
+        """
+        Record the lateness of an event that was ran.
 
-        # validate keyword arguments were provided
-        if kwargs:
-            self.kwargs = kwargs
-        else:
-            self.kwargs = {}
+        :param lateness: seconds an event ran after its scheduled time
+        :return: nothing
+        """
+        self.count += 1
+        self.total += lateness
+        self.maximum = max(self.maximum, lateness)
+        self.last = lateness
 
-    def cancel(self) -> bool:
+    @property
+    def mean(self) -> float:
         """
-        Stop the timer if it hasn't finished yet.  Return False if
-        the timer was already running.
+        Mean lateness of events ran.
 
-        :return: True if canceled, False otherwise
+        :return: mean lateness in seconds
         """
-        locked = self._running.acquire(False)
-        if locked:
-            self.finished.set()
-            self._running.release()
-        return locked
+        if not self.count:
+            return 0.0
+        return self.total / self.count
 
-    def run(self) -> None:
+    def to_dict(self) -> Dict[str, float]:
         """
-        Run the timer.
+        Provides a dict representation of the current stats.
 
-        :return: nothing
+        :return: dict of current stats
         """
-        self.finished.wait(self.interval)
-        with self._running:
-            if not self.finished.is_set():
-                self.function(*self.args, **self.kwargs)
-            self.finished.set()
+        return dict(
+            count=self.count, mean=self.mean, maximum=self.maximum, last=self.last
+        )
 
 
 @total_ordering
@@ -95,12 +83,14 @@ class Event:
         self.args = args
         self.kwds = kwds
         self.canceled = False
+        # set while the event is within an event loop queue
+        self.queued = False
+        # seconds between runs of periodic events, None for single events
+        self.interval = None
+        self.stats = EventStats()
 
     def __lt__(self, other: "Event") -> bool:
-        result = self.time < other.time
-        if result:
-            result = self.eventnum < other.eventnum
-        return result
+        return (self.time, self.eventnum) < (other.time, other.eventnum)
 
     def run(self) -> None:
         """
@@ -114,17 +104,18 @@ class Event:
 
     def cancel(self) -> None:
         """
-        Cancel event.
+        Cancel event, canceled events are discarded when they reach the head
+        of the event queue.
 
         :return: nothing
         """
-        # XXX not thread-safe
         self.canceled = True
 
 
 class EventLoop:
     """
-    Provides an event loop for running events.
+    Provides an event loop for running events, using a single scheduler thread
+    waiting on the head of the event queue.
     """
 
     def __init__(self) -> None:
@@ -132,54 +123,100 @@ class EventLoop:
         Creates a EventLoop instance.
         """
         self.lock = threading.RLock()
+        self.condition = threading.Condition(self.lock)
         self.queue = []
         self.eventnum = 0
-        self.timer = None
+        self.canceled = 0
+        self.thread = None
         self.running = False
         self.start = None
+        self.lateness = EventStats()
 
     def __run_events(self) -> None:
         """
-        Run events.
+        Scheduler thread target, waits for the event at the head of the queue to
+        become due and runs it.
 
         :return: nothing
         """
-        schedule = False
+        thread = threading.current_thread()
         while True:
             with self.lock:
-                if not self.running or not self.queue:
+                # a stopped loop may have been restarted with a new thread
+                if not self.running or self.thread is not thread:
                     break
+                if not self.queue:
+                    self.condition.wait()
+                    continue
                 now = time.monotonic()
-                if self.queue[0].time > now:
-                    schedule = True
-                    break
-                event = heapq.heappop(self.queue)
-            if event.time > now:
-                raise ValueError("invalid event time: %s > %s", event.time, now)
-            event.run()
+                head = self.queue[0]
+                if head.canceled:
+                    heapq.heappop(self.queue)
+                    head.queued = False
+                    self.canceled -= 1
+                    continue
+                if head.time > now:
+                    self.condition.wait(head.time - now)
+                    continue
+                self.lateness.update(now - head.time)
+                head.stats.update(now - head.time)
+                heapq.heappop(self.queue)
+                head.queued = False
+            try:
+                head.run()
+            except Exception:
+                logging.exception("error running event: %s", head.func)
+            if head.interval is not None:
+                self.__reschedule(head)
+
+    def __reschedule(self, event: Event) -> None:
+        """
+        Queue the next run of a periodic event, unless it was canceled or the loop
+        stopped while it ran. Runs missed by a late event are skipped.
 
+        :param event: periodic event that ran
+        :return: nothing
+        """
         with self.lock:
-            self.timer = None
-            if schedule:
-                self.__schedule_event()
+            if event.canceled or event.queued or not self.running:
+                return
+            if self.thread is not threading.current_thread():
+                return
+            event.time += event.interval
+            now = time.monotonic()
+            if event.time < now:
+                event.time = now
+            self.__add_event(event)
 
-    def __schedule_event(self) -> None:
+    def __compact(self) -> None:
         """
-        Schedule event.
+        Remove canceled events from the queue, once they make up a majority of it.
 
         :return: nothing
         """
-        with self.lock:
-            if not self.running:
-                raise ValueError("scheduling event while not running")
-            if not self.queue:
-                return
-            delay = self.queue[0].time - time.monotonic()
-            if self.timer:
-                raise ValueError("timer was already set")
-            self.timer = Timer(delay, self.__run_events)
-            self.timer.daemon = True
-            self.timer.start()
+        if self.canceled * 2 > len(self.queue):
+            queue = []
+            for event in self.queue:
+                if event.canceled:
+                    event.queued = False
+                else:
+                    queue.append(event)
+            heapq.heapify(queue)
+            self.queue = queue
+            self.canceled = 0
+
+    def __add_event(self, event: Event) -> Event:
+        """
+        Add event to the queue and wake the scheduler when it becomes the new head.
+
+        :param event: event to add
+        :return: added event
+        """
+        heapq.heappush(self.queue, event)
+        event.queued = True
+        if self.queue[0] is event:
+            self.condition.notify()
+        return event
 
     def run(self) -> None:
         """
@@ -194,7 +231,8 @@ class EventLoop:
             self.start = time.monotonic()
             for event in self.queue:
                 event.time += self.start
-            self.__schedule_event()
+            self.thread = threading.Thread(target=self.__run_events, daemon=True)
+            self.thread.start()
 
     def stop(self) -> None:
         """
@@ -205,15 +243,20 @@ class EventLoop:
         with self.lock:
             if not self.running:
                 return
+            logging.debug("event loop lateness stats: %s", self.stats())
+            for event in self.queue:
+                event.queued = False
             self.queue = []
             self.eventnum = 0
-            if self.timer is not None:
-                self.timer.cancel()
-                self.timer = None
+            self.canceled = 0
             self.running = False
             self.start = None
+            self.thread = None
+            self.condition.notify_all()
 
-    def add_event(self, delaysec: float, func: Callable, *args: Any, **kwds: Any):
+    def add_event(
+        self, delaysec: float, func: Callable, *args: Any, **kwds: Any
+    ) -> Event:
         """
         Add an event to the event loop.
 
@@ -230,17 +273,56 @@ class EventLoop:
             if self.running:
                 evtime += time.monotonic()
             event = Event(eventnum, evtime, func, *args, **kwds)
+            return self.__add_event(event)
 
-            if self.queue:
-                prevhead = self.queue[0]
-            else:
-                prevhead = None
-
-            heapq.heappush(self.queue, event)
-            head = self.queue[0]
-            if prevhead is not None and prevhead != head:
-                if self.timer is not None and self.timer.cancel():
-                    self.timer = None
-            if self.running and self.timer is None:
-                self.__schedule_event()
-        return event
+    def add_periodic_event(
+        self, delaysec: float, interval: float, func: Callable, *args: Any, **kwds: Any
+    ) -> Event:
+        """
+        Add an event to the event loop that runs every interval, until canceled
+        using cancel_event.
+
+        :param delaysec: delay in seconds before the first run of the event
+        :param interval: seconds between runs of the event
+        :param func: event function
+        :param args: event arguments
+        :param kwds: event keyword arguments
+        :return: created event
+        """
+        if interval <= 0:
+            raise ValueError(f"invalid periodic event interval: {interval}")
+        with self.lock:
+            event = self.add_event(delaysec, func, *args, **kwds)
+            event.interval = float(interval)
+            return event
+
+    def stats(self, event: Optional[Event] = None) -> Dict[str, float]:
+        """
+        Retrieve lateness stats, the seconds events ran after their scheduled
+        time, while the loop is running.
+
+        :param event: event to get stats for, all events ran when not provided
+        :return: dict of lateness stats
+        """
+        with self.lock:
+            if event is None:
+                return self.lateness.to_dict()
+            return event.stats.to_dict()
+
+    def cancel_event(self, event: Event) -> None:
+        """
+        Cancel an event, canceled events still queued are removed once they make
+        up most of the queue.
+
+        :param event: event to cancel
+        :return: nothing
+        """
+        with self.lock:
+            if event.canceled:
+                return
+            event.cancel()
+            if not event.queued:
+                return
+            self.canceled += 1
+            self.__compact()
+            self.condition.notify()
@@ -2,8 +2,9 @@
 Provides conversions from x,y,z to lon,lat,alt.
 """
 
-import logging
-from typing import Tuple
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Tuple
 
 import pyproj
 
@@ -22,6 +23,8 @@ class GeoLocation:
 
     name = "location"
     config_type = RegisterTlvs.UTILITY.value
+    # max number of recent conversions to cache
+    cache_size = 1024
 
     def __init__(self) -> None:
         """
@@ -35,6 +38,10 @@ class GeoLocation:
         self.refgeo = (0.0, 0.0, 0.0)
         self.refxyz = (0.0, 0.0, 0.0)
         self.refscale = 1.0
+        self.lock = threading.Lock()
+        self.geo_cache = OrderedDict()
+        self.xyz_cache = OrderedDict()
+        self.cache_reference = None
 
     def setrefgeo(self, lat: float, lon: float, alt: float) -> None:
         """
@@ -80,6 +87,65 @@ class GeoLocation:
             return 0.0
         return SCALE_FACTOR * (value / self.refscale)
 
+    def _check_cache(self) -> None:
+        """
+        Clear cached conversions when reference values have changed since they
+        were cached. Reference values may be set directly, so they are compared
+        rather than tracked.
+
+        :return: nothing
+        """
+        reference = (self.refproj, self.refgeo, self.refxyz, self.refscale)
+        if reference != self.cache_reference:
+            self.geo_cache.clear()
+            self.xyz_cache.clear()
+            self.cache_reference = reference
+
+    def _cache_lookup(
+        self, cache: OrderedDict, keys: List[Tuple[float, float, float]]
+    ) -> Tuple[List[Optional[Tuple[float, float, float]]], List[int]]:
+        """
+        Lookup cached conversions.
+
+        :param cache: cache to lookup conversions in
+        :param keys: values to lookup conversions for
+        :return: cached conversions, None when missing, and indexes of missing
+            conversions
+        """
+        results = []
+        missing = []
+        with self.lock:
+            self._check_cache()
+            for i, key in enumerate(keys):
+                result = cache.get(key)
+                if result is None:
+                    missing.append(i)
+                else:
+                    cache.move_to_end(key)
+                results.append(result)
+        return results, missing
+
+    def _cache_update(
+        self,
+        cache: OrderedDict,
+        keys: List[Tuple[float, float, float]],
+        results: List[Tuple[float, float, float]],
+    ) -> None:
+        """
+        Add conversions to a cache, removing the least recently used conversions
+        when full.
+
+        :param cache: cache to add conversions to
+        :param keys: values converted
+        :param results: conversions of values
+        :return: nothing
+        """
+        with self.lock:
+            for key, result in zip(keys, results):
+                cache[key] = result
+            while len(cache) > self.cache_size:
+                cache.popitem(last=False)
+
     def getxyz(self, lat: float, lon: float, alt: float) -> Tuple[float, float, float]:
         """
         Convert provided lon,lat,alt to x,y,z.
@@ -89,16 +155,42 @@ class GeoLocation:
         :param alt: altitude value
         :return: x,y,z representation of provided values
         """
-        logging.debug("input lon,lat,alt(%s, %s, %s)", lon, lat, alt)
-        px, py = self.to_pixels.transform(lon, lat)
-        px -= self.refproj[0]
-        py -= self.refproj[1]
-        pz = alt - self.refproj[2]
-        x = self.meters2pixels(px) + self.refxyz[0]
-        y = -(self.meters2pixels(py) + self.refxyz[1])
-        z = self.meters2pixels(pz) + self.refxyz[2]
-        logging.debug("result x,y,z(%s, %s, %s)", x, y, z)
-        return x, y, z
+        xs, ys, zs = self.getxyz_many([lat], [lon], [alt])
+        return xs[0], ys[0], zs[0]
+
+    def getxyz_many(
+        self, lats: Sequence[float], lons: Sequence[float], alts: Sequence[float]
+    ) -> Tuple[List[float], List[float], List[float]]:
+        """
+        Convert provided lon,lat,alt values to x,y,z values, using a single
+        transform for all values not recently converted.
+
+        :param lats: latitude values
+        :param lons: longitude values
+        :param alts: altitude values
+        :return: x,y,z values representing provided values
+        """
+        keys = list(zip(lats, lons, alts))
+        results, missing = self._cache_lookup(self.xyz_cache, keys)
+        if missing:
+            pxs, pys = self.to_pixels.transform(
+                [keys[i][1] for i in missing], [keys[i][0] for i in missing]
+            )
+            converted = []
+            for i, px, py in zip(missing, pxs, pys):
+                px -= self.refproj[0]
+                py -= self.refproj[1]
+                pz = keys[i][2] - self.refproj[2]
+                x = self.meters2pixels(px) + self.refxyz[0]
+                y = -(self.meters2pixels(py) + self.refxyz[1])
+                z = self.meters2pixels(pz) + self.refxyz[2]
+                results[i] = (x, y, z)
+                converted.append(results[i])
+            self._cache_update(self.xyz_cache, [keys[i] for i in missing], converted)
+        xs = [x for x, _, _ in results]
+        ys = [y for _, y, _ in results]
+        zs = [z for _, _, z in results]
+        return xs, ys, zs
 
     def getgeo(self, x: float, y: float, z: float) -> Tuple[float, float, float]:
         """
@@ -109,16 +201,46 @@ class GeoLocation:
         :param z: z value
         :return: lat,lon,alt representation of provided values
         """
-        logging.debug("input x,y(%s, %s)", x, y)
-        x -= self.refxyz[0]
-        y = -(y - self.refxyz[1])
-        if z is None:
-            z = self.refxyz[2]
-        else:
-            z -= self.refxyz[2]
-        px = self.refproj[0] + self.pixels2meters(x)
-        py = self.refproj[1] + self.pixels2meters(y)
-        lon, lat = self.to_geo.transform(px, py)
-        alt = self.refgeo[2] + self.pixels2meters(z)
-        logging.debug("result lon,lat,alt(%s, %s, %s)", lon, lat, alt)
-        return lat, lon, alt
+        lats, lons, alts = self.getgeo_many([x], [y], [z])
+        return lats[0], lons[0], alts[0]
+
+    def getgeo_many(
+        self,
+        xs: Sequence[float],
+        ys: Sequence[float],
+        zs: Sequence[Optional[float]],
+    ) -> Tuple[List[float], List[float], List[float]]:
+        """
+        Convert provided x,y,z values to lon,lat,alt values, using a single
+        transform for all values not recently converted.
+
+        :param xs: x values
+        :param ys: y values
+        :param zs: z values, None values use the reference z value
+        :return: lat,lon,alt values representing provided values
+        """
+        keys = list(zip(xs, ys, zs))
+        results, missing = self._cache_lookup(self.geo_cache, keys)
+        if missing:
+            pxs = []
+            pys = []
+            for i in missing:
+                x, y, _z = keys[i]
+                pxs.append(self.refproj[0] + self.pixels2meters(x - self.refxyz[0]))
+                pys.append(self.refproj[1] + self.pixels2meters(self.refxyz[1] - y))
+            lons, lats = self.to_geo.transform(pxs, pys)
+            converted = []
+            for i, lon, lat in zip(missing, lons, lats):
+                z = keys[i][2]
+                if z is None:
+                    z = self.refxyz[2]
+                else:
+                    z -= self.refxyz[2]
+                alt = self.refgeo[2] + self.pixels2meters(z)
+                results[i] = (lat, lon, alt)
+                converted.append(results[i])
+            self._cache_update(self.geo_cache, [keys[i] for i in missing], converted)
+        lats = [lat for lat, _, _ in results]
+        lons = [lon for _, lon, _ in results]
+        alts = [alt for _, _, alt in results]
+        return lats, lons, alts
@@ -9,7 +9,7 @@ import os
 import threading
 import time
 from functools import total_ordering
-from typing import TYPE_CHECKING, Dict, List, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
 
 from core import utils
 from core.config import ConfigGroup, ConfigurableOptions, Configuration, ModelManager
@@ -22,12 +22,21 @@ from core.emulator.enumerations import (
     RegisterTlvs,
 )
 from core.errors import CoreError
+from core.location.trace import Ns2Trace
 from core.nodes.base import CoreNode, NodeBase
 from core.nodes.interface import CoreInterface
 
 if TYPE_CHECKING:
     from core.emulator.session import Session
 
+InterfacePair = Tuple[CoreInterface, CoreInterface]
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+    logging.debug("numpy not installed, using per pair range calculations")
+
 
 class MobilityManager(ModelManager):
     """
@@ -215,6 +224,7 @@ class WirelessModel(ConfigurableOptions):
     config_type = RegisterTlvs.WIRELESS.value
     bitmap = None
     position_callback = None
+    link_callback = None
 
     def __init__(self, session: "Session", _id: int):
         """
@@ -257,6 +267,206 @@ class WirelessModel(ConfigurableOptions):
         pass
 
 
+class RangeGrid:
+    """
+    Uniform grid spatial index of interface positions, using cells the size of the
+    wireless range, so that only interfaces within neighboring cells can be
+    within range of each other.
+    """
+
+    def __init__(self, size: float) -> None:
+        """
+        Create a RangeGrid instance.
+
+        :param size: size of grid cells, the wireless range
+        """
+        self.size = max(size, 1)
+        self.cells = {}
+        self.netifs = {}
+
+    def cell(self, x: float, y: float) -> Tuple[int, int]:
+        """
+        Retrieve the cell a position falls within.
+
+        :param x: x position
+        :param y: y position
+        :return: cell position
+        """
+        return int(x // self.size), int(y // self.size)
+
+    def set_position(self, netif: CoreInterface, x: float, y: float) -> None:
+        """
+        Add or move an interface within the grid.
+
+        :param netif: network interface to set position for
+        :param x: x position
+        :param y: y position
+        :return: nothing
+        """
+        cell = self.cell(x, y)
+        current = self.netifs.get(netif)
+        if current == cell:
+            return
+        if current is not None:
+            self.remove(netif)
+        self.netifs[netif] = cell
+        self.cells.setdefault(cell, set()).add(netif)
+
+    def remove(self, netif: CoreInterface) -> None:
+        """
+        Remove an interface from the grid.
+
+        :param netif: network interface to remove
+        :return: nothing
+        """
+        cell = self.netifs.pop(netif, None)
+        if cell is None:
+            return
+        netifs = self.cells[cell]
+        netifs.discard(netif)
+        if not netifs:
+            del self.cells[cell]
+
+    def neighbors(self, netif: CoreInterface) -> Set[CoreInterface]:
+        """
+        Retrieve interfaces within the same and neighboring cells of an interface.
+
+        :param netif: network interface to get neighbors for
+        :return: neighboring interfaces
+        """
+        neighbors = set()
+        cell = self.netifs.get(netif)
+        if cell is None:
+            return neighbors
+        x, y = cell
+        for i in range(x - 1, x + 2):
+            for j in range(y - 1, y + 2):
+                netifs = self.cells.get((i, j))
+                if netifs:
+                    neighbors.update(netifs)
+        neighbors.discard(netif)
+        return neighbors
+
+
+class RangeArray:
+    """
+    Contiguous array of interface positions and a boolean link adjacency matrix,
+    used to calculate link changes for many moved interfaces in bulk.
+    """
+
+    # max number of moved interfaces to calculate distances for at once
+    block_size = 256
+
+    def __init__(self) -> None:
+        """
+        Create a RangeArray instance.
+        """
+        self.index = {}
+        self.netifs = []
+        self.positions = numpy.empty((0, 3))
+        self.linked = numpy.zeros((0, 0), dtype=bool)
+
+    def grow(self) -> None:
+        """
+        Double the capacity of the arrays.
+
+        :return: nothing
+        """
+        size = max(len(self.positions) * 2, 16)
+        count = len(self.netifs)
+        positions = numpy.full((size, 3), numpy.nan)
+        positions[:count] = self.positions[:count]
+        self.positions = positions
+        linked = numpy.zeros((size, size), dtype=bool)
+        linked[:count, :count] = self.linked[:count, :count]
+        self.linked = linked
+
+    def add(self, netif: CoreInterface) -> int:
+        """
+        Add an interface to the arrays, if not already present.
+
+        :param netif: network interface to add
+        :return: array index of interface
+        """
+        index = self.index.get(netif)
+        if index is None:
+            index = len(self.netifs)
+            if index == len(self.positions):
+                self.grow()
+            self.index[netif] = index
+            self.netifs.append(netif)
+        return index
+
+    def set_position(
+        self, netif: CoreInterface, x: float, y: float, z: Optional[float]
+    ) -> None:
+        """
+        Set the position of an interface, None values are stored as NaN.
+
+        :param netif: network interface to set position for
+        :param x: x position
+        :param y: y position
+        :param z: z position
+        :return: nothing
+        """
+        index = self.add(netif)
+        self.positions[index] = [numpy.nan if v is None else v for v in (x, y, z)]
+
+    def set_linked(
+        self, netif: CoreInterface, netif2: CoreInterface, linked: bool
+    ) -> None:
+        """
+        Set the link state between two interfaces.
+
+        :param netif: interface one
+        :param netif2: interface two
+        :param linked: True if linked, False otherwise
+        :return: nothing
+        """
+        index = self.add(netif)
+        index2 = self.add(netif2)
+        self.linked[index, index2] = linked
+        self.linked[index2, index] = linked
+
+    def changes(
+        self, moved_netifs: List[CoreInterface], distance: float
+    ) -> Tuple[List[InterfacePair], List[InterfacePair]]:
+        """
+        Calculate the distance from moved interfaces to all interfaces and compare
+        against the current link state. Pairs between moved interfaces are only
+        provided once.
+
+        :param moved_netifs: moved network interfaces
+        :param distance: max distance for interfaces to be linked
+        :return: pairs to link and pairs to unlink
+        """
+        up = []
+        down = []
+        count = len(self.netifs)
+        positions = self.positions[:count]
+        rows = numpy.array([self.index[x] for x in moved_netifs], dtype=int)
+        # order moved interfaces, to only consider a pair from its later interface
+        rank = numpy.full(count, -1)
+        rank[rows] = numpy.arange(len(rows))
+        for start in range(0, len(rows), self.block_size):
+            block = rows[start : start + self.block_size]
+            delta = positions[block, None, :] - positions[None, :, :]
+            # unknown z positions do not contribute to distance
+            delta[:, :, 2] = numpy.nan_to_num(delta[:, :, 2])
+            d = numpy.sqrt(numpy.sum(delta * delta, axis=2))
+            # unknown x or y positions result in nan, and are ignored
+            known = ~numpy.isnan(d)
+            within = d <= distance
+            linked = self.linked[block, :count]
+            order = numpy.arange(start, start + len(block))[:, None]
+            known &= (rank[None, :] < 0) | (rank[None, :] < order)
+            for i, j in zip(*numpy.nonzero(known & within & ~linked)):
+                up.append((self.netifs[block[i]], self.netifs[j]))
+            for i, j in zip(*numpy.nonzero(known & ~within & linked)):
+                down.append((self.netifs[block[i]], self.netifs[j]))
+        return up, down
+
+
 class BasicRangeModel(WirelessModel):
     """
     Basic Range wireless model, calculates range between nodes and links
@@ -311,6 +521,12 @@ class BasicRangeModel(WirelessModel):
         self.wlan = session.get_node(_id)
         self._netifs = {}
         self._netifslock = threading.Lock()
+        self._grid = RangeGrid(0)
+        # interfaces currently linked to each interface
+        self._links = {}
+        self._array = None
+        if numpy is not None:
+            self._array = RangeArray()
 
         self.range = 0
         self.bw = None
@@ -326,6 +542,12 @@ class BasicRangeModel(WirelessModel):
         :return: nothing
         """
         self.range = int(float(config["range"]))
+        with self._netifslock:
+            if self._grid.size != max(self.range, 1):
+                self._grid = RangeGrid(self.range)
+                for netif, (x, y, _) in self._netifs.items():
+                    if x is not None and y is not None:
+                        self._grid.set_position(netif, x, y)
         logging.debug(
             "basic range model configured for WLAN %d using range %d",
             self.wlan.id,
@@ -384,14 +606,16 @@ class BasicRangeModel(WirelessModel):
         :param z: z position
         :return: nothing
         """
-        self._netifslock.acquire()
-        self._netifs[netif] = (x, y, z)
-        if x is None or y is None:
-            self._netifslock.release()
-            return
-        for netif2 in self._netifs:
-            self.calclink(netif, netif2)
-        self._netifslock.release()
+        with self._netifslock:
+            self._netifs[netif] = (x, y, z)
+            if self._array is not None:
+                self._array.set_position(netif, x, y, z)
+            if x is None or y is None:
+                self._grid.remove(netif)
+                return
+            self._grid.set_position(netif, x, y)
+            for netif2 in self.candidates(netif):
+                self.calclink(netif, netif2)
 
     position_callback = set_position
 
@@ -407,16 +631,41 @@ class BasicRangeModel(WirelessModel):
         :return: nothing
         """
         with self._netifslock:
-            while len(moved_netifs):
-                netif = moved_netifs.pop()
-                nx, ny, nz = netif.node.getposition()
-                if netif in self._netifs:
-                    self._netifs[netif] = (nx, ny, nz)
-                for netif2 in self._netifs:
-                    if netif2 in moved_netifs:
+            moved_netifs = [x for x in moved_netifs if x in self._netifs]
+            for netif in moved_netifs:
+                x, y, z = netif.node.getposition()
+                self._netifs[netif] = (x, y, z)
+                self._grid.set_position(netif, x, y)
+                if self._array is not None:
+                    self._array.set_position(netif, x, y, z)
+            if not moved_netifs:
+                return
+            if self._array is not None:
+                up, down = self._array.changes(moved_netifs, self.range)
+                self.setlinks(down, False)
+                self.setlinks(up, True)
+                return
+            pending = set(moved_netifs)
+            for netif in moved_netifs:
+                pending.discard(netif)
+                for netif2 in self.candidates(netif):
+                    if netif2 in pending:
                         continue
                     self.calclink(netif, netif2)
 
+    def candidates(self, netif: CoreInterface) -> Set[CoreInterface]:
+        """
+        Retrieve interfaces that may have changed link state with an interface,
+        those in neighboring grid cells that may be within range and those
+        previously linked that may have left range.
+
+        :param netif: network interface to get candidates for
+        :return: candidate interfaces
+        """
+        candidates = self._grid.neighbors(netif)
+        candidates.update(self._links.get(netif, ()))
+        return candidates
+
     def calclink(self, netif: CoreInterface, netif2: CoreInterface) -> None:
         """
         Helper used by set_position() and update() to
@@ -460,6 +709,68 @@ class BasicRangeModel(WirelessModel):
         except KeyError:
             logging.exception("error getting interfaces during calclinkS")
 
+    def setlinked(
+        self, netif: CoreInterface, netif2: CoreInterface, linked: bool
+    ) -> None:
+        """
+        Track the link state between two interfaces, used to find previously linked
+        interfaces that may have left range.
+
+        :param netif: interface one
+        :param netif2: interface two
+        :param linked: True if linked, False otherwise
+        :return: nothing
+        """
+        if linked:
+            self._links.setdefault(netif, set()).add(netif2)
+            self._links.setdefault(netif2, set()).add(netif)
+        else:
+            self._links.get(netif, set()).discard(netif2)
+            self._links.get(netif2, set()).discard(netif)
+        if self._array is not None:
+            self._array.set_linked(netif, netif2, linked)
+
+    def links_changed(self, pairs: List[InterfacePair], linked: bool) -> None:
+        """
+        WLAN callback for changed link state, keeping tracked link state in sync
+        with links changed by the model or directly on the WLAN.
+
+        :param pairs: interface pairs that changed
+        :param linked: True if pairs were linked, False if unlinked
+        :return: nothing
+        """
+        for netif, netif2 in pairs:
+            self.setlinked(netif, netif2, linked)
+
+    link_callback = links_changed
+
+    def setlinks(self, pairs: List[InterfacePair], linked: bool) -> None:
+        """
+        Link or unlink a batch of interface pairs, applying them to the WLAN in a
+        single update before sending link/unlink messages.
+
+        :param pairs: interface pairs to change
+        :param linked: True to link pairs, False to unlink
+        :return: nothing
+        """
+        # interfaces may have been detached from the wlan since being moved
+        attached = set(self.wlan.netifs())
+        # ordering is important, to keep the wlan._linked dict organized
+        pairs = [
+            (min(a, b), max(a, b)) for a, b in pairs if a in attached and b in attached
+        ]
+        try:
+            changed = self.wlan.setlinks(pairs, linked)
+        except (KeyError, ValueError):
+            logging.exception("error getting interfaces during setlinks")
+            return
+        # changed pairs are tracked by the wlan callback, pairs already in the
+        # desired state are tracked here
+        for a, b in pairs:
+            self.setlinked(a, b, linked)
+        for a, b in changed:
+            self.sendlinkmsg(a, b, unlink=not linked)
+
     @staticmethod
     def calcdistance(
         p1: Tuple[float, float, float], p2: Tuple[float, float, float]
@@ -549,6 +860,8 @@ class WayPoint:
     Maintains information regarding waypoints.
     """
 
+    __slots__ = ("time", "nodenum", "coords", "speed")
+
     def __init__(self, time: float, nodenum: int, coords, speed: float):
         """
         Creates a WayPoint instance.
@@ -576,6 +889,126 @@ class WayPoint:
             return self.time < other.time
 
 
+class WayPointArray:
+    """
+    Arrays of target positions and speeds for nodes moving towards their current
+    waypoints, used to move all nodes in a single vectorized step.
+    """
+
+    def __init__(self) -> None:
+        """
+        Create a WayPointArray instance.
+        """
+        self.index = {}
+        self.node_ids = []
+        self.targets = numpy.empty((0, 3))
+        # linear speeds, nan for waypoints with a velocity vector
+        self.speeds = numpy.empty(0)
+        self.velocities = numpy.empty((0, 2))
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    def grow(self) -> None:
+        """
+        Double the capacity of the arrays.
+
+        :return: nothing
+        """
+        size = max(len(self.speeds) * 2, 16)
+        count = len(self.node_ids)
+        targets = numpy.empty((size, 3))
+        targets[:count] = self.targets[:count]
+        self.targets = targets
+        speeds = numpy.empty(size)
+        speeds[:count] = self.speeds[:count]
+        self.speeds = speeds
+        velocities = numpy.empty((size, 2))
+        velocities[:count] = self.velocities[:count]
+        self.velocities = velocities
+
+    def set(self, wp: WayPoint) -> None:
+        """
+        Set the current waypoint of a node.
+
+        :param wp: waypoint to set
+        :return: nothing
+        """
+        index = self.index.get(wp.nodenum)
+        if index is None:
+            index = len(self.node_ids)
+            if index == len(self.speeds):
+                self.grow()
+            self.index[wp.nodenum] = index
+            self.node_ids.append(wp.nodenum)
+        x, y, z = wp.coords
+        self.targets[index] = (x, y, numpy.nan if z is None else z)
+        if isinstance(wp.speed, (float, int)):
+            self.speeds[index] = wp.speed
+            self.velocities[index] = (0.0, 0.0)
+        else:
+            self.speeds[index] = numpy.nan
+            self.velocities[index] = wp.speed[:2]
+
+    def remove(self, node_id: int) -> None:
+        """
+        Remove the waypoint of a node, moving the last row into its place.
+
+        :param node_id: id of node to remove waypoint for
+        :return: nothing
+        """
+        index = self.index.pop(node_id, None)
+        if index is None:
+            return
+        last = len(self.node_ids) - 1
+        last_id = self.node_ids.pop()
+        if index != last:
+            self.node_ids[index] = last_id
+            self.index[last_id] = index
+            self.targets[index] = self.targets[last]
+            self.speeds[index] = self.speeds[last]
+            self.velocities[index] = self.velocities[last]
+
+    def clear(self) -> None:
+        """
+        Remove all waypoints.
+
+        :return: nothing
+        """
+        self.index.clear()
+        self.node_ids.clear()
+
+    def step(
+        self, rows: "numpy.ndarray", positions: "numpy.ndarray", dt: float
+    ) -> Tuple["numpy.ndarray", "numpy.ndarray", "numpy.ndarray"]:
+        """
+        Calculate the next positions of nodes towards their waypoints, without
+        overshooting or moving into negative coordinates.
+
+        :param rows: array rows of nodes to move
+        :param positions: current x, y positions of nodes, nan when unknown
+        :param dt: time in seconds since the last step
+        :return: new x, y positions, nodes to move directly to their waypoint, and
+            nodes that have reached their waypoint
+        """
+        remaining = self.targets[rows, :2] - positions
+        speeds = self.speeds[rows]
+        distance = numpy.hypot(remaining[:, 0], remaining[:, 1])
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            scale = numpy.where(distance > 0.0, speeds / distance, 0.0)
+        velocity = remaining * scale[:, None]
+        vectors = numpy.isnan(speeds)
+        velocity[vectors] = self.velocities[rows[vectors]]
+        delta = velocity * dt
+        # prevent overshoot
+        overshoot = numpy.abs(delta) > numpy.abs(remaining)
+        delta[overshoot] = remaining[overshoot]
+        # instantaneous moves, nodes without a position also move directly
+        instant = (speeds == 0.0) | numpy.isnan(positions).any(axis=1)
+        arrived = ~instant & (delta == 0.0).all(axis=1)
+        return numpy.maximum(positions + delta, 0.0), instant, arrived
+
+
 class WayPointMobility(WirelessModel):
     """
     Abstract class for mobility models that set node waypoints.
@@ -611,6 +1044,11 @@ class WayPointMobility(WirelessModel):
         # flag whether to stop scheduling when queue is empty
         #  (ns-3 sets this to False as new waypoints may be added from trace)
         self.empty_queue_stop = True
+        # periodic event running rounds, canceled when stopped or paused
+        self.round_event = None
+        self._array = None
+        if numpy is not None:
+            self._array = WayPointArray()
 
     def runround(self) -> None:
         """
@@ -634,37 +1072,62 @@ class WayPointMobility(WirelessModel):
                 nexttime = self.queue[0].time - now
                 if nexttime > (0.001 * self.refresh_ms):
                     nexttime -= 0.001 * self.refresh_ms
-                self.session.event_loop.add_event(nexttime, self.runround)
+                    self.start_rounds(nexttime)
                 return
             else:
                 # no more waypoints or queued items, loop?
                 if not self.empty_queue_stop:
                     # keep running every refresh_ms, even with empty queue
-                    self.session.event_loop.add_event(
-                        0.001 * self.refresh_ms, self.runround
-                    )
                     return
                 if not self.loopwaypoints():
                     return self.stop(move_initial=False)
                 if not len(self.queue):
                     # prevent busy loop
+                    self.stop_rounds()
                     return
                 return self.run()
 
         # only move netifs attached to self.wlan, or all nodenum in script?
-        moved = []
-        moved_netifs = []
-        for netif in self.wlan.netifs():
-            node = netif.node
-            if self.movenode(node, dt):
-                moved.append(node)
-                moved_netifs.append(netif)
+        moved, moved_netifs = self.movenodes(dt)
 
         # calculate all ranges after moving nodes; this saves calculations
         self.session.mobility.updatewlans(moved, moved_netifs)
 
-        # TODO: check session state
-        self.session.event_loop.add_event(0.001 * self.refresh_ms, self.runround)
+    def start_rounds(self, delay: float) -> None:
+        """
+        Run rounds of the script every refresh_ms using a periodic event,
+        replacing any currently running rounds.
+
+        :param delay: delay in seconds before the first round
+        :return: nothing
+        """
+        self.stop_rounds()
+        interval = 0.001 * self.refresh_ms
+        self.round_event = self.session.event_loop.add_periodic_event(
+            delay, interval, self.runround
+        )
+
+    def stop_rounds(self) -> None:
+        """
+        Cancel the periodic event running rounds of the script, so restarting the
+        script does not result in multiple rounds being ran.
+
+        :return: nothing
+        """
+        if self.round_event is not None:
+            self.session.event_loop.cancel_event(self.round_event)
+            self.round_event = None
+
+    def round_stats(self) -> Dict[str, float]:
+        """
+        Retrieve lateness stats for the rounds of the script, to check for rounds
+        slipping behind refresh_ms.
+
+        :return: dict of round lateness stats
+        """
+        if self.round_event is None:
+            return {}
+        return self.session.event_loop.stats(self.round_event)
 
     def run(self) -> None:
         """
@@ -673,12 +1136,79 @@ class WayPointMobility(WirelessModel):
         :return: nothing
         """
         logging.info("running mobility scenario")
+        self.start_rounds(0.001 * self.refresh_ms)
         self.timezero = time.monotonic()
         self.lasttime = self.timezero - (0.001 * self.refresh_ms)
         self.movenodesinitial()
         self.runround()
         self.session.mobility.sendevent(self)
 
+    def movenodes(self, dt: float) -> Tuple[List[CoreNode], List[CoreInterface]]:
+        """
+        Move nodes attached to the wlan towards their current waypoints, in a
+        single vectorized step when numpy is available, broadcasting all new
+        positions together.
+
+        :param dt: move factor
+        :return: moved nodes and their interfaces
+        """
+        moved = []
+        moved_netifs = []
+        if self._array is None:
+            for netif in self.wlan.netifs():
+                node = netif.node
+                if self.movenode(node, dt):
+                    moved.append(node)
+                    moved_netifs.append(netif)
+            return moved, moved_netifs
+
+        netifs = {}
+        for netif in self.wlan.netifs():
+            netifs.setdefault(netif.node.id, netif)
+        rows = []
+        attached = []
+        positions = []
+        for index, node_id in enumerate(self._array.node_ids):
+            netif = netifs.get(node_id)
+            if netif is not None:
+                rows.append(index)
+                attached.append(netif)
+                position = netif.node.position
+                positions.append((position.x, position.y))
+        if not rows:
+            return moved, moved_netifs
+        rows = numpy.array(rows, dtype=int)
+        positions = numpy.array(positions, dtype=float)
+        targets = self._array.targets[rows]
+        positions, instant, arrived = self._array.step(rows, positions, dt)
+
+        updates = []
+        done = []
+        # convert results once, indexing arrays per node is slow
+        steps = zip(attached, positions.tolist(), instant.tolist(), arrived.tolist())
+        for i, (netif, (x, y), is_instant, is_arrived) in enumerate(steps):
+            node = netif.node
+            if is_instant:
+                x, y, z = targets[i].tolist()
+                updates.append((node, x, y, None if z != z else z))
+                done.append(node.id)
+            elif is_arrived:
+                done.append(node.id)
+                continue
+            else:
+                updates.append((node, x, y, node.position.z))
+            moved.append(node)
+            moved_netifs.append(netif)
+        if arrived.any() and self.endtime < (self.lasttime - self.timezero):
+            # the last node to reach the last waypoint determines this
+            # script's endtime
+            self.endtime = self.lasttime - self.timezero
+        for node_id in done:
+            self._array.remove(node_id)
+            del self.points[node_id]
+        self.setnodepositions(updates)
+        return moved, moved_netifs
+
     def movenode(self, node: CoreNode, dt: float) -> bool:
         """
         Calculate next node location and update its coordinates.
@@ -791,6 +1321,8 @@ class WayPointMobility(WirelessModel):
                 break
             wp = heapq.heappop(self.queue)
             self.points[wp.nodenum] = wp
+            if self._array is not None:
+                self._array.set(wp)
 
     def copywaypoints(self) -> None:
         """
@@ -825,6 +1357,24 @@ class WayPointMobility(WirelessModel):
         node_data = node.data(message_type=0)
         self.session.broadcast_node(node_data)
 
+    def setnodepositions(
+        self, positions: List[Tuple[CoreNode, float, float, Optional[float]]]
+    ) -> None:
+        """
+        Helper to move many nodes, notifying any GUI of all new positions in a
+        single broadcast, without invoking interface poshook callbacks.
+
+        :param positions: nodes and their x, y, and z positions
+        :return: nothing
+        """
+        node_datas = []
+        for node, x, y, z in positions:
+            node.position.set(x, y, z)
+            node_data = node.data(message_type=0)
+            if node_data is not None:
+                node_datas.append(node_data)
+        self.session.broadcast_nodes(node_datas)
+
     def setendtime(self) -> None:
         """
         Set self.endtime to the time of the last waypoint in the queue of
@@ -857,6 +1407,7 @@ class WayPointMobility(WirelessModel):
             now = time.monotonic()
             self.timezero += now - self.lasttime
             self.lasttime = now - (0.001 * self.refresh_ms)
+            self.start_rounds(0.001 * self.refresh_ms)
             self.runround()
 
     def stop(self, move_initial: bool = True) -> None:
@@ -868,6 +1419,13 @@ class WayPointMobility(WirelessModel):
         :return: nothing
         """
         self.state = self.STATE_STOPPED
+        if self.round_event is not None:
+            logging.debug("mobility round lateness stats: %s", self.round_stats())
+        self.stop_rounds()
+        # nodes may have been stopped on the way to their current waypoints
+        self.points.clear()
+        if self._array is not None:
+            self._array.clear()
         self.loopwaypoints()
         self.timezero = 0
         self.lasttime = 0
@@ -882,6 +1440,7 @@ class WayPointMobility(WirelessModel):
         :return: nothing
         """
         self.state = self.STATE_PAUSED
+        self.stop_rounds()
         self.lasttime = time.monotonic()
 
 
@@ -892,6 +1451,8 @@ class Ns2ScriptedMobility(WayPointMobility):
     """
 
     name = "ns2script"
+    # time in seconds of waypoints queued ahead of playback
+    window = 10.0
     options = [
         Configuration(
             _id="file", _type=ConfigDataTypes.STRING, label="mobility script file"
@@ -957,6 +1518,8 @@ class Ns2ScriptedMobility(WayPointMobility):
         self.script_start = None
         self.script_pause = None
         self.script_stop = None
+        self.trace = None
+        self.cursor = 0
 
     def update_config(self, config: Dict[str, str]) -> None:
         self.file = config["file"]
@@ -978,69 +1541,90 @@ class Ns2ScriptedMobility(WayPointMobility):
 
     def readscriptfile(self) -> None:
         """
-        Read in mobility script from a file. This adds waypoints to a
-        priority queue, sorted by waypoint time. Initial waypoints are
-        stored in a separate dict.
+        Load the mobility script file as a compiled trace, compiling it when the
+        file has changed. Waypoints are read from the trace as playback reaches
+        them, initial waypoints are stored in a separate dict.
 
         :return: nothing
         """
+        if self.trace is not None:
+            self.trace.close()
+            self.trace = None
+        self.queue = []
+        self.cursor = 0
+        self.initial = {}
         filename = self.findfile(self.file)
         try:
-            f = open(filename, "r")
+            self.trace = Ns2Trace.load(filename)
         except IOError:
             logging.exception(
                 "ns-2 scripted mobility failed to load file: %s", self.file
             )
             return
-        logging.info("reading ns-2 script file: %s", filename)
-        ln = 0
-        ix = iy = iz = None
-        inodenum = None
-        for line in f:
-            ln += 1
-            if line[:2] != "$n":
-                continue
-            try:
-                if line[:8] == "$ns_ at ":
-                    if ix is not None and iy is not None:
-                        self.addinitial(self.map(inodenum), ix, iy, iz)
-                        ix = iy = iz = None
-                    # waypoints:
-                    #    $ns_ at 1.00 "$node_(6) setdest 500.0 178.0 25.0"
-                    parts = line.split()
-                    time = float(parts[2])
-                    nodenum = parts[3][1 + parts[3].index("(") : parts[3].index(")")]
-                    x = float(parts[5])
-                    y = float(parts[6])
-                    z = None
-                    speed = float(parts[7].strip('"'))
-                    self.addwaypoint(time, self.map(nodenum), x, y, z, speed)
-                elif line[:7] == "$node_(":
-                    # initial position (time=0, speed=0):
-                    #    $node_(6) set X_ 780.0
-                    parts = line.split()
-                    nodenum = parts[0][1 + parts[0].index("(") : parts[0].index(")")]
-                    if parts[2] == "X_":
-                        if ix is not None and iy is not None:
-                            self.addinitial(self.map(inodenum), ix, iy, iz)
-                            ix = iy = iz = None
-                        ix = float(parts[3])
-                    elif parts[2] == "Y_":
-                        iy = float(parts[3])
-                    elif parts[2] == "Z_":
-                        iz = float(parts[3])
-                        self.addinitial(self.map(nodenum), ix, iy, iz)
-                        ix = iy = iz = None
-                    inodenum = nodenum
-                else:
-                    raise ValueError
-            except ValueError:
-                logging.exception(
-                    "skipping line %d of file %s '%s'", ln, self.file, line
-                )
-                continue
-        if ix is not None and iy is not None:
-            self.addinitial(self.map(inodenum), ix, iy, iz)
+        logging.info("read ns-2 script file: %s", filename)
+        for nodenum, x, y, z in self.trace.initial():
+            self.addinitial(self.map(nodenum), x, y, z)
+        self.loadwaypoints(self.window)
+
+    def loadwaypoints(self, until: float) -> None:
+        """
+        Queue waypoints from the trace up to a time, along with the next waypoint
+        when none are queued, allowing the next round to be scheduled.
+
+        :param until: time to queue waypoints up to
+        :return: nothing
+        """
+        if self.trace is None:
+            return
+        end = self.trace.index(until, self.cursor)
+        if not self.queue and end == self.cursor and end < len(self.trace):
+            end += 1
+        for _time, nodenum, x, y, z, speed in self.trace.waypoints(self.cursor, end):
+            self.addwaypoint(_time, self.map(nodenum), x, y, z, speed)
+        self.cursor = end
+
+    def updatepoints(self, now: float) -> None:
+        """
+        Queue waypoints within the read ahead window, then move items from
+        self.queue to self.points when their time has come.
+
+        :param now: current timestamp
+        :return: nothing
+        """
+        self.loadwaypoints(now + self.window)
+        super().updatepoints(now)
+        self.loadwaypoints(now + self.window)
+
+    def copywaypoints(self) -> None:
+        """
+        Waypoints are read again from the trace when looping, no copy is kept.
+
+        :return: nothing
+        """
+        pass
+
+    def loopwaypoints(self) -> bool:
+        """
+        Restart reading waypoints from the beginning of the trace.
+
+        :return: True if looping is enabled, False otherwise
+        """
+        self.queue = []
+        self.cursor = 0
+        self.loadwaypoints(self.window)
+        return self.loop
+
+    def setendtime(self) -> None:
+        """
+        Set self.endtime to the time of the last waypoint in the trace, adjusted
+        later to when the last moving node reaches its final waypoint.
+
+        :return: nothing
+        """
+        if self.trace is not None and len(self.trace):
+            self.endtime = self.trace.time(len(self.trace) - 1)
+        else:
+            self.endtime = 0
 
     def findfile(self, file_name: str) -> str:
         """
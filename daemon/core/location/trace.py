@@ -0,0 +1,387 @@
+"""
+Compiled ns-2 mobility traces. A parsed trace is stored as columns of waypoint
+times, node numbers, coordinates, and speeds, cached within a directory private to
+the current user and memory mapped for playback, allowing waypoints to be read as
+needed.
+"""
+
+import array
+import bisect
+import hashlib
+import logging
+import mmap
+import os
+import stat
+import struct
+import tempfile
+from typing import Iterator, Optional, Tuple
+
+from core import utils
+
+# magic and version identifying compiled trace files
+MAGIC = b"CORENS2\x00"
+VERSION = 1
+
+# magic, version, reserved, source mtime, source size, waypoints, initial positions
+HEADER = struct.Struct("<8sIIqqqq")
+
+# waypoint columns, all stored as doubles except node numbers
+WAYPOINT_COLUMNS = (
+    ("time", "d"),
+    ("node", "q"),
+    ("x", "d"),
+    ("y", "d"),
+    ("z", "d"),
+    ("speed", "d"),
+)
+INITIAL_COLUMNS = (("node", "q"), ("x", "d"), ("y", "d"), ("z", "d"))
+
+# private directory compiled traces are cached within
+CACHE_DIR = os.path.join(tempfile.gettempdir(), f"core-mobility-{os.geteuid()}")
+
+Position = Tuple[int, float, float, Optional[float]]
+WayPointRecord = Tuple[float, int, float, float, Optional[float], float]
+
+
+def to_double(value: Optional[float]) -> float:
+    """
+    Convert an optional value to a double, None is stored as nan.
+
+    :param value: value to convert
+    :return: double value
+    """
+    if value is None:
+        return float("nan")
+    return value
+
+
+def from_double(value: float) -> Optional[float]:
+    """
+    Convert a stored double back to an optional value.
+
+    :param value: value to convert
+    :return: value or None for nan
+    """
+    if value != value:
+        return None
+    return value
+
+
+def parse_node(value: str) -> int:
+    """
+    Parse the node number from a node reference, such as $node_(6).
+
+    :param value: node reference
+    :return: node number
+    :raises ValueError: when the reference is not valid
+    """
+    return int(value[1 + value.index("(") : value.index(")")])
+
+
+def compile_trace(filename: str, source: os.stat_result) -> bytes:
+    """
+    Parse an ns-2 mobility script into compiled trace data, with waypoints sorted
+    by time.
+
+    :param filename: script file to parse
+    :param source: stat of the script file, identifying the compiled version
+    :return: compiled trace data
+    :raises IOError: when the file can not be read
+    """
+    waypoints = {name: array.array(code) for name, code in WAYPOINT_COLUMNS}
+    initial = {name: array.array(code) for name, code in INITIAL_COLUMNS}
+
+    def add_initial(nodenum: int, x: float, y: float, z: Optional[float]) -> None:
+        initial["node"].append(nodenum)
+        initial["x"].append(x)
+        initial["y"].append(y)
+        initial["z"].append(to_double(z))
+
+    ln = 0
+    ix = iy = iz = None
+    inodenum = None
+    with open(filename, "r") as f:
+        for line in f:
+            ln += 1
+            if line[:2] != "$n":
+                continue
+            try:
+                if line[:8] == "$ns_ at ":
+                    if ix is not None and iy is not None:
+                        add_initial(inodenum, ix, iy, iz)
+                        ix = iy = iz = None
+                    # waypoints:
+                    #    $ns_ at 1.00 "$node_(6) setdest 500.0 178.0 25.0"
+                    parts = line.split()
+                    time = float(parts[2])
+                    nodenum = parse_node(parts[3])
+                    x = float(parts[5])
+                    y = float(parts[6])
+                    speed = float(parts[7].strip('"'))
+                    waypoints["time"].append(time)
+                    waypoints["node"].append(nodenum)
+                    waypoints["x"].append(x)
+                    waypoints["y"].append(y)
+                    waypoints["z"].append(to_double(None))
+                    waypoints["speed"].append(speed)
+                elif line[:7] == "$node_(":
+                    # initial position (time=0, speed=0):
+                    #    $node_(6) set X_ 780.0
+                    parts = line.split()
+                    nodenum = parse_node(parts[0])
+                    if parts[2] == "X_":
+                        if ix is not None and iy is not None:
+                            add_initial(inodenum, ix, iy, iz)
+                            ix = iy = iz = None
+                        ix = float(parts[3])
+                    elif parts[2] == "Y_":
+                        iy = float(parts[3])
+                    elif parts[2] == "Z_":
+                        iz = float(parts[3])
+                        add_initial(nodenum, ix, iy, iz)
+                        ix = iy = iz = None
+                    inodenum = nodenum
+                else:
+                    raise ValueError
+            except (ValueError, IndexError):
+                logging.exception(
+                    "skipping line %d of file %s '%s'", ln, filename, line
+                )
+                continue
+    if ix is not None and iy is not None:
+        add_initial(inodenum, ix, iy, iz)
+
+    # waypoints are played back in time order, keeping file order for equal times
+    times = waypoints["time"]
+    if any(times[i] > times[i + 1] for i in range(len(times) - 1)):
+        order = sorted(range(len(times)), key=times.__getitem__)
+        for name, code in WAYPOINT_COLUMNS:
+            column = waypoints[name]
+            waypoints[name] = array.array(code, (column[i] for i in order))
+
+    data = bytearray()
+    for name, _ in WAYPOINT_COLUMNS:
+        data += waypoints[name].tobytes()
+    for name, _ in INITIAL_COLUMNS:
+        data += initial[name].tobytes()
+    header = HEADER.pack(
+        MAGIC,
+        VERSION,
+        0,
+        source.st_mtime_ns,
+        source.st_size,
+        len(times),
+        len(initial["node"]),
+    )
+    return header + data
+
+
+def trace_size(count: int, initial_count: int) -> int:
+    """
+    Calculate the size of compiled trace data.
+
+    :param count: number of waypoints
+    :param initial_count: number of initial positions
+    :return: size in bytes
+    """
+    waypoints = count * 8 * len(WAYPOINT_COLUMNS)
+    initial = initial_count * 8 * len(INITIAL_COLUMNS)
+    return HEADER.size + waypoints + initial
+
+
+def cache_path(filename: str) -> str:
+    """
+    Retrieve the path a compiled trace is cached at, keyed by the script path.
+
+    :param filename: script file the trace is compiled from
+    :return: cache path
+    """
+    path = os.path.abspath(filename)
+    name = os.path.basename(path)
+    digest = hashlib.sha1(path.encode()).hexdigest()
+    return os.path.join(CACHE_DIR, f"{name}-{digest}.cache")
+
+
+def open_cache(path: str, source: os.stat_result) -> Optional[mmap.mmap]:
+    """
+    Memory map a cached trace, when it was compiled from the current source.
+    Caches not written by the current user, or writable by others, are ignored.
+
+    :param path: cache path
+    :param source: stat of the source script file
+    :return: mapped trace, None when missing, not trusted, or out of date
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY | os.O_NOFOLLOW)
+    except OSError:
+        return None
+    try:
+        status = os.fstat(fd)
+        if (
+            not stat.S_ISREG(status.st_mode)
+            or status.st_uid != os.geteuid()
+            or status.st_mode & 0o022
+        ):
+            logging.warning("ignoring untrusted ns-2 trace cache: %s", path)
+            return None
+        data = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    finally:
+        os.close(fd)
+    if len(data) < HEADER.size:
+        data.close()
+        return None
+    magic, version, _, mtime, size, count, initial_count = HEADER.unpack_from(data)
+    current = (MAGIC, VERSION, source.st_mtime_ns, source.st_size)
+    expected = trace_size(count, initial_count)
+    if (magic, version, mtime, size) != current or len(data) != expected:
+        data.close()
+        return None
+    return data
+
+
+def write_cache(path: str, data: bytes) -> bool:
+    """
+    Write a compiled trace to a cache path, replacing any previous cache. The
+    cache directory is only used when private to the current user.
+
+    :param path: cache path
+    :param data: compiled trace data
+    :return: True if written, False otherwise
+    """
+    directory = os.path.dirname(path)
+    if not utils.private_directory(directory):
+        logging.warning("ns-2 trace cache directory is not private: %s", directory)
+        return False
+    temp_path = None
+    try:
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except OSError as e:
+        logging.debug("unable to cache ns-2 trace at %s: %s", path, e)
+        if temp_path is not None:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+        return False
+    return True
+
+
+class Ns2Trace:
+    """
+    Memory mapped compiled ns-2 trace, waypoints are read from the mapped columns
+    as needed.
+    """
+
+    def __init__(self, data: mmap.mmap) -> None:
+        """
+        Create an Ns2Trace instance.
+
+        :param data: mapped compiled trace data
+        """
+        self.data = data
+        _, _, _, _, _, self.count, initial_count = HEADER.unpack_from(data)
+        view = memoryview(data)
+        self.columns = {}
+        offset = HEADER.size
+        for name, code in WAYPOINT_COLUMNS:
+            end = offset + self.count * 8
+            self.columns[name] = view[offset:end].cast(code)
+            offset = end
+        self.initial_columns = {}
+        for name, code in INITIAL_COLUMNS:
+            end = offset + initial_count * 8
+            self.initial_columns[name] = view[offset:end].cast(code)
+            offset = end
+        view.release()
+
+    @classmethod
+    def load(cls, filename: str) -> "Ns2Trace":
+        """
+        Load the compiled trace for a script file, compiling and caching it when
+        there is no cache for the current version of the file.
+
+        :param filename: script file to load
+        :return: loaded trace
+        :raises IOError: when the script file can not be read
+        """
+        source = os.stat(filename)
+        path = cache_path(filename)
+        data = open_cache(path, source)
+        if data is not None:
+            logging.info("loaded compiled ns-2 script file: %s", path)
+            return cls(data)
+        logging.info("compiling ns-2 script file: %s", filename)
+        compiled = compile_trace(filename, source)
+        if write_cache(path, compiled):
+            data = open_cache(path, source)
+            if data is not None:
+                return cls(data)
+        data = mmap.mmap(-1, len(compiled))
+        data.write(compiled)
+        return cls(data)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def index(self, time: float, start: int = 0) -> int:
+        """
+        Find the index after the last waypoint at or before a time.
+
+        :param time: time to find
+        :param start: index to start searching from
+        :return: waypoint index
+        """
+        return bisect.bisect_right(self.columns["time"], time, start)
+
+    def time(self, index: int) -> float:
+        """
+        Retrieve the time of a waypoint.
+
+        :param index: waypoint index
+        :return: waypoint time
+        """
+        return self.columns["time"][index]
+
+    def waypoints(self, start: int, end: int) -> Iterator[WayPointRecord]:
+        """
+        Read a range of waypoints.
+
+        :param start: index of first waypoint
+        :param end: index after the last waypoint
+        :return: waypoint time, node number, x, y, z, and speed
+        """
+        columns = [self.columns[name] for name, _ in WAYPOINT_COLUMNS]
+        times, nodes, xs, ys, zs, speeds = columns
+        for i in range(start, end):
+            yield times[i], nodes[i], xs[i], ys[i], from_double(zs[i]), speeds[i]
+
+    def initial(self) -> Iterator[Position]:
+        """
+        Read initial node positions.
+
+        :return: node number, x, y, and z
+        """
+        columns = [self.initial_columns[name] for name, _ in INITIAL_COLUMNS]
+        nodes, xs, ys, zs = columns
+        for i in range(len(nodes)):
+            yield nodes[i], xs[i], ys[i], from_double(zs[i])
+
+    def close(self) -> None:
+        """
+        Release the mapped trace data.
+
+        :return: nothing
+        """
+        for column in self.columns.values():
+            column.release()
+        for column in self.initial_columns.values():
+            column.release()
+        self.columns.clear()
+        self.initial_columns.clear()
+        self.count = 0
+        self.data.close()
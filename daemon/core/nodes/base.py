@@ -77,7 +77,7 @@ class NodeBase:
         self.position = Position()
 
         use_ovs = session.options.get_config("ovs") == "True"
-        self.net_client = get_net_client(use_ovs, self.host_cmd)
+        self.net_client = get_net_client(use_ovs, self.host_cmd, server is None)
 
     def startup(self) -> None:
         """
@@ -174,6 +174,9 @@ class NodeBase:
         :param netif: interface to get index for
         :return: interface index if found, -1 otherwise
         """
+        ifindex = getattr(netif, "netindex", None)
+        if self._netif.get(ifindex) is netif:
+            return ifindex
         for ifindex in self._netif:
             if self._netif[ifindex] is netif:
                 return ifindex
@@ -314,14 +317,49 @@ class CoreNodeBase(NodeBase):
     def start_config_services(self) -> None:
         """
         Determins startup paths and starts configuration services, based on their
-        dependency chains.
+        dependency chains. Independent chains are started concurrently, and the
+        last service of each chain is validated once all chains have started.
 
         :return: nothing
+        :raises ConfigServiceBootError: when there is an error starting a service
         """
         startup_paths = ConfigServiceDependencies(self.config_services).startup_paths()
+        funcs = []
         for startup_path in startup_paths:
-            for service in startup_path:
-                service.start()
+            funcs.append((self._start_config_path, (startup_path,), {}))
+        results, exceptions = self.session.run_tasks(funcs)
+        if exceptions:
+            raise exceptions[0]
+        funcs = []
+        for service in results:
+            if service is not None:
+                funcs.append((service.check_validation, (), {}))
+        results, exceptions = self.session.run_tasks(funcs)
+        if exceptions:
+            raise exceptions[0]
+
+    def _start_config_path(
+        self, startup_path: List["ConfigService"]
+    ) -> Optional["ConfigService"]:
+        """
+        Start services along a dependency chain in order, services that others
+        depend on are validated before moving on.
+
+        :param startup_path: services to start in dependent order
+        :return: last service when it still requires validation, None otherwise
+        """
+        logging.info(
+            "node(%s) starting config services: %s",
+            self.name,
+            " -> ".join(x.name for x in startup_path),
+        )
+        last = startup_path[-1]
+        for service in startup_path:
+            if service.boot():
+                if service is last:
+                    return service
+                service.check_validation()
+        return None
 
     def makenodedir(self) -> None:
         """
@@ -639,6 +677,7 @@ class CoreNode(CoreNodeBase):
             return self.client.check_cmd(args, wait=wait, shell=shell)
         else:
             args = self.client.create_cmd(args)
+            self.server.flush(self.nodedir)
             return self.server.remote_cmd(args, wait=wait)
 
     def termcmdstring(self, sh: str = "/bin/sh") -> str:
@@ -693,6 +732,30 @@ class CoreNode(CoreNodeBase):
         with self.lock:
             return super().newifindex()
 
+    def veth_names(self, ifindex: int) -> Tuple[str, str]:
+        """
+        Create the names used for the veth pair of an interface, before the
+        node side is moved into the node and renamed.
+
+        :param ifindex: index of interface
+        :return: node side name and host side local name
+        :raises ValueError: when names are too long
+        """
+        sessionid = self.session.short_session_id()
+        try:
+            suffix = f"{self.id:x}.{ifindex}.{sessionid}"
+        except TypeError:
+            suffix = f"{self.id}.{ifindex}.{sessionid}"
+
+        localname = f"veth{suffix}"
+        if len(localname) >= 16:
+            raise ValueError(f"interface local name ({localname}) too long")
+
+        name = localname + "p"
+        if len(name) >= 16:
+            raise ValueError(f"interface name ({name}) too long")
+        return name, localname
+
     def newveth(self, ifindex: int = None, ifname: str = None) -> int:
         """
         Create a new interface.
@@ -708,26 +771,17 @@ class CoreNode(CoreNodeBase):
             if ifname is None:
                 ifname = f"eth{ifindex}"
 
-            sessionid = self.session.short_session_id()
-
-            try:
-                suffix = f"{self.id:x}.{ifindex}.{sessionid}"
-            except TypeError:
-                suffix = f"{self.id}.{ifindex}.{sessionid}"
-
-            localname = f"veth{suffix}"
-            if len(localname) >= 16:
-                raise ValueError(f"interface local name ({localname}) too long")
-
-            name = localname + "p"
-            if len(name) >= 16:
-                raise ValueError(f"interface name ({name}) too long")
-
+            name, localname = self.veth_names(ifindex)
             veth = Veth(
                 self.session, self, name, localname, start=self.up, server=self.server
             )
 
             if self.up:
+                # local devices can be read from host sysfs, before being moved into
+                # the namespace, as the ifindex and mac are kept when moved
+                if self.server is None:
+                    flow_id = self.net_client.get_ifindex(veth.name)
+                    hwaddr = self.net_client.get_mac(veth.name)
                 self.net_client.device_ns(veth.name, str(self.pid))
                 self.node_net_client.device_name(veth.name, ifname)
                 self.node_net_client.checksums_off(ifname)
@@ -735,10 +789,11 @@ class CoreNode(CoreNodeBase):
             veth.name = ifname
 
             if self.up:
-                flow_id = self.node_net_client.get_ifindex(veth.name)
+                if self.server is not None:
+                    flow_id = self.node_net_client.get_ifindex(veth.name)
+                    hwaddr = self.node_net_client.get_mac(veth.name)
                 veth.flow_id = int(flow_id)
                 logging.debug("interface flow index: %s - %s", veth.name, veth.flow_id)
-                hwaddr = self.node_net_client.get_mac(veth.name)
                 logging.debug("interface mac: %s - %s", veth.name, hwaddr)
                 veth.sethwaddr(hwaddr)
 
@@ -886,13 +941,15 @@ class CoreNode(CoreNodeBase):
             if net is not None:
                 self.attachnet(ifindex, net)
 
-            if hwaddr:
-                self.sethwaddr(ifindex, hwaddr)
+            # configure the interface within the node using a single batch
+            with self.node_net_client.batch():
+                if hwaddr:
+                    self.sethwaddr(ifindex, hwaddr)
 
-            for address in utils.make_tuple(addrlist):
-                self.addaddr(ifindex, address)
+                for address in utils.make_tuple(addrlist):
+                    self.addaddr(ifindex, address)
 
-            self.ifup(ifindex)
+                self.ifup(ifindex)
             return ifindex
 
     def addfile(self, srcname: str, filename: str) -> None:
@@ -911,6 +968,7 @@ class CoreNode(CoreNodeBase):
             self.client.check_cmd(f"mv {srcname} {filename}")
             self.client.check_cmd("sync")
         else:
+            self.server.flush(self.nodedir)
             self.host_cmd(f"mkdir -p {directory}")
             self.server.remote_put(srcname, filename)
 
@@ -948,9 +1006,7 @@ class CoreNode(CoreNodeBase):
                 open_file.write(contents)
                 os.chmod(open_file.name, mode)
         else:
-            self.host_cmd(f"mkdir -m {0o755:o} -p {dirname}")
-            self.server.remote_put_temp(hostfilename, contents)
-            self.host_cmd(f"chmod {mode:o} {hostfilename}")
+            self.server.remote_write(hostfilename, contents, mode, self.nodedir)
         logging.debug(
             "node(%s) added file: %s; mode: 0%o", self.name, hostfilename, mode
         )
@@ -969,6 +1025,7 @@ class CoreNode(CoreNodeBase):
         if self.server is None:
             shutil.copy2(srcfilename, hostfilename)
         else:
+            self.server.flush(self.nodedir)
             self.server.remote_put(srcfilename, hostfilename)
         if mode is not None:
             self.host_cmd(f"chmod {mode:o} {hostfilename}")
@@ -1110,7 +1167,8 @@ class CoreNetworkBase(NodeBase):
             for address in netif.addrlist:
                 ip, _sep, mask = address.partition("/")
                 mask = int(mask)
-                if netaddr.valid_ipv4(ip):
+                # addresses are validated when added, only ipv6 contains colons
+                if ":" not in ip:
                     interface2_ip4 = ip
                     interface2_ip4_mask = mask
                 else:
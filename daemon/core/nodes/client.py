@@ -4,8 +4,126 @@ over a control channel to the vnoded process running in a network namespace.
 The control channel can be accessed via calls using the vcmd shell.
 """
 
+import logging
+import os
+import selectors
+import shlex
+import threading
+import time
+import uuid
+from subprocess import PIPE, Popen
+from typing import Dict, List, Tuple
+
 from core import utils
 from core.constants import VCMD_BIN
+from core.errors import CoreCommandError
+
+
+class VnodeShell:
+    """
+    Long-lived shell running within a node, used to run commands without spawning
+    a new vcmd process for each. Each command output is framed by a marker
+    written to stdout, along with the exit status, and to stderr.
+    """
+
+    def __init__(self, args: List[str]) -> None:
+        """
+        Create a VnodeShell instance.
+
+        :param args: command arguments used to start the shell within the node
+        :raises OSError: when the shell fails to start
+        """
+        self.process = Popen(args, stdin=PIPE, stdout=PIPE, stderr=PIPE)
+        self.token = uuid.uuid4().hex
+        self.count = 0
+        # set once a command fails to complete, the shell can not be reused
+        self.broken = False
+
+    def alive(self) -> bool:
+        """
+        Check if the shell is still running and able to run commands.
+
+        :return: True if running, False otherwise
+        """
+        return not self.broken and self.process.poll() is None
+
+    def run(self, args: str, wait: bool = True) -> Tuple[int, bytes, bytes]:
+        """
+        Run a command within the shell.
+
+        :param args: shell command to run
+        :param wait: True to wait for status, False to run in the background
+        :return: exit status, stdout, and stderr of command
+        :raises IOError: when the shell exits before the command completes
+        """
+        try:
+            return self._run(args, wait)
+        except Exception:
+            self.broken = True
+            raise
+
+    def _run(self, args: str, wait: bool) -> Tuple[int, bytes, bytes]:
+        """
+        Write a command to the shell and read its framed output.
+
+        :param args: shell command to run
+        :param wait: True to wait for status, False to run in the background
+        :return: exit status, stdout, and stderr of command
+        :raises IOError: when the shell exits before the command completes
+        """
+        self.count += 1
+        marker = f"{self.token}:{self.count}".encode()
+        if wait:
+            script = f"(\n{args}\n) </dev/null"
+        else:
+            script = f"(\n{args}\n) </dev/null >/dev/null 2>&1 &"
+        script += (
+            f"\nprintf '\\n%s %d\\n' {marker.decode()} $?"
+            f"\nprintf '\\n%s\\n' {marker.decode()} >&2\n"
+        )
+        self.process.stdin.write(script.encode())
+        self.process.stdin.flush()
+        buffers = {self.process.stdout: b"", self.process.stderr: b""}
+        markers = {
+            self.process.stdout: b"\n" + marker + b" ",
+            self.process.stderr: b"\n" + marker + b"\n",
+        }
+        with selectors.DefaultSelector() as selector:
+            for stream in buffers:
+                selector.register(stream, selectors.EVENT_READ)
+            while selector.get_map():
+                for key, _ in selector.select():
+                    stream = key.fileobj
+                    data = os.read(stream.fileno(), 65536)
+                    if not data:
+                        raise IOError("node shell exited")
+                    buffers[stream] += data
+                    buffer = buffers[stream]
+                    if markers[stream] in buffer and buffer.endswith(b"\n"):
+                        selector.unregister(stream)
+        stdout, status = buffers[self.process.stdout].rsplit(
+            markers[self.process.stdout], 1
+        )
+        stderr = buffers[self.process.stderr].rsplit(markers[self.process.stderr], 1)
+        return int(status), stdout, stderr[0]
+
+    def close(self) -> None:
+        """
+        Stop the shell.
+
+        :return: nothing
+        """
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.process.wait(timeout=1)
+        except Exception:
+            self.process.kill()
+            self.process.wait()
+        self.process.stdout.close()
+        self.process.stderr.close()
 
 
 class VnodeClient:
@@ -13,6 +131,9 @@ class VnodeClient:
     Provides client functionality for interacting with a virtual node.
     """
 
+    # max number of concurrent node shells
+    max_shells = 4
+
     def __init__(self, name: str, ctrlchnlname: str) -> None:
         """
         Create a VnodeClient instance.
@@ -22,6 +143,15 @@ class VnodeClient:
         """
         self.name = name
         self.ctrlchnlname = ctrlchnlname
+        self.lock = threading.Lock()
+        # signalled when a shell becomes idle or is removed
+        self.condition = threading.Condition(self.lock)
+        self.shells = []
+        self.idle = []
+        self.persistent = True
+        self.count = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
 
     def _verify_connection(self) -> None:
         """
@@ -43,15 +173,87 @@ class VnodeClient:
 
     def close(self) -> None:
         """
-        Close the client connection.
+        Close the client connection, stopping any node shells, and log the commands
+        ran for this node.
 
         :return: nothing
         """
-        pass
+        logging.debug("node(%s) command stats: %s", self.name, self.stats())
+        with self.condition:
+            shells = self.shells
+            self.shells = []
+            self.idle = []
+            self.condition.notify_all()
+        for shell in shells:
+            shell.close()
 
     def create_cmd(self, args: str) -> str:
         return f"{VCMD_BIN} -c {self.ctrlchnlname} -- {args}"
 
+    def stats(self) -> Dict[str, float]:
+        """
+        Retrieve command count and latency stats for this node.
+
+        :return: dict of command stats
+        """
+        with self.lock:
+            mean = self.total_time / self.count if self.count else 0.0
+            return dict(
+                count=self.count,
+                total=self.total_time,
+                mean=mean,
+                maximum=self.max_time,
+                shells=len(self.shells),
+            )
+
+    def _get_shell(self) -> VnodeShell:
+        """
+        Retrieve an idle node shell, creating one when below the max number of
+        shells, otherwise waiting for one to become idle or be removed.
+
+        :return: node shell
+        :raises OSError: when a node shell fails to start
+        """
+        with self.condition:
+            while not self.idle and len(self.shells) >= self.max_shells:
+                self.condition.wait()
+            if self.idle:
+                return self.idle.pop()
+            args = shlex.split(self.create_cmd("/bin/sh"))
+            shell = VnodeShell(args)
+            self.shells.append(shell)
+            return shell
+
+    def _put_shell(self, shell: VnodeShell) -> None:
+        """
+        Return a node shell after use, discarding it if it is no longer running,
+        allowing a waiting caller to start a new shell.
+
+        :param shell: node shell to return
+        :return: nothing
+        """
+        with self.condition:
+            reuse = shell in self.shells and shell.alive()
+            if reuse:
+                self.idle.append(shell)
+            elif shell in self.shells:
+                self.shells.remove(shell)
+            self.condition.notify()
+        if not reuse:
+            shell.close()
+
+    def _update_stats(self, elapsed: float) -> None:
+        """
+        Record the latency of a command.
+
+        :param elapsed: time in seconds the command took
+        :return: nothing
+        """
+        with self.lock:
+            self.count += 1
+            self.total_time += elapsed
+            self.max_time = max(self.max_time, elapsed)
+
     def check_cmd(self, args: str, wait: bool = True, shell: bool = False) -> str:
         """
         Run command and return exit status and combined stdout and stderr.
@@ -63,5 +265,40 @@ class VnodeClient:
         :raises core.CoreCommandError: when there is a non-zero exit status
         """
         self._verify_connection()
-        args = self.create_cmd(args)
-        return utils.cmd(args, wait=wait, shell=shell)
+        start = time.monotonic()
+        try:
+            if self.persistent:
+                return self._shell_cmd(args, wait, shell)
+            args = self.create_cmd(args)
+            return utils.cmd(args, wait=wait, shell=shell)
+        finally:
+            self._update_stats(time.monotonic() - start)
+
+    def _shell_cmd(self, args: str, wait: bool, shell: bool) -> str:
+        """
+        Run command using a persistent node shell, falling back to running a
+        vcmd process when node shells are not available.
+
+        :param args: command to run
+        :param wait: True to wait for command status, False otherwise
+        :param shell: True to use shell, False otherwise
+        :return: stdout of command
+        :raises core.CoreCommandError: when there is a non-zero exit status
+        """
+        try:
+            node_shell = self._get_shell()
+        except OSError:
+            logging.exception("node(%s) error starting shell, using vcmd", self.name)
+            self.persistent = False
+            return utils.cmd(self.create_cmd(args), wait=wait, shell=shell)
+        if not shell:
+            args = " ".join(shlex.quote(x) for x in shlex.split(args))
+        try:
+            status, stdout, stderr = node_shell.run(args, wait)
+        except (IOError, ValueError):
+            raise CoreCommandError(-1, args)
+        finally:
+            self._put_shell(node_shell)
+        if status != 0:
+            raise CoreCommandError(status, args, stdout, stderr)
+        return stdout.decode("utf-8").strip()
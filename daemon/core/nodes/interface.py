@@ -9,6 +9,7 @@ from typing import TYPE_CHECKING, Callable, Dict, List, Tuple
 from core import utils
 from core.errors import CoreCommandError
 from core.nodes.netclient import get_net_client
+from core.nodes.netlink import LinkMonitor
 
 if TYPE_CHECKING:
     from core.emulator.distributed import DistributedServer
@@ -272,8 +273,9 @@ class Veth(CoreInterface):
         :return: nothing
         :raises CoreCommandError: when there is a command exception
         """
-        self.net_client.create_veth(self.localname, self.name)
-        self.net_client.device_up(self.localname)
+        with self.net_client.batch():
+            self.net_client.create_veth(self.localname, self.name)
+            self.net_client.device_up(self.localname)
         self.up = True
 
     def shutdown(self) -> None:
@@ -396,6 +398,31 @@ class TunTap(CoreInterface):
 
         return result
 
+    def waitforlink(
+        self, func: Callable[[], int], name: str, pid: int = None, timeout: float = 10
+    ) -> bool:
+        """
+        Wait for func() to return zero, using netlink link notifications for the
+        device instead of polling. Only available for local devices.
+
+        :param func: function to check for a result of zero
+        :param name: name of device to wait for notifications of
+        :param pid: process id within the network namespace of the device, None for
+            the host namespace
+        :param timeout: max time in seconds to wait for the device
+        :return: True if wait succeeded, False when failed or not available
+        """
+        if self.server is not None:
+            return False
+        try:
+            with LinkMonitor(pid) as monitor:
+                if func() == 0:
+                    return True
+                return monitor.wait(name, timeout) and func() == 0
+        except OSError as e:
+            logging.debug("link notifications not available: %s", e)
+            return False
+
     def waitfordevicelocal(self) -> None:
         """
         Check for presence of a local device - tap device may not
@@ -412,6 +439,8 @@ class TunTap(CoreInterface):
             except CoreCommandError:
                 return 1
 
+        if self.waitforlink(localdevexists, self.localname):
+            return
         self.waitfor(localdevexists)
 
     def waitfordevicenode(self) -> None:
@@ -429,6 +458,9 @@ class TunTap(CoreInterface):
             except CoreCommandError:
                 return 1
 
+        if self.waitforlink(nodedevexists, self.name, self.node.pid):
+            return
+
         count = 0
         while True:
             result = self.waitfor(nodedevexists)
@@ -526,8 +558,9 @@ class GreTap(CoreInterface):
         if remoteip is None:
             raise ValueError("missing remote IP required for GRE TAP device")
 
-        self.net_client.create_gretap(self.localname, remoteip, localip, ttl, key)
-        self.net_client.device_up(self.localname)
+        with self.net_client.batch():
+            self.net_client.create_gretap(self.localname, remoteip, localip, ttl, key)
+            self.net_client.device_up(self.localname)
         self.up = True
 
     def shutdown(self) -> None:
@@ -538,8 +571,9 @@ class GreTap(CoreInterface):
         """
         if self.localname:
             try:
-                self.net_client.device_down(self.localname)
-                self.net_client.delete_device(self.localname)
+                with self.net_client.batch():
+                    self.net_client.device_down(self.localname)
+                    self.net_client.delete_device(self.localname)
             except CoreCommandError:
                 logging.exception("error during shutdown")
 
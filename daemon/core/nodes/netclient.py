@@ -2,7 +2,9 @@
 Clients for dealing with bridge/interface commands.
 """
 import json
-from typing import Callable
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, List
 
 from core.constants import ETHTOOL_BIN, IP_BIN, OVS_BIN, TC_BIN
 
@@ -12,13 +14,104 @@ class LinuxNetClient:
     Client for creating Linux bridges and ip interfaces for nodes.
     """
 
-    def __init__(self, run: Callable[..., str]) -> None:
+    def __init__(self, run: Callable[..., str], sysfs: bool = False) -> None:
         """
         Create LinuxNetClient instance.
 
         :param run: function to run commands with
+        :param sysfs: True when device sysfs attributes can be read directly by this
+            process, False to read them using commands
         """
         self.run = run
+        self.sysfs = sysfs
+        self._batch = threading.local()
+
+    def cmd(self, args: str, shell: bool = False) -> str:
+        """
+        Run a command that can not be batched, running any currently queued ip
+        commands before it to preserve ordering.
+
+        :param args: command to run
+        :param shell: True to use shell, False otherwise
+        :return: command output
+        """
+        self.flush()
+        if shell:
+            return self.run(args, shell=True)
+        else:
+            return self.run(args)
+
+    def ip(self, args: str) -> None:
+        """
+        Run an ip command, or queue it when within a batch.
+
+        :param args: ip command arguments
+        :return: nothing
+        """
+        cmds = getattr(self._batch, "cmds", None)
+        if cmds is None:
+            self.run(f"{IP_BIN} {args}")
+        else:
+            cmds.append(args)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Queue ip commands ran by the current thread within this context, and run
+        them using a single ip batch command when the outermost context exits.
+
+        :return: nothing
+        """
+        if getattr(self._batch, "cmds", None) is not None:
+            yield
+            return
+        self._batch.cmds = []
+        try:
+            yield
+        finally:
+            cmds = self._batch.cmds
+            self._batch.cmds = None
+            self.run_batch(cmds)
+
+    def flush(self) -> None:
+        """
+        Run currently queued ip commands, if any.
+
+        :return: nothing
+        """
+        cmds = getattr(self._batch, "cmds", None)
+        if cmds:
+            self._batch.cmds = []
+            self.run_batch(cmds)
+
+    def run_batch(self, cmds: List[str]) -> None:
+        """
+        Run ip commands together using a single ip batch command.
+
+        :param cmds: ip command arguments to run
+        :return: nothing
+        """
+        if not cmds:
+            return
+        if len(cmds) == 1:
+            self.run(f"{IP_BIN} {cmds[0]}")
+            return
+        cmds = "\n".join(cmds)
+        self.run(f"{IP_BIN} -batch - <<EOF\n{cmds}\nEOF", shell=True)
+
+    def read_sysfs(self, device: str, name: str) -> str:
+        """
+        Read a sysfs attribute for a device, directly when possible.
+
+        :param device: device to read attribute for
+        :param name: name of attribute to read
+        :return: attribute value
+        """
+        path = f"/sys/class/net/{device}/{name}"
+        if self.sysfs:
+            with open(path, "r") as f:
+                return f.read().strip()
+        return self.cmd(f"cat {path}")
 
     def set_hostname(self, name: str) -> None:
         """
@@ -27,7 +120,7 @@ class LinuxNetClient:
         :param name: name for hostname
         :return: nothing
         """
-        self.run(f"hostname {name}")
+        self.cmd(f"hostname {name}")
 
     def create_route(self, route: str, device: str) -> None:
         """
@@ -37,7 +130,7 @@ class LinuxNetClient:
         :param device: device to add route to
         :return: nothing
         """
-        self.run(f"{IP_BIN} route add {route} dev {device}")
+        self.ip(f"route add {route} dev {device}")
 
     def device_up(self, device: str) -> None:
         """
@@ -46,7 +139,7 @@ class LinuxNetClient:
         :param device: device to bring up
         :return: nothing
         """
-        self.run(f"{IP_BIN} link set {device} up")
+        self.ip(f"link set {device} up")
 
     def device_down(self, device: str) -> None:
         """
@@ -55,7 +148,7 @@ class LinuxNetClient:
         :param device: device to bring down
         :return: nothing
         """
-        self.run(f"{IP_BIN} link set {device} down")
+        self.ip(f"link set {device} down")
 
     def device_name(self, device: str, name: str) -> None:
         """
@@ -65,7 +158,7 @@ class LinuxNetClient:
         :param name: name to set
         :return: nothing
         """
-        self.run(f"{IP_BIN} link set {device} name {name}")
+        self.ip(f"link set {device} name {name}")
 
     def device_show(self, device: str) -> str:
         """
@@ -74,7 +167,7 @@ class LinuxNetClient:
         :param device: device to get information for
         :return: device information
         """
-        return self.run(f"{IP_BIN} link show {device}")
+        return self.cmd(f"{IP_BIN} link show {device}")
 
     def get_mac(self, device: str) -> str:
         """
@@ -83,7 +176,7 @@ class LinuxNetClient:
         :param device: device to get mac for
         :return: MAC address
         """
-        return self.run(f"cat /sys/class/net/{device}/address")
+        return self.read_sysfs(device, "address")
 
     def get_ifindex(self, device: str) -> str:
         """
@@ -92,7 +185,7 @@ class LinuxNetClient:
         :param device: device to get ifindex for
         :return: ifindex
         """
-        return self.run(f"cat /sys/class/net/{device}/ifindex")
+        return self.read_sysfs(device, "ifindex")
 
     def device_ns(self, device: str, namespace: str) -> None:
         """
@@ -102,7 +195,7 @@ class LinuxNetClient:
         :param namespace: namespace to set device to
         :return: nothing
         """
-        self.run(f"{IP_BIN} link set {device} netns {namespace}")
+        self.ip(f"link set {device} netns {namespace}")
 
     def device_flush(self, device: str) -> None:
         """
@@ -111,7 +204,7 @@ class LinuxNetClient:
         :param device: device to flush
         :return: nothing
         """
-        self.run(
+        self.cmd(
             f"[ -e /sys/class/net/{device} ] && {IP_BIN} -6 address flush dev {device} || true",
             shell=True,
         )
@@ -124,7 +217,7 @@ class LinuxNetClient:
         :param mac: mac to set
         :return: nothing
         """
-        self.run(f"{IP_BIN} link set dev {device} address {mac}")
+        self.ip(f"link set dev {device} address {mac}")
 
     def delete_device(self, device: str) -> None:
         """
@@ -133,7 +226,7 @@ class LinuxNetClient:
         :param device: device to delete
         :return: nothing
         """
-        self.run(f"{IP_BIN} link delete {device}")
+        self.ip(f"link delete {device}")
 
     def delete_tc(self, device: str) -> None:
         """
@@ -142,7 +235,7 @@ class LinuxNetClient:
         :param device: device to remove tc
         :return: nothing
         """
-        self.run(f"{TC_BIN} qdisc delete dev {device} root")
+        self.cmd(f"{TC_BIN} qdisc delete dev {device} root")
 
     def checksums_off(self, interface_name: str) -> None:
         """
@@ -151,7 +244,22 @@ class LinuxNetClient:
         :param interface_name: interface to update
         :return: nothing
         """
-        self.run(f"{ETHTOOL_BIN} -K {interface_name} rx off tx off")
+        self.cmd(f"{ETHTOOL_BIN} -K {interface_name} rx off tx off")
+
+    def checksums_off_devices(self, interface_names: List[str]) -> None:
+        """
+        Turns checksums off for several interfaces using a single shell command.
+
+        :param interface_names: interfaces to update
+        :return: nothing
+        """
+        if not interface_names:
+            return
+        if len(interface_names) == 1:
+            self.checksums_off(interface_names[0])
+            return
+        cmds = [f"{ETHTOOL_BIN} -K {x} rx off tx off" for x in interface_names]
+        self.cmd(" && ".join(cmds), shell=True)
 
     def create_address(self, device: str, address: str, broadcast: str = None) -> None:
         """
@@ -163,11 +271,9 @@ class LinuxNetClient:
         :return: nothing
         """
         if broadcast is not None:
-            self.run(
-                f"{IP_BIN} address add {address} broadcast {broadcast} dev {device}"
-            )
+            self.ip(f"address add {address} broadcast {broadcast} dev {device}")
         else:
-            self.run(f"{IP_BIN} address add {address} dev {device}")
+            self.ip(f"address add {address} dev {device}")
 
     def delete_address(self, device: str, address: str) -> None:
         """
@@ -177,7 +283,7 @@ class LinuxNetClient:
         :param address: address to remove
         :return: nothing
         """
-        self.run(f"{IP_BIN} address delete {address} dev {device}")
+        self.ip(f"address delete {address} dev {device}")
 
     def create_veth(self, name: str, peer: str) -> None:
         """
@@ -187,7 +293,7 @@ class LinuxNetClient:
         :param peer: peer name
         :return: nothing
         """
-        self.run(f"{IP_BIN} link add name {name} type veth peer name {peer}")
+        self.ip(f"link add name {name} type veth peer name {peer}")
 
     def create_gretap(
         self, device: str, address: str, local: str, ttl: int, key: int
@@ -202,14 +308,14 @@ class LinuxNetClient:
         :param key: key for tap
         :return: nothing
         """
-        cmd = f"{IP_BIN} link add {device} type gretap remote {address}"
+        cmd = f"link add {device} type gretap remote {address}"
         if local is not None:
             cmd += f" local {local}"
         if ttl is not None:
             cmd += f" ttl {ttl}"
         if key is not None:
             cmd += f" key {key}"
-        self.run(cmd)
+        self.ip(cmd)
 
     def create_bridge(self, name: str) -> None:
         """
@@ -218,12 +324,13 @@ class LinuxNetClient:
         :param name: bridge name
         :return: nothing
         """
-        self.run(f"{IP_BIN} link add name {name} type bridge")
-        self.run(f"{IP_BIN} link set {name} type bridge stp_state 0")
-        self.run(f"{IP_BIN} link set {name} type bridge forward_delay 0")
-        self.run(f"{IP_BIN} link set {name} type bridge mcast_snooping 0")
-        self.run(f"{IP_BIN} link set {name} type bridge group_fwd_mask 65528")
-        self.device_up(name)
+        with self.batch():
+            self.ip(f"link add name {name} type bridge")
+            self.ip(f"link set {name} type bridge stp_state 0")
+            self.ip(f"link set {name} type bridge forward_delay 0")
+            self.ip(f"link set {name} type bridge mcast_snooping 0")
+            self.ip(f"link set {name} type bridge group_fwd_mask 65528")
+            self.device_up(name)
 
     def delete_bridge(self, name: str) -> None:
         """
@@ -232,8 +339,9 @@ class LinuxNetClient:
         :param name: bridge name
         :return: nothing
         """
-        self.device_down(name)
-        self.run(f"{IP_BIN} link delete {name} type bridge")
+        with self.batch():
+            self.device_down(name)
+            self.ip(f"link delete {name} type bridge")
 
     def create_interface(self, bridge_name: str, interface_name: str) -> None:
         """
@@ -243,8 +351,9 @@ class LinuxNetClient:
         :param interface_name: interface name
         :return: nothing
         """
-        self.run(f"{IP_BIN} link set dev {interface_name} master {bridge_name}")
-        self.device_up(interface_name)
+        with self.batch():
+            self.ip(f"link set dev {interface_name} master {bridge_name}")
+            self.device_up(interface_name)
 
     def delete_interface(self, bridge_name: str, interface_name: str) -> None:
         """
@@ -254,7 +363,7 @@ class LinuxNetClient:
         :param interface_name: interface name
         :return: nothing
         """
-        self.run(f"{IP_BIN} link set dev {interface_name} nomaster")
+        self.ip(f"link set dev {interface_name} nomaster")
 
     def existing_bridges(self, _id: int) -> bool:
         """
@@ -263,7 +372,7 @@ class LinuxNetClient:
         :param _id: node id to check bridges for
         :return: True if there are existing bridges, False otherwise
         """
-        output = self.run(f"{IP_BIN} -j link show type bridge")
+        output = self.cmd(f"{IP_BIN} -j link show type bridge")
         bridges = json.loads(output)
         for bridge in bridges:
             name = bridge.get("ifname")
@@ -283,7 +392,7 @@ class LinuxNetClient:
         :param name: bridge name
         :return: nothing
         """
-        self.run(f"{IP_BIN} link set {name} type bridge ageing_time 0")
+        self.ip(f"link set {name} type bridge ageing_time 0")
 
 
 class OvsNetClient(LinuxNetClient):
@@ -298,10 +407,12 @@ class OvsNetClient(LinuxNetClient):
         :param name: bridge name
         :return: nothing
         """
-        self.run(f"{OVS_BIN} add-br {name}")
-        self.run(f"{OVS_BIN} set bridge {name} stp_enable=false")
-        self.run(f"{OVS_BIN} set bridge {name} other_config:stp-max-age=6")
-        self.run(f"{OVS_BIN} set bridge {name} other_config:stp-forward-delay=4")
+        self.cmd(
+            f"{OVS_BIN} add-br {name} "
+            f"-- set bridge {name} stp_enable=false "
+            f"-- set bridge {name} other_config:stp-max-age=6 "
+            f"-- set bridge {name} other_config:stp-forward-delay=4"
+        )
         self.device_up(name)
 
     def delete_bridge(self, name: str) -> None:
@@ -312,7 +423,7 @@ class OvsNetClient(LinuxNetClient):
         :return: nothing
         """
         self.device_down(name)
-        self.run(f"{OVS_BIN} del-br {name}")
+        self.cmd(f"{OVS_BIN} del-br {name}")
 
     def create_interface(self, bridge_name: str, interface_name: str) -> None:
         """
@@ -322,7 +433,7 @@ class OvsNetClient(LinuxNetClient):
         :param interface_name: interface name
         :return: nothing
         """
-        self.run(f"{OVS_BIN} add-port {bridge_name} {interface_name}")
+        self.cmd(f"{OVS_BIN} add-port {bridge_name} {interface_name}")
         self.device_up(interface_name)
 
     def delete_interface(self, bridge_name: str, interface_name: str) -> None:
@@ -333,7 +444,7 @@ class OvsNetClient(LinuxNetClient):
         :param interface_name: interface name
         :return: nothing
         """
-        self.run(f"{OVS_BIN} del-port {bridge_name} {interface_name}")
+        self.cmd(f"{OVS_BIN} del-port {bridge_name} {interface_name}")
 
     def existing_bridges(self, _id: int) -> bool:
         """
@@ -342,7 +453,7 @@ class OvsNetClient(LinuxNetClient):
         :param _id: node id to check bridges for
         :return: True if there are existing bridges, False otherwise
         """
-        output = self.run(f"{OVS_BIN} list-br")
+        output = self.cmd(f"{OVS_BIN} list-br")
         if output:
             for line in output.split("\n"):
                 fields = line.split(".")
@@ -357,18 +468,21 @@ class OvsNetClient(LinuxNetClient):
         :param name: bridge name
         :return: nothing
         """
-        self.run(f"{OVS_BIN} set bridge {name} other_config:mac-aging-time=0")
+        self.cmd(f"{OVS_BIN} set bridge {name} other_config:mac-aging-time=0")
 
 
-def get_net_client(use_ovs: bool, run: Callable[..., str]) -> LinuxNetClient:
+def get_net_client(
+    use_ovs: bool, run: Callable[..., str], sysfs: bool = False
+) -> LinuxNetClient:
     """
     Retrieve desired net client for running network commands.
 
     :param use_ovs: True for OVS bridges, False for Linux bridges
     :param run: function used to run net client commands
+    :param sysfs: True when device sysfs attributes can be read directly
     :return: net client class
     """
     if use_ovs:
-        return OvsNetClient(run)
+        return OvsNetClient(run, sysfs)
     else:
-        return LinuxNetClient(run)
+        return LinuxNetClient(run, sysfs)
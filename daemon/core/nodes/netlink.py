@@ -0,0 +1,167 @@
+"""
+Netlink helpers for waiting on link notifications, within the host or a node
+network namespace, rather than polling for devices.
+"""
+
+import ctypes
+import logging
+import os
+import select
+import socket
+import struct
+import time
+from typing import List
+
+# rtnetlink multicast group and message types, from linux/rtnetlink.h
+RTMGRP_LINK = 0x1
+RTM_NEWLINK = 16
+IFLA_IFNAME = 3
+CLONE_NEWNET = 0x40000000
+
+NLMSG_HEADER = struct.Struct("=IHHII")
+IFINFO_MSG = struct.Struct("=BxHiII")
+RTA_HEADER = struct.Struct("=HH")
+
+
+def align(length: int) -> int:
+    """
+    Align a netlink length to 4 bytes.
+
+    :param length: length to align
+    :return: aligned length
+    """
+    return (length + 3) & ~3
+
+
+def link_names(data: bytes) -> List[str]:
+    """
+    Parse the names of links created or changed from netlink messages.
+
+    :param data: netlink messages
+    :return: link names found in new link messages
+    """
+    names = []
+    offset = 0
+    while offset + NLMSG_HEADER.size <= len(data):
+        length, msg_type, _flags, _seq, _pid = NLMSG_HEADER.unpack_from(data, offset)
+        if length < NLMSG_HEADER.size:
+            break
+        end = offset + length
+        if msg_type == RTM_NEWLINK:
+            attr = offset + NLMSG_HEADER.size + IFINFO_MSG.size
+            while attr + RTA_HEADER.size <= end:
+                attr_len, attr_type = RTA_HEADER.unpack_from(data, attr)
+                if attr_len < RTA_HEADER.size:
+                    break
+                if attr_type == IFLA_IFNAME:
+                    value = data[attr + RTA_HEADER.size : attr + attr_len]
+                    names.append(value.rstrip(b"\0").decode("utf-8"))
+                    break
+                attr += align(attr_len)
+        offset += align(length)
+    return names
+
+
+def setns(fd: int) -> None:
+    """
+    Move the current thread into the network namespace referred to by fd.
+
+    :param fd: network namespace file descriptor
+    :return: nothing
+    :raises OSError: when the namespace can not be entered
+    """
+    libc = ctypes.CDLL(None, use_errno=True)
+    if libc.setns(fd, CLONE_NEWNET) != 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, os.strerror(errno))
+
+
+class LinkMonitor:
+    """
+    Netlink socket subscribed to link notifications, used to wait for a device
+    to appear. Subscribe before checking for a device, so a device created in
+    between can not be missed.
+    """
+
+    def __init__(self, pid: int = None) -> None:
+        """
+        Create a LinkMonitor instance.
+
+        :param pid: process id within the network namespace to monitor, None for
+            the current namespace
+        :raises OSError: when netlink sockets or namespaces are not available
+        """
+        if pid is None:
+            self.sock = self.create_socket()
+        else:
+            self.sock = self.create_ns_socket(pid)
+
+    @classmethod
+    def create_socket(cls) -> socket.socket:
+        """
+        Create a netlink socket subscribed to link notifications.
+
+        :return: netlink socket
+        """
+        sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+        try:
+            sock.bind((0, RTMGRP_LINK))
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    @classmethod
+    def create_ns_socket(cls, pid: int) -> socket.socket:
+        """
+        Create a netlink socket within the network namespace of a process. Sockets
+        stay bound to the namespace they were created in, so the current thread
+        only enters the namespace while creating it.
+
+        :param pid: process id within the network namespace
+        :return: netlink socket
+        """
+        with open("/proc/thread-self/ns/net") as current, open(
+            f"/proc/{pid}/ns/net"
+        ) as target:
+            setns(target.fileno())
+            try:
+                return cls.create_socket()
+            finally:
+                setns(current.fileno())
+
+    def wait(self, name: str, timeout: float) -> bool:
+        """
+        Wait for a link notification for the given device.
+
+        :param name: name of device to wait for
+        :param timeout: max time in seconds to wait
+        :return: True if a notification was received, False on timeout
+        """
+        end = time.monotonic() + timeout
+        while True:
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                return False
+            readable, _, _ = select.select([self.sock], [], [], remaining)
+            if not readable:
+                return False
+            data = self.sock.recv(65536)
+            names = link_names(data)
+            logging.debug("link notifications: %s", names)
+            if name in names:
+                return True
+
+    def close(self) -> None:
+        """
+        Close the netlink socket.
+
+        :return: nothing
+        """
+        self.sock.close()
+
+    def __enter__(self) -> "LinkMonitor":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
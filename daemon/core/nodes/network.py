@@ -5,7 +5,7 @@ Defines network nodes used within core.
 import logging
 import threading
 import time
-from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Type
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set, Tuple, Type
 
 import netaddr
 
@@ -39,6 +39,8 @@ class EbtablesQueue:
     rate = 0.3
     # ebtables
     atomic_file = "/tmp/pycore.ebtables.atomic"
+    # max number of ebtables commands joined into a single shell invocation
+    batch_size = 500
 
     def __init__(self) -> None:
         """
@@ -56,6 +58,8 @@ class EbtablesQueue:
         # timestamps of last WLAN update; this keeps track of WLANs that are
         # using this queue
         self.last_update_time = {}
+        # interface pairs with rules currently installed, per WLAN chain
+        self.rules = {}
 
     def startupdateloop(self, wlan: "CoreNetwork") -> None:
         """
@@ -86,6 +90,7 @@ class EbtablesQueue:
                 logging.exception(
                     "error deleting last update time for wlan, ignored before: %s", wlan
                 )
+            self.rules.pop(wlan, None)
 
         if len(self.last_update_time) > 0:
             return
@@ -161,22 +166,28 @@ class EbtablesQueue:
     def ebcommit(self, wlan: "CoreNetwork") -> None:
         """
         Perform ebtables atomic commit using commands built in the self.cmds list.
+        Commands are joined into batched shell invocations, rather than running a
+        process per command, and applied to a saved snapshot that is committed
+        to the kernel at the end of the final batch.
 
         :return: nothing
         """
-        # save kernel ebtables snapshot to a file
-        args = self.ebatomiccmd("--atomic-save")
-        wlan.host_cmd(args)
-
-        # modify the table file using queued ebtables commands
-        for c in self.cmds:
-            args = self.ebatomiccmd(c)
-            wlan.host_cmd(args)
+        if not self.cmds:
+            return
+        cmds = [self.ebatomiccmd(x) for x in self.cmds]
         self.cmds = []
-
-        # commit the table file to the kernel
-        args = self.ebatomiccmd("--atomic-commit")
-        wlan.host_cmd(args)
+        # save kernel ebtables snapshot to a file, modify the table file using
+        # the queued ebtables commands and commit the table file to the kernel
+        cmds.insert(0, self.ebatomiccmd("--atomic-save"))
+        cmds.append(self.ebatomiccmd("--atomic-commit"))
+        try:
+            for i in range(0, len(cmds), self.batch_size):
+                args = " && ".join(cmds[i : i + self.batch_size])
+                wlan.host_cmd(args, shell=True)
+        except CoreCommandError:
+            logging.exception("error committing ebtables for wlan: %s", wlan.name)
+            # installed rules are now unknown, force a rebuild on next update
+            self.rules.pop(wlan, None)
 
         try:
             wlan.host_cmd(f"rm -f {self.atomic_file}")
@@ -186,7 +197,7 @@ class EbtablesQueue:
     def ebchange(self, wlan: "CoreNetwork") -> None:
         """
         Flag a change to the given WLAN's _linked dict, so the ebtables
-        chain will be rebuilt at the next interval.
+        chain will be updated at the next interval.
 
         :return: nothing
         """
@@ -194,41 +205,66 @@ class EbtablesQueue:
             if wlan not in self.updates:
                 self.updates.append(wlan)
 
-    def buildcmds(self, wlan: "CoreNetwork") -> None:
+    def ebrules(self, wlan: "CoreNetwork") -> Set[Tuple[str, str]]:
         """
-        Inspect a _linked dict from a wlan, and rebuild the ebtables chain for that WLAN.
+        Build the set of interface pairs that require rules within the WLAN chain,
+        linked pairs for a DROP policy or unlinked pairs for an ACCEPT policy.
 
-        :return: nothing
+        :param wlan: wlan entity
+        :return: interface local name pairs requiring rules
         """
+        rules = set()
         with wlan._linked_lock:
-            if wlan.has_ebtables_chain:
-                # flush the chain
-                self.cmds.append(f"-F {wlan.brname}")
-            else:
-                wlan.has_ebtables_chain = True
-                self.cmds.extend(
-                    [
-                        f"-N {wlan.brname} -P {wlan.policy}",
-                        f"-A FORWARD --logical-in {wlan.brname} -j {wlan.brname}",
-                    ]
-                )
-            # rebuild the chain
             for netif1, v in wlan._linked.items():
                 for netif2, linked in v.items():
                     if wlan.policy == "DROP" and linked:
-                        self.cmds.extend(
-                            [
-                                f"-A {wlan.brname} -i {netif1.localname} -o {netif2.localname} -j ACCEPT",
-                                f"-A {wlan.brname} -o {netif1.localname} -i {netif2.localname} -j ACCEPT",
-                            ]
-                        )
+                        rules.add((netif1.localname, netif2.localname))
                     elif wlan.policy == "ACCEPT" and not linked:
-                        self.cmds.extend(
-                            [
-                                f"-A {wlan.brname} -i {netif1.localname} -o {netif2.localname} -j DROP",
-                                f"-A {wlan.brname} -o {netif1.localname} -i {netif2.localname} -j DROP",
-                            ]
-                        )
+                        rules.add((netif1.localname, netif2.localname))
+        return rules
+
+    def buildcmds(self, wlan: "CoreNetwork") -> None:
+        """
+        Inspect a _linked dict from a wlan, and update the ebtables chain for that
+        WLAN. Only rules for pairs that changed since the last update are added or
+        removed, the chain is only fully rebuilt when its current state is unknown.
+
+        :return: nothing
+        """
+        if wlan.policy == "DROP":
+            target = "ACCEPT"
+        else:
+            target = "DROP"
+        rules = self.ebrules(wlan)
+        installed = self.rules.get(wlan)
+        if not wlan.has_ebtables_chain:
+            wlan.has_ebtables_chain = True
+            installed = set()
+            self.cmds.extend(
+                [
+                    f"-N {wlan.brname} -P {wlan.policy}",
+                    f"-A FORWARD --logical-in {wlan.brname} -j {wlan.brname}",
+                ]
+            )
+        elif installed is None:
+            # flush the chain
+            installed = set()
+            self.cmds.append(f"-F {wlan.brname}")
+        for name1, name2 in installed - rules:
+            self.cmds.extend(
+                [
+                    f"-D {wlan.brname} -i {name1} -o {name2} -j {target}",
+                    f"-D {wlan.brname} -o {name1} -i {name2} -j {target}",
+                ]
+            )
+        for name1, name2 in rules - installed:
+            self.cmds.extend(
+                [
+                    f"-A {wlan.brname} -i {name1} -o {name2} -j {target}",
+                    f"-A {wlan.brname} -o {name1} -i {name2} -j {target}",
+                ]
+            )
+        self.rules[wlan] = rules
 
 
 # a global object because all WLANs share the same queue
@@ -286,6 +322,8 @@ class CoreNetwork(CoreNetworkBase):
         self.brname = f"b.{self.id}.{sessionid}"
         self.up = False
         self.has_ebtables_chain = False
+        # called with interface pairs and their new link state, when changed
+        self.linkhook = None
         if start:
             self.startup()
             ebq.startupdateloop(self)
@@ -420,6 +458,8 @@ class CoreNetwork(CoreNetworkBase):
             if not self.linked(netif1, netif2):
                 return
             self._linked[netif1][netif2] = False
+            if self.linkhook:
+                self.linkhook([(netif1, netif2)], False)
 
         ebq.ebchange(self)
 
@@ -436,9 +476,35 @@ class CoreNetwork(CoreNetworkBase):
             if self.linked(netif1, netif2):
                 return
             self._linked[netif1][netif2] = True
+            if self.linkhook:
+                self.linkhook([(netif1, netif2)], True)
 
         ebq.ebchange(self)
 
+    def setlinks(
+        self, pairs: List[Tuple[CoreInterface, CoreInterface]], linked: bool
+    ) -> List[Tuple[CoreInterface, CoreInterface]]:
+        """
+        Link or unlink many interface pairs, resulting in a single update of
+        ebtables filtering rules.
+
+        :param pairs: interface pairs to link or unlink
+        :param linked: True to link pairs, False to unlink
+        :return: interface pairs that changed
+        """
+        changed = []
+        with self._linked_lock:
+            for netif1, netif2 in pairs:
+                if self.linked(netif1, netif2) == linked:
+                    continue
+                self._linked[netif1][netif2] = linked
+                changed.append((netif1, netif2))
+            if changed and self.linkhook:
+                self.linkhook(changed, linked)
+        if changed:
+            ebq.ebchange(self)
+        return changed
+
     def linkconfig(
         self,
         netif: CoreInterface,
@@ -924,7 +990,7 @@ class PtpNet(CoreNetwork):
         for address in if1.addrlist:
             ip, _sep, mask = address.partition("/")
             mask = int(mask)
-            if netaddr.valid_ipv4(ip):
+            if ":" not in ip:
                 interface1_ip4 = ip
                 interface1_ip4_mask = mask
             else:
@@ -938,7 +1004,7 @@ class PtpNet(CoreNetwork):
         for address in if2.addrlist:
             ip, _sep, mask = address.partition("/")
             mask = int(mask)
-            if netaddr.valid_ipv4(ip):
+            if ":" not in ip:
                 interface2_ip4 = ip
                 interface2_ip4_mask = mask
             else:
@@ -1096,6 +1162,7 @@ class WlanNode(CoreNetwork):
         logging.debug("node(%s) setting model: %s", self.name, model.name)
         if model.config_type == RegisterTlvs.WIRELESS.value:
             self.model = model(session=self.session, _id=self.id)
+            self.linkhook = self.model.link_callback
             for netif in self.netifs():
                 netif.poshook = self.model.position_callback
                 if netif.poshook and netif.node:
@@ -11,6 +11,7 @@ from urllib.parse import urlparse
 from core import constants
 from core.constants import CORE_DATA_DIR
 from core.emane.nodes import EmaneNet
+from core.emulator.broadcast import BroadcastSubscriber, OverflowPolicy
 from core.emulator.data import LinkData, NodeData
 from core.emulator.enumerations import EventTypes, LinkTypes, MessageFlags
 from core.errors import CoreError
@@ -38,6 +39,8 @@ class Sdt:
     DEFAULT_SDT_URL = "tcp://127.0.0.1:50000/"
     # default altitude (in meters) for flyto view
     DEFAULT_ALT = 2500
+    # max size of batched commands sent together, to fit within a udp datagram
+    MAX_BATCH = 1400
     # TODO: read in user"s nodes.conf here; below are default node types from the GUI
     DEFAULT_SPRITES = [
         ("router", "router.gif"),
@@ -66,8 +69,22 @@ class Sdt:
         self.url = self.DEFAULT_SDT_URL
         self.address = None
         self.protocol = None
-        self.session.node_handlers.append(self.handle_node_update)
-        self.session.link_handlers.append(self.handle_link_update)
+        self.threshold = 0
+        # commands waiting to be sent together
+        self.batch = []
+        self.batch_size = 0
+        # last sent canvas position and cached wireless check for nodes
+        self.positions = {}
+        self.wireless = {}
+        # updates are sent from a dispatch thread, so node movement never blocks
+        # on the sdt socket, commands for a burst of updates are sent together
+        # once the dispatch thread is idle
+        self.broadcasts = BroadcastSubscriber(
+            f"sdt-{session.id}", policy=OverflowPolicy.COALESCE, idle=self.flush
+        )
+        handler = self.broadcasts.handler
+        self.session.node_handlers.append(handler(self.handle_node_update))
+        self.session.link_handlers.append(handler(self.handle_link_update))
 
     def is_enabled(self) -> bool:
         """
@@ -89,6 +106,7 @@ class Sdt:
         self.url = urlparse(url)
         self.address = (self.url.hostname, self.url.port)
         self.protocol = self.url.scheme
+        self.threshold = self.session.options.get_config_int("sdtthreshold", default=0)
 
     def connect(self, flags: int = 0) -> bool:
         """
@@ -164,26 +182,64 @@ class Sdt:
 
         :return: nothing
         """
+        self.broadcasts.flush(timeout=1)
         self.cmd("clear all")
         self.disconnect()
         self.showerror = True
+        self.positions.clear()
+        self.wireless.clear()
 
-    def cmd(self, cmdstr: str) -> bool:
+    def cmd(self, cmdstr: str, flush: bool = True) -> bool:
         """
         Send an SDT command over a UDP socket. socket.sendall() is used
         as opposed to socket.sendto() because an exception is raised when
-        there is no socket listener.
+        there is no socket listener. Commands can be batched, to be sent along
+        with following commands, in as few datagrams as possible.
 
         :param cmdstr: command to send
+        :param flush: True to send the command now, along with batched commands,
+            False to batch the command
         :return: True if command was successful, False otherwise
         """
         if self.sock is None:
             return False
 
+        cmd = f"{cmdstr}\n".encode()
+        logging.debug("sdt cmd: %s", cmd)
+        with self.lock:
+            if self.batch and self.batch_size + len(cmd) > self.MAX_BATCH:
+                if not self._send_batch():
+                    return False
+            self.batch.append(cmd)
+            self.batch_size += len(cmd)
+            if flush:
+                return self._send_batch()
+        return True
+
+    def flush(self) -> bool:
+        """
+        Send all batched commands.
+
+        :return: True if commands were sent, False otherwise
+        """
+        with self.lock:
+            if not self.batch:
+                return True
+            return self._send_batch()
+
+    def _send_batch(self) -> bool:
+        """
+        Send batched commands together. Expects lock to be held.
+
+        :return: True if commands were sent, False otherwise
+        """
+        data = b"".join(self.batch)
+        self.batch.clear()
+        self.batch_size = 0
+        if self.sock is None:
+            return False
         try:
-            cmd = f"{cmdstr}\n".encode()
-            logging.debug("sdt cmd: %s", cmd)
-            self.sock.sendall(cmd)
+            self.sock.sendall(data)
             return True
         except IOError:
             logging.exception("SDT connection error")
@@ -280,15 +336,53 @@ class Sdt:
 
     def delete_node(self, node_id: int) -> None:
         """
-        Handle deleting a node in SDT.
+        Handle deleting a node in SDT. The delete is queued behind pending
+        updates, so a pending update can not re-create the node after it was
+        deleted.
+
+        :param node_id: node id to delete
+        :return: nothing
+        """
+        if not self.is_enabled():
+            self.positions.pop(node_id, None)
+            self.wireless.pop(node_id, None)
+            return
+        self.broadcasts.handler(self.handle_node_delete)(node_id)
+
+    def handle_node_delete(self, node_id: int) -> None:
+        """
+        Handler for deleting a node, ran on the dispatch thread.
 
         :param node_id: node id to delete
         :return: nothing
         """
         logging.debug("sdt delete node: %s", node_id)
+        self.positions.pop(node_id, None)
+        self.wireless.pop(node_id, None)
         if not self.connect():
             return
-        self.cmd(f"delete node,{node_id}")
+        self.cmd(f"delete node,{node_id}", flush=False)
+
+    def moved(self, node_data: NodeData) -> bool:
+        """
+        Check if a node has moved further than the movement threshold, since the
+        last position sent.
+
+        :param node_data: node data with new position
+        :return: True if node moved enough to be sent, False otherwise
+        """
+        x = node_data.x_position
+        y = node_data.y_position
+        if not self.threshold or x is None or y is None:
+            return True
+        last = self.positions.get(node_data.id)
+        if last is not None:
+            last_x, last_y = last
+            distance = ((x - last_x) ** 2 + (y - last_y) ** 2) ** 0.5
+            if distance < self.threshold:
+                return False
+        self.positions[node_data.id] = (x, y)
+        return True
 
     def handle_node_update(self, node_data: NodeData) -> None:
         """
@@ -303,8 +397,10 @@ class Sdt:
 
         # delete node
         if node_data.message_type == MessageFlags.DELETE.value:
-            self.cmd(f"delete node,{node_data.id}")
-        else:
+            self.positions.pop(node_data.id, None)
+            self.wireless.pop(node_data.id, None)
+            self.cmd(f"delete node,{node_data.id}", flush=False)
+        elif self.moved(node_data):
             x = node_data.x_position
             y = node_data.y_position
             lat = node_data.latitude
@@ -312,11 +408,11 @@ class Sdt:
             alt = node_data.altitude
             if all([lat is not None, lon is not None, alt is not None]):
                 pos = f"pos {lon:.6f},{lat:.6f},{alt:.6f}"
-                self.cmd(f"node {node_data.id} {pos}")
+                self.cmd(f"node {node_data.id} {pos}", flush=False)
             elif node_data.message_type == 0:
                 lat, lon, alt = self.session.location.getgeo(x, y, 0)
                 pos = f"pos {lon:.6f},{lat:.6f},{alt:.6f}"
-                self.cmd(f"node {node_data.id} {pos}")
+                self.cmd(f"node {node_data.id} {pos}", flush=False)
 
     def wireless_net_check(self, node_id: int) -> bool:
         """
@@ -325,21 +421,26 @@ class Sdt:
         :param node_id: node id to check
         :return: True is a wireless node type, False otherwise
         """
-        result = False
-        try:
-            node = self.session.get_node(node_id)
+        result = self.wireless.get(node_id)
+        if result is None:
+            try:
+                node = self.session.get_node(node_id)
+            except CoreError:
+                return False
             result = isinstance(node, (WlanNode, EmaneNet))
-        except CoreError:
-            pass
+            self.wireless[node_id] = result
         return result
 
-    def add_link(self, node_one: int, node_two: int, is_wireless: bool) -> None:
+    def add_link(
+        self, node_one: int, node_two: int, is_wireless: bool, flush: bool = True
+    ) -> None:
         """
         Handle adding a link in SDT.
 
         :param node_one: node one id
         :param node_two: node two id
         :param is_wireless: True if link is wireless, False otherwise
+        :param flush: True to send now, False to batch with following commands
         :return: nothing
         """
         logging.debug("sdt add link: %s, %s, %s", node_one, node_two, is_wireless)
@@ -351,14 +452,15 @@ class Sdt:
             attr = "green,2"
         else:
             attr = "red,2"
-        self.cmd(f"link {node_one},{node_two} line {attr}")
+        self.cmd(f"link {node_one},{node_two} line {attr}", flush)
 
-    def delete_link(self, node_one: int, node_two: int) -> None:
+    def delete_link(self, node_one: int, node_two: int, flush: bool = True) -> None:
         """
         Handle deleting a node in SDT.
 
         :param node_one: node one id
         :param node_two: node two id
+        :param flush: True to send now, False to batch with following commands
         :return: nothing
         """
         logging.debug("sdt delete link: %s, %s", node_one, node_two)
@@ -366,7 +468,7 @@ class Sdt:
             return
         if self.wireless_net_check(node_one) or self.wireless_net_check(node_two):
             return
-        self.cmd(f"delete link,{node_one},{node_two}")
+        self.cmd(f"delete link,{node_one},{node_two}", flush)
 
     def handle_link_update(self, link_data: LinkData) -> None:
         """
@@ -377,7 +479,7 @@ class Sdt:
         """
         if link_data.message_type == MessageFlags.ADD.value:
             params = link_data_params(link_data)
-            self.add_link(*params)
+            self.add_link(*params, flush=False)
         elif link_data.message_type == MessageFlags.DELETE.value:
             params = link_data_params(link_data)
-            self.delete_link(*params[:2])
+            self.delete_link(*params[:2], flush=False)
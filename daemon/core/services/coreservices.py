@@ -467,7 +467,7 @@ class CoreServices:
         for boot_path in boot_paths:
             args = (node, boot_path)
             funcs.append((self._start_boot_paths, args, {}))
-        result, exceptions = utils.threadpool(funcs)
+        result, exceptions = node.session.run_tasks(funcs)
         if exceptions:
             raise ServiceBootError(*exceptions)
 
@@ -14,6 +14,7 @@ import os
 import random
 import shlex
 import shutil
+import stat
 import sys
 from subprocess import PIPE, STDOUT, Popen
 from typing import (
@@ -287,6 +288,27 @@ def file_demunge(pathname: str, header: str) -> None:
         write_file.write("".join(lines))
 
 
+def private_directory(path: str) -> bool:
+    """
+    Create a directory only accessible to the current user, or check that an
+    existing directory is, so files within it can not be planted by others.
+
+    :param path: directory path
+    :return: True if the directory is private, False otherwise
+    """
+    try:
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        status = os.lstat(path)
+    except OSError:
+        logging.exception("error creating private directory: %s", path)
+        return False
+    if not stat.S_ISDIR(status.st_mode):
+        return False
+    if status.st_uid != os.geteuid():
+        return False
+    return not status.st_mode & 0o077
+
+
 def expand_corepath(
     pathname: str, session: "Session" = None, node: "CoreNode" = None
 ) -> str:
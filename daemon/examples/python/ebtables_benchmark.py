@@ -0,0 +1,73 @@
+"""
+Benchmark ebtables commit latency for a fully linked WLAN, across WLAN sizes.
+
+Measures the initial build of the WLAN chain and the commit of a single link change.
+"""
+import argparse
+import logging
+import time
+
+from core.emulator.coreemu import CoreEmu
+from core.emulator.emudata import IpPrefixes, NodeOptions
+from core.emulator.enumerations import EventTypes, NodeTypes
+from core.nodes.network import ebq
+
+
+def commit(wlan):
+    start = time.perf_counter()
+    ebq.buildcmds(wlan)
+    count = len(ebq.cmds)
+    ebq.ebcommit(wlan)
+    return count, time.perf_counter() - start
+
+
+def benchmark(size):
+    prefixes = IpPrefixes("10.83.0.0/16")
+    coreemu = CoreEmu()
+    session = coreemu.create_session()
+    session.set_state(EventTypes.CONFIGURATION_STATE)
+
+    # create wlan and nodes, links are controlled directly below
+    wlan = session.add_node(_type=NodeTypes.WIRELESS_LAN)
+    options = NodeOptions(model="PC")
+    for _ in range(size):
+        node = session.add_node(options=options)
+        interface = prefixes.create_interface(node)
+        session.add_link(node.id, wlan.id, interface_one=interface)
+
+    # link all interfaces and commit the full chain
+    netifs = wlan.netifs(sort=True)
+    for i, netif1 in enumerate(netifs):
+        for netif2 in netifs[i + 1 :]:
+            wlan.link(netif1, netif2)
+    with ebq.updatelock:
+        count, elapsed = commit(wlan)
+    logging.info("size(%s) full build: rules(%s) %.4fs", size, count, elapsed)
+
+    # flip a single link and commit the change
+    wlan.unlink(netifs[0], netifs[1])
+    with ebq.updatelock:
+        count, elapsed = commit(wlan)
+    logging.info("size(%s) link change: rules(%s) %.4fs", size, count, elapsed)
+
+    coreemu.shutdown()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Run ebtables benchmark")
+    parser.add_argument(
+        "-s",
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10, 50, 100, 200],
+        help="wlan sizes to benchmark",
+    )
+    args = parser.parse_args()
+    for size in args.sizes:
+        benchmark(size)
+
+
+if __name__ == "__main__":
+    main()
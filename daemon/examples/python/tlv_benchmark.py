@@ -0,0 +1,89 @@
+"""
+Benchmark packing and parsing of large legacy api config and file messages.
+
+Sizes are limited by the 16 bit message length field, messages hold at most 64KB.
+"""
+import argparse
+import logging
+import time
+
+from core.api.tlv import coreapi
+from core.emulator.enumerations import ConfigTlvs, FileTlvs, MessageFlags
+
+
+def config_message(size):
+    values = "|".join(f"value{i}" for i in range(size))
+    captions = "|".join(f"caption{i}" for i in range(size))
+    data_types = tuple(10 for _ in range(size))
+    tlv_data = [
+        (ConfigTlvs.NODE, 1),
+        (ConfigTlvs.OBJECT, "benchmark"),
+        (ConfigTlvs.TYPE, 0),
+        (ConfigTlvs.DATA_TYPES, data_types),
+        (ConfigTlvs.VALUES, values),
+        (ConfigTlvs.CAPTIONS, captions),
+    ]
+    return coreapi.CoreConfMessage.create(MessageFlags.ADD.value, tlv_data)
+
+
+def file_message(size):
+    tlv_data = [
+        (FileTlvs.NODE, 1),
+        (FileTlvs.NAME, "/tmp/benchmark"),
+        (FileTlvs.DATA, "x" * size),
+    ]
+    return coreapi.CoreFileMessage.create(MessageFlags.ADD.value, tlv_data)
+
+
+def benchmark(name, message, count):
+    header = message.raw_message[: coreapi.CoreMessage.header_len]
+    data = message.raw_message[coreapi.CoreMessage.header_len :]
+    message_class = message.__class__
+    start = time.perf_counter()
+    for _ in range(count):
+        message.repack()
+    pack_time = (time.perf_counter() - start) / count
+    start = time.perf_counter()
+    for _ in range(count):
+        message_class(message.flags, header, data)
+    parse_time = (time.perf_counter() - start) / count
+    logging.info(
+        "%s bytes(%s) pack: %.6fs parse: %.6fs",
+        name,
+        len(message.raw_message),
+        pack_time,
+        parse_time,
+    )
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Run tlv benchmark")
+    parser.add_argument(
+        "-v",
+        "--values",
+        type=int,
+        nargs="+",
+        default=[100, 1000, 2000],
+        help="number of config values to benchmark",
+    )
+    parser.add_argument(
+        "-f",
+        "--files",
+        type=int,
+        nargs="+",
+        default=[1, 16, 63],
+        help="kilobytes of file data to benchmark",
+    )
+    parser.add_argument(
+        "-c", "--count", type=int, default=100, help="iterations per benchmark"
+    )
+    args = parser.parse_args()
+    for size in args.values:
+        benchmark("config", config_message(size), args.count)
+    for size in args.files:
+        benchmark("file", file_message(size * 1024), args.count)
+
+
+if __name__ == "__main__":
+    main()
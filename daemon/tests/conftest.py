@@ -60,6 +60,7 @@ def patcher(request):
         patch_manager.patch_obj(
             LinuxNetClient, "get_mac", return_value="00:00:00:00:00:00"
         )
+        patch_manager.patch_obj(LinuxNetClient, "get_ifindex", return_value="1")
         patch_manager.patch_obj(CoreNode, "nodefile")
         patch_manager.patch_obj(Session, "write_state")
         patch_manager.patch_obj(Session, "write_nodes")
@@ -150,3 +150,24 @@ class TestEmane:
         assert session.get_node(n2_id)
         assert session.get_node(emane_id)
         assert value == config_value
+
+    def test_nem_lookup(self, session, ip_prefixes):
+        # given
+        emane_network = session.add_node(_type=NodeTypes.EMANE)
+        node = session.add_node()
+        interface = ip_prefixes.create_interface(node)
+        session.add_link(node.id, emane_network.id, interface_one=interface)
+        netif = node.netif(interface.id)
+
+        # when
+        emane_network.setnemid(netif, 1)
+        found = session.emane.nemlookup(1)
+        emane_network.setnemid(netif, 2)
+        previous = session.emane.nemlookup(1)
+        session.delete_link(node.id, emane_network.id, interface.id, None)
+
+        # then
+        assert found == (emane_network, netif)
+        assert previous == (None, None)
+        assert emane_network.getnemnetif(2) is None
+        assert session.emane.nemlookup(2) == (None, None)
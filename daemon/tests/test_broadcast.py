@@ -0,0 +1,108 @@
+import threading
+
+import mock
+
+from core.emulator.broadcast import BroadcastSubscriber, OverflowPolicy
+from core.emulator.data import NodeData
+from core.emulator.enumerations import MessageFlags
+
+
+class TestBroadcast:
+    def test_handler(self):
+        # given
+        subscriber = BroadcastSubscriber("test")
+        results = []
+
+        # when
+        handler = subscriber.handler(results.append)
+        for value in range(10):
+            handler(value)
+        subscriber.flush(timeout=5)
+
+        # then
+        assert subscriber.handler(results.append) is handler
+        assert results == list(range(10))
+        assert subscriber.stats()["delivered"] == 10
+        subscriber.stop()
+
+    def test_drop_oldest(self):
+        # given
+        subscriber = BroadcastSubscriber("test", max_queue=2)
+        event = threading.Event()
+        results = []
+
+        def blocked(value):
+            event.wait(timeout=5)
+            results.append(value)
+
+        # when
+        handler = subscriber.handler(blocked)
+        handler(0)
+        with subscriber.condition:
+            subscriber.condition.wait_for(lambda: subscriber.busy, timeout=5)
+        for value in range(1, 5):
+            handler(value)
+        event.set()
+        subscriber.flush(timeout=5)
+
+        # then
+        assert results == [0, 3, 4]
+        assert subscriber.stats()["dropped"] == 2
+        subscriber.stop()
+
+    def test_coalesce(self):
+        # given
+        subscriber = BroadcastSubscriber("test", policy=OverflowPolicy.COALESCE)
+        event = threading.Event()
+        results = []
+
+        def blocked(node_data):
+            event.wait(timeout=5)
+            results.append(node_data)
+
+        # when
+        handler = subscriber.handler(blocked)
+        handler(NodeData(id=1))
+        with subscriber.condition:
+            subscriber.condition.wait_for(lambda: subscriber.busy, timeout=5)
+        handler(NodeData(id=1, x_position=1))
+        handler(NodeData(id=2))
+        handler(NodeData(id=1, x_position=2))
+        handler(NodeData(id=1, message_type=MessageFlags.DELETE.value))
+        event.set()
+        subscriber.flush(timeout=5)
+
+        # then
+        assert [x.id for x in results] == [1, 1, 2, 1]
+        assert results[1].x_position == 2
+        assert results[3].message_type == MessageFlags.DELETE.value
+        assert subscriber.stats()["coalesced"] == 1
+        subscriber.stop()
+
+    def test_broadcast_nodes_batch(self, session):
+        # given
+        subscriber = BroadcastSubscriber("test")
+        results = []
+        single = []
+        handler = subscriber.handler(results.append)
+        session.node_handlers.append(handler)
+        session.node_handlers.append(single.append)
+        node_datas = [NodeData(id=x) for x in range(3)]
+
+        # when
+        with mock.patch.object(subscriber, "put") as put:
+            with mock.patch.object(
+                subscriber, "_dispatch", wraps=subscriber._dispatch
+            ) as dispatch:
+                session.broadcast_nodes(node_datas)
+        subscriber.flush(timeout=5)
+        session.node_handlers.remove(subscriber.handler(results.append))
+        session.node_handlers.remove(single.append)
+
+        # then
+        put.assert_not_called()
+        dispatch.assert_called_once()
+        assert results == node_datas
+        assert single == node_datas
+        assert handler not in session.node_handlers
+        subscriber.stop()
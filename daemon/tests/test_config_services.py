@@ -1,3 +1,4 @@
+import time
 from unittest import mock
 
 import pytest
@@ -7,6 +8,7 @@ from core.configservice.base import (
     ConfigService,
     ConfigServiceBootError,
     ConfigServiceMode,
+    TemplateCache,
 )
 from core.emulator.enumerations import ConfigDataTypes
 from core.errors import CoreCommandError, CoreError
@@ -45,6 +47,23 @@ class MyService(ConfigService):
         return TEMPLATE_TEXT
 
 
+class MyOtherService(MyService):
+    name = "MyOtherService"
+
+
+class MyDependentService(MyService):
+    name = "MyDependentService"
+    dependencies = [MyService.name]
+
+
+def mock_boot(service, validation_mode, validation_timer):
+    service.validation_mode = validation_mode
+    service.validation_timer = validation_timer
+    service.create_dirs = mock.MagicMock()
+    service.create_files = mock.MagicMock()
+    service.run_startup = mock.MagicMock()
+
+
 class TestConfigServices:
     def test_set_template(self):
         # given
@@ -94,6 +113,56 @@ class TestConfigServices:
         # then
         node.nodefile.assert_called_with(MyService.files[0], TEMPLATE_TEXT)
 
+    def test_create_files_cached(self, tmpdir):
+        # given
+        cache = TemplateCache(str(tmpdir))
+        node = mock.MagicMock()
+        MyService.template_cache = cache
+        try:
+            service1 = MyService(node)
+            service2 = MyService(node)
+
+            # when
+            service1.create_files()
+            service2.create_files()
+        finally:
+            del MyService.template_cache
+
+        # then
+        node.nodefile.assert_called_with(MyService.files[0], TEMPLATE_TEXT)
+        stats = cache.stats()
+        assert stats["misses"] == 2
+        assert stats["hits"] == 2
+        assert stats["texts"] == 1
+
+    def test_template_cache_restart(self, tmpdir):
+        # given
+        text = "echo ${config['value1']}"
+        cache = TemplateCache(str(tmpdir))
+        template = cache.get_text(MyService, text)
+
+        # when
+        restarted = TemplateCache(str(tmpdir))
+        restarted_template = restarted.get_text(MyService, text)
+
+        # then
+        assert restarted_template is not template
+        assert restarted_template.module.__file__ == template.module.__file__
+        assert restarted_template.render(config=dict(value1="hi")) == "echo hi"
+
+    def test_template_cache_not_private(self, tmpdir):
+        # given
+        tmpdir.chmod(0o777)
+        cache = TemplateCache(str(tmpdir))
+
+        # when
+        template = cache.get_text(MyService, "echo ${config['value1']}")
+
+        # then
+        assert cache.module_directory is None
+        assert not tmpdir.listdir()
+        assert template.render(config=dict(value1="hi")) == "echo hi"
+
     def test_run_startup(self):
         # given
         node = mock.MagicMock()
@@ -298,3 +367,61 @@ class TestConfigServices:
         service.run_startup.assert_called_once()
         service.run_validation.assert_called_once()
         service.wait_validation.assert_not_called()
+
+    def test_start_config_services_concurrent(self, session):
+        # given
+        node = session.add_node()
+        node.add_config_service(MyService)
+        node.add_config_service(MyOtherService)
+        for service in node.config_services.values():
+            mock_boot(service, ConfigServiceMode.TIMER, 0.5)
+
+        # when
+        start = time.monotonic()
+        node.start_config_services()
+        elapsed = time.monotonic() - start
+
+        # then
+        assert elapsed < 0.9
+        for service in node.config_services.values():
+            service.run_startup.assert_called_once()
+
+    def test_start_config_services_dependency(self, session):
+        # given
+        node = session.add_node()
+        node.add_config_service(MyService)
+        node.add_config_service(MyDependentService)
+        calls = []
+        for service in node.config_services.values():
+            mock_boot(service, ConfigServiceMode.NON_BLOCKING, 0)
+            service.run_startup.side_effect = lambda x, s=service: calls.append(
+                ("startup", s.name)
+            )
+            service.run_validation = mock.MagicMock(
+                side_effect=lambda s=service: calls.append(("validate", s.name))
+            )
+
+        # when
+        node.start_config_services()
+
+        # then
+        assert calls == [
+            ("startup", MyService.name),
+            ("validate", MyService.name),
+            ("startup", MyDependentService.name),
+            ("validate", MyDependentService.name),
+        ]
+
+    def test_start_config_services_exception(self, session):
+        # given
+        node = session.add_node()
+        node.add_config_service(MyService)
+        service = node.config_services[MyService.name]
+        mock_boot(service, ConfigServiceMode.NON_BLOCKING, 0)
+        service.run_validation = mock.MagicMock(
+            side_effect=ConfigServiceBootError("error")
+        )
+
+        # when
+        with pytest.raises(ConfigServiceBootError):
+            node.start_config_services()
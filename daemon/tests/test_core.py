@@ -164,6 +164,156 @@ class TestCore:
         status = ping(node_one, node_two, ip_prefixes)
         assert not status
 
+    def test_wlan_range_links(self, session, ip_prefixes):
+        """
+        Test basic range model linking and unlinking nodes as they move.
+
+        :param core.emulator.coreemu.EmuSession session: session for test
+        :param ip_prefixes: generates ip addresses for nodes
+        """
+
+        # create wlan
+        wlan_node = session.add_node(_type=NodeTypes.WIRELESS_LAN)
+        session.mobility.set_model(wlan_node, BasicRangeModel)
+
+        # create nodes
+        options = NodeOptions(model="mdr")
+        options.set_position(0, 0)
+        node_one = session.add_node(options=options)
+        options.set_position(1000, 0)
+        node_two = session.add_node(options=options)
+
+        # link nodes
+        for node in [node_one, node_two]:
+            interface = ip_prefixes.create_interface(node)
+            session.add_link(node.id, wlan_node.id, interface_one=interface)
+        netif_one = min(node_one.netif(0), node_two.netif(0))
+        netif_two = max(node_one.netif(0), node_two.netif(0))
+        assert not wlan_node.linked(netif_one, netif_two)
+
+        # move node two within range, then out of range
+        node_two.setposition(100, 0)
+        assert wlan_node.linked(netif_one, netif_two)
+        node_two.setposition(1000, 0)
+        assert not wlan_node.linked(netif_one, netif_two)
+
+    def test_wlan_range_update(self, session, ip_prefixes):
+        """
+        Test basic range model linking and unlinking a batch of moved nodes.
+
+        :param core.emulator.coreemu.EmuSession session: session for test
+        :param ip_prefixes: generates ip addresses for nodes
+        """
+
+        # create wlan
+        wlan_node = session.add_node(_type=NodeTypes.WIRELESS_LAN)
+        session.mobility.set_model(wlan_node, BasicRangeModel)
+
+        # create nodes
+        options = NodeOptions(model="mdr")
+        options.set_position(0, 0)
+        node_one = session.add_node(options=options)
+        node_two = session.add_node(options=options)
+        node_three = session.add_node(options=options)
+        nodes = [node_one, node_two, node_three]
+
+        # link nodes
+        for node in nodes:
+            interface = ip_prefixes.create_interface(node)
+            session.add_link(node.id, wlan_node.id, interface_one=interface)
+        netifs = sorted(x.netif(0) for x in nodes)
+        assert wlan_node.linked(netifs[0], netifs[1])
+
+        # move all nodes apart, but keep node three close to node one
+        node_one.position.set(0, 0)
+        node_two.position.set(1000, 0)
+        node_three.position.set(0, 100)
+        wlan_node.model.update(nodes, [x.netif(0) for x in nodes])
+
+        # then
+        linked = []
+        for i, netif_one in enumerate(netifs):
+            for netif_two in netifs[i + 1 :]:
+                if wlan_node.linked(netif_one, netif_two):
+                    linked.append({netif_one.node, netif_two.node})
+        assert linked == [{node_one, node_three}]
+
+    def test_wlan_range_update_detached(self, session, ip_prefixes):
+        """
+        Test basic range model updates ignore interfaces detached from the wlan.
+
+        :param core.emulator.coreemu.EmuSession session: session for test
+        :param ip_prefixes: generates ip addresses for nodes
+        """
+
+        # create wlan
+        wlan_node = session.add_node(_type=NodeTypes.WIRELESS_LAN)
+        session.mobility.set_model(wlan_node, BasicRangeModel)
+
+        # create and link nodes
+        options = NodeOptions(model="mdr")
+        options.set_position(0, 0)
+        nodes = []
+        for _ in range(20):
+            node = session.add_node(options=options)
+            interface = ip_prefixes.create_interface(node)
+            session.add_link(node.id, wlan_node.id, interface_one=interface)
+            nodes.append(node)
+        netifs = [x.netif(0) for x in nodes]
+
+        # detach an interface and move all nodes apart
+        wlan_node.detach(netifs[1])
+        for i, node in enumerate(nodes):
+            node.position.set(i * 1000, 0)
+        wlan_node.model.update(nodes, netifs)
+
+        # then
+        assert not wlan_node.linked(
+            min(netifs[0], netifs[2]), max(netifs[0], netifs[2])
+        )
+
+    def test_wlan_range_external_links(self, session, ip_prefixes):
+        """
+        Test basic range model updates account for links changed directly on the
+        wlan.
+
+        :param core.emulator.coreemu.EmuSession session: session for test
+        :param ip_prefixes: generates ip addresses for nodes
+        """
+
+        # create wlan
+        wlan_node = session.add_node(_type=NodeTypes.WIRELESS_LAN)
+        session.mobility.set_model(wlan_node, BasicRangeModel, {"range": "100"})
+
+        # create and link nodes
+        options = NodeOptions(model="mdr")
+        options.set_position(0, 0)
+        nodes = []
+        for _ in range(3):
+            node = session.add_node(options=options)
+            interface = ip_prefixes.create_interface(node)
+            session.add_link(node.id, wlan_node.id, interface_one=interface)
+            nodes.append(node)
+        netifs = [x.netif(0) for x in nodes]
+        near = min(netifs[0], netifs[1]), max(netifs[0], netifs[1])
+        far = min(netifs[0], netifs[2]), max(netifs[0], netifs[2])
+        nodes[2].position.set(500, 0)
+        wlan_node.model.update(nodes, netifs)
+
+        # change links directly on the wlan
+        wlan_node.unlink(*near)
+        wlan_node.link(*far)
+
+        # move nodes, keeping the same distances
+        for node in nodes:
+            x, y, _ = node.position.get()
+            node.position.set(x, y + 1)
+        wlan_node.model.update(nodes, netifs)
+
+        # then
+        assert wlan_node.linked(*near)
+        assert not wlan_node.linked(*far)
+
     def test_mobility(self, session, ip_prefixes):
         """
         Test basic wlan network.
@@ -1,3 +1,9 @@
+import tarfile
+
+import mock
+from fabric import Connection
+
+from core.emulator.distributed import DistributedServer
 from core.emulator.emudata import NodeOptions
 from core.emulator.enumerations import NodeTypes
 
@@ -38,3 +44,97 @@ class TestDistributed:
         assert node.server.name == server_name
         assert node.server.host == host
         assert len(session.distributed.tunnels) > 0
+
+    def test_remote_bridge_servers(self, session):
+        # given
+        host = "127.0.0.1"
+        session.distributed.address = host
+        session.distributed.add_server("core2", host)
+        session.distributed.add_server("core3", "127.0.0.2")
+
+        # when
+        session.add_node(_type=NodeTypes.HUB)
+        session.add_node(_type=NodeTypes.SWITCH)
+        session.instantiate()
+
+        # then
+        assert len(session.distributed.tunnels) == 4
+
+    def test_server_connections(self):
+        # given
+        server = DistributedServer("core2", "127.0.0.1")
+
+        # when
+        with server.connection() as conn_one:
+            with server.connection() as conn_two:
+                pass
+        with server.connection() as conn_three:
+            pass
+
+        # then
+        assert conn_one is not conn_two
+        assert conn_three in (conn_one, conn_two)
+        assert len(server.connections) == 2
+
+    def test_server_staged_files(self):
+        # given
+        server = DistributedServer("core2", "127.0.0.1")
+        server.staging = True
+
+        # when
+        with mock.patch.object(Connection, "put") as put, mock.patch.object(
+            server, "remote_cmd"
+        ) as run:
+            server.remote_write("/tmp/n1.conf/one.sh", "one", 0o755)
+            server.remote_write("/tmp/n1.conf/two.conf", "two")
+            put.assert_not_called()
+            server.flush()
+
+        # then
+        put.assert_called_once()
+        run.assert_called_once()
+        data = put.call_args[0][0]
+        data.seek(0)
+        with tarfile.open(fileobj=data) as tar:
+            modes = {x.name: x.mode for x in tar.getmembers()}
+        assert modes == {"tmp/n1.conf/one.sh": 0o755, "tmp/n1.conf/two.conf": 0o644}
+        assert server.stats()["files"] == 2
+        assert server.stats()["archives"] == 1
+
+    def test_server_staged_files_grouped(self):
+        # given
+        server = DistributedServer("core2", "127.0.0.1")
+        server.staging = True
+        for name in ["n1", "n2", "n3"]:
+            nodedir = f"/tmp/{name}.conf"
+            server.remote_write(f"{nodedir}/one.sh", "one", 0o755, nodedir)
+            server.remote_write(f"{nodedir}/two.conf", "two", 0o644, nodedir)
+
+        # when
+        with mock.patch.object(Connection, "put") as put, mock.patch.object(
+            server, "remote_cmd"
+        ) as run:
+            server.remote_put("/tmp/scenario.xml", "/tmp/scenario.xml")
+            sent_put = put.call_count
+            server.flush("/tmp/n1.conf")
+            server.flush("/tmp/n1.conf")
+            sent_node = put.call_count
+            server.flush()
+
+        # then
+        assert sent_put == 1
+        assert sent_node == 2
+        assert put.call_count == 3
+        assert run.call_count == 2
+        data = put.call_args[0][0]
+        data.seek(0)
+        with tarfile.open(fileobj=data) as tar:
+            names = sorted(x.name for x in tar.getmembers())
+        assert names == [
+            "tmp/n2.conf/one.sh",
+            "tmp/n2.conf/two.conf",
+            "tmp/n3.conf/one.sh",
+            "tmp/n3.conf/two.conf",
+        ]
+        assert server.stats()["files"] == 6
+        assert server.stats()["archives"] == 2
@@ -0,0 +1,69 @@
+import threading
+
+from core.emulator.executor import SessionExecutor
+
+
+def add(x, y):
+    return x + y
+
+
+def fail():
+    raise ValueError("failure")
+
+
+class TestExecutor:
+    def test_run(self):
+        # given
+        executor = SessionExecutor(4)
+        funcs = [(add, (x, 1), {}) for x in range(10)]
+        funcs.append((fail, (), {}))
+
+        # when
+        results, exceptions = executor.run(funcs)
+
+        # then
+        assert results == [x + 1 for x in range(10)]
+        assert len(exceptions) == 1
+        assert isinstance(exceptions[0], ValueError)
+        stats = executor.stats()
+        assert stats["completed"] == 11
+        assert stats["queued"] == 0
+        assert stats["active"] == 0
+        executor.shutdown()
+        assert not executor.threads
+
+    def test_run_nested(self):
+        # given
+        executor = SessionExecutor(1)
+        event = threading.Event()
+
+        def nested(value):
+            results, _ = executor.run([(add, (value, 1), {}) for _ in range(3)])
+            return sum(results)
+
+        def blocked():
+            event.wait(timeout=5)
+            return 0
+
+        # when
+        funcs = [(blocked, (), {})]
+        funcs.extend((nested, (x,), {}) for x in range(3))
+        thread = threading.Timer(0.1, event.set)
+        thread.start()
+        results, exceptions = executor.run(funcs)
+
+        # then
+        assert not exceptions
+        assert sorted(results) == [0, 3, 6, 9]
+        executor.shutdown()
+
+    def test_session_workers(self, session):
+        # given
+        session.options.set_config("workers", "2")
+
+        # when
+        results, exceptions = session.run_tasks([(add, (1, 2), {})])
+
+        # then
+        assert results == [3]
+        assert session.executor.workers == 2
@@ -0,0 +1,58 @@
+import pytest
+
+from core.location.geo import GeoLocation
+
+LAT = 47.57917
+LON = -122.13232
+ALT = 2.0
+
+
+class TestGeo:
+    def test_getgeo_many(self):
+        # given
+        location = GeoLocation()
+        location.setrefgeo(LAT, LON, ALT)
+        location.refscale = 150.0
+        xs = [0.0, 100.0, 250.0]
+        ys = [0.0, 200.0, 50.0]
+        zs = [None, 5.0, 10.0]
+
+        # when
+        lats, lons, alts = location.getgeo_many(xs, ys, zs)
+
+        # then
+        expected = [location.getgeo(x, y, z) for x, y, z in zip(xs, ys, zs)]
+        assert list(zip(lats, lons, alts)) == expected
+        assert lats[0] == pytest.approx(LAT)
+        assert lons[0] == pytest.approx(LON)
+        assert alts[0] == pytest.approx(ALT)
+
+    def test_getxyz_many(self):
+        # given
+        location = GeoLocation()
+        location.setrefgeo(LAT, LON, ALT)
+        location.refscale = 150.0
+        lats, lons, alts = location.getgeo_many([100.0, 250.0], [200.0, 50.0], [5, 10])
+
+        # when
+        xs, ys, zs = location.getxyz_many(lats, lons, alts)
+
+        # then
+        assert round(xs[0]) == 100 and round(ys[0]) == 200 and round(zs[0]) == 5
+        assert round(xs[1]) == 250 and round(ys[1]) == 50 and round(zs[1]) == 10
+
+    def test_cache_reference_change(self):
+        # given
+        location = GeoLocation()
+        location.setrefgeo(LAT, LON, ALT)
+        location.refscale = 150.0
+        position = location.getgeo(100.0, 200.0, 0.0)
+
+        # when
+        location.refxyz = (100.0, 200.0, 0.0)
+        moved = location.getgeo(100.0, 200.0, 0.0)
+
+        # then
+        assert len(location.geo_cache) == 1
+        assert moved != position
+        assert moved == pytest.approx((LAT, LON, ALT))
@@ -7,9 +7,11 @@ from mock import patch
 
 from core.api.grpc import core_pb2
 from core.api.grpc.client import CoreGrpcClient, InterfaceHelper
+from core.api.grpc.events import EventStreamer
+from core.api.grpc.throughputs import ThroughputSampler, ThroughputSamplers
 from core.config import ConfigShim
 from core.emane.ieee80211abg import EmaneIeee80211abgModel
-from core.emulator.data import EventData
+from core.emulator.data import EventData, NodeData
 from core.emulator.emudata import NodeOptions
 from core.emulator.enumerations import (
     ConfigFlags,
@@ -155,6 +157,36 @@ class TestGrpc:
         )
         assert service_file.data == service_file_config.data
 
+    def test_start_session_bulk(self, grpc_server):
+        # given
+        client = CoreGrpcClient()
+        session = grpc_server.coreemu.create_session()
+        node_one = core_pb2.Node(id=1, model="PC")
+        node_two = core_pb2.Node(id=2, model="PC")
+        interface_helper = InterfaceHelper(ip4_prefix="10.83.0.0/16")
+        link = core_pb2.Link(
+            type=core_pb2.LinkType.WIRED,
+            node_one_id=node_one.id,
+            node_two_id=node_two.id,
+            interface_one=interface_helper.create_interface(node_one.id, 0),
+            interface_two=interface_helper.create_interface(node_two.id, 0),
+        )
+
+        # when
+        with patch.object(CoreXmlWriter, "write"):
+            with client.context_connect():
+                response = client.start_session(
+                    session.id, [node_one, node_two], [link], bulk=True
+                )
+
+        # then
+        assert response.result is True
+        assert "topology" in response.timings
+        assert "instantiate" in response.timings
+        interface_one = session.nodes[node_one.id].netif(0)
+        interface_two = session.nodes[node_two.id].netif(0)
+        assert interface_one.net is interface_two.net
+
     @pytest.mark.parametrize("session_id", [None, 6013])
     def test_create_session(self, grpc_server, session_id):
         # given
@@ -206,6 +238,47 @@ class TestGrpc:
         assert len(response.session.nodes) == 1
         assert len(response.session.links) == 0
 
+    def test_get_session_delta(self, grpc_server, ip_prefixes):
+        # given
+        client = CoreGrpcClient()
+        session = grpc_server.coreemu.create_session()
+        session.set_state(EventTypes.CONFIGURATION_STATE)
+        node_one = session.add_node()
+        node_two = session.add_node()
+        switch = session.add_node(_type=NodeTypes.SWITCH)
+        interface_one = ip_prefixes.create_interface(node_one)
+        session.add_link(node_one.id, switch.id, interface_one)
+        with client.context_connect():
+            response = client.get_session(session.id)
+        version = response.version
+
+        # when
+        interface_two = ip_prefixes.create_interface(node_two)
+        session.add_link(node_two.id, switch.id, interface_two)
+        session.delete_link(node_one.id, switch.id, interface_one.id, None)
+        session.delete_node(node_one.id)
+        with client.context_connect():
+            delta = client.get_session_delta(session.id, version)
+            unchanged = client.get_session_delta(session.id, delta.version)
+            full = client.get_session_delta(session.id, delta.version + 1)
+
+        # then
+        assert len(response.session.nodes) == 3
+        assert len(response.session.links) == 1
+        assert not delta.full
+        assert delta.version > version
+        assert list(delta.deleted_nodes) == [node_one.id]
+        assert len(delta.links) == 1
+        assert delta.links[0].node_two_id == node_two.id
+        assert len(delta.deleted_links) == 1
+        assert delta.deleted_links[0].node_two_id == node_one.id
+        assert not unchanged.full
+        assert not unchanged.nodes
+        assert not unchanged.links
+        assert full.full
+        assert len(full.session.nodes) == 2
+        assert len(full.session.links) == 1
+
     def test_get_sessions(self, grpc_server):
         # given
         client = CoreGrpcClient()
@@ -1028,6 +1101,99 @@ class TestGrpc:
             # then
             queue.get(timeout=5)
 
+    def test_batch_events(self, grpc_server):
+        # given
+        client = CoreGrpcClient()
+        session = grpc_server.coreemu.create_session()
+        node = session.add_node()
+        queue = Queue()
+
+        def handle_event(events):
+            assert events.session_id == session.id
+            queue.put(events)
+
+        # then
+        with client.context_connect():
+            client.batch_events(session.id, handle_event, coalesce=0.5)
+            time.sleep(0.1)
+            for x in range(10):
+                node.setposition(x=x, y=x)
+                session.broadcast_node(node.data(message_type=0))
+
+            # then
+            events = queue.get(timeout=5)
+            assert len(events.events) == 1
+            assert events.coalesced == 9
+            assert events.events[0].node_event.node.position.x == 9
+
+    def test_event_streamer_coalesce(self, grpc_server, ip_prefixes):
+        # given
+        session = grpc_server.coreemu.create_session()
+        wlan = session.add_node(_type=NodeTypes.WIRELESS_LAN)
+        node = session.add_node()
+        interface = ip_prefixes.create_interface(node)
+        session.add_link(node.id, wlan.id, interface)
+        link_data = wlan.all_link_data(0)[0]
+        event_types = [core_pb2.EventType.LINK, core_pb2.EventType.SESSION]
+        streamer = EventStreamer(session, event_types, coalesce=0.1, max_queue=2)
+
+        # when
+        session.broadcast_link(link_data._replace(message_type=1))
+        session.broadcast_link(link_data._replace(message_type=2))
+        for _ in range(3):
+            event_data = EventData(event_type=EventTypes.RUNTIME_STATE.value)
+            session.broadcast_event(event_data)
+        events = streamer.process_batch()
+        streamer.remove_handlers()
+
+        # then
+        assert len(events.events) == 2
+        assert events.coalesced == 2
+        assert events.dropped == 1
+        assert streamer.stats()["pending"] == 0
+
+    def test_event_streamer_coalesce_networks(self, grpc_server, ip_prefixes):
+        # given
+        session = grpc_server.coreemu.create_session()
+        wlan = session.add_node(_type=NodeTypes.WIRELESS_LAN)
+        node = session.add_node()
+        interface = ip_prefixes.create_interface(node)
+        session.add_link(node.id, wlan.id, interface)
+        link_data = wlan.all_link_data(0)[0]
+        event_types = [core_pb2.EventType.LINK]
+        streamer = EventStreamer(session, event_types, coalesce=0.1)
+
+        # when
+        session.broadcast_link(link_data._replace(message_type=1))
+        other_data = link_data._replace(message_type=2, network_id=wlan.id + 1)
+        session.broadcast_link(other_data)
+        events = streamer.process_batch()
+        streamer.remove_handlers()
+
+        # then
+        assert len(events.events) == 2
+        assert events.coalesced == 0
+
+    def test_event_streamer_node_batch(self, grpc_server):
+        # given
+        session = grpc_server.coreemu.create_session()
+        event_types = [core_pb2.EventType.NODE]
+        streamer = EventStreamer(session, event_types, coalesce=0.1)
+        node_datas = [NodeData(id=x, x_position=x) for x in range(3)]
+
+        # when
+        with patch.object(streamer.node_handler, "func") as put:
+            session.broadcast_nodes(node_datas)
+            session.broadcast_nodes(node_datas[:1])
+        events = streamer.process_batch()
+        streamer.remove_handlers()
+
+        # then
+        put.assert_not_called()
+        assert len(events.events) == 3
+        assert events.coalesced == 1
+        assert streamer.node_handler not in session.node_handlers
+
     def test_throughputs(self, request, grpc_server):
         if request.config.getoption("mock"):
             pytest.skip("mocking calls")
@@ -1049,6 +1215,65 @@ class TestGrpc:
             # then
             queue.get(timeout=5)
 
+    def test_throughput_sampler(self, grpc_server, ip_prefixes, tmpdir):
+        # given
+        session = grpc_server.coreemu.create_session()
+        node = session.add_node()
+        switch = session.add_node(_type=NodeTypes.SWITCH)
+        interface = ip_prefixes.create_interface(node)
+        session.add_link(node.id, switch.id, interface)
+        netif = node.netif(interface.id)
+        sampler = ThroughputSampler(session, 0.1, 0.5)
+        sampler.sysfs_path = str(tmpdir)
+
+        def write_counters(name, rx, tx):
+            statistics = tmpdir.join(name, "statistics")
+            statistics.ensure(dir=True)
+            statistics.join("rx_bytes").write(f"{rx}\n")
+            statistics.join("tx_bytes").write(f"{tx}\n")
+
+        # when
+        write_counters(netif.localname, 0, 0)
+        write_counters(switch.brname, 0, 0)
+        first = sampler.sample()
+        write_counters(netif.localname, 1000, 1000)
+        write_counters(switch.brname, 500, 0)
+        second = sampler.sample()
+        write_counters(netif.localname, 1000, 1000)
+        third = sampler.sample()
+        sampler.close()
+
+        # then
+        assert first is None
+        assert len(second.interface_throughputs) == 1
+        interface_throughput = second.interface_throughputs[0]
+        assert interface_throughput.node_id == node.id
+        assert interface_throughput.interface_id == interface.id
+        assert interface_throughput.throughput > 0
+        assert len(second.bridge_throughputs) == 1
+        assert second.bridge_throughputs[0].node_id == switch.id
+        smoothed = third.interface_throughputs[0].throughput
+        assert 0 < smoothed < interface_throughput.throughput
+        assert sampler.stats()["devices"] == 2
+
+    def test_throughput_samplers_shared(self, grpc_server):
+        # given
+        session = grpc_server.coreemu.create_session()
+        samplers = ThroughputSamplers()
+
+        # when
+        sampler_one = samplers.subscribe(session, 1.0)
+        sampler_two = samplers.subscribe(session, 1.0)
+        sampler_three = samplers.subscribe(session, 2.0)
+        samplers.unsubscribe(sampler_one)
+        samplers.unsubscribe(sampler_two)
+        samplers.unsubscribe(sampler_three)
+
+        # then
+        assert sampler_one is sampler_two
+        assert sampler_one is not sampler_three
+        assert not samplers.samplers
+
     def test_session_events(self, grpc_server):
         # given
         client = CoreGrpcClient()
@@ -9,8 +9,9 @@ import netaddr
 import pytest
 from mock import MagicMock
 
-from core.api.tlv import coreapi
+from core.api.tlv import coreapi, dataconversion
 from core.emane.ieee80211abg import EmaneIeee80211abgModel
+from core.emulator.data import LinkData
 from core.emulator.enumerations import (
     ConfigFlags,
     ConfigTlvs,
@@ -969,3 +970,52 @@ class TestGui:
 
         config = coretlv.session.emane.get_configs()
         assert config[config_key] == config_value
+
+    def test_config_large_message(self):
+        values = "|".join(f"value{i}" for i in range(1000))
+        data_types = tuple(10 for _ in range(1000))
+        message = coreapi.CoreConfMessage.create(
+            0,
+            [
+                (ConfigTlvs.OBJECT, "large"),
+                (ConfigTlvs.DATA_TYPES, data_types),
+                (ConfigTlvs.VALUES, values),
+            ],
+        )
+        header = message.raw_message[: coreapi.CoreMessage.header_len]
+        data = message.raw_message[coreapi.CoreMessage.header_len :]
+
+        parsed = coreapi.CoreConfMessage(message.flags, header, bytearray(data))
+
+        assert parsed.get_tlv(ConfigTlvs.OBJECT.value) == "large"
+        assert parsed.get_tlv(ConfigTlvs.DATA_TYPES.value) == data_types
+        assert parsed.get_tlv(ConfigTlvs.VALUES.value) == values
+
+    def test_broadcast_link_encoded_once(self):
+        link_data = LinkData(
+            message_type=MessageFlags.ADD.value,
+            node1_id=1,
+            node2_id=2,
+            delay=1000,
+            per=1.5,
+            interface1_id=0,
+            interface1_ip4="10.0.0.1",
+            interface1_ip4_mask=24,
+            interface1_mac="00:00:00:aa:00:01",
+        )
+        hits = dataconversion.encoded_cache.stats()["hits"]
+
+        message = dataconversion.encode(dataconversion.convert_link, link_data)
+        cached = dataconversion.encode(dataconversion.convert_link, link_data)
+
+        assert cached is message
+        assert dataconversion.encoded_cache.stats()["hits"] == hits + 1
+        header = message[: coreapi.CoreMessage.header_len]
+        data = message[coreapi.CoreMessage.header_len :]
+        parsed = coreapi.CoreLinkMessage(link_data.message_type, header, data)
+        assert parsed.get_tlv(LinkTlvs.N1_NUMBER.value) == 1
+        assert parsed.get_tlv(LinkTlvs.N2_NUMBER.value) == 2
+        assert parsed.get_tlv(LinkTlvs.DELAY.value) == 1000
+        assert parsed.get_tlv(LinkTlvs.PER.value) == "1.5"
+        assert parsed.get_tlv(LinkTlvs.INTERFACE1_IP4.value) == "10.0.0.1"
+        assert parsed.get_tlv(LinkTlvs.INTERFACE1_IP4_MASK.value) == 24
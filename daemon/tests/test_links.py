@@ -1,7 +1,11 @@
-from core.emulator.emudata import LinkOptions
+from core.emulator.emudata import InterfaceData, LinkOptions, NodeOptions
 from core.emulator.enumerations import NodeTypes
 
 
+def create_interface(_id, ip4_id):
+    return InterfaceData(_id, f"eth{_id}", None, f"10.0.0.{ip4_id}", 24, None, None)
+
+
 def create_ptp_network(session, ip_prefixes):
     # create nodes
     node_one = session.add_node()
@@ -127,3 +131,45 @@ class TestLinks:
         # then
         assert not node_one.netif(interface_one.id)
         assert not node_two.netif(interface_two.id)
+
+    def test_add_topology(self, session):
+        # given
+        nodes = [
+            (NodeTypes.DEFAULT, 1, NodeOptions()),
+            (NodeTypes.DEFAULT, 2, NodeOptions()),
+            (NodeTypes.SWITCH, 3, NodeOptions()),
+            (NodeTypes.WIRELESS_LAN, 4, NodeOptions()),
+        ]
+        links = [
+            (1, 2, create_interface(0, 1), create_interface(0, 2), None),
+            (1, 3, create_interface(1, 3), None, None),
+            (3, 2, None, create_interface(1, 4), None),
+            (2, 4, create_interface(2, 5), None, None),
+        ]
+
+        # when
+        timings, exceptions = session.add_topology(nodes, links)
+
+        # then
+        assert not exceptions
+        assert list(timings) == [
+            "nodes",
+            "plan",
+            "host",
+            "namespaces",
+            "config",
+            "links",
+        ]
+        node_one = session.get_node(1)
+        node_two = session.get_node(2)
+        switch = session.get_node(3)
+        wlan = session.get_node(4)
+        ptp_one = node_one.netif(0)
+        ptp_two = node_two.netif(0)
+        assert ptp_one.up
+        assert ptp_one.name == "eth0"
+        assert ptp_one.net is ptp_two.net
+        assert ptp_one.addrlist == ["10.0.0.1/24"]
+        assert node_one.netif(1).net is switch
+        assert node_two.netif(1).net is switch
+        assert node_two.netif(2).net is wlan
@@ -1,6 +1,23 @@
+import threading
+import time
+
+import mock
 import pytest
 
-from core.location.mobility import WayPoint
+from core.emulator.emudata import NodeOptions
+from core.emulator.enumerations import NodeTypes
+from core.location.event import EventLoop
+from core.location.mobility import Ns2ScriptedMobility, WayPoint, WayPointMobility
+from core.location.trace import Ns2Trace
+
+_SCRIPT = """$node_(1) set X_ 10.0
+$node_(1) set Y_ 20.0
+$node_(1) set Z_ 0.0
+$ns_ at 20.0 "$node_(1) setdest 30.0 40.0 5.0"
+$ns_ at 1.0 "$node_(1) setdest 50.0 60.0 5.0"
+$ns_ at 5.0 "$node_(2) setdest 70.0 80.0 0.0"
+$ns_ at 40.0 "$node_(2) setdest 90.0 100.0 5.0"
+"""
 
 
 class TestMobility:
@@ -15,3 +32,193 @@ class TestMobility:
     )
     def test_waypoint_lessthan(self, wp1, wp2, expected):
         assert (wp1 < wp2) == expected
+
+    def test_event_loop_cancel(self):
+        # given
+        event_loop = EventLoop()
+        ran = threading.Event()
+        done = threading.Event()
+        canceled = event_loop.add_event(0.01, ran.set)
+        finished = event_loop.add_event(0.02, done.set)
+
+        # when
+        event_loop.cancel_event(canceled)
+        event_loop.run()
+        done.wait(1)
+        event_loop.cancel_event(finished)
+        pending = event_loop.canceled
+        event_loop.stop()
+
+        # then
+        assert not ran.is_set()
+        assert done.is_set()
+        assert pending == 0
+        assert event_loop.stats()["count"] == 1
+
+    def test_event_loop_periodic(self):
+        # given
+        event_loop = EventLoop()
+        ticks = []
+        done = threading.Event()
+
+        def tick():
+            ticks.append(event_loop.stats(event)["count"])
+            if len(ticks) == 3:
+                event_loop.cancel_event(event)
+                done.set()
+
+        event = event_loop.add_periodic_event(0.0, 0.01, tick)
+
+        # when
+        event_loop.run()
+        done.wait(1)
+        time.sleep(0.05)
+        event_loop.stop()
+
+        # then
+        assert ticks == [1, 2, 3]
+        assert not event.queued
+        assert event_loop.stats()["count"] == 3
+
+    def test_waypoint_round_canceled(self, session):
+        # given
+        wlan = session.add_node(_type=NodeTypes.WIRELESS_LAN)
+        mobility = WayPointMobility(session, wlan.id)
+        mobility.addwaypoint(100.0, 1, 10.0, 10.0, None, 1.0)
+        mobility.copywaypoints()
+        mobility.setendtime()
+
+        # when
+        mobility.start()
+        event = mobility.round_event
+        mobility.pause()
+        mobility.start()
+
+        # then
+        assert event.canceled
+        queued = [x for x in session.event_loop.queue if not x.canceled]
+        assert queued == [mobility.round_event]
+        assert mobility.round_event.interval == 0.001 * mobility.refresh_ms
+
+    def test_waypoints_stop_clears_points(self, session):
+        # given
+        wlan = session.add_node(_type=NodeTypes.WIRELESS_LAN)
+        mobility = WayPointMobility(session, wlan.id)
+        mobility.addwaypoint(0.0, 1, 100.0, 100.0, None, 1.0)
+        mobility.copywaypoints()
+        mobility.setendtime()
+        mobility.start()
+
+        # when
+        points = list(mobility.points)
+        mobility.stop(move_initial=False)
+
+        # then
+        assert points == [1]
+        assert not mobility.points
+        if mobility._array is not None:
+            assert len(mobility._array) == 0
+
+    def test_ns2_trace_cached(self, tmpdir):
+        # given
+        script = tmpdir.join("test.scen")
+        script.write(_SCRIPT)
+        cache_dir = tmpdir.join("cache")
+
+        # when
+        with mock.patch("core.location.trace.CACHE_DIR", str(cache_dir)):
+            trace = Ns2Trace.load(str(script))
+            waypoints = list(trace.waypoints(0, len(trace)))
+            initial = list(trace.initial())
+            trace.close()
+            with mock.patch("core.location.trace.compile_trace") as compile_trace:
+                trace = Ns2Trace.load(str(script))
+                trace.close()
+
+        # then
+        assert [x[0] for x in waypoints] == [1.0, 5.0, 20.0, 40.0]
+        assert waypoints[0] == (1.0, 1, 50.0, 60.0, None, 5.0)
+        assert initial == [(1, 10.0, 20.0, 0.0)]
+        assert sorted(x.basename for x in tmpdir.listdir()) == ["cache", "test.scen"]
+        assert len(cache_dir.listdir()) == 1
+        assert cache_dir.stat().mode & 0o077 == 0
+        compile_trace.assert_not_called()
+
+    def test_ns2_trace_cache_untrusted(self, tmpdir):
+        # given
+        script = tmpdir.join("test.scen")
+        script.write(_SCRIPT)
+        cache_dir = tmpdir.join("cache")
+        with mock.patch("core.location.trace.CACHE_DIR", str(cache_dir)):
+            trace = Ns2Trace.load(str(script))
+            trace.close()
+        cache = cache_dir.listdir()[0]
+        cache.chmod(0o666)
+
+        # when
+        with mock.patch("core.location.trace.CACHE_DIR", str(cache_dir)):
+            with mock.patch("core.location.trace.compile_trace") as compile_trace:
+                compile_trace.return_value = cache.read_binary()
+                trace = Ns2Trace.load(str(script))
+                trace.close()
+
+        # then
+        compile_trace.assert_called_once()
+        assert cache.stat().mode & 0o077 == 0
+
+    def test_ns2_waypoints_windowed(self, session, tmpdir):
+        # given
+        script = tmpdir.join("test.scen")
+        script.write(_SCRIPT)
+        wlan = session.add_node(_type=NodeTypes.WIRELESS_LAN)
+        config = Ns2ScriptedMobility.default_values()
+        config["file"] = str(script)
+        config["map"] = "2:3"
+        session.mobility.set_model(wlan, Ns2ScriptedMobility, config)
+        mobility = wlan.mobility
+
+        # when
+        queued = sorted(x.time for x in mobility.queue)
+        mobility.updatepoints(15.0)
+        points = sorted(mobility.points)
+        queued_after = [x.time for x in mobility.queue]
+        mobility.loopwaypoints()
+
+        # then
+        assert queued == [1.0, 5.0]
+        assert points == [1, 3]
+        assert queued_after == [20.0]
+        assert sorted(x.time for x in mobility.queue) == [1.0, 5.0]
+        assert mobility.initial[1].coords == (10.0, 20.0, 0.0)
+        assert mobility.endtime == 40.0
+
+    def test_waypoints_moved_together(self, session, ip_prefixes):
+        # given
+        wlan = session.add_node(_type=NodeTypes.WIRELESS_LAN)
+        options = NodeOptions(model="mdr")
+        options.set_position(0, 0)
+        nodes = []
+        for _ in range(3):
+            node = session.add_node(options=options)
+            interface = ip_prefixes.create_interface(node)
+            session.add_link(node.id, wlan.id, interface_one=interface)
+            nodes.append(node)
+        mobility = WayPointMobility(session, wlan.id)
+        mobility.endtime = 0
+        mobility.addwaypoint(1.0, nodes[0].id, 30.0, 40.0, None, 10.0)
+        mobility.addwaypoint(1.0, nodes[1].id, 5.0, 0.0, None, 10.0)
+        mobility.addwaypoint(1.0, nodes[2].id, 100.0, 100.0, None, 0)
+        mobility.updatepoints(1.0)
+
+        # when
+        with mock.patch.object(session, "broadcast_nodes") as broadcast_nodes:
+            moved, _ = mobility.movenodes(1.0)
+
+        # then
+        assert moved == nodes
+        assert nodes[0].position.get() == (6.0, 8.0, None)
+        assert nodes[1].position.get() == (5.0, 0.0, None)
+        assert nodes[2].position.get() == (100.0, 100.0, None)
+        broadcast_nodes.assert_called_once()
+        assert len(broadcast_nodes.call_args[0][0]) == 3
+        assert sorted(mobility.points) == [nodes[0].id, nodes[1].id]
@@ -1,8 +1,15 @@
+import threading
+
 import pytest
+from mock import MagicMock, patch
 
 from core.emulator.emudata import NodeOptions
 from core.emulator.enumerations import NodeTypes
-from core.errors import CoreError
+from core.errors import CoreCommandError, CoreError
+from core.nodes import netlink
+from core.nodes.client import VnodeClient, VnodeShell
+from core.nodes.netclient import LinuxNetClient
+from core.nodes.network import ebq
 
 MODELS = ["router", "host", "PC", "mdr"]
 NET_TYPES = [NodeTypes.SWITCH, NodeTypes.HUB, NodeTypes.WIRELESS_LAN]
@@ -105,3 +112,129 @@ class TestNodes:
         # then
         assert node
         assert node.up
+
+    def test_wlan_ebtables_changes(self, session, ip_prefixes):
+        # given
+        wlan = session.add_node(_type=NodeTypes.WIRELESS_LAN)
+        node_one = session.add_node()
+        node_two = session.add_node()
+        for node in [node_one, node_two]:
+            interface = ip_prefixes.create_interface(node)
+            session.add_link(node.id, wlan.id, interface_one=interface)
+        netif_one, netif_two = wlan.netifs(sort=True)
+        wlan.link(netif_one, netif_two)
+        ebq.buildcmds(wlan)
+        ebq.cmds = []
+
+        # when
+        wlan.unlink(netif_one, netif_two)
+        ebq.buildcmds(wlan)
+        cmds = ebq.cmds
+        ebq.cmds = []
+
+        # then
+        assert len(cmds) == 2
+        assert all(x.startswith(f"-D {wlan.brname}") for x in cmds)
+
+    def test_net_client_batch(self):
+        # given
+        run = MagicMock()
+        net_client = LinuxNetClient(run)
+
+        # when
+        with net_client.batch():
+            net_client.create_veth("veth0", "veth1")
+            net_client.device_up("veth0")
+            net_client.create_address("veth0", "10.0.0.1/24")
+
+        # then
+        run.assert_called_once()
+        args = run.call_args[0][0]
+        assert "-batch" in args
+        assert "link set veth0 up" in args
+
+    def test_net_client_checksums_off_devices(self):
+        # given
+        run = MagicMock()
+        net_client = LinuxNetClient(run)
+
+        # when
+        net_client.checksums_off_devices(["eth0", "eth1", "eth2"])
+
+        # then
+        run.assert_called_once()
+        args = run.call_args[0][0]
+        assert run.call_args[1] == {"shell": True}
+        assert all(f"-K {x} rx off tx off" in args for x in ["eth0", "eth1", "eth2"])
+
+    def test_vnode_shell(self):
+        # given
+        shell = VnodeShell(["/bin/sh"])
+
+        # when
+        output = shell.run("echo one; echo two >&2")
+        failure = shell.run("exit 2")
+        shell.close()
+
+        # then
+        assert output == (0, b"one\n", b"two\n")
+        assert failure[0] == 2
+
+    def test_vnode_client_shell_exit(self):
+        # given
+        client = VnodeClient("test", "ctrl")
+        client.max_shells = 1
+        client.create_cmd = lambda args: args
+        results = []
+
+        def run(args):
+            try:
+                results.append(client.check_cmd(args, shell=True))
+            except CoreCommandError as e:
+                results.append(e)
+
+        # when
+        first = threading.Thread(target=run, args=("sleep 0.2; kill -9 $$",))
+        first.start()
+        second = threading.Thread(target=run, args=("echo two",))
+        second.start()
+        first.join(5)
+        second.join(5)
+        client.close()
+
+        # then
+        assert not second.is_alive()
+        assert "two" in results
+        assert any(isinstance(x, CoreCommandError) for x in results)
+
+    def test_vnode_client_close_stats(self):
+        # given
+        client = VnodeClient("test", "ctrl")
+        client.create_cmd = lambda args: args
+        client.check_cmd("echo one")
+        client.check_cmd("echo two")
+
+        # when
+        with patch("core.nodes.client.logging") as logging:
+            client.close()
+
+        # then
+        _, name, stats = logging.debug.call_args[0]
+        assert name == "test"
+        assert stats["count"] == 2
+        assert stats["shells"] == 1
+
+    def test_netlink_link_names(self):
+        # given
+        name = b"veth0\0\0\0"
+        attr = netlink.RTA_HEADER.pack(netlink.RTA_HEADER.size + 6, netlink.IFLA_IFNAME)
+        info = netlink.IFINFO_MSG.pack(0, 0, 1, 0, 0)
+        length = netlink.NLMSG_HEADER.size + len(info) + len(attr) + len(name)
+        header = netlink.NLMSG_HEADER.pack(length, netlink.RTM_NEWLINK, 0, 0, 0)
+        message = header + info + attr + name
+
+        # when
+        names = netlink.link_names(message + message)
+
+        # then
+        assert names == ["veth0", "veth0"]
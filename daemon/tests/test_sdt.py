@@ -0,0 +1,114 @@
+import threading
+
+import mock
+import pytest
+from mock import MagicMock
+
+from core.emulator.data import NodeData
+from core.emulator.enumerations import NodeTypes
+
+
+@pytest.fixture
+def sdt(session):
+    session.options.set_config("enablesdt", "1")
+    sdt = session.sdt
+    sdt.sock = MagicMock()
+    sdt.connected = True
+    yield sdt
+    sdt.sock = None
+    sdt.connected = False
+    sdt.threshold = 0
+    sdt.positions.clear()
+    sdt.wireless.clear()
+    session.options.set_config("enablesdt", "0")
+
+
+class TestSdt:
+    def test_node_updates_batched(self, sdt):
+        # given
+        updates = []
+        for node_id in range(100):
+            node_data = NodeData(
+                message_type=0,
+                id=node_id,
+                latitude=1.0,
+                longitude=1.0,
+                altitude=1.0,
+            )
+            updates.append(node_data)
+
+        # when
+        for node_data in updates:
+            sdt.handle_node_update(node_data)
+        sdt.flush()
+
+        # then
+        sent = [x[0][0] for x in sdt.sock.sendall.call_args_list]
+        assert 1 < len(sent) < len(updates)
+        assert all(len(x) <= sdt.MAX_BATCH for x in sent)
+        assert b"".join(sent).count(b"\n") == len(updates)
+
+    def test_node_update_threshold(self, sdt):
+        # given
+        sdt.threshold = 10
+
+        # when
+        for x in (0, 5, 9, 10, 25):
+            node_data = NodeData(
+                message_type=0,
+                id=1,
+                x_position=x,
+                y_position=0,
+                latitude=1.0,
+                longitude=1.0,
+                altitude=1.0,
+            )
+            sdt.handle_node_update(node_data)
+        sdt.flush()
+
+        # then
+        data = sdt.sock.sendall.call_args[0][0]
+        assert data.count(b"\n") == 3
+
+    def test_wireless_cached(self, session, sdt):
+        # given
+        wlan = session.add_node(_type=NodeTypes.WIRELESS_LAN)
+        node = session.add_node()
+
+        # when
+        sdt.add_link(node.id, wlan.id, False)
+        with mock.patch.object(session, "get_node") as get_node:
+            sdt.add_link(node.id, wlan.id, False)
+
+        # then
+        get_node.assert_not_called()
+        assert sdt.wireless == {node.id: False, wlan.id: True}
+        assert not sdt.sock.sendall.called
+
+    def test_delete_node_after_updates(self, sdt):
+        # given
+        event = threading.Event()
+        moved = sdt.moved
+
+        def blocked(node_data):
+            event.wait(timeout=5)
+            return moved(node_data)
+
+        # when
+        with mock.patch.object(sdt, "moved", side_effect=blocked):
+            for node_id in (1, 2):
+                node_data = NodeData(
+                    message_type=0,
+                    id=node_id,
+                    latitude=1.0,
+                    longitude=1.0,
+                    altitude=1.0,
+                )
+                sdt.broadcasts.handler(sdt.handle_node_update)(node_data)
+            sdt.delete_node(2)
+            event.set()
+            sdt.broadcasts.flush(timeout=5)
+
+        # then
+        data = b"".join(x[0][0] for x in sdt.sock.sendall.call_args_list)
+        assert data.index(b"node 2 pos") < data.index(b"delete node,2")